@@ -0,0 +1,109 @@
+"""
+Runs the benchmark suite and compares the results against the stored baseline.
+
+Usage (from the repository root):
+
+    python -m benchmarks                      # run everything, compare against the baseline
+    python -m benchmarks --save-baseline      # run everything and store it as the new baseline
+    python -m benchmarks -k 'rps_logic.*'     # run a subset
+    python -m benchmarks --threshold 0.1 --threshold-for game.play_game=0.5
+
+The process exits with status 1 if any benchmark regressed beyond its threshold.
+"""
+
+import argparse
+import importlib
+import os
+import pkgutil
+import sys
+
+from benchmarks.harness import (BENCHMARKS, DEFAULT_THRESHOLD, compare_results, format_ns,
+                                load_baseline, run_benchmarks, save_baseline)
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+
+def discover():
+    """
+    Imports every 'bench_*' module of this package, registering its benchmarks.
+    """
+    for module in pkgutil.iter_modules([os.path.dirname(__file__)]):
+        if module.name.startswith('bench_'):
+            importlib.import_module(f'benchmarks.{module.name}')
+
+
+def parse_threshold(value: str):
+    """
+    :param value: A 'name=threshold' pair.
+    :return: The (name, threshold) tuple.
+    """
+    name, _, threshold = value.partition('=')
+    try:
+        return name, float(threshold)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(f'expected NAME=THRESHOLD, got {value!r}') from e
+
+
+def main() -> int:
+    """
+    Runs the benchmark suite from the command line.
+
+    :return: The process exit status.
+    """
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-k', '--filter', action='append', default=[],
+                        help='Only run benchmarks matching this glob pattern (repeatable).')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE,
+                        help='The baseline JSON file.')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='Store the results as the new baseline.')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Relative slowdown reported as a regression (default: %(default)s).')
+    parser.add_argument('--threshold-for', type=parse_threshold, action='append', default=[],
+                        metavar='NAME=THRESHOLD', help='Per-benchmark threshold (repeatable).')
+    parser.add_argument('--repeats', type=int, default=5, help='Timed repeats per benchmark.')
+    parser.add_argument('--target-seconds', type=float, default=0.2,
+                        help='Approximate duration of each repeat.')
+    parser.add_argument('--list', action='store_true', help='List the benchmarks and exit.')
+    args = parser.parse_args()
+
+    discover()
+    if args.list:
+        for name in BENCHMARKS:
+            print(name)
+        return 0
+
+    results = run_benchmarks(args.filter, args.repeats, args.target_seconds)
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results)
+        print(f'\nSaved {len(results)} results to {args.baseline}')
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if not baseline:
+        print(f'\nNo baseline at {args.baseline}; run with --save-baseline to create one.')
+        return 0
+
+    # Benchmark-specific thresholds from the registry, overridden by the command line
+    thresholds = {name: threshold for name, (_, threshold) in BENCHMARKS.items()
+                  if threshold is not None}
+    thresholds.update(dict(args.threshold_for))
+    rows = compare_results(results, baseline, args.threshold, thresholds)
+
+    print(f'\n{"benchmark":<50} {"baseline":>12} {"current":>12} {"change":>8}')
+    for row in rows:
+        flag = '  REGRESSION' if row['regressed'] else ''
+        print(f'{row["name"]:<50} {format_ns(row["baseline_ns"]):>12} '
+              f'{format_ns(row["current_ns"]):>12} {row["ratio"] - 1:>+8.1%}{flag}')
+
+    regressions = [row for row in rows if row['regressed']]
+    if regressions:
+        print(f'\n{len(regressions)} benchmark(s) regressed.')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
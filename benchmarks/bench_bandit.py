@@ -0,0 +1,36 @@
+"""
+Benchmarks of the bandit meta-strategy's decisions, across portfolio sizes. The time per decision
+should stay nearly flat as the portfolio grows, since arms are updated in vector operations.
+"""
+
+import numpy as np
+
+from benchmarks.harness import benchmark
+from rps.bandit import BanditStrategy
+from rps.round_history import RoundHistory
+from rps.rps_logic import RPSLogic
+
+_DECISIONS = 2000
+
+
+def _register(num_arms: int):
+    @benchmark(f'bandit.decide[arms={num_arms}]', threshold=0.5)
+    def bench_decide():
+        rps_logic = RPSLogic()
+        # Half frequency arms and half Markov arms, with a random and an equilibrium arm
+        decays = np.linspace(0.5, 1.0, (num_arms - 2) // 2)
+        strategy = BanditStrategy(frequency_decays=decays, markov_decays=decays, seed=0)
+        history = RoundHistory(num_weapons=len(rps_logic.options))
+        strategy.attach_history(history, 1)
+        opponent_moves = np.random.default_rng(0).integers(3, size=_DECISIONS).tolist()
+        weapon_ids, outcomes = rps_logic.weapon_ids, rps_logic.outcome_matrix.tolist()
+
+        def run():
+            for opponent in opponent_moves:
+                move = weapon_ids[strategy.execute(rps_logic)]
+                history.append(move, opponent, outcomes[move][opponent])
+        return run, _DECISIONS, {'arms': strategy.num_arms}
+
+
+for _num_arms in (4, 16, 128, 512):
+    _register(_num_arms)
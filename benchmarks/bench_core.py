@@ -0,0 +1,90 @@
+"""
+Benchmarks of the core game hot paths: ruleset loading and validation, weapon comparison,
+strategy execution, a full game loop and asset retrieval.
+"""
+
+import builtins
+import random
+from unittest.mock import patch
+
+from benchmarks.harness import benchmark
+from benchmarks.rulesets import balanced_ruleset
+from rps.asset_manager import AssetManager
+from rps.game import Game
+from rps.player import ComputerPlayer
+from rps.rps_logic import RPSLogic
+from rps.strategy import RandomStrategy
+from rps.verify_input_files import validate_config_files_input
+
+
+@benchmark('rps_logic.construct')
+def bench_rps_logic_construct():
+    return RPSLogic, 1
+
+
+@benchmark('rps_logic.compare')
+def bench_rps_logic_compare():
+    rps_logic = RPSLogic()
+    pairs = [(a, b) for a in rps_logic.options for b in rps_logic.options]
+
+    def run():
+        for weapon1, weapon2 in pairs:
+            rps_logic.compare(weapon1, weapon2)
+    return run, len(pairs)
+
+
+def _register_validation(num_weapons: int):
+    @benchmark(f'verify_input_files.validate[{num_weapons}]')
+    def bench_validate():
+        names_tuples, relationship = balanced_ruleset(num_weapons)
+
+        def run():
+            validate_config_files_input(names_tuples, relationship)
+        return run, 1
+
+
+for _num_weapons in (3, 101, 501):
+    _register_validation(_num_weapons)
+
+
+@benchmark('strategy.random.execute')
+def bench_random_strategy():
+    rps_logic = RPSLogic()
+    strategy = RandomStrategy()
+    random.seed(0)
+
+    def run():
+        for _ in range(1000):
+            strategy.execute(rps_logic)
+    return run, 1000
+
+
+@benchmark('game.play_game', threshold=0.3)
+def bench_play_game():
+    rps_logic = RPSLogic()
+    num_rounds = 1000
+
+    def run():
+        # Stub the number-of-rounds prompt and all output; only the game loop is measured
+        with patch('rps.game.get_user_input_with_verification', return_value=str(num_rounds)), \
+                patch.object(builtins, 'print', lambda *args, **kwargs: None):
+            game = Game(ComputerPlayer(rps_logic), ComputerPlayer(rps_logic), rps_logic)
+            game.play_game()
+    return run, num_rounds
+
+
+@benchmark('asset_manager.get_asset.cached')
+def bench_get_asset_cached():
+    asset_manager = AssetManager()
+    asset_manager.get_asset('game_title.txt')
+
+    def run():
+        asset_manager.get_asset('game_title.txt')
+    return run, 1
+
+
+@benchmark('asset_manager.get_asset.uncached')
+def bench_get_asset_uncached():
+    def run():
+        AssetManager().get_asset('game_title.txt')
+    return run, 1
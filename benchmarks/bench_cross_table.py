@@ -0,0 +1,49 @@
+"""
+Benchmarks of the expected-payoff cross-table between stationary strategies, against a simulated
+round-robin of the same strategies. Times are per pairing: the analytic table should be many
+orders of magnitude cheaper per pairing than simulating its games, even for thousands of
+strategies.
+"""
+
+import numpy as np
+
+from benchmarks.harness import benchmark
+from rps.cross_table import cross_table
+from rps.game_runner import ThreadPoolGameRunner
+from rps.rps_logic import RPSLogic
+from rps.strategy import MixedStrategy
+
+_SIMULATED_ROUNDS = 1000
+
+
+def _factories(num_strategies: int) -> dict:
+    """
+    :return: Factories of mixed strategies with random weights, by name.
+    """
+    weights = np.random.default_rng(0).random((num_strategies, 3)).tolist()
+    return {f'mixed{index}': (lambda w=w: MixedStrategy(dict(zip('rps', w)), seed=0))
+            for index, w in enumerate(weights)}
+
+
+def _register_analytic(num_strategies: int):
+    @benchmark(f'cross_table.analytic[strategies={num_strategies}]', threshold=0.5)
+    def bench_analytic():
+        rps_logic = RPSLogic()
+        factories = _factories(num_strategies)
+        return lambda: cross_table(rps_logic, factories), num_strategies * num_strategies
+
+
+@benchmark('cross_table.simulated_round_robin[strategies=10]', threshold=0.5)
+def bench_simulated_round_robin():
+    rps_logic = RPSLogic()
+    factories = list(_factories(10).values())
+    runner = ThreadPoolGameRunner(rps_logic, max_workers=1)
+    matchups = [(factory1, factory2) for factory1 in factories for factory2 in factories]
+
+    def run():
+        runner.run(matchups, _SIMULATED_ROUNDS)
+    return run, len(matchups), {'rounds': _SIMULATED_ROUNDS}
+
+
+for _num_strategies in (10, 1000, 5000):
+    _register_analytic(_num_strategies)
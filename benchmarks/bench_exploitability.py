@@ -0,0 +1,39 @@
+"""
+Benchmarks of the exploitability evaluator: the cost per round of feeding a live game round by
+round, and of streaming a round log in batches.
+"""
+
+import numpy as np
+
+from benchmarks.harness import benchmark
+from rps.exploitability import ExploitabilityEvaluator
+from rps.rps_logic import RPSLogic
+
+_ROUNDS = 100_000
+
+
+def _rounds():
+    rng = np.random.default_rng(0)
+    return rng.integers(3, size=_ROUNDS), rng.integers(3, size=_ROUNDS)
+
+
+@benchmark('exploitability.observe', threshold=0.5)
+def bench_observe():
+    evaluator = ExploitabilityEvaluator(RPSLogic(), max_depth=3)
+    stream = evaluator.new_stream()
+    subject, opponent = (moves.tolist() for moves in _rounds())
+    rounds = list(zip(subject, opponent))
+    observe = stream.observe
+
+    def run():
+        for move, opponent_move in rounds:
+            observe(move, opponent_move)
+        stream.flush()
+    return run, _ROUNDS
+
+
+@benchmark('exploitability.observe_many', threshold=0.5)
+def bench_observe_many():
+    evaluator = ExploitabilityEvaluator(RPSLogic(), max_depth=3)
+    subject, opponent = _rounds()
+    return lambda: evaluator.new_stream().observe_many(subject, opponent), _ROUNDS
@@ -0,0 +1,32 @@
+"""
+Benchmarks of the thread-pool game runner. Comparing the time per round across thread counts shows
+how games sharing one RPSLogic scale: on a free-threaded build they should run in parallel, and with
+the GIL more threads should cost little compared to one.
+"""
+
+import os
+import sys
+
+from benchmarks.harness import benchmark
+from rps.game_runner import ThreadPoolGameRunner
+from rps.rps_logic import RPSLogic
+from rps.strategy import RandomStrategy
+
+_GAMES = 64
+_ROUNDS = 1000
+
+
+def _register(num_threads: int):
+    @benchmark(f'game_runner.threads[{num_threads}]', threshold=0.5)
+    def bench_game_runner():
+        runner = ThreadPoolGameRunner(RPSLogic(), max_workers=num_threads)
+        matchups = [(RandomStrategy, RandomStrategy)] * _GAMES
+        gil_enabled = getattr(sys, '_is_gil_enabled', lambda: True)()
+
+        def run():
+            runner.run(matchups, _ROUNDS)
+        return run, _GAMES * _ROUNDS, {'gil_enabled': int(gil_enabled)}
+
+
+for _num_threads in sorted({1, 2, 4, os.cpu_count() or 1}):
+    _register(_num_threads)
@@ -0,0 +1,87 @@
+"""
+Benchmarks of the HTTP/JSON game API over a keep-alive localhost connection. The server runs on an
+event loop in a background thread; the client is `http.client`.
+
+For 'http_api.round' one operation is one request, so requests per second is 1e9 / (ns per op).
+For the batch benchmarks one operation is one round, showing how batching amortizes the request.
+"""
+
+import asyncio
+import http.client
+import json
+import threading
+
+from benchmarks.harness import benchmark
+from rps.http_api import GameServer
+from rps.rps_logic import RPSLogic
+
+_BATCH_SIZES = (100, 10_000)
+
+_server: GameServer = None
+
+
+def _start_server() -> GameServer:
+    """
+    :return: A server running in a background thread, shared by all benchmarks of this module.
+    """
+    global _server
+    if _server is None:
+        server = GameServer(RPSLogic(), port=0)
+        loop = asyncio.new_event_loop()
+        started = threading.Event()
+
+        def serve():
+            asyncio.set_event_loop(loop)
+            loop.run_until_complete(server.start())
+            started.set()
+            loop.run_forever()
+
+        threading.Thread(target=serve, daemon=True).start()
+        started.wait()
+        _server = server
+    return _server
+
+
+def _session(server: GameServer):
+    """
+    :return: A keep-alive connection and the path of a new session.
+    """
+    connection = http.client.HTTPConnection(*server.address)
+    connection.request('POST', '/sessions', body=b'{}',
+                       headers={'Content-Type': 'application/json'})
+    session = json.loads(connection.getresponse().read())
+    return connection, f'/sessions/{session["session"]}'
+
+
+def _post(connection: http.client.HTTPConnection, path: str, body: bytes):
+    connection.request('POST', path, body=body, headers={'Content-Type': 'application/json'})
+    response = connection.getresponse()
+    response.read()
+    if response.status != 200:
+        raise RuntimeError(f'{path} answered {response.status}')
+
+
+@benchmark('http_api.round', threshold=0.5)
+def bench_round():
+    connection, path = _session(_start_server())
+    body = b'{"move": "r"}'
+
+    def run():
+        _post(connection, f'{path}/round', body)
+    return run, 1
+
+
+def _register_batch(batch_size: int):
+    @benchmark(f'http_api.rounds[batch={batch_size}]', threshold=0.5)
+    def bench_batch():
+        connection, path = _session(_start_server())
+        body = json.dumps({'moves': ['r', 'p', 's'] * (batch_size // 3)
+                           + ['r'] * (batch_size % 3)}).encode()
+
+        def run():
+            _post(connection, f'{path}/rounds', body)
+        return run, batch_size
+
+
+for _batch_size in _BATCH_SIZES:
+    _register_batch(_batch_size)
@@ -0,0 +1,36 @@
+"""
+Benchmarks of the Iocaine-style ensemble's moves, on the standard ruleset and on larger balanced
+ones. The target is under 50us per move on the standard ruleset.
+"""
+
+import numpy as np
+
+from benchmarks.harness import benchmark
+from benchmarks.rulesets import balanced_ruleset
+from rps.iocaine import IocaineStrategy
+from rps.round_history import RoundHistory
+from rps.rps_logic import RPSLogic
+
+_MOVES = 2000
+
+
+def _register(num_weapons: int):
+    @benchmark(f'iocaine.move[{num_weapons}]', threshold=0.5)
+    def bench_move():
+        rps_logic = RPSLogic() if num_weapons == 3 else RPSLogic.from_data(
+            *balanced_ruleset(num_weapons))
+        strategy = IocaineStrategy(seed=0)
+        history = RoundHistory(num_weapons=num_weapons)
+        strategy.attach_history(history, 1)
+        opponent_moves = np.random.default_rng(0).integers(num_weapons, size=_MOVES).tolist()
+        weapon_ids, outcomes = rps_logic.weapon_ids, rps_logic.outcome_matrix.tolist()
+
+        def run():
+            for opponent in opponent_moves:
+                move = weapon_ids[strategy.execute(rps_logic)]
+                history.append(move, opponent, outcomes[move][opponent])
+        return run, _MOVES, {'predictors': strategy.num_predictors}
+
+
+for _num_weapons in (3, 101, 501):
+    _register(_num_weapons)
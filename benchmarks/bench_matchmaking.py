@@ -0,0 +1,63 @@
+"""
+Benchmarks of the matchmaking queue with 100,000 players waiting. One operation is one match, so
+matches per second is 1e9 / (ns per op).
+"""
+
+import itertools
+import random
+
+from benchmarks.harness import benchmark
+from rps.matchmaking import MatchmakingQueue
+
+_QUEUED = 100_000
+_BATCH = 1000
+
+
+class _FrozenClock:
+    """Keeps the waiting players' windows from widening, so the queue stays full."""
+
+    def __call__(self):
+        return 0.0
+
+
+def _full_queue() -> MatchmakingQueue:
+    """
+    :return: A queue of players whose ratings are all further apart than the initial window.
+    """
+    queue = MatchmakingQueue(initial_window=0.0, widen_rate=25.0, clock=_FrozenClock())
+    ratings = random.Random(0).sample(range(10 * _QUEUED), _QUEUED)
+    for player, rating in enumerate(ratings):
+        queue.enqueue(player, rating + 0.5)
+    return queue
+
+
+@benchmark('matchmaking.match[100k queued]')
+def bench_match():
+    queue = _full_queue()
+    rng = random.Random(1)
+    player_ids = itertools.count(_QUEUED)
+
+    def run():
+        # Each pair of newcomers shares a rating, so each pair matches and the queue stays full
+        enqueue = queue.enqueue
+        for _ in range(_BATCH):
+            rating = rng.randrange(10 * _QUEUED)
+            enqueue(next(player_ids), rating)
+            enqueue(next(player_ids), rating)
+        queue.poll()
+    return run, _BATCH
+
+
+@benchmark('matchmaking.enqueue_cancel[100k queued]')
+def bench_enqueue_cancel():
+    queue = _full_queue()
+    rng = random.Random(2)
+    player_ids = itertools.count(_QUEUED)
+
+    def run():
+        enqueue, cancel = queue.enqueue, queue.cancel
+        for _ in range(_BATCH):
+            player = next(player_ids)
+            enqueue(player, rng.randrange(10 * _QUEUED) + 0.25)
+            cancel(player)
+    return run, _BATCH
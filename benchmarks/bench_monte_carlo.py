@@ -0,0 +1,27 @@
+"""
+Benchmarks of the multi-process Monte Carlo engine. Comparing the time per round across worker
+counts shows how the engine scales with cores.
+"""
+
+import os
+
+from benchmarks.harness import benchmark
+from rps.monte_carlo import MonteCarloEngine
+from rps.rps_logic import RPSLogic
+from rps.strategy import RandomStrategy
+
+_ROUNDS = 400_000
+
+
+def _register(num_workers: int):
+    @benchmark(f'monte_carlo.run[workers={num_workers}]', threshold=0.5)
+    def bench_monte_carlo():
+        engine = MonteCarloEngine(RPSLogic(), RandomStrategy, RandomStrategy, num_workers)
+
+        def run():
+            engine.run(_ROUNDS, seed=0)
+        return run, _ROUNDS
+
+
+for _num_workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+    _register(_num_workers)
@@ -0,0 +1,49 @@
+"""
+Benchmarks of the population dynamics, in generations per second: the replicator dynamics against
+the number of strategy types, and the Moran process against the number of individuals.
+"""
+
+import numpy as np
+
+from benchmarks.harness import benchmark
+from rps.population_dynamics import MoranProcess, ReplicatorDynamics
+from rps.rps_logic import RPSLogic
+
+_GENERATIONS = 10
+_MORAN_TYPES = 1000
+
+
+def _distributions(num_types: int) -> np.ndarray:
+    """
+    :return: Random mixed strategies over rock, paper and scissors.
+    """
+    return np.random.default_rng(0).dirichlet(np.ones(3), size=num_types)
+
+
+def _register_replicator(num_types: int):
+    @benchmark(f'population_dynamics.replicator[types={num_types}]', threshold=0.5)
+    def bench_replicator():
+        rps_logic = RPSLogic()
+        distributions = _distributions(num_types)
+        report = ReplicatorDynamics(rps_logic, distributions).run(_GENERATIONS)
+        return (lambda: ReplicatorDynamics(rps_logic, distributions).run(_GENERATIONS),
+                _GENERATIONS, {'generations_per_second': report.generations_per_second,
+                               'steps_per_generation': report.steps / _GENERATIONS})
+
+
+def _register_moran(population_size: int):
+    @benchmark(f'population_dynamics.moran[individuals={population_size}]', threshold=0.5)
+    def bench_moran():
+        rps_logic = RPSLogic()
+        distributions = _distributions(_MORAN_TYPES)
+        process = MoranProcess(rps_logic, distributions, population_size, seed=0)
+        report = process.run(_GENERATIONS)
+        return (lambda: process.run(_GENERATIONS), _GENERATIONS,
+                {'generations_per_second': report.generations_per_second,
+                 'leaps_per_generation': report.steps / _GENERATIONS})
+
+
+for _num_types in (3, 1000, 10000):
+    _register_replicator(_num_types)
+for _population_size in (100, 10000, 1000000):
+    _register_moran(_population_size)
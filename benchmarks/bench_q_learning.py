@@ -0,0 +1,28 @@
+"""
+Benchmarks of the vectorized Q-learning trainer, across the number of lockstep environments. The
+throughput in environment steps per second should grow with the number of environments, as the
+per-step overhead is shared among them.
+"""
+
+from benchmarks.harness import benchmark
+from rps.q_learning import QLearningTrainer, RecordedOpponent
+from rps.rps_logic import RPSLogic
+
+_STEPS = 200
+
+
+def _register(num_envs: int):
+    @benchmark(f'q_learning.train[envs={num_envs}]', threshold=0.5)
+    def bench_train():
+        rps_logic = RPSLogic()
+        opponent = RecordedOpponent.from_names(rps_logic, 'rrpspsrpsspr')
+        trainer = QLearningTrainer(rps_logic, opponent, num_envs=num_envs, context_length=2,
+                                   seed=0)
+
+        def run():
+            trainer.train(_STEPS)
+        return run, _STEPS * num_envs
+
+
+for _num_envs in (64, 1024, 16384):
+    _register(_num_envs)
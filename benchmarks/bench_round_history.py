@@ -0,0 +1,31 @@
+"""
+Benchmarks of the round history ring buffer: recording a round, and taking a window of recent
+rounds. Both should stay flat however many rounds have been recorded.
+"""
+
+from benchmarks.harness import benchmark
+from rps.round_history import RoundHistory
+
+
+@benchmark('round_history.append')
+def bench_append():
+    history = RoundHistory(capacity=1024)
+
+    def run():
+        append = history.append
+        for round_number in range(10_000):
+            append(round_number % 3, 2, 1)
+    return run, 10_000
+
+
+@benchmark('round_history.window[k=64]')
+def bench_window():
+    history = RoundHistory(capacity=1024)
+    for round_number in range(5000):
+        history.append(round_number % 3, 2, 1)
+
+    def run():
+        moves = history.moves
+        for _ in range(10_000):
+            moves(2, 64)
+    return run, 10_000
@@ -0,0 +1,19 @@
+"""
+Benchmarks of the ruleset balance report, up to rulesets of thousands of weapons.
+"""
+
+from benchmarks.harness import benchmark
+from benchmarks.rulesets import balanced_ruleset
+from rps.rps_logic import RPSLogic
+from rps.ruleset_analysis import analyze
+
+
+def _register(num_weapons: int):
+    @benchmark(f'ruleset_analysis.analyze[{num_weapons}]', threshold=0.5)
+    def bench_analyze():
+        rps_logic = RPSLogic.from_data(*balanced_ruleset(num_weapons))
+        return lambda: analyze(rps_logic), 1
+
+
+for _num_weapons in (3, 101, 1001, 5001):
+    _register(_num_weapons)
@@ -0,0 +1,79 @@
+"""
+Benchmarks of loading a large ruleset from CSV and from the binary formats. Besides the load time,
+each benchmark reports the peak resident memory added by one load, measured in a fresh process.
+"""
+
+import atexit
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.harness import benchmark
+from benchmarks.rulesets import balanced_ruleset
+from rps.rps_logic import RPSLogic
+from rps.ruleset_format import ENCODING_INT8, ENCODING_PACKED, csv_to_binary
+
+_NUM_WEAPONS = 2001
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_files = {}
+
+
+def _ruleset_files() -> dict:
+    """
+    Writes the ruleset in every format once, to a directory removed at exit.
+
+    :return: The paths of the files, by format.
+    """
+    if not _files:
+        directory = tempfile.mkdtemp(prefix='rps-ruleset-format-')
+        atexit.register(shutil.rmtree, directory, True)
+        names_tuples, relationship = balanced_ruleset(_NUM_WEAPONS)
+        _files['short_names'] = os.path.join(directory, 'short_names.json')
+        _files['csv'] = os.path.join(directory, 'relationship.csv')
+        with open(_files['short_names'], 'w', encoding='utf-8') as f:
+            json.dump(names_tuples, f)
+        relationship.to_csv(_files['csv'], index_label='index')
+        for name, encoding in (('int8', ENCODING_INT8), ('packed', ENCODING_PACKED)):
+            _files[name] = os.path.join(directory, f'ruleset.{name}.rpsr')
+            csv_to_binary(_files['short_names'], _files['csv'], _files[name], encoding)
+    return _files
+
+
+def _load_statement(fmt: str, files: dict) -> str:
+    if fmt == 'csv':
+        return f'RPSLogic({files["short_names"]!r}, {files["csv"]!r})'
+    return f'RPSLogic.from_binary({files[fmt]!r})'
+
+
+def _peak_rss_kb(statement: str) -> float:
+    """
+    :param statement: The statement to run in a fresh process, after importing RPSLogic.
+    :return: The peak resident memory the statement adds to the process, in KiB.
+    """
+    script = ('import resource\n'
+              'from rps.rps_logic import RPSLogic\n'
+              'before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss\n'
+              f'rps_logic = {statement}\n'
+              'print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before)\n')
+    output = subprocess.run([sys.executable, '-c', script], cwd=_ROOT, check=True,
+                            capture_output=True, text=True).stdout
+    return float(output)
+
+
+def _register(fmt: str):
+    @benchmark(f'ruleset_format.load[{fmt}, {_NUM_WEAPONS}]', threshold=0.5)
+    def bench_load():
+        files = _ruleset_files()
+        statement = _load_statement(fmt, files)
+        if fmt == 'csv':
+            load = lambda: RPSLogic(files['short_names'], files['csv'])
+        else:
+            load = lambda: RPSLogic.from_binary(files[fmt])
+        return load, 1, {'peak_rss_kb': _peak_rss_kb(statement)}
+
+
+for _fmt in ('csv', 'int8', 'packed'):
+    _register(_fmt)
@@ -0,0 +1,64 @@
+"""
+Benchmarks of the session store at one million idle game sessions: lookups, inserts at the session
+cap (each evicting the least recently used session) and the memory held per idle session.
+"""
+
+import itertools
+import random
+import tracemalloc
+
+from benchmarks.harness import benchmark
+from rps.http_api import GameSession
+from rps.rps_logic import RPSLogic
+from rps.session_store import SessionStore
+
+_SESSIONS = 1_000_000
+_LOOKUPS = 10_000
+
+_store: SessionStore = None
+_bytes_per_session: float = None
+
+
+def _idle_store() -> SessionStore:
+    """
+    :return: A store filled with idle sessions, shared by the benchmarks of this module.
+    """
+    global _store, _bytes_per_session
+    if _store is None:
+        rps_logic = RPSLogic()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        store = SessionStore(max_sessions=_SESSIONS)
+        for index in range(_SESSIONS):
+            key = f'{index:032x}'
+            store.put(key, GameSession(key, rps_logic))
+        _bytes_per_session = (tracemalloc.get_traced_memory()[0] - before) / _SESSIONS
+        tracemalloc.stop()
+        _store = store
+    return _store
+
+
+@benchmark('session_store.get[1M idle]')
+def bench_get():
+    store = _idle_store()
+    keys = [f'{index:032x}' for index in random.Random(0).sample(range(_SESSIONS), _LOOKUPS)]
+
+    def run():
+        get = store.get
+        for key in keys:
+            get(key)
+    return run, _LOOKUPS, {'bytes_per_session': _bytes_per_session}
+
+
+@benchmark('session_store.put_evict[1M idle]')
+def bench_put_evict():
+    store = _idle_store()
+    rps_logic = RPSLogic()
+    session = GameSession('new', rps_logic)
+    counter = itertools.count(_SESSIONS)
+
+    def run():
+        put = store.put
+        for index in itertools.islice(counter, _LOOKUPS):
+            put(f'{index:032x}', session)
+    return run, _LOOKUPS
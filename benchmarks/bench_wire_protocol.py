@@ -0,0 +1,74 @@
+"""
+Benchmarks of the binary wire protocol over a localhost connection, named to line up with the
+HTTP/JSON benchmarks ('http_api.*') so the two protocols can be compared directly: one operation
+is one round, and for 'wire_protocol.round' also one request.
+"""
+
+import asyncio
+import threading
+
+import numpy as np
+
+from benchmarks.harness import benchmark
+from rps.rps_logic import RPSLogic
+from rps.wire_protocol import WireClient, WireServer
+
+_BATCH_SIZES = (100, 10_000)
+
+_server: WireServer = None
+
+
+def _start_server() -> WireServer:
+    """
+    :return: A server running in a background thread, shared by all benchmarks of this module.
+    """
+    global _server
+    if _server is None:
+        server = WireServer(RPSLogic(), port=0)
+        loop = asyncio.new_event_loop()
+        loop.run_until_complete(server.start())
+        threading.Thread(target=loop.run_forever, daemon=True).start()
+        _server = server
+    return _server
+
+
+def _moves(count: int) -> bytes:
+    """
+    :return: Rock, paper and scissors in turn, as weapon ids.
+    """
+    return (np.arange(count) % 3).astype(np.uint8).tobytes()
+
+
+@benchmark('wire_protocol.round', threshold=0.5)
+def bench_round():
+    client = WireClient(*_start_server().address)
+    moves = _moves(1)
+
+    def run():
+        client.play_ids(moves)
+    return run, 1
+
+
+def _register_batch(batch_size: int):
+    @benchmark(f'wire_protocol.rounds[batch={batch_size}]', threshold=0.5)
+    def bench_batch():
+        client = WireClient(*_start_server().address)
+        moves = _moves(batch_size)
+
+        def run():
+            client.play_ids(moves)
+        return run, batch_size
+
+
+for _batch_size in _BATCH_SIZES:
+    _register_batch(_batch_size)
+
+
+@benchmark('wire_protocol.pipelined[frames=64,batch=100]', threshold=0.5)
+def bench_pipelined():
+    client = WireClient(*_start_server().address)
+    batches = [_moves(100)] * 64
+
+    def run():
+        client.pipeline(batches)
+    return run, 64 * 100
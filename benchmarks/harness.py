@@ -0,0 +1,173 @@
+"""
+This module provides the benchmark harness: a registry of benchmarks, a timer that calibrates the
+number of loops to a target duration, and the comparison of results against a stored JSON baseline.
+
+A benchmark is a function decorated with `@benchmark(name)` that performs its setup and returns a
+tuple of (callable, operations per call). Only the callable is timed. A setup may return a dict of
+additional measurements as a third element (e.g. memory use); they are reported and stored with the
+timings, but not compared against the baseline.
+"""
+
+import fnmatch
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+# Default relative slowdown (0.2 = 20% slower) above which a benchmark is reported as a regression
+DEFAULT_THRESHOLD = 0.2
+
+# A benchmark setup returns (callable, operations per call) or (callable, operations, extra results)
+Setup = Callable[[], Union[Tuple[Callable[[], None], int],
+                           Tuple[Callable[[], None], int, Dict[str, float]]]]
+
+# Registered benchmarks: name -> (setup function, regression threshold or None for the default)
+BENCHMARKS: Dict[str, Tuple[Setup, Optional[float]]] = {}
+
+
+def benchmark(name: str, threshold: float = None):
+    """
+    Registers a benchmark setup function.
+
+    :param name: The unique benchmark name, e.g. 'rps_logic.compare'.
+    :param threshold: A benchmark-specific regression threshold, for inherently noisy benchmarks.
+    :return: A decorator registering the function.
+    """
+    def decorator(setup):
+        if name in BENCHMARKS:
+            raise ValueError(f'Benchmark already registered: {name}')
+        BENCHMARKS[name] = (setup, threshold)
+        return setup
+    return decorator
+
+
+def measure(func: Callable[[], None], operations: int, repeats: int = 5,
+            target_seconds: float = 0.2) -> Dict[str, float]:
+    """
+    Times a callable. The number of loops per repeat is calibrated so that each repeat takes
+    roughly `target_seconds`.
+
+    :param func: The callable to time.
+    :param operations: The number of operations a single call performs.
+    :param repeats: The number of timed repeats.
+    :param target_seconds: The approximate duration of each repeat.
+    :return: The best and median time per operation in nanoseconds, and the loops per repeat.
+    """
+    # Calibrate: double the loop count until a repeat takes a meaningful amount of time
+    loops = 1
+    while True:
+        start = time.perf_counter_ns()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter_ns() - start
+        if elapsed >= target_seconds * 1e9 / 10 or loops >= 1 << 20:
+            break
+        loops *= 2
+    loops = max(1, int(loops * target_seconds * 1e9 / max(elapsed, 1)))
+
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter_ns()
+        for _ in range(loops):
+            func()
+        timings.append((time.perf_counter_ns() - start) / (loops * operations))
+
+    return {'best_ns': min(timings), 'median_ns': statistics.median(timings), 'loops': loops}
+
+
+def run_benchmarks(patterns: List[str] = None, repeats: int = 5,
+                   target_seconds: float = 0.2, log=print) -> Dict[str, Dict[str, float]]:
+    """
+    Runs all registered benchmarks matching any of the given glob patterns.
+
+    :param patterns: Glob patterns over benchmark names; all benchmarks run if empty.
+    :param repeats: The number of timed repeats per benchmark.
+    :param target_seconds: The approximate duration of each repeat.
+    :param log: Called with a progress line after each benchmark.
+    :return: The results per benchmark name.
+    """
+    results = {}
+    for name, (setup, _) in BENCHMARKS.items():
+        if patterns and not any(fnmatch.fnmatch(name, pattern) for pattern in patterns):
+            continue
+        func, operations, *extra = setup()
+        results[name] = measure(func, operations, repeats, target_seconds)
+        line = f'{name:<50} {format_ns(results[name]["best_ns"]):>12} / op'
+        if extra:
+            results[name].update(extra[0])
+            line += ''.join(f'  {key}={value:,.0f}' for key, value in extra[0].items())
+        log(line)
+    return results
+
+
+def compare_results(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+                    threshold: float = DEFAULT_THRESHOLD,
+                    thresholds: Dict[str, float] = None) -> List[Dict[str, object]]:
+    """
+    Compares results against a baseline, using the best time per operation.
+
+    :param results: The current results per benchmark name.
+    :param baseline: The baseline results per benchmark name.
+    :param threshold: The default relative slowdown treated as a regression.
+    :param thresholds: Per-benchmark thresholds overriding the default.
+    :return: One row per benchmark present in both, with the baseline and current times, their
+     ratio, the threshold applied and whether it regressed.
+    """
+    thresholds = thresholds or {}
+    rows = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        limit = thresholds.get(name, threshold)
+        ratio = result['best_ns'] / baseline[name]['best_ns']
+        rows.append({'name': name, 'baseline_ns': baseline[name]['best_ns'],
+                     'current_ns': result['best_ns'], 'ratio': ratio, 'threshold': limit,
+                     'regressed': ratio > 1 + limit})
+    return rows
+
+
+def load_baseline(path: str) -> Dict[str, Dict[str, float]]:
+    """
+    :param path: The baseline file path.
+    :return: The stored results, or an empty dict if there is no baseline yet.
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)['results']
+
+
+def save_baseline(path: str, results: Dict[str, Dict[str, float]]):
+    """
+    Stores results as the new baseline, merged over any previously stored results, so that
+    running a subset of the benchmarks doesn't drop the others.
+
+    :param path: The baseline file path.
+    :param results: The results per benchmark name.
+    """
+    merged = load_baseline(path)
+    merged.update(results)
+    document = {
+        'python': sys.version,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'results': dict(sorted(merged.items())),
+    }
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def format_ns(value: float) -> str:
+    """
+    :param value: A duration in nanoseconds.
+    :return: The duration formatted with a readable unit.
+    """
+    for unit, scale in (('s', 1e9), ('ms', 1e6), ('us', 1e3)):
+        if value >= scale:
+            return f'{value / scale:.2f} {unit}'
+    return f'{value:.1f} ns'
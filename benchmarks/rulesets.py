@@ -0,0 +1,25 @@
+"""
+Synthetic rulesets for benchmarks at sizes beyond the shipped 3-weapon game.
+"""
+
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def balanced_ruleset(num_weapons: int) -> Tuple[List[List[str]], pd.DataFrame]:
+    """
+    Builds a balanced ruleset in which every weapon beats the next (n - 1) / 2 weapons, cyclically.
+
+    :param num_weapons: The number of weapons (should be odd for a balanced ruleset).
+    :return: The short names list (as loaded from short_names.json) and the relationship
+     DataFrame (as loaded from relationship.csv).
+    """
+    shorts = [f'w{i}' for i in range(num_weapons)]
+    names_tuples = [[short, f'weapon {i}'] for i, short in enumerate(shorts)]
+    half = num_weapons // 2
+    ids = np.arange(num_weapons)
+    distance = (ids[None, :] - ids[:, None]) % num_weapons
+    rows = np.where(distance == 0, 0, np.where(distance <= half, 1, 2))
+    return names_tuples, pd.DataFrame(rows, index=shorts, columns=shorts)
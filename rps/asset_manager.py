@@ -2,9 +2,181 @@
 This module provides the AssetManager class, which is responsible for managing and retrieving
 assets from a specified folder. The default asset folder is set to 'assets', relative to the
 script's location.
+
+Retrieved assets are kept in a size-bounded, in-memory LRU cache that is invalidated when the
+underlying file's modification time changes. Assets can also be served from a single packed,
+memory-mapped bundle file (see `write_asset_bundle`), so that a deployment opens one file instead
+of many.
 """
 
+import argparse
+import mmap
 import os
+import struct
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+# Environment variable pointing the shared AssetManager at a packed asset bundle
+ASSET_BUNDLE_ENV = 'RPS_ASSET_BUNDLE'
+
+# Default upper bound for the in-memory asset cache, in bytes
+DEFAULT_MAX_CACHE_BYTES = 4 * 1024 * 1024
+
+
+class AssetBundle:
+    """
+    A read-only, memory-mapped bundle of assets packed into a single file.
+
+    File layout (little-endian):
+        header:  magic (8 bytes) | version (uint16) | entry count (uint32)
+        index:   per entry: name length (uint16) | UTF-8 name | data offset (uint64) |
+                 data length (uint64)
+        data:    the raw UTF-8 contents of all assets, back to back
+
+    Attributes:
+        path (str): The path of the bundle file.
+        mtime (int): The bundle file's modification time (ns) when it was opened.
+    """
+
+    MAGIC = b'RPSASSET'
+    VERSION = 1
+    _HEADER = struct.Struct('<8sHI')
+    _NAME_LENGTH = struct.Struct('<H')
+    _LOCATION = struct.Struct('<QQ')
+
+    def __init__(self, path: str):
+        """
+        Opens and memory-maps a bundle file and reads its index.
+
+        :param path: The path of the bundle file.
+        :raises ValueError: If the file is not a valid asset bundle.
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            self.mtime = os.fstat(f.fileno()).st_mtime_ns
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        view = memoryview(self._mmap)
+        try:
+            self._index = self._read_index(view)
+        except (struct.error, ValueError) as e:
+            view.release()
+            self.close()
+            raise ValueError(f'{path}: not a valid version {self.VERSION} asset bundle') from e
+        view.release()
+
+    @classmethod
+    def _read_index(cls, view: memoryview) -> Dict[str, Tuple[int, int]]:
+        """
+        Parses the bundle header and index.
+
+        :param view: A view over the whole bundle file.
+        :return: A mapping of asset names to their (offset, length) in the file.
+        """
+        magic, version, count = cls._HEADER.unpack_from(view, 0)
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise ValueError('bad magic or version')
+
+        index = {}
+        position = cls._HEADER.size
+        for _ in range(count):
+            (name_length,) = cls._NAME_LENGTH.unpack_from(view, position)
+            position += cls._NAME_LENGTH.size
+            name = bytes(view[position:position + name_length]).decode('utf-8')
+            position += name_length
+            index[name] = cls._LOCATION.unpack_from(view, position)
+            position += cls._LOCATION.size
+        return index
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+
+    def names(self):
+        """
+        :return: The names of all assets in the bundle.
+        """
+        return list(self._index)
+
+    def get(self, name: str) -> Optional[str]:
+        """
+        Decodes a single asset directly from the mapped file.
+
+        :param name: The asset name (path relative to the assets folder, '/'-separated).
+        :return: The asset's content, or None if the bundle does not contain it.
+        """
+        location = self._index.get(name)
+        if location is None:
+            return None
+        offset, length = location
+        return self._mmap[offset:offset + length].decode('utf-8')
+
+    def size(self, name: str) -> int:
+        """
+        :param name: The asset name.
+        :return: The asset's stored size in bytes, or 0 if the bundle does not contain it.
+        """
+        location = self._index.get(name)
+        return location[1] if location is not None else 0
+
+    def close(self):
+        """
+        Unmaps the bundle file.
+        """
+        self._mmap.close()
+
+
+def write_asset_bundle(assets_dir: str, bundle_path: str) -> int:
+    """
+    Packs every file under an assets folder into a single bundle file.
+
+    The bundle is written to a temporary file and moved into place atomically, so processes
+    reading the previous bundle are never exposed to a partial file.
+
+    :param assets_dir: The folder containing the assets to pack.
+    :param bundle_path: The path of the bundle file to write.
+    :return: The number of packed assets.
+    """
+    entries = []
+    for root, _, files in os.walk(assets_dir):
+        for filename in sorted(files):
+            path = os.path.join(root, filename)
+            name = os.path.relpath(path, assets_dir).replace(os.sep, '/')
+            with open(path, 'rb') as f:
+                entries.append((name.encode('utf-8'), f.read()))
+    entries.sort()
+
+    # Data starts right after the header and the index
+    index_size = sum(AssetBundle._NAME_LENGTH.size + len(name) + AssetBundle._LOCATION.size
+                     for name, _ in entries)
+    offset = AssetBundle._HEADER.size + index_size
+
+    tmp_path = f'{bundle_path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(AssetBundle._HEADER.pack(AssetBundle.MAGIC, AssetBundle.VERSION, len(entries)))
+        for name, data in entries:
+            f.write(AssetBundle._NAME_LENGTH.pack(len(name)))
+            f.write(name)
+            f.write(AssetBundle._LOCATION.pack(offset, len(data)))
+            offset += len(data)
+        for _, data in entries:
+            f.write(data)
+    os.replace(tmp_path, bundle_path)
+    return len(entries)
+
+
+class _CacheEntry:
+    """
+    A cached asset together with the information needed to revalidate it.
+    """
+    __slots__ = ('content', 'mtime', 'size', 'checked_at')
+
+    def __init__(self, content: str, mtime: int, size: int, checked_at: float):
+        self.content = content
+        self.mtime = mtime
+        self.size = size
+        self.checked_at = checked_at
 
 
 class AssetManager:
@@ -12,18 +184,56 @@ class AssetManager:
     AssetManager is responsible for managing and retrieving assets from a specified asset folder.
     The asset folder is assumed to be located at 'assets' relative to the script's location.
 
+    Assets are cached in memory with LRU eviction once the cache exceeds `max_cache_bytes`.
+    A cached asset is revalidated against its file's modification time at most once every
+    `revalidate_after` seconds, and reread if the file changed.
+
     Attributes:
         assets_dir (str): The path to the folder containing assets.
+        bundle (AssetBundle): An optional packed asset bundle, consulted before the folder.
+        max_cache_bytes (int): The maximum total size of cached assets.
+        revalidate_after (float): Seconds between modification time checks of a cached asset.
     """
 
-    def __init__(self):
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, assets_dir: str = None, bundle_path: str = None,
+                 max_cache_bytes: int = DEFAULT_MAX_CACHE_BYTES,
+                 revalidate_after: float = 1.0):
         """
         Initializes the AssetManager by setting the asset folder path.
-        The asset folder is located at '../assets'.
+        The asset folder is located at '../assets' unless given explicitly.
+
+        :param assets_dir: The folder containing assets.
+        :param bundle_path: The path of a packed asset bundle to serve assets from.
+        :param max_cache_bytes: The maximum total size of cached assets.
+        :param revalidate_after: Seconds between modification time checks of a cached asset.
         """
         # Resolve the assets directory relative to this file so that assets are
         # found correctly even when the current working directory differs.
-        self.assets_dir = os.path.join(os.path.dirname(__file__), '..', 'assets')
+        self.assets_dir = assets_dir or os.path.join(os.path.dirname(__file__), '..', 'assets')
+        self.bundle = AssetBundle(bundle_path) if bundle_path else None
+        self.max_cache_bytes = max_cache_bytes
+        self.revalidate_after = revalidate_after
+
+        self._cache: 'OrderedDict[str, _CacheEntry]' = OrderedDict()
+        self._cache_bytes = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> 'AssetManager':
+        """
+        Returns the process-wide AssetManager, creating it on first use.
+        If the RPS_ASSET_BUNDLE environment variable is set, assets are served from that bundle.
+
+        :return: The shared AssetManager instance.
+        """
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:
+                    cls._shared = cls(bundle_path=os.environ.get(ASSET_BUNDLE_ENV))
+        return cls._shared
 
     def get_asset(self, filename: str) -> str:
         """
@@ -33,9 +243,142 @@ class AssetManager:
         :return: The content of the file as a string. Returns an empty string if the file is not
          found.
         """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._cache.get(filename)
+            if entry is not None and now - entry.checked_at < self.revalidate_after:
+                self._cache.move_to_end(filename)
+                return entry.content
+
+        if self.bundle is not None:
+            content = self._get_from_bundle(filename)
+            if content is not None:
+                return content
+
         path = os.path.join(self.assets_dir, filename)
+        mtime, size = self._stat(path)
+        if entry is not None and mtime is not None and entry.mtime == mtime:
+            # Unchanged on disk, only the revalidation timestamp needs refreshing
+            with self._lock:
+                entry.checked_at = now
+            return entry.content
+
         try:
             with open(path, 'r', encoding='utf-8') as f:
-                return f.read()
+                content = f.read()
         except FileNotFoundError:
+            self._evict(filename)
             return ""
+
+        # Only cache files whose modification time is known, so they can be revalidated
+        if mtime is not None:
+            self._store(filename, _CacheEntry(content, mtime, size, now))
+        return content
+
+    def preload(self) -> int:
+        """
+        Loads every asset of the bundle (or, without a bundle, of the assets folder) into the
+        cache, up to the cache size limit.
+
+        :return: The number of assets loaded.
+        """
+        if self.bundle is not None:
+            names = self.bundle.names()
+        else:
+            names = []
+            for root, _, files in os.walk(self.assets_dir):
+                for filename in files:
+                    path = os.path.relpath(os.path.join(root, filename), self.assets_dir)
+                    names.append(path.replace(os.sep, '/'))
+
+        for name in names:
+            self.get_asset(name)
+        return len(names)
+
+    def clear_cache(self):
+        """
+        Drops all cached assets.
+        """
+        with self._lock:
+            self._cache.clear()
+            self._cache_bytes = 0
+
+    def _get_from_bundle(self, filename: str) -> Optional[str]:
+        """
+        Retrieves an asset from the bundle, reopening the bundle if it was replaced on disk.
+
+        :param filename: The asset name.
+        :return: The asset's content, or None if the bundle does not contain it.
+        """
+        mtime, _ = self._stat(self.bundle.path)
+        # Remapping and reading both happen under the lock, so no thread can read from a bundle
+        # while it is being closed
+        with self._lock:
+            if mtime is not None and mtime != self.bundle.mtime:
+                # The bundle was rebuilt: remap it and forget everything cached from the old one
+                old_bundle, self.bundle = self.bundle, AssetBundle(self.bundle.path)
+                old_bundle.close()
+                self._cache.clear()
+                self._cache_bytes = 0
+            bundle = self.bundle
+            content = bundle.get(filename)
+            size = bundle.size(filename)
+
+        if content is not None:
+            # Sized in stored bytes, like assets read from the folder
+            self._store(filename, _CacheEntry(content, bundle.mtime, size, time.monotonic()))
+        return content
+
+    def _store(self, filename: str, entry: _CacheEntry):
+        """
+        Inserts an entry into the cache, evicting the least recently used entries if needed.
+        Entries larger than the whole cache are not stored.
+
+        :param filename: The asset name.
+        :param entry: The cache entry.
+        """
+        if entry.size > self.max_cache_bytes:
+            return
+        with self._lock:
+            previous = self._cache.pop(filename, None)
+            if previous is not None:
+                self._cache_bytes -= previous.size
+            self._cache[filename] = entry
+            self._cache_bytes += entry.size
+            while self._cache_bytes > self.max_cache_bytes:
+                _, evicted = self._cache.popitem(last=False)
+                self._cache_bytes -= evicted.size
+
+    def _evict(self, filename: str):
+        """
+        Removes an entry from the cache, if present.
+
+        :param filename: The asset name.
+        """
+        with self._lock:
+            previous = self._cache.pop(filename, None)
+            if previous is not None:
+                self._cache_bytes -= previous.size
+
+    @staticmethod
+    def _stat(path: str) -> Tuple[Optional[int], int]:
+        """
+        :param path: The file path.
+        :return: The file's modification time (ns) and size, or (None, 0) if it can't be read.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None, 0
+        return stat.st_mtime_ns, stat.st_size
+
+
+if __name__ == '__main__':
+    # Pack the assets folder into a single bundle file, e.g. during a container build
+    parser = argparse.ArgumentParser(description='Pack the assets folder into an asset bundle.')
+    parser.add_argument('bundle_path', help='The bundle file to write.')
+    parser.add_argument('--assets-dir', default=AssetManager().assets_dir,
+                        help='The folder to pack (default: the game assets folder).')
+    args = parser.parse_args()
+    print(f'Packed {write_asset_bundle(args.assets_dir, args.bundle_path)} assets '
+          f'into {args.bundle_path}')
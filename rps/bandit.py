@@ -0,0 +1,257 @@
+"""
+This module provides the BanditStrategy class, a meta-strategy that picks online among a portfolio
+of simple predictive strategies (the arms), using UCB1, Thompson sampling or EXP3.
+
+Every arm proposes a move each round, and once the opponent's move is known every arm is credited
+with the reward its proposal would have earned, whether it was played or not. Arms are grouped in
+families whose state is held in NumPy arrays: all arms of a family update and propose in a single
+vector operation, and all rewards come from one lookup in a reward table derived from the
+ruleset's outcome matrix. The per-round cost therefore stays nearly flat as the portfolio grows to
+hundreds of arms.
+
+The families are:
+
+    random       Uniformly random moves.
+    equilibrium  Moves drawn from the ruleset's equilibrium mixed strategy.
+    frequency    Counters the opponent's most frequent move, with exponentially decaying counts.
+    markov       Counters the opponent's most frequent move after their previous move, with
+                 exponentially decaying transition counts.
+"""
+
+from typing import Sequence
+
+import numpy as np
+
+from rps.decaying_counts import DecayingCounts
+from rps.rps_logic import RPSLogic
+from rps.ruleset_analysis import equilibrium, payoff_matrix
+from rps.strategy import Strategy, register_strategy
+
+ALGORITHMS = ('ucb1', 'thompson', 'exp3')
+
+
+@register_strategy('bandit')
+class BanditStrategy(Strategy):
+    """
+    A strategy choosing each round which arm of its portfolio to follow.
+
+    Rewards are 1 for a win, 0.5 for a tie and 0 for a loss, and are discounted by `discount` every
+    round so the strategy can follow an opponent that changes its play. Since every arm's reward is
+    observed every round, UCB1's exploration bonus is based on how often each arm was followed,
+    and EXP3 reduces to exponential weights over the arms' total rewards.
+
+    The portfolio is set up for the ruleset of the first move; the game's round history must be
+    attached for the strategy to learn (see `Strategy.attach_history`).
+
+    Attributes:
+        algorithm (str): The arm selection algorithm, one of `ALGORITHMS`.
+        num_arms (int): The size of the portfolio.
+        arm_names (list): A description of each arm, e.g. 'frequency(decay=0.9)'.
+        last_arm (int): The index of the arm followed in the last move, or None.
+    """
+    uses_history = True
+
+    def __init__(self, algorithm: str = 'ucb1', random_arms: int = 1, equilibrium_arms: int = 1,
+                 frequency_decays: Sequence[float] = (1.0, 0.9, 0.5),
+                 markov_decays: Sequence[float] = (1.0, 0.9), discount: float = 1.0,
+                 exploration: float = None, learning_rate: float = 0.5, seed: int = None):
+        """
+        :param algorithm: The arm selection algorithm, one of `ALGORITHMS`.
+        :param random_arms: The number of uniformly random arms.
+        :param equilibrium_arms: The number of arms playing the equilibrium mixed strategy.
+        :param frequency_decays: The count decay of each frequency arm (1 never forgets).
+        :param markov_decays: The transition count decay of each Markov arm (1 never forgets).
+        :param discount: The factor applied to past rewards every round (1 never forgets).
+        :param exploration: The scale of UCB1's exploration bonus (0.5 by default), or EXP3's
+         uniform mixing rate (0.05 by default).
+        :param learning_rate: EXP3's learning rate.
+        :param seed: Seeds the strategy's random number generator.
+        :raises ValueError: If the algorithm is unknown or the portfolio is empty.
+        """
+        super().__init__('Bandit')
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f'Unknown algorithm {algorithm!r}, expected one of {ALGORITHMS}.')
+        self.algorithm = algorithm
+        self.discount = discount
+        self.exploration = (exploration if exploration is not None
+                            else 0.05 if algorithm == 'exp3' else 0.5)
+        self.learning_rate = learning_rate
+        self._frequency_decays = np.array(frequency_decays, dtype=float)
+        self._markov_decays = np.array(markov_decays, dtype=float)
+        self._num_random = random_arms
+        self._num_equilibrium = equilibrium_arms
+        self.num_arms = (random_arms + equilibrium_arms + len(self._frequency_decays)
+                         + len(self._markov_decays))
+        if not self.num_arms:
+            raise ValueError('The portfolio is empty.')
+        self.arm_names = (['random'] * random_arms + ['equilibrium'] * equilibrium_arms
+                          + [f'frequency(decay={decay:g})' for decay in frequency_decays]
+                          + [f'markov(decay={decay:g})' for decay in markov_decays])
+        self.last_arm: int = None
+        self._rng = np.random.default_rng(seed)
+        self._rps_logic: RPSLogic = None
+        self._pending_state: dict = None  # Restored once the ruleset is known
+
+    def _setup(self, rps_logic: RPSLogic):
+        """
+        Sets up the portfolio's state for a ruleset.
+
+        :param rps_logic: The game logic.
+        """
+        self._rps_logic = rps_logic
+        num_weapons = len(rps_logic.options)
+        payoff = payoff_matrix(rps_logic)
+        # The reward of playing each weapon (rows) against each weapon (columns)
+        self._rewards = (payoff + 1.0) / 2.0
+        # The best answer to each predicted opponent weapon
+        self._counter = payoff.argmax(axis=0)
+        self._equilibrium_cdf = np.cumsum(equilibrium(rps_logic))
+
+        self._frequency_counts = DecayingCounts(self._frequency_decays, (num_weapons,))
+        self._markov_counts = DecayingCounts(self._markov_decays, (num_weapons, num_weapons))
+        self._opponent_previous: int = None
+        self._rounds_seen = 0
+
+        self._proposals = np.zeros(self.num_arms, dtype=np.intp)
+        self._reward_sums = np.zeros(self.num_arms)
+        self._loss_sums = np.zeros(self.num_arms)
+        self._rounds = 0.0  # Discounted number of observed rounds
+        self._pulls = np.zeros(self.num_arms)
+        if self._pending_state is not None:
+            self._restore(self._pending_state)
+            self._pending_state = None
+        else:
+            self._propose()
+
+    def execute(self, game_logic: RPSLogic) -> str:
+        """
+        Learns from the last round, then follows the arm chosen by the selection algorithm.
+
+        :param game_logic: The game logic.
+        :return: The chosen weapon's short name.
+        """
+        if game_logic is not self._rps_logic:
+            self._setup(game_logic)
+
+        history = self.history
+        if history is not None and history.total != self._rounds_seen:
+            if history.total > self._rounds_seen and len(history):
+                self._observe(int(history.moves(3 - self.seat, 1)[0]))
+            self._rounds_seen = history.total
+            self._propose()
+
+        arm = self._select()
+        self.last_arm = arm
+        self._pulls[arm] += 1
+        return game_logic.options[self._proposals[arm]]
+
+    def _observe(self, opponent: int):
+        """
+        Credits every arm with the reward of its proposal against the opponent's move, and updates
+        the arms' statistics.
+
+        :param opponent: The opponent's weapon id.
+        """
+        rewards = self._rewards[self._proposals, opponent]
+        discount = self.discount
+        if discount != 1.0:
+            self._reward_sums *= discount
+            self._loss_sums *= discount
+            self._pulls *= discount
+        self._reward_sums += rewards
+        self._loss_sums += 1.0 - rewards
+        self._rounds = self._rounds * discount + 1.0
+
+        self._frequency_counts.add((opponent,))
+        if self._opponent_previous is not None:
+            self._markov_counts.add((self._opponent_previous, opponent))
+        self._opponent_previous = opponent
+
+    def _propose(self):
+        """
+        Computes every arm's move for the next round.
+        """
+        proposals, num_weapons = self._proposals, len(self._counter)
+        end = self._num_random
+        proposals[:end] = self._rng.integers(num_weapons, size=end)
+        start, end = end, end + self._num_equilibrium
+        proposals[start:end] = np.minimum(
+            np.searchsorted(self._equilibrium_cdf, self._rng.random(end - start), side='right'),
+            num_weapons - 1)
+        start, end = end, end + len(self._frequency_decays)
+        proposals[start:end] = self._counter[self._frequency_counts.values.argmax(axis=1)]
+        start = end
+        previous = self._opponent_previous if self._opponent_previous is not None else 0
+        proposals[start:] = self._counter[self._markov_counts.values[:, previous].argmax(axis=1)]
+
+    def _select(self) -> int:
+        """
+        :return: The index of the arm to follow.
+        """
+        if self._rounds == 0:
+            return int(self._rng.integers(self.num_arms))
+
+        if self.algorithm == 'ucb1':
+            means = self._reward_sums / self._rounds
+            bonus = self.exploration * np.sqrt(2.0 * np.log(self._rounds + 1.0)
+                                               / (self._pulls + 1.0))
+            return int(np.argmax(means + bonus))
+
+        if self.algorithm == 'thompson':
+            samples = self._rng.beta(self._reward_sums + 1.0, self._loss_sums + 1.0)
+            return int(np.argmax(samples))
+
+        # EXP3, with the arms' rewards all observed
+        scores = self.learning_rate * self._reward_sums
+        weights = np.exp(scores - scores.max())
+        probabilities = ((1.0 - self.exploration) * weights / weights.sum()
+                         + self.exploration / self.num_arms)
+        arm = np.searchsorted(np.cumsum(probabilities), self._rng.random(), side='right')
+        return min(int(arm), self.num_arms - 1)
+
+    def get_state(self) -> dict:
+        """
+        :return: The portfolio's statistics and the random number generator's state.
+        """
+        state = {'rng': self._rng.bit_generator.state, 'last_arm': self.last_arm}
+        if self._rps_logic is not None:
+            state.update({
+                'frequency_counts': self._frequency_counts.get_state(),
+                'markov_counts': self._markov_counts.get_state(),
+                'opponent_previous': self._opponent_previous,
+                'rounds_seen': self._rounds_seen,
+                'proposals': self._proposals.copy(),
+                'reward_sums': self._reward_sums.copy(),
+                'loss_sums': self._loss_sums.copy(),
+                'rounds': self._rounds,
+                'pulls': self._pulls.copy(),
+            })
+        return state
+
+    def set_state(self, state: dict):
+        """
+        Restores a state returned by `get_state`. The portfolio's statistics take effect once the
+        strategy has been set up for the ruleset, on its next move.
+
+        :param state: The state to restore.
+        """
+        self._rng.bit_generator.state = state['rng']
+        self.last_arm = state['last_arm']
+        self._rps_logic = None
+        self._pending_state = state if 'reward_sums' in state else None
+
+    def _restore(self, state: dict):
+        """
+        Restores the portfolio's statistics from a state returned by `get_state`.
+
+        :param state: The state to restore.
+        """
+        self._frequency_counts.set_state(state['frequency_counts'])
+        self._markov_counts.set_state(state['markov_counts'])
+        self._opponent_previous = state['opponent_previous']
+        self._rounds_seen = state['rounds_seen']
+        self._proposals = state['proposals'].copy()
+        self._reward_sums = state['reward_sums'].copy()
+        self._loss_sums = state['loss_sums'].copy()
+        self._rounds = state['rounds']
+        self._pulls = state['pulls'].copy()
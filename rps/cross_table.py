@@ -0,0 +1,93 @@
+"""
+This module computes the cross-table of expected results between many strategies: how much each
+strategy is expected to win per round against each other strategy.
+
+Between stationary strategies, which declare the distribution they draw every move from (see
+`Strategy.move_distribution`), the expected payoff is exactly p1ᵀ·M·p2, where M is the ruleset's
+payoff matrix. Stacking the distributions as the rows of P, the whole cross-table is the single
+matrix product P·M·Pᵀ, which covers thousands of strategies in well under a second. Only the
+pairings involving strategies that declare no distribution are simulated, as games played on a
+thread pool.
+"""
+
+from typing import Dict, NamedTuple, Tuple
+
+import numpy as np
+
+from rps.game_runner import StrategyFactory, ThreadPoolGameRunner
+from rps.rps_logic import RPSLogic
+from rps.ruleset_analysis import payoff_matrix
+
+
+class CrossTable(NamedTuple):
+    """
+    The expected results between every pair of strategies.
+
+    Attributes:
+        names (tuple): The strategies' names, in the order of the table's rows and columns.
+        payoffs (np.ndarray): payoffs[i, j] is strategy i's expected payoff per round against
+         strategy j: its probability of winning a round minus its probability of losing it.
+        simulated (np.ndarray): Whether each payoff was estimated by simulation rather than
+         computed exactly.
+    """
+    names: Tuple[str, ...]
+    payoffs: np.ndarray
+    simulated: np.ndarray
+
+    def mean_payoffs(self) -> Dict[str, float]:
+        """
+        :return: Each strategy's average expected payoff against all strategies, itself included.
+        """
+        return dict(zip(self.names, self.payoffs.mean(axis=1).tolist()))
+
+
+def cross_table(rps_logic: RPSLogic, strategy_factories: Dict[str, StrategyFactory],
+                simulation_rounds: int = 1000, max_workers: int = None) -> CrossTable:
+    """
+    Computes the expected payoff of every strategy against every other.
+
+    A strategy is expected to break even against a fresh instance of itself, so the diagonal is
+    never simulated. Simulated pairings are played once, with the first strategy as player 1, and
+    their payoff is mirrored for the reverse pairing.
+
+    :param rps_logic: The game logic.
+    :param strategy_factories: Maps each strategy's name to a callable creating an instance.
+    :param simulation_rounds: The number of rounds of each simulated pairing.
+    :param max_workers: The number of threads playing simulated pairings.
+    :return: The cross-table.
+    :raises ValueError: If a declared distribution is not a probability distribution over the
+     ruleset's weapons.
+    """
+    names = tuple(strategy_factories)
+    num_weapons = len(rps_logic.options)
+    distributions = [strategy_factories[name]().move_distribution(rps_logic) for name in names]
+    declared = np.array([distribution is not None for distribution in distributions], dtype=bool)
+
+    probabilities = np.zeros((len(names), num_weapons))
+    if declared.any():
+        probabilities[declared] = [distribution for distribution in distributions
+                                   if distribution is not None]
+        rows = probabilities[declared]
+        invalid = (rows < 0).any(axis=1) | ~np.isclose(rows.sum(axis=1), 1.0)
+        if invalid.any():
+            name = np.array(names, dtype=object)[declared][invalid][0]
+            raise ValueError(f'{name} does not declare a probability distribution over the '
+                             f'{num_weapons} weapons.')
+
+    # Rows of undeclared strategies are all zero, and are filled in by simulation
+    payoffs = probabilities @ payoff_matrix(rps_logic) @ probabilities.T
+
+    undeclared = np.flatnonzero(~declared).tolist()
+    pairings = [(i, j) for i in undeclared for j in range(len(names))
+                if j != i and (declared[j] or j > i)]
+    simulated = np.zeros((len(names), len(names)), dtype=bool)
+    if pairings:
+        runner = ThreadPoolGameRunner(rps_logic, max_workers)
+        scores = runner.run([(strategy_factories[names[i]], strategy_factories[names[j]])
+                             for i, j in pairings], simulation_rounds)
+        rows, columns = np.array(pairings).T
+        estimates = np.array([score1 - score2 for score1, score2 in scores]) / simulation_rounds
+        payoffs[rows, columns] = estimates
+        payoffs[columns, rows] = -estimates
+        simulated[rows, columns] = simulated[columns, rows] = True
+    return CrossTable(names, payoffs, simulated)
@@ -0,0 +1,70 @@
+"""
+This module provides the DecayingCounts class: several tables of counts, each forgetting old
+observations at its own exponential rate, updated in O(1) per observation.
+
+Decaying every count on every observation touches the whole table, and drives counts that stop
+being observed into subnormal floats, which are very slow to compute with. Instead, each new
+observation is counted with a weight that grows by `1 / decay` per step, which leaves the ratios
+between counts exactly as if the old counts had been decayed. The weights are rescaled long before
+they could overflow.
+"""
+
+from typing import Sequence, Tuple
+
+import numpy as np
+
+# Counts are rescaled once a weight exceeds this
+_RESCALE_ABOVE = 1e100
+
+
+class DecayingCounts:
+    """
+    Counts of observations, as one table per decay rate.
+
+    Attributes:
+        values (np.ndarray): The counts, of shape (number of decay rates, *shape). Only their
+         ratios within a table are meaningful, e.g. for `argmax` or normalizing.
+    """
+
+    def __init__(self, decays: Sequence[float], shape: Tuple[int, ...]):
+        """
+        :param decays: The factor by which each table's old counts are weighted down per step, in
+         (0, 1]; 1 never forgets.
+        :param shape: The shape of each table.
+        :raises ValueError: If a decay is not in (0, 1].
+        """
+        self._decays = np.array(decays, dtype=float)
+        if np.any((self._decays <= 0) | (self._decays > 1)):
+            raise ValueError('Decays must be in (0, 1].')
+        self._growth = 1.0 / self._decays
+        self._weights = np.ones(len(self._decays))
+        self._fastest = int(np.argmax(self._growth)) if len(self._decays) else 0
+        self._expand = (slice(None),) + (None,) * len(shape)
+        self.values = np.zeros((len(self._decays),) + tuple(shape))
+
+    def add(self, *indices: Tuple[int, ...]):
+        """
+        Advances one step, weighting down all older observations, and counts observations in
+        every table.
+
+        :param indices: The position of each observation within a table.
+        """
+        self._weights *= self._growth
+        for index in indices:
+            self.values[(slice(None),) + index] += self._weights
+        if len(self._weights) and self._weights[self._fastest] > _RESCALE_ABOVE:
+            self.values /= self._weights[self._expand]
+            self._weights[:] = 1.0
+
+    def get_state(self) -> dict:
+        """
+        :return: The counts, as a picklable dictionary that `set_state` can restore.
+        """
+        return {'values': self.values / self._weights[self._expand]}
+
+    def set_state(self, state: dict):
+        """
+        :param state: A state returned by `get_state`.
+        """
+        self.values = state['values'].copy()
+        self._weights[:] = 1.0
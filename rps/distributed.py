@@ -0,0 +1,473 @@
+"""
+This module distributes the games of a round-robin tournament across worker processes, possibly on
+other machines, connected to a coordinator over plain TCP.
+
+Protocol: every message is a JSON object, framed by a 4-byte big-endian length. After a 'hello',
+the coordinator sends the tournament's configuration, including a fingerprint of its ruleset that
+the worker checks against its own. The worker then repeatedly sends a 'sync' message carrying a
+batch of finished results, the tasks still waiting in its local queue and how many more it wants.
+The coordinator answers with new tasks, tasks to drop ('revoke') and whether the tournament is
+done. While a game is being played, the worker sends 'heartbeat' messages, which get no answer.
+
+Scheduling:
+    - Workers pull tasks in small batches and keep them in a local queue.
+    - When no unassigned tasks are left, an idle worker steals half of the queued (not yet
+      started) tasks of the most loaded worker; the victim is told to drop them on its next sync.
+    - A worker whose connection drops, or that has sent nothing for `worker_timeout` seconds, is
+      considered dead and its unfinished tasks are reassigned. Timed out workers are reaped
+      periodically by a background thread.
+    - A task finished twice (after a steal race or a reassignment) keeps its first result.
+"""
+
+import argparse
+import json
+import socket
+import socketserver
+import struct
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+from rps.exceptions import ConfigurationError
+from rps.game import Game
+from rps.player import Player
+from rps.rps_logic import RPSLogic
+from rps.ruleset_analysis import ruleset_digest
+from rps.strategy import STRATEGIES
+from rps.tournament import Tournament
+
+_LENGTH = struct.Struct('>I')
+
+
+def send_message(sock: socket.socket, message: dict):
+    """
+    Sends a length-prefixed JSON message.
+
+    :param sock: The connected socket.
+    :param message: The message to send.
+    """
+    payload = json.dumps(message, separators=(',', ':')).encode('utf-8')
+    sock.sendall(_LENGTH.pack(len(payload)) + payload)
+
+
+def receive_message(stream) -> Optional[dict]:
+    """
+    Reads a length-prefixed JSON message.
+
+    :param stream: A binary file object wrapping the socket (see `socket.makefile`).
+    :return: The message, or None if the connection was closed.
+    """
+    header = stream.read(_LENGTH.size)
+    if len(header) < _LENGTH.size:
+        return None
+    (length,) = _LENGTH.unpack(header)
+    payload = stream.read(length)
+    if len(payload) < length:
+        return None
+    return json.loads(payload)
+
+
+class _WorkerState:
+    """
+    The coordinator's view of a connected worker.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """
+        Forgets everything about the worker's tasks, and counts it as alive and just seen.
+        """
+        self.outstanding = set()  # Assigned to this worker and not finished
+        self.queued = set()  # Not yet started, as of the worker's last sync
+        self.revoke = set()  # Stolen from this worker, to be dropped on its next sync
+        self.last_seen = time.monotonic()
+        self.alive = True
+
+
+class TournamentCoordinator:
+    """
+    Hands out the pairings of a round-robin tournament to TCP workers and collects the results.
+
+    Attributes:
+        tournament (Tournament): Holds the pairings and the collected results.
+        contestants (dict): Maps each contestant's name to the name of a registered strategy.
+        worker_timeout (float): Seconds without a message after which a worker is considered
+         dead.
+        ruleset (str): The fingerprint of the ruleset, which workers must share (see
+         `rps.ruleset_analysis.ruleset_digest`).
+        address (tuple): The (host, port) the coordinator listens on.
+    """
+
+    def __init__(self, rps_logic: RPSLogic, contestants: Dict[str, str], rounds_per_game: int,
+                 host: str = '127.0.0.1', port: int = 0, worker_timeout: float = 30.0):
+        """
+        :param rps_logic: The game logic (workers load the same ruleset).
+        :param contestants: Maps each contestant's name to the name of a registered strategy
+         (see `rps.strategy.STRATEGIES`).
+        :param rounds_per_game: The number of rounds of each game.
+        :param host: The address to listen on.
+        :param port: The port to listen on (0 picks a free port).
+        :param worker_timeout: Seconds without a message after which a worker is considered dead.
+        :raises KeyError: If a contestant's strategy is not registered.
+        """
+        self.contestants = contestants
+        self.tournament = Tournament(
+            rps_logic, {name: STRATEGIES[key] for name, key in contestants.items()},
+            rounds_per_game)
+        self.worker_timeout = worker_timeout
+        self.ruleset = ruleset_digest(rps_logic)
+
+        self._pending = deque(range(len(self.tournament.pairings)))
+        self._workers: Dict[int, _WorkerState] = {}
+        self._next_worker_id = 0
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._stopped = threading.Event()
+        if not self._pending:
+            self._done.set()
+
+        coordinator = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            """
+            Serves a single worker connection.
+            """
+
+            def handle(self):
+                coordinator._serve_worker(self.request)
+
+        self._server = socketserver.ThreadingTCPServer((host, port), Handler,
+                                                       bind_and_activate=True)
+        self._server.daemon_threads = True
+        self.address = self._server.server_address
+
+    def start(self):
+        """
+        Starts accepting workers, and reaping timed out ones, in background threads.
+        """
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        threading.Thread(target=self._reap_periodically, daemon=True).start()
+
+    def wait(self, timeout: float = None) -> Dict[str, Dict[str, int]]:
+        """
+        Blocks until every pairing has a result.
+
+        :param timeout: The maximum number of seconds to wait.
+        :return: The tournament standings.
+        :raises TimeoutError: If the tournament did not finish in time.
+        """
+        if not self._done.wait(timeout):
+            raise TimeoutError('The tournament did not finish in time.')
+        return self.tournament.standings()
+
+    def stop(self):
+        """
+        Stops accepting workers and closes the listening socket.
+        """
+        self._stopped.set()
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _serve_worker(self, sock: socket.socket):
+        """
+        Runs the protocol with a single worker until it disconnects.
+
+        :param sock: The worker's socket.
+        """
+        stream = sock.makefile('rb')
+        with self._lock:
+            worker_id = self._next_worker_id
+            self._next_worker_id += 1
+            self._workers[worker_id] = _WorkerState()
+
+        try:
+            if receive_message(stream) is None:
+                return
+            send_message(sock, {'type': 'config', 'contestants': self.contestants,
+                                'rounds_per_game': self.tournament.rounds_per_game,
+                                'pairings': self.tournament.pairings, 'ruleset': self.ruleset})
+            while True:
+                message = receive_message(stream)
+                if message is None:
+                    return
+                if message['type'] == 'heartbeat':
+                    self._heartbeat(worker_id)
+                else:
+                    send_message(sock, self._sync(worker_id, message))
+        except (ConnectionError, OSError, ValueError, KeyError):
+            return
+        finally:
+            self._forget_worker(worker_id)
+            stream.close()
+
+    def _heartbeat(self, worker_id: int):
+        """
+        Records that a worker busy playing a game is still alive. A worker that already timed out
+        stays dead until its next sync.
+
+        :param worker_id: The worker.
+        """
+        with self._lock:
+            worker = self._workers[worker_id]
+            if worker.alive:
+                worker.last_seen = time.monotonic()
+
+    def _sync(self, worker_id: int, message: dict) -> dict:
+        """
+        Handles a worker's sync: records its results and decides which tasks it gets or drops.
+
+        :param worker_id: The syncing worker.
+        :param message: The worker's sync message.
+        :return: The reply to send.
+        """
+        with self._lock:
+            worker = self._workers[worker_id]
+            if not worker.alive:
+                # Timed out earlier and its tasks were reassigned; drop everything it still has
+                worker.reset()
+                worker.revoke = set(message['queued'])
+            worker.last_seen = time.monotonic()
+
+            results = self.tournament.results
+            for index, score1, score2 in message['results']:
+                if index not in results:
+                    results[index] = (score1, score2)
+                for other in self._workers.values():
+                    other.outstanding.discard(index)
+            worker.queued = set(message['queued']) & worker.outstanding
+            if len(results) == len(self.tournament.pairings):
+                self._done.set()
+
+            tasks = []
+            while len(tasks) < message['want'] and self._pending:
+                index = self._pending.popleft()
+                if index not in results:
+                    tasks.append(index)
+            if not tasks and message['want'] and not worker.queued:
+                tasks = self._steal()
+            worker.outstanding.update(tasks)
+
+            revoke, worker.revoke = sorted(worker.revoke), set()
+            return {'type': 'sync', 'tasks': tasks, 'revoke': revoke, 'done': self._done.is_set()}
+
+    def _steal(self) -> List[int]:
+        """
+        Takes half of the queued tasks of the most loaded live worker. Must hold the lock.
+
+        :return: The stolen tasks.
+        """
+        victims = [worker for worker in self._workers.values() if worker.alive and worker.queued]
+        if not victims:
+            return []
+        victim = max(victims, key=lambda worker: len(worker.queued))
+        queued = sorted(victim.queued)
+        stolen = queued[len(queued) // 2:]
+        victim.queued.difference_update(stolen)
+        victim.outstanding.difference_update(stolen)
+        victim.revoke.update(stolen)
+        return stolen
+
+    def _reap_periodically(self):
+        """
+        Reaps timed out workers until the coordinator is stopped.
+        """
+        while not self._stopped.wait(self.worker_timeout / 4):
+            with self._lock:
+                self._reap_timed_out_workers()
+
+    def _reap_timed_out_workers(self):
+        """
+        Reassigns the tasks of workers that have sent nothing within the timeout. Must hold the
+        lock.
+        """
+        now = time.monotonic()
+        for worker in self._workers.values():
+            if worker.alive and now - worker.last_seen > self.worker_timeout:
+                self._requeue(worker)
+                worker.alive = False
+
+    def _forget_worker(self, worker_id: int):
+        """
+        Removes a disconnected worker and reassigns its unfinished tasks.
+
+        :param worker_id: The disconnected worker.
+        """
+        with self._lock:
+            worker = self._workers.pop(worker_id)
+            self._requeue(worker)
+
+    def _requeue(self, worker: _WorkerState):
+        """
+        Puts a worker's unfinished tasks back at the front of the queue. Must hold the lock.
+
+        :param worker: The worker whose tasks are reassigned.
+        """
+        unfinished = sorted(index for index in worker.outstanding
+                            if index not in self.tournament.results)
+        self._pending.extendleft(reversed(unfinished))
+        worker.outstanding.clear()
+        worker.queued.clear()
+
+
+class TournamentWorker:
+    """
+    Connects to a TournamentCoordinator, plays the games it is assigned and streams back the
+    results in batches.
+
+    Attributes:
+        address (tuple): The coordinator's (host, port).
+        rps_logic (RPSLogic): The game logic used for all games.
+        prefetch (int): The number of tasks to keep in the local queue.
+        result_batch (int): The number of results to collect before syncing.
+        sync_interval (float): The maximum number of seconds between syncs while busy, and
+         between heartbeats while a game is being played.
+        poll_interval (float): Seconds to wait before asking again when no task is available.
+        games_played (int): The number of games this worker has played.
+    """
+
+    def __init__(self, host: str, port: int, rps_logic: RPSLogic = None, prefetch: int = 4,
+                 result_batch: int = 4, sync_interval: float = 0.5,
+                 poll_interval: float = 0.05):
+        """
+        :param host: The coordinator's host.
+        :param port: The coordinator's port.
+        :param rps_logic: The game logic; loaded from the data files if not provided.
+        :param prefetch: The number of tasks to keep in the local queue.
+        :param result_batch: The number of results to collect before syncing.
+        :param sync_interval: The maximum number of seconds between syncs while busy, and between
+         heartbeats while a game is being played.
+        :param poll_interval: Seconds to wait before asking again when no task is available.
+        """
+        self.address = (host, port)
+        self.rps_logic = rps_logic or RPSLogic()
+        self.prefetch = prefetch
+        self.result_batch = result_batch
+        self.sync_interval = sync_interval
+        self.poll_interval = poll_interval
+        self.games_played = 0
+
+    def play(self, config: dict, index: int, heartbeat: Callable[[], None] = None) -> List[int]:
+        """
+        Plays a single pairing.
+
+        :param config: The tournament configuration sent by the coordinator.
+        :param index: The index of the pairing.
+        :param heartbeat: Called after every round, to show the coordinator that the worker is
+         alive.
+        :return: The [index, score1, score2] result.
+        """
+        name1, name2 = config['pairings'][index]
+        contestants = config['contestants']
+        player1 = Player(name1, STRATEGIES[contestants[name1]](), self.rps_logic)
+        player2 = Player(name2, STRATEGIES[contestants[name2]](), self.rps_logic)
+        game = Game(player1, player2, self.rps_logic, num_rounds=config['rounds_per_game'],
+                    verbose=False)
+        for _ in game.iter_rounds():
+            if heartbeat is not None:
+                heartbeat()
+        self.games_played += 1
+        return [index, player1.score, player2.score]
+
+    def run(self):
+        """
+        Works until the coordinator reports that the tournament is done.
+
+        :raises ConnectionError: If the connection to the coordinator is lost.
+        :raises ConfigurationError: If the worker's ruleset differs from the coordinator's.
+        """
+        with socket.create_connection(self.address) as sock, sock.makefile('rb') as stream:
+            send_message(sock, {'type': 'hello'})
+            config = receive_message(stream)
+            if config is None:
+                raise ConnectionError('The coordinator closed the connection.')
+            if config.get('ruleset') != ruleset_digest(self.rps_logic):
+                raise ConfigurationError('The worker\'s ruleset differs from the coordinator\'s.')
+
+            queue = deque()
+            results = []
+            last_sync = last_sent = float('-inf')
+
+            def heartbeat():
+                nonlocal last_sent
+                if time.monotonic() - last_sent >= self.sync_interval:
+                    send_message(sock, {'type': 'heartbeat'})
+                    last_sent = time.monotonic()
+
+            while True:
+                if (not queue or len(results) >= self.result_batch
+                        or time.monotonic() - last_sync >= self.sync_interval):
+                    send_message(sock, {'type': 'sync', 'results': results,
+                                        'queued': list(queue),
+                                        'want': max(0, self.prefetch - len(queue))})
+                    reply = receive_message(stream)
+                    if reply is None:
+                        raise ConnectionError('The coordinator closed the connection.')
+                    results, last_sync = [], time.monotonic()
+                    last_sent = last_sync
+
+                    if reply['done']:
+                        return
+                    if reply['revoke']:
+                        revoked = set(reply['revoke'])
+                        queue = deque(index for index in queue if index not in revoked)
+                    queue.extend(reply['tasks'])
+                    if not queue:
+                        time.sleep(self.poll_interval)
+                        continue
+
+                results.append(self.play(config, queue.popleft(), heartbeat))
+
+
+def _parse_contestant(value: str):
+    """
+    :param value: A 'name=strategy' pair.
+    :return: The (name, strategy) tuple.
+    """
+    name, _, key = value.partition('=')
+    if key not in STRATEGIES:
+        raise argparse.ArgumentTypeError(f'unknown strategy {key!r}, '
+                                         f'expected one of {sorted(STRATEGIES)}')
+    return name, key
+
+
+def main():
+    """
+    Runs a coordinator or a worker from the command line.
+    """
+    parser = argparse.ArgumentParser(description='Distributed round-robin tournaments.')
+    subparsers = parser.add_subparsers(dest='role', required=True)
+
+    coordinator_parser = subparsers.add_parser('coordinator', help='Run the coordinator.')
+    coordinator_parser.add_argument('--host', default='127.0.0.1')
+    coordinator_parser.add_argument('--port', type=int, default=7878)
+    coordinator_parser.add_argument('--rounds', type=int, default=1000,
+                                    help='Rounds per game.')
+    coordinator_parser.add_argument('--contestant', type=_parse_contestant, action='append',
+                                    required=True, metavar='NAME=STRATEGY',
+                                    help='A contestant and its registered strategy (repeatable).')
+
+    worker_parser = subparsers.add_parser('worker', help='Run a worker.')
+    worker_parser.add_argument('--host', default='127.0.0.1')
+    worker_parser.add_argument('--port', type=int, default=7878)
+
+    args = parser.parse_args()
+    if args.role == 'coordinator':
+        coordinator = TournamentCoordinator(RPSLogic(), dict(args.contestant), args.rounds,
+                                            args.host, args.port)
+        coordinator.start()
+        print(f'Coordinator listening on {coordinator.address[0]}:{coordinator.address[1]}')
+        standings = coordinator.wait()
+        coordinator.stop()
+        for name, row in standings.items():
+            print(f'{name}: {row}')
+    else:
+        worker = TournamentWorker(args.host, args.port)
+        worker.run()
+        print(f'Worker played {worker.games_played} games')
+
+
+if __name__ == '__main__':
+    main()
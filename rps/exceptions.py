@@ -21,3 +21,9 @@ class FailedWeaponChoiceException(Exception):
 
 class FailedGameException(Exception):
     """Raised when the game fails to complete successfully."""
+
+class SimulationError(Exception):
+    """Raised when a simulation fails to complete successfully."""
+
+class CheckpointError(Exception):
+    """Raised when a checkpoint file is invalid or cannot be resumed from."""
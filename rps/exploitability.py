@@ -0,0 +1,313 @@
+"""
+This module measures how exploitable a strategy is from the rounds it played: it estimates the
+strategy's move distribution conditioned on the last few rounds, finds the best response to each
+conditional distribution under the ruleset, and reports the strategy's expected loss per round
+against that best response.
+
+Rounds are folded into one table of move counts per context depth as they arrive, so any number of
+rounds is evaluated in fixed memory: round logs are streamed in chunks, and live games feed the
+evaluator round by round (see `EvaluationStream`). Two estimates are reported per depth:
+
+    expected_loss         The loss against the best response to the final tables. With few rounds
+                          per context this overfits, and overstates what an opponent could win.
+    online_expected_loss  The loss against an opponent that best-responds to the tables as they
+                          stand before each round (updated every 256 rounds). This is what a
+                          learning opponent could actually have won, and understates the loss.
+
+Run as a script to evaluate a round log:
+
+    python -m rps.exploitability LOG [--seat 2] [--max-depth 3]
+"""
+
+import argparse
+import weakref
+from typing import List, NamedTuple, Sequence
+
+import numpy as np
+import pandas as pd
+
+from rps.rps_logic import DEFAULT_RELATIONSHIP_PATH, DEFAULT_SHORT_NAMES_PATH, RPSLogic
+from rps.ruleset_analysis import payoff_matrix
+
+# Rounds observed one at a time are buffered and folded into the tables in batches of this size
+_BUFFER_ROUNDS = 256
+
+
+class ExploitabilityEstimate(NamedTuple):
+    """
+    The exploitability of a strategy at one context depth.
+
+    Attributes:
+        depth (int): The number of previous rounds (both players' moves) the strategy's moves are
+         conditioned on.
+        rounds (int): The number of rounds counted at this depth.
+        contexts (int): The number of distinct contexts seen.
+        expected_loss (float): The strategy's expected loss per round (losses minus wins) against
+         the best response to its observed conditional move distribution.
+        online_expected_loss (float): The strategy's average loss per round against an opponent
+         best-responding to the rounds observed before.
+    """
+    depth: int
+    rounds: int
+    contexts: int
+    expected_loss: float
+    online_expected_loss: float
+
+
+class ExploitabilityEvaluator:
+    """
+    Accumulates a strategy's conditional move counts and estimates its exploitability.
+
+    Rounds are fed through streams (see `new_stream`), one per game, since contexts never span two
+    games. The evaluator is not thread-safe; feed it from one thread, e.g. the event loop.
+
+    Attributes:
+        rps_logic (RPSLogic): The game logic.
+        max_depth (int): The deepest context evaluated; depths 0 to `max_depth` are reported.
+    """
+
+    def __init__(self, rps_logic: RPSLogic, max_depth: int = 3, max_table_cells: int = 1 << 24):
+        """
+        :param rps_logic: The game logic.
+        :param max_depth: The deepest context evaluated.
+        :param max_table_cells: The maximum total size of the count tables, which bounds memory.
+        :raises ValueError: If the tables of `max_depth` would exceed `max_table_cells`.
+        """
+        self.rps_logic = rps_logic
+        self.max_depth = max_depth
+        num_weapons = len(rps_logic.options)
+        self._num_weapons = num_weapons
+        # A round is one symbol: the strategy's move and the opponent's move
+        self._symbols = num_weapons * num_weapons
+        table_cells = sum(self._symbols ** depth * num_weapons for depth in range(max_depth + 1))
+        if table_cells > max_table_cells:
+            raise ValueError(f'Contexts of depth {max_depth} need {table_cells} table cells, '
+                             f'more than {max_table_cells}.')
+        self._powers = [self._symbols ** depth for depth in range(max_depth + 1)]
+        self._payoff = payoff_matrix(rps_logic)
+        # The exploiter's payoff against each strategy move when it has no data, playing uniformly
+        self._uniform_payoff = self._payoff.mean(axis=0)
+        # counts[depth][context, move]: how often the strategy played each move in each context
+        self._counts = [np.zeros((power, num_weapons), dtype=np.int64) for power in self._powers]
+        self._online_payoffs = np.zeros(max_depth + 1)
+        # Streams with buffered rounds; a game's stream is dropped once the game is discarded
+        self._streams = weakref.WeakSet()
+        self._default_stream: 'EvaluationStream' = None
+
+    def new_stream(self) -> 'EvaluationStream':
+        """
+        :return: A stream for the rounds of one game.
+        """
+        stream = EvaluationStream(self)
+        self._streams.add(stream)
+        return stream
+
+    def observe_many(self, subject: Sequence[int], opponent: Sequence[int]):
+        """
+        Counts consecutive rounds of a single game, continuing the previous call's game.
+
+        :param subject: The evaluated strategy's weapon ids.
+        :param opponent: The opponent's weapon ids.
+        """
+        if self._default_stream is None:
+            self._default_stream = self.new_stream()
+        self._default_stream.observe_many(subject, opponent)
+
+    def report(self) -> List[ExploitabilityEstimate]:
+        """
+        :return: The exploitability estimate at each depth, from 0 to `max_depth`.
+        """
+        for stream in list(self._streams):
+            stream.flush()
+
+        estimates = []
+        for depth, counts in enumerate(self._counts):
+            rounds = int(counts.sum())
+            # Per context, the exploiter's best total payoff against the observed moves
+            best_payoffs = (counts @ self._payoff.T).max(axis=1)
+            estimates.append(ExploitabilityEstimate(
+                depth=depth,
+                rounds=rounds,
+                contexts=int(np.count_nonzero(counts.any(axis=1))),
+                expected_loss=float(best_payoffs.sum()) / rounds if rounds else 0.0,
+                online_expected_loss=(float(self._online_payoffs[depth]) / rounds
+                                      if rounds else 0.0)))
+        return estimates
+
+    def _count(self, symbols: np.ndarray, previous: np.ndarray, subject: np.ndarray):
+        """
+        Scores the online exploiter against a batch of rounds, then counts them.
+
+        :param symbols: The batch's round symbols.
+        :param previous: The symbols of up to `max_depth` rounds before the batch, oldest first.
+        :param subject: The batch's strategy moves.
+        """
+        num_previous, num_rounds = len(previous), len(symbols)
+        history = np.concatenate([previous, symbols])
+        contexts = np.zeros(num_rounds, dtype=np.intp)
+        for depth, counts in enumerate(self._counts):
+            if depth:
+                # Add the round `depth` rounds back as the context's most significant symbol
+                start = num_previous - depth
+                shifted = history[max(start, 0):start + num_rounds]
+                contexts[num_rounds - len(shifted):] += shifted * self._powers[depth - 1]
+            # Rounds without `depth` previous rounds in the game have no context at this depth
+            first = max(depth - num_previous, 0)
+            if first >= num_rounds:
+                break
+            rows, moves = contexts[first:], subject[first:]
+
+            seen = counts[rows]
+            best = (seen @ self._payoff.T).argmax(axis=1)
+            payoffs = np.where(seen.any(axis=1), self._payoff[best, moves],
+                               self._uniform_payoff[moves])
+            self._online_payoffs[depth] += payoffs.sum()
+            np.add.at(counts, (rows, moves), 1)
+
+
+class EvaluationStream:
+    """
+    Feeds the rounds of one game to an ExploitabilityEvaluator. Rounds observed one at a time are
+    buffered and counted in batches, so observing a round costs little more than a list append.
+    Buffered rounds are counted on `flush`, `close` or the evaluator's next report; a stream that
+    is discarded without being closed loses them.
+    """
+    __slots__ = ('_evaluator', '_previous', '_subject', '_opponent', '__weakref__')
+
+    def __init__(self, evaluator: ExploitabilityEvaluator):
+        """
+        :param evaluator: The evaluator counting the rounds.
+        """
+        self._evaluator = evaluator
+        # The last rounds' symbols, which are the context of the next rounds
+        self._previous = np.zeros(0, dtype=np.intp)
+        self._subject: List[int] = []
+        self._opponent: List[int] = []
+
+    def observe(self, subject: int, opponent: int):
+        """
+        :param subject: The evaluated strategy's weapon id in the round.
+        :param opponent: The opponent's weapon id in the round.
+        """
+        self._subject.append(subject)
+        self._opponent.append(opponent)
+        if len(self._subject) >= _BUFFER_ROUNDS:
+            self.flush()
+
+    def observe_many(self, subject: Sequence[int], opponent: Sequence[int]):
+        """
+        :param subject: The evaluated strategy's weapon ids in consecutive rounds.
+        :param opponent: The opponent's weapon ids in the same rounds.
+        """
+        self.flush()
+        self._count(np.asarray(subject, dtype=np.intp), np.asarray(opponent, dtype=np.intp))
+
+    def flush(self):
+        """
+        Counts the buffered rounds.
+        """
+        if self._subject:
+            subject = np.array(self._subject, dtype=np.intp)
+            opponent = np.array(self._opponent, dtype=np.intp)
+            self._subject.clear()
+            self._opponent.clear()
+            self._count(subject, opponent)
+
+    def close(self):
+        """
+        Counts the buffered rounds and ends the game.
+        """
+        self.flush()
+        self._evaluator._streams.discard(self)
+
+    def _count(self, subject: np.ndarray, opponent: np.ndarray):
+        """
+        :param subject: The evaluated strategy's weapon ids.
+        :param opponent: The opponent's weapon ids.
+        """
+        if not len(subject):
+            return
+        evaluator = self._evaluator
+        symbols = subject * evaluator._num_weapons + opponent
+        # The online exploiter learns between batches, so long runs are split into batches
+        for start in range(0, len(symbols), _BUFFER_ROUNDS):
+            end = start + _BUFFER_ROUNDS
+            evaluator._count(symbols[start:end], self._previous, subject[start:end])
+            if evaluator.max_depth:
+                self._previous = np.concatenate(
+                    [self._previous, symbols[start:end]])[-evaluator.max_depth:]
+
+
+def evaluate_round_log(path: str, rps_logic: RPSLogic, seat: int = 2, max_depth: int = 3,
+                       chunk_rounds: int = 1 << 16) -> List[ExploitabilityEstimate]:
+    """
+    Evaluates a strategy from a round log, reading it in chunks.
+
+    The log is a CSV file with the fields of `RoundResult` as columns: `weapon1` and `weapon2`
+    hold the players' short names, and an optional `round_number` restarting at 1 separates games.
+
+    :param path: The round log.
+    :param rps_logic: The game logic.
+    :param seat: The evaluated strategy's player: 1 for weapon1, 2 for weapon2.
+    :param max_depth: The deepest context evaluated.
+    :param chunk_rounds: The number of rounds read at a time.
+    :return: The exploitability estimate at each depth.
+    :raises ValueError: If the log holds an unknown weapon.
+    """
+    evaluator = ExploitabilityEvaluator(rps_logic, max_depth)
+    stream = evaluator.new_stream()
+    weapon_ids = dict(rps_logic.weapon_ids)
+    subject_column, opponent_column = ('weapon1', 'weapon2') if seat == 1 else ('weapon2', 'weapon1')
+    for chunk in pd.read_csv(path, chunksize=chunk_rounds, dtype={'weapon1': str, 'weapon2': str}):
+        subject = chunk[subject_column].map(weapon_ids)
+        opponent = chunk[opponent_column].map(weapon_ids)
+        if subject.isna().any() or opponent.isna().any():
+            raise ValueError(f'{path}: unknown weapons in rounds {chunk.index[0]} to '
+                             f'{chunk.index[-1]}')
+        subject, opponent = subject.to_numpy(np.intp), opponent.to_numpy(np.intp)
+
+        new_games = (set(np.flatnonzero(chunk['round_number'].to_numpy() == 1).tolist())
+                     if 'round_number' in chunk else set())
+        edges = sorted(new_games | {0, len(chunk)})
+        for start, end in zip(edges, edges[1:]):
+            if start in new_games:
+                # Contexts never span two games
+                stream.close()
+                stream = evaluator.new_stream()
+            stream.observe_many(subject[start:end], opponent[start:end])
+    stream.close()
+    return evaluator.report()
+
+
+def format_estimates(estimates: Sequence[ExploitabilityEstimate]) -> str:
+    """
+    :param estimates: The estimates, e.g. from `ExploitabilityEvaluator.report`.
+    :return: The estimates as a readable table.
+    """
+    lines = ['depth     rounds  contexts  expected loss  online loss']
+    for estimate in estimates:
+        lines.append(f'{estimate.depth:>5} {estimate.rounds:>10} {estimate.contexts:>9} '
+                     f'{estimate.expected_loss:>14.4f} {estimate.online_expected_loss:>12.4f}')
+    return '\n'.join(lines)
+
+
+def main():
+    """
+    Prints the exploitability of a strategy from a round log, from the command line.
+    """
+    parser = argparse.ArgumentParser(description='Estimate how exploitable a strategy is.')
+    parser.add_argument('log', help='A CSV round log with weapon1 and weapon2 columns.')
+    parser.add_argument('--seat', type=int, choices=(1, 2), default=2,
+                        help='The evaluated player: 1 for weapon1, 2 for weapon2 (default).')
+    parser.add_argument('--max-depth', type=int, default=3,
+                        help='The deepest context, in rounds (default: 3).')
+    parser.add_argument('--short-names', default=DEFAULT_SHORT_NAMES_PATH)
+    parser.add_argument('--relationship', default=DEFAULT_RELATIONSHIP_PATH)
+    args = parser.parse_args()
+
+    rps_logic = RPSLogic(args.short_names, args.relationship)
+    print(format_estimates(evaluate_round_log(args.log, rps_logic, args.seat, args.max_depth)))
+
+
+if __name__ == '__main__':
+    main()
@@ -6,11 +6,35 @@ The Game class interacts with external modules to verify user inputs and handles
 for game flow control.
 """
 
+import asyncio
+from time import perf_counter_ns
+from typing import AsyncIterator, Iterator, NamedTuple
+
 from rps.exceptions import (FailedWeaponChoiceException, FailedGameException,
                             MaxAttemptsExceededError)
+from rps.instrumentation import RoundInstrumentation
+from rps.metrics import GameMetrics
+from rps.round_history import RoundHistory
+from rps.strategy import Strategy
 from rps.user_input import get_user_input_with_verification, verify_positive_integer
 
 
+class RoundResult(NamedTuple):
+    """
+    The record of a single played round.
+
+    Attributes:
+        round_number (int): The round's number, starting at 1.
+        weapon1 (str): The first player's weapon (short name).
+        weapon2 (str): The second player's weapon (short name).
+        result (int): 0 for a tie, 1 if player1 won and 2 if player2 won.
+    """
+    round_number: int
+    weapon1: str
+    weapon2: str
+    result: int
+
+
 class Game:
     """
     Represents a Rock-Paper-Scissors game between two players. The game can be played for a
@@ -24,21 +48,55 @@ class Game:
         rps_logic: Logic that determines the winner based on weapon choices, including a comparison
          method and weapon names.
         num_rounds (int): The number of rounds to be played, provided by the user.
+        rounds_played (int): The number of rounds played so far.
+        verbose (bool): Whether rounds and scores are printed.
+        instrumentation (RoundInstrumentation): Optional collector of per-phase round timings.
+        metrics (GameMetrics): Optional metrics the game reports rounds and outcomes to.
+        history (RoundHistory): The most recent rounds, recorded only if a player's strategy uses
+         history (see `Strategy.uses_history`), and None otherwise.
     """
 
-    def __init__(self, player1, player2, rps_logic):
+    def __init__(self, player1, player2, rps_logic,
+                 instrumentation: RoundInstrumentation = None, metrics: GameMetrics = None,
+                 num_rounds: int = None, verbose: bool = True, history_capacity: int = 1024):
         """
         Initializes the Game with two players and the logic for comparing Rock-Paper-Scissors
-         choices. Asks the user to input the number of rounds, verified by a method.
+         choices. Asks the user to input the number of rounds, verified by a method, unless it is
+         given explicitly.
 
         :param player1: First player object.
         :param player2: Second player object.
         :param rps_logic: The logic used to compare the players' weapon choices.
+        :param instrumentation: Collects per-phase round timings if provided.
+        :param metrics: Game metrics to report to if provided.
+        :param num_rounds: The number of rounds to play, for games run without a user.
+        :param verbose: Whether rounds and scores are printed.
+        :param history_capacity: The number of most recent rounds kept in the round history.
         :raises FailedGameException: If the user fails to provide a valid number of rounds.
         """
         self.player1 = player1
         self.player2 = player2
         self.rps_logic = rps_logic
+        self.instrumentation = instrumentation
+        self.metrics = metrics
+        self.verbose = verbose
+        self.rounds_played: int = 0
+        # Rounds are only timed when somebody consumes the timings
+        self._timed: bool = instrumentation is not None or metrics is not None
+
+        # Rounds are only recorded when a strategy reads them
+        self.history: RoundHistory = None
+        strategies = [getattr(player, 'strategy', None) for player in (player1, player2)]
+        if any(isinstance(strategy, Strategy) and strategy.uses_history
+               for strategy in strategies):
+            self.history = RoundHistory(history_capacity, len(rps_logic.options))
+            for seat, strategy in enumerate(strategies, start=1):
+                if isinstance(strategy, Strategy):
+                    strategy.attach_history(self.history, seat)
+
+        if num_rounds is not None:
+            self.num_rounds: int = num_rounds
+            return
 
         try:
             # Asking user for the number of rounds to play, with input verification
@@ -48,6 +106,8 @@ class Game:
             ))
         except MaxAttemptsExceededError as e:
             # Raise an error if the user fails to provide valid input after multiple attempts
+            if metrics is not None:
+                metrics.game_failed(e, started=False)
             raise FailedGameException('Invalid number of rounds.') from e
 
     def play_game(self):
@@ -57,21 +117,70 @@ class Game:
          round.
         """
 
-        # Looping through the number of rounds and playing each one
-        for round_number in range(1, self.num_rounds + 1):
-            print(f'\n---------\nRound {round_number} / {self.num_rounds}\n')
-            self.play_one_round()
+        if self.metrics is not None:
+            self.metrics.game_started()
+
+        try:
+            # Drive the round generator; the records aren't kept
+            for _ in self.iter_rounds():
+                pass
+        except BaseException as e:
+            # Any error ends the game, and must not leave it counted as active
+            if self.metrics is not None:
+                self.metrics.game_failed(e)
+            raise
+
+        if self.metrics is not None:
+            self.metrics.game_completed()
 
         # Print final scores after all rounds are completed
-        print(f'Final score: {self.get_scores_as_str()}')
+        if self.verbose:
+            print(f'Final score: {self.get_scores_as_str()}')
+
+    def iter_rounds(self) -> Iterator[RoundResult]:
+        """
+        Plays the remaining rounds lazily, one per iteration. Stopping the iteration early leaves
+        the game after the last yielded round, so it can be continued later. Unlike `play_game`,
+        the game's start and end are not reported to its metrics.
 
-    def play_one_round(self):
+        :return: A generator of the played rounds' records.
+        :raises FailedGameException: If any player makes an invalid weapon choice.
+        """
+        while self.rounds_played < self.num_rounds:
+            if self.verbose:
+                print(f'\n---------\nRound {self.rounds_played + 1} / {self.num_rounds}\n')
+            yield self.play_one_round()
+
+    async def aiter_rounds(self, rounds_per_yield: int = 64) -> AsyncIterator[RoundResult]:
+        """
+        Plays the remaining rounds lazily like `iter_rounds`, for asyncio consumers. Rounds are
+        played synchronously, so control returns to the event loop every few rounds to keep it
+        responsive.
+
+        :param rounds_per_yield: The number of rounds played between returns to the event loop.
+        :return: An asynchronous generator of the played rounds' records.
+        :raises FailedGameException: If any player makes an invalid weapon choice.
+        """
+        countdown = rounds_per_yield
+        for record in self.iter_rounds():
+            yield record
+            countdown -= 1
+            if not countdown:
+                countdown = rounds_per_yield
+                await asyncio.sleep(0)
+
+    def play_one_round(self) -> RoundResult:
         """
         Plays a single round of the game where each player selects a weapon.
         The round result is calculated and summarized.
 
+        :return: The round's record.
         :raises FailedGameException: If any player makes an invalid weapon choice.
         """
+        if self._timed:
+            # Timing is kept out of the default path, so disabled instrumentation costs nothing
+            return self._play_one_round_timed()
+
         try:
             # Each player chooses a weapon (the 'choose' method is implemented in player objects)
             weapon1 = self.player1.choose()
@@ -80,15 +189,61 @@ class Game:
             # Raise an error if either player's weapon choice is invalid
             raise FailedGameException(f'Invalid weapon choice: ({e})') from e
 
-        # Use rps_logic to determine the result: 0 for tie, 1 if player1 wins, -1 if player2 wins
+        # Use rps_logic to determine the result: 0 for tie, 1 if player1 wins, 2 if player2 wins
         result: int = self.rps_logic.compare(weapon1, weapon2)
+        if self.history is not None:
+            weapon_ids = self.rps_logic.weapon_ids
+            self.history.append(weapon_ids[weapon1], weapon_ids[weapon2], result)
+
+        if self.verbose:
+            # Convert the weapon's short name (e.g., 'r', 'p') to a full name ('Rock', 'Paper')
+            weapon1_name: str = self.rps_logic.short_names_to_full_names[weapon1].capitalize()
+            weapon2_name: str = self.rps_logic.short_names_to_full_names[weapon2].capitalize()
+
+            # Summarize the round and display results
+            self.summarize_round(result, weapon1_name, weapon2_name)
+        else:
+            # Silent games don't render weapon names at all
+            self._keep_score(result)
+        self.rounds_played += 1
+        return RoundResult(self.rounds_played, weapon1, weapon2, result)
+
+    def _play_one_round_timed(self):
+        """
+        Plays a single round exactly like `play_one_round`, reporting the duration of each phase
+        to the game's instrumentation and metrics.
+
+        :return: The round's record.
+        :raises FailedGameException: If any player makes an invalid weapon choice.
+        """
+        start = perf_counter_ns()
+        try:
+            weapon1 = self.player1.choose()
+            weapon2 = self.player2.choose()
+        except FailedWeaponChoiceException as e:
+            raise FailedGameException(f'Invalid weapon choice: ({e})') from e
+        chosen = perf_counter_ns()
+
+        result: int = self.rps_logic.compare(weapon1, weapon2)
+        if self.history is not None:
+            weapon_ids = self.rps_logic.weapon_ids
+            self.history.append(weapon_ids[weapon1], weapon_ids[weapon2], result)
+        compared = perf_counter_ns()
 
-        # Convert the weapon's short name (e.g., 'r', 'p') to a full name ('Rock', 'Paper')
         weapon1_name: str = self.rps_logic.short_names_to_full_names[weapon1].capitalize()
         weapon2_name: str = self.rps_logic.short_names_to_full_names[weapon2].capitalize()
+        looked_up = perf_counter_ns()
 
-        # Summarize the round and display results
         self.summarize_round(result, weapon1_name, weapon2_name)
+        self.rounds_played += 1
+        summarized = perf_counter_ns()
+
+        if self.instrumentation is not None:
+            self.instrumentation.record_round(chosen - start, compared - chosen,
+                                              looked_up - compared, summarized - looked_up)
+        if self.metrics is not None:
+            self.metrics.round_played(weapon1, weapon2, result, summarized - start)
+        return RoundResult(self.rounds_played, weapon1, weapon2, result)
 
     def summarize_round(self, result: int, weapon1_name: str, weapon2_name: str):
         """
@@ -98,6 +253,11 @@ class Game:
         :param weapon1_name: Full name of player1's chosen weapon.
         :param weapon2_name: Full name of player2's chosen weapon.
         """
+        if not self.verbose:
+            # Silent games (e.g. in a tournament) only keep score
+            self._keep_score(result)
+            return
+
         # Displaying the chosen weapons for both players
         print(f'{self.player1.name} chose {weapon1_name},'
               f' {self.player2.name} chose {weapon2_name}.')
@@ -119,6 +279,41 @@ class Game:
         # Display the updated scores after the round
         print(self.get_scores_as_str())
 
+    def _keep_score(self, result: int):
+        """
+        Awards the round to its winner, without any output.
+
+        :param result: The result of the comparison (0 - tie, 1 - player1 wins, 2 - player2 wins).
+        """
+        if result == 1:
+            self.player1.score += 1
+        elif result != 0:
+            self.player2.score += 1
+
+    def get_state(self) -> dict:
+        """
+        Returns the game's progress and both players' states, for checkpointing.
+
+        :return: A picklable dictionary that `set_state` can restore.
+        """
+        return {'num_rounds': self.num_rounds, 'rounds_played': self.rounds_played,
+                'player1': self.player1.get_state(), 'player2': self.player2.get_state(),
+                'history': self.history.get_state() if self.history is not None else None}
+
+    def set_state(self, state: dict):
+        """
+        Restores a state previously returned by `get_state`; `play_game` then continues with the
+        next unplayed round.
+
+        :param state: The state to restore.
+        """
+        self.num_rounds = state['num_rounds']
+        self.rounds_played = state['rounds_played']
+        self.player1.set_state(state['player1'])
+        self.player2.set_state(state['player2'])
+        if self.history is not None and state.get('history') is not None:
+            self.history.set_state(state['history'])
+
     def get_scores_as_str(self) -> str:
         """
         Returns the current scores of both players as a formatted string.
@@ -0,0 +1,69 @@
+"""
+This module provides the ThreadPoolGameRunner class, which plays many independent silent games
+concurrently on a pool of threads, all sharing a single RPSLogic.
+
+Sharing is safe because an RPSLogic is immutable, and every game gets fresh strategy instances, so
+no mutable state is shared between threads. On free-threaded CPython builds the games run in
+parallel; with the GIL they are interleaved, and the pool adds little overhead.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, Tuple
+
+from rps.game import Game
+from rps.player import Player
+from rps.rps_logic import RPSLogic
+from rps.strategy import Strategy
+
+# Creates a fresh strategy instance for each game
+StrategyFactory = Callable[[], Strategy]
+
+
+class ThreadPoolGameRunner:
+    """
+    Plays silent games between pairs of strategies on a thread pool.
+
+    Attributes:
+        rps_logic (RPSLogic): The game logic shared by all games.
+        max_workers (int): The number of threads.
+    """
+
+    def __init__(self, rps_logic: RPSLogic, max_workers: int = None):
+        """
+        :param rps_logic: The game logic shared by all games.
+        :param max_workers: The number of threads; defaults to the number of CPUs.
+        """
+        self.rps_logic = rps_logic
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def play(self, factory1: StrategyFactory, factory2: StrategyFactory,
+             num_rounds: int) -> Tuple[int, int]:
+        """
+        Plays a single game between fresh instances of two strategies, on the calling thread.
+
+        :param factory1: Creates the first player's strategy.
+        :param factory2: Creates the second player's strategy.
+        :param num_rounds: The number of rounds to play.
+        :return: The final (score1, score2).
+        """
+        player1 = Player('Player 1', factory1(), self.rps_logic)
+        player2 = Player('Player 2', factory2(), self.rps_logic)
+        game = Game(player1, player2, self.rps_logic, num_rounds=num_rounds, verbose=False)
+        game.play_game()
+        return player1.score, player2.score
+
+    def run(self, matchups: Iterable[Tuple[StrategyFactory, StrategyFactory]],
+            num_rounds: int) -> List[Tuple[int, int]]:
+        """
+        Plays one game per matchup on the thread pool.
+
+        :param matchups: The (factory1, factory2) strategy factories of each game.
+        :param num_rounds: The number of rounds of each game.
+        :return: The final (score1, score2) of each game, in the order of the matchups.
+        :raises FailedGameException: If a game fails; the remaining games still complete.
+        """
+        with ThreadPoolExecutor(self.max_workers) as executor:
+            futures = [executor.submit(self.play, factory1, factory2, num_rounds)
+                       for factory1, factory2 in matchups]
+            return [future.result() for future in futures]
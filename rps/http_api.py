@@ -0,0 +1,498 @@
+"""
+This module provides an HTTP/JSON API for playing Rock-Paper-Scissors against the computer from
+other services, built on asyncio and the standard library only.
+
+Endpoints:
+    GET    /ruleset               The weapons, their full names and the outcome matrix.
+    POST   /sessions              Starts a game against a ComputerPlayer; optional {"rounds": N}.
+    GET    /sessions/{id}         The session's scores and progress.
+    DELETE /sessions/{id}         Ends the session.
+    POST   /sessions/{id}/round   Plays one round: {"move": "r"}.
+    POST   /sessions/{id}/rounds  Plays one round per submitted move: {"moves": ["r", "p", ...]}.
+    GET    /exploitability        How exploitable the computer's play has been across sessions, if
+                                  the server evaluates it (see `rps.exploitability`).
+
+Round results use the codes of `RPSLogic.compare`: 0 for a tie, 1 if the client wins and 2 if the
+computer wins. Connections are kept alive (HTTP/1.1 semantics), so a client can play many rounds
+over a single connection.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import re
+import uuid
+from http import HTTPStatus
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from rps.exceptions import InvalidInputError
+from rps.exploitability import EvaluationStream, ExploitabilityEvaluator
+from rps.player import ComputerPlayer
+from rps.rps_logic import RPSLogic
+from rps.ruleset_watcher import RulesetWatcher
+from rps.session_store import SessionStore, deep_sizeof
+
+# Requests with larger bodies are rejected, which also bounds the size of a batch
+MAX_BODY_BYTES = 1 << 20
+# Requests with larger headers are rejected
+_MAX_HEADER_BYTES = 16 << 10
+
+_SESSION_PATH = re.compile(r'^/sessions/([0-9a-f]{32})(/round|/rounds)?$')
+
+_logger = logging.getLogger(__name__)
+
+
+def weapon_id_dtype(rps_logic: RPSLogic) -> np.dtype:
+    """
+    :param rps_logic: The game logic.
+    :return: The smallest unsigned integer dtype holding every weapon id of the ruleset.
+    """
+    return np.min_scalar_type(max(len(rps_logic.options) - 1, 0))
+
+
+class HTTPError(Exception):
+    """
+    An error answered with an HTTP status code and a JSON error message.
+    """
+
+    def __init__(self, status: HTTPStatus, message: str):
+        """
+        :param status: The response status.
+        :param message: The error message.
+        """
+        super().__init__(message)
+        self.status = status
+
+
+class GameSession:
+    """
+    A game between an API client and a ComputerPlayer. Rounds are played in batches, with their
+    outcomes looked up in the ruleset's outcome matrix all at once, so a session keeps only the
+    state it needs rather than driving a `Game` round by round.
+
+    Attributes:
+        session_id (str): The session's identifier.
+        rps_logic (RPSLogic): The game logic.
+        computer (ComputerPlayer): The computer's player, which chooses its moves.
+        num_rounds (int): The maximum number of rounds, or None for no limit.
+        rounds_played (int): The number of rounds played.
+        client_score (int): The number of rounds the client won.
+        computer_score (int): The number of rounds the computer won.
+        evaluation (EvaluationStream): Feeds the rounds to the server's exploitability evaluator,
+         if any.
+    """
+    __slots__ = ('session_id', 'rps_logic', 'computer', 'num_rounds', 'rounds_played',
+                 'client_score', 'computer_score', 'evaluation')
+
+    def __init__(self, session_id: str, rps_logic: RPSLogic, num_rounds: Optional[int] = None,
+                 evaluation: EvaluationStream = None):
+        """
+        :param session_id: The session's identifier.
+        :param rps_logic: The game logic.
+        :param num_rounds: The maximum number of rounds, or None for no limit.
+        :param evaluation: Feeds the rounds to an exploitability evaluator, if provided.
+        """
+        self.session_id = session_id
+        self.rps_logic = rps_logic
+        self.computer = ComputerPlayer(rps_logic)
+        self.num_rounds = num_rounds
+        self.rounds_played = 0
+        self.client_score = 0
+        self.computer_score = 0
+        self.evaluation = evaluation
+
+    def play(self, moves: List[str]) -> Tuple[List[str], List[int]]:
+        """
+        Plays one round per move against the computer.
+
+        :param moves: The client's moves (short names).
+        :return: The computer's moves and the round results (see `RPSLogic.compare`).
+        :raises HTTPError: If the moves exceed the session's round limit.
+        """
+        weapon_ids = self.rps_logic.weapon_ids
+        client_ids = np.fromiter((weapon_ids[move] for move in moves),
+                                 dtype=weapon_id_dtype(self.rps_logic), count=len(moves))
+        computer_ids, results = self.play_ids(client_ids)
+        options = self.rps_logic.options
+        return [options[weapon_id] for weapon_id in computer_ids.tolist()], results.tolist()
+
+    def play_ids(self, client_ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Plays one round per move against the computer, with moves given as weapon ids (see
+        `RPSLogic.weapon_ids`). Outcomes are computed for the whole batch at once from the
+        ruleset's outcome matrix.
+
+        :param client_ids: The client's moves, as an integer array of weapon ids.
+        :return: The computer's moves as an array of weapon ids (see `weapon_id_dtype`), and the
+         round results as an int8 array (see `RPSLogic.compare`).
+        :raises HTTPError: If the moves exceed the session's round limit.
+        """
+        count = len(client_ids)
+        if self.num_rounds is not None and self.rounds_played + count > self.num_rounds:
+            raise HTTPError(HTTPStatus.CONFLICT,
+                            f'Only {self.num_rounds - self.rounds_played} rounds left.')
+
+        rps_logic = self.rps_logic
+        weapon_ids = rps_logic.weapon_ids
+        choose = self.computer.choose
+        computer_ids = np.fromiter((weapon_ids[choose()] for _ in range(count)),
+                                   dtype=weapon_id_dtype(rps_logic), count=count)
+        results = rps_logic.outcome_matrix[client_ids, computer_ids]
+
+        _, client_wins, computer_wins = np.bincount(results, minlength=3).tolist()
+        self.client_score += client_wins
+        self.computer_score += computer_wins
+        self.rounds_played += count
+        if self.evaluation is not None:
+            self.evaluation.observe_many(computer_ids, client_ids)
+        return computer_ids, results
+
+    def to_json(self) -> dict:
+        """
+        :return: The session's scores and progress.
+        """
+        return {'session': self.session_id, 'rounds': self.num_rounds,
+                'rounds_played': self.rounds_played,
+                'score': {'client': self.client_score, 'computer': self.computer_score}}
+
+
+class GameServer:
+    """
+    Serves the game API over HTTP/1.1 with keep-alive connections.
+
+    Attributes:
+        rps_logic (RPSLogic): The game logic used by new sessions. With a ruleset watcher, this is
+         its current ruleset; existing sessions keep the ruleset they started with.
+        watcher (RulesetWatcher): Reloads the ruleset when its data files change, if provided.
+        sessions (SessionStore): The active sessions by identifier. Abandoned sessions expire,
+         and the least recently used ones are evicted beyond the store's caps.
+        keep_alive_timeout (float): Seconds an idle connection is kept open.
+        evaluator (ExploitabilityEvaluator): Evaluates the computer's play in the sessions of its
+         ruleset, if provided.
+        address (tuple): The (host, port) the server listens on, once started.
+    """
+
+    def __init__(self, rps_logic: RPSLogic = None, host: str = '127.0.0.1', port: int = 8080,
+                 keep_alive_timeout: float = 15.0, sessions: SessionStore = None,
+                 watcher: RulesetWatcher = None, evaluator: ExploitabilityEvaluator = None):
+        """
+        :param rps_logic: The game logic; loaded from the data files if not provided. Ignored if
+         a watcher is given.
+        :param host: The address to listen on.
+        :param port: The port to listen on (0 picks a free port).
+        :param keep_alive_timeout: Seconds an idle connection is kept open.
+        :param sessions: The session store; by default sessions expire after 30 idle minutes and
+         at most 100,000 sessions or 256 MB of them are kept.
+        :param watcher: Reloads the ruleset when its data files change; the server starts and
+         stops it.
+        :param evaluator: Evaluates how exploitable the computer's play is, in the sessions that
+         use the evaluator's ruleset.
+        """
+        self.watcher = watcher
+        self.evaluator = evaluator
+        self._rps_logic = None if watcher is not None else rps_logic or RPSLogic()
+        # Rulesets and the evaluator are shared between sessions, so they don't count towards a
+        # session's size
+        self.sessions = sessions or SessionStore(
+            ttl=1800.0, max_sessions=100_000, max_bytes=256 << 20,
+            size_of=lambda session: deep_sizeof(
+                session, exclude=(session.rps_logic, self.evaluator)))
+        self.keep_alive_timeout = keep_alive_timeout
+        self.address: Tuple[str, int] = (host, port)
+        self._server: asyncio.AbstractServer = None
+        # The encoded description of a ruleset, computed once per ruleset
+        self._ruleset_body: Tuple[RPSLogic, bytes] = (None, b'')
+
+    @property
+    def rps_logic(self) -> RPSLogic:
+        """
+        :return: The ruleset new sessions start with.
+        """
+        return self.watcher.current if self.watcher is not None else self._rps_logic
+
+    def _describe_ruleset(self) -> bytes:
+        """
+        :return: The current ruleset's description, encoded as JSON.
+        """
+        rps_logic = self.rps_logic
+        cached_logic, body = self._ruleset_body
+        if cached_logic is not rps_logic:
+            options = list(rps_logic.options)
+            body = json.dumps({
+                'options': options,
+                'names': {short: rps_logic.short_names_to_full_names[short] for short in options},
+                'outcome_matrix': rps_logic.outcome_matrix.tolist(),
+            }).encode('utf-8')
+            self._ruleset_body = (rps_logic, body)
+        return body
+
+    async def start(self):
+        """
+        Starts listening for connections, expiring abandoned sessions and watching the ruleset.
+        """
+        self.sessions.start()
+        if self.watcher is not None:
+            self.watcher.start()
+        self._server = await asyncio.start_server(self._handle_connection, *self.address,
+                                                  limit=_MAX_HEADER_BYTES)
+        self.address = self._server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self):
+        """
+        Starts the server if needed and serves until cancelled.
+        """
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        """
+        Stops listening and waits for the server to close.
+        """
+        self.sessions.stop()
+        if self.watcher is not None:
+            self.watcher.stop()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader,
+                                 writer: asyncio.StreamWriter):
+        """
+        Serves requests on a connection until the client closes it, asks to close it, or it is
+        idle for longer than the keep-alive timeout.
+        """
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'),
+                                                  self.keep_alive_timeout)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError):
+                    return
+                except asyncio.LimitOverrunError:
+                    await self._respond(writer, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE,
+                                        {'error': 'Request headers too large.'}, False)
+                    return
+
+                try:
+                    method, path, version, headers = self._parse_head(head)
+                    keep_alive = self._keep_alive(version, headers)
+                    length = int(headers.get('content-length', 0))
+                    if length > MAX_BODY_BYTES:
+                        keep_alive = False
+                        raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                                        'Request body too large.')
+                    body = await reader.readexactly(length) if length else b''
+                    status, payload = self.dispatch(method, path, body)
+                except HTTPError as e:
+                    status, payload = e.status, {'error': str(e)}
+                except ValueError:
+                    keep_alive = False
+                    status, payload = HTTPStatus.BAD_REQUEST, {'error': 'Malformed request.'}
+                except Exception:  # pylint: disable=broad-except
+                    # A bug must still get an answer, rather than a dropped connection
+                    _logger.exception('Failed to serve a request.')
+                    keep_alive = False
+                    status, payload = (HTTPStatus.INTERNAL_SERVER_ERROR,
+                                       {'error': 'Internal server error.'})
+
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            return
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _parse_head(head: bytes) -> Tuple[str, str, str, Dict[str, str]]:
+        """
+        :param head: The request line and headers, up to and including the blank line.
+        :return: The method, path, HTTP version and headers (with lower-case names).
+        :raises ValueError: If the request line is malformed.
+        """
+        lines = head.decode('latin-1').split('\r\n')
+        method, path, version = lines[0].split(' ')
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(':')
+                headers[name.strip().lower()] = value.strip()
+        return method, path.split('?', 1)[0], version, headers
+
+    @staticmethod
+    def _keep_alive(version: str, headers: Dict[str, str]) -> bool:
+        """
+        :return: Whether the connection stays open after the response.
+        """
+        connection = headers.get('connection', '').lower()
+        if version == 'HTTP/1.0':
+            return connection == 'keep-alive'
+        return connection != 'close'
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: HTTPStatus, payload,
+                       keep_alive: bool):
+        """
+        Writes a JSON response.
+
+        :param payload: The response body: bytes already encoded as JSON, or an object to encode.
+        """
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode('utf-8')
+        writer.write(
+            f'HTTP/1.1 {status.value} {status.phrase}\r\n'
+            f'Content-Type: application/json\r\n'
+            f'Content-Length: {len(body)}\r\n'
+            f'Connection: {"keep-alive" if keep_alive else "close"}\r\n\r\n'.encode('latin-1')
+            + body)
+        await writer.drain()
+
+    def dispatch(self, method: str, path: str, body: bytes):
+        """
+        Routes a request to its handler.
+
+        :param method: The HTTP method.
+        :param path: The request path, without the query string.
+        :param body: The raw request body.
+        :return: The response status and payload.
+        :raises HTTPError: If the request cannot be served.
+        """
+        if path == '/ruleset':
+            self._check_method(method, 'GET')
+            return HTTPStatus.OK, self._describe_ruleset()
+
+        if path == '/exploitability':
+            self._check_method(method, 'GET')
+            if self.evaluator is None:
+                raise HTTPError(HTTPStatus.NOT_FOUND, 'Exploitability is not evaluated.')
+            return HTTPStatus.OK, {'estimates': [estimate._asdict()
+                                                 for estimate in self.evaluator.report()]}
+
+        if path == '/sessions':
+            self._check_method(method, 'POST')
+            return HTTPStatus.CREATED, self._create_session(self._parse_json(body)).to_json()
+
+        match = _SESSION_PATH.match(path)
+        if match is None:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f'Unknown path {path}.')
+        session_id, action = match.groups()
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise HTTPError(HTTPStatus.NOT_FOUND, 'Unknown session.')
+
+        if action is None:
+            if method == 'DELETE':
+                del self.sessions[session_id]
+                if session.evaluation is not None:
+                    session.evaluation.close()
+                return HTTPStatus.OK, session.to_json()
+            self._check_method(method, 'GET')
+            return HTTPStatus.OK, session.to_json()
+
+        self._check_method(method, 'POST')
+        request = self._parse_json(body)
+        if action == '/round':
+            move = self._resolve_moves(session, [request.get('move')])
+            computer_moves, results = session.play(move)
+            response = {'move': move[0], 'computer_move': computer_moves[0],
+                        'result': results[0]}
+        else:
+            moves = request.get('moves')
+            if not isinstance(moves, list):
+                raise HTTPError(HTTPStatus.BAD_REQUEST, '"moves" must be a list.')
+            moves = self._resolve_moves(session, moves)
+            computer_moves, results = session.play(moves)
+            response = {'moves': moves, 'computer_moves': computer_moves, 'results': results}
+        # The computer's strategy may have grown, e.g. on its first move
+        self.sessions.update_size(session_id)
+        response.update(session.to_json())
+        return HTTPStatus.OK, response
+
+    def _create_session(self, request: dict) -> GameSession:
+        """
+        :param request: The request body, with an optional round limit.
+        :return: The new session.
+        :raises HTTPError: If the round limit is invalid.
+        """
+        num_rounds = request.get('rounds')
+        if num_rounds is not None and (type(num_rounds) is not int or num_rounds <= 0):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, '"rounds" must be a positive integer.')
+        rps_logic, evaluator = self.rps_logic, self.evaluator
+        evaluation = (evaluator.new_stream()
+                      if evaluator is not None and evaluator.rps_logic is rps_logic else None)
+        session = GameSession(uuid.uuid4().hex, rps_logic, num_rounds, evaluation)
+        self.sessions[session.session_id] = session
+        return session
+
+    @staticmethod
+    def _resolve_moves(session: GameSession, moves: list) -> List[str]:
+        """
+        :param session: The session the moves are played in, whose ruleset they are checked
+         against.
+        :param moves: Submitted moves, as short names, full names or unambiguous prefixes.
+        :return: The moves' short names.
+        :raises HTTPError: If a move is not a valid weapon.
+        """
+        match = session.rps_logic.input_matcher.match
+        try:
+            return [match(move) for move in moves]
+        except (InvalidInputError, AttributeError, TypeError) as e:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f'Invalid move: {e}') from e
+
+    @staticmethod
+    def _parse_json(body: bytes) -> dict:
+        """
+        :param body: The raw request body; empty bodies count as an empty object.
+        :return: The decoded object.
+        :raises HTTPError: If the body is not a JSON object.
+        """
+        try:
+            request = json.loads(body) if body else {}
+        except ValueError as e:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, 'The body must be JSON.') from e
+        if not isinstance(request, dict):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, 'The body must be a JSON object.')
+        return request
+
+    @staticmethod
+    def _check_method(method: str, allowed: str):
+        """
+        :raises HTTPError: If the method is not the allowed one.
+        """
+        if method != allowed:
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, f'Use {allowed}.')
+
+
+def main():
+    """
+    Runs the API server from the command line.
+    """
+    parser = argparse.ArgumentParser(description='Rock-Paper-Scissors HTTP/JSON API.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--watch', action='store_true',
+                        help='Reload the ruleset when the data files change.')
+    parser.add_argument('--evaluate-depth', type=int,
+                        help='Evaluate how exploitable the computer is, conditioning on up to this '
+                             'many previous rounds (GET /exploitability).')
+    args = parser.parse_args()
+
+    watcher = RulesetWatcher() if args.watch else None
+    rps_logic = watcher.current if watcher is not None else RPSLogic()
+    evaluator = (ExploitabilityEvaluator(rps_logic, args.evaluate_depth)
+                 if args.evaluate_depth is not None else None)
+    server = GameServer(rps_logic, host=args.host, port=args.port, watcher=watcher,
+                        evaluator=evaluator)
+    print(f'Serving on http://{args.host}:{args.port}')
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
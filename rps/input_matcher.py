@@ -0,0 +1,115 @@
+"""
+This module provides the InputMatcher class, which resolves free-form user input to a weapon's
+short name.
+
+The matcher is compiled once per ruleset: every accepted spelling of every weapon (short name,
+full name, case-insensitive variants and unique prefixes) is precomputed into hash indexes, so
+resolving an input is a constant number of dictionary lookups regardless of the number of weapons.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from rps.exceptions import InvalidInputError
+
+
+class InputMatcher:
+    """
+    Resolves user input to a weapon short name using precomputed hash indexes.
+
+    Lookup order:
+        1. Exact short name (case-sensitive), e.g. 'r'.
+        2. Exact short name or full name, case-insensitive, e.g. 'R', 'ROCK'.
+        3. Unique case-insensitive prefix of a short name or full name, e.g. 'roc'.
+
+    Attributes:
+        options (list): All weapon short names, in ruleset order.
+        prompt (str): The rendered prompt text listing all available weapons.
+    """
+
+    # Marks an index key that resolves to more than one weapon
+    _AMBIGUOUS = None
+
+    def __init__(self, names_tuples: List[Tuple[str, str]]):
+        """
+        Compiles the lookup indexes and the prompt text for a ruleset.
+
+        :param names_tuples: List of (short name, full name) pairs, as loaded from
+         short_names.json.
+        """
+        self.options: List[str] = [short for short, _ in names_tuples]
+
+        # Case-sensitive short names take precedence over everything else
+        self._exact: Dict[str, str] = {short: short for short in self.options}
+
+        # Case-insensitive short and full names
+        self._folded: Dict[str, Optional[str]] = {}
+        for short, full in names_tuples:
+            for key in {short.casefold(), full.casefold()}:
+                self._add(self._folded, key, short)
+
+        # Every case-insensitive prefix of every short and full name
+        self._prefixes: Dict[str, Optional[str]] = {}
+        for short, full in names_tuples:
+            keys = set()
+            for name in (short.casefold(), full.casefold()):
+                keys.update(name[:length] for length in range(1, len(name) + 1))
+            for key in keys:
+                self._add(self._prefixes, key, short)
+
+        # Render the prompt once; it only changes together with the ruleset
+        separator: str = '\n\t'
+        formatted_options = separator + separator.join(
+            f'{short_name}- {full_name}' for short_name, full_name in names_tuples
+        )
+        self.prompt: str = f'Choose from the following options: {formatted_options}\n'
+
+    @classmethod
+    def _add(cls, index: Dict[str, Optional[str]], key: str, short: str):
+        """
+        Adds a key to an index, marking it as ambiguous if it already points to another weapon.
+
+        :param index: The index to update.
+        :param key: The lookup key.
+        :param short: The weapon short name the key resolves to.
+        """
+        if index.get(key, short) != short:
+            index[key] = cls._AMBIGUOUS
+        else:
+            index[key] = short
+
+    def match(self, user_input: str) -> str:
+        """
+        Resolves user input to a weapon short name.
+
+        :param user_input: The raw input typed by the user.
+        :return: The short name of the matched weapon.
+        :raises InvalidInputError: If the input matches no weapon or is an ambiguous prefix.
+        """
+        short = self._exact.get(user_input)
+        if short is not None:
+            return short
+
+        key = user_input.strip().casefold()
+        for index in (self._folded, self._prefixes):
+            if key in index:
+                short = index[key]
+                if short is self._AMBIGUOUS:
+                    raise InvalidInputError(f"Ambiguous option: '{user_input}', "
+                                            f"matches more than one of {self.options}")
+                return short
+
+        raise InvalidInputError(f"Invalid option: '{user_input}', "
+                                f"must be one of {self.options}")
+
+    def __contains__(self, user_input: str) -> bool:
+        """
+        Checks whether user input resolves to exactly one weapon.
+
+        :param user_input: The raw input typed by the user.
+        :return: True if the input can be matched, otherwise False.
+        """
+        try:
+            self.match(user_input)
+        except InvalidInputError:
+            return False
+        return True
@@ -0,0 +1,219 @@
+"""
+This module provides the IocaineStrategy class, an ensemble strategy modeled on Iocaine Powder.
+
+Many predictors guess the opponent's next move, or the strategy's own next move as the opponent
+might anticipate it:
+
+    history matching  The moves that followed the most recent earlier occurrence of the last L
+                      moves, for several lengths L, matching the opponent's moves, the strategy's
+                      own moves or both.
+    frequency         The most frequent move, with exponentially decaying counts.
+
+Each guess is turned into several candidate moves by the "sicilian" rotations: beating the guessed
+move, beating the move that beats it, and so on, which answers opponents who second-guess the
+strategy in turn. Every candidate is scored against the opponent's actual moves over several
+horizons, the best candidate of each horizon is followed by a meta-predictor, and the meta-predictor
+with the best record picks the move.
+
+Candidates are scored together: the predictor x weapon payoff lookup for all of them is one NumPy
+indexing operation per round, and all horizons are updated in one array operation, so the cost per
+move grows only slowly with the number of predictors and the size of the ruleset. Matching past
+histories uses a table per length, indexed by a rolling hash of the last L moves, so it never
+scans the history. The tables have a fixed number of entries, and a sequence overwrites an older
+one whose hash lands on the same entry, so a strategy's memory stays bounded however long it
+plays, favouring recent history.
+"""
+
+import random
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from rps.decaying_counts import DecayingCounts
+from rps.rps_logic import RPSLogic
+from rps.ruleset_analysis import payoff_matrix
+from rps.strategy import Strategy, register_strategy
+
+# Rolling hashes of move sequences are computed modulo a Mersenne prime
+_HASH_MODULUS = (1 << 61) - 1
+_HASH_BASE = 1_000_003
+
+
+@register_strategy('iocaine')
+class IocaineStrategy(Strategy):
+    """
+    An ensemble of predictors scored against each other every round, in the style of Iocaine
+    Powder. The game's round history must be attached for the strategy to learn (see
+    `Strategy.attach_history`).
+
+    Attributes:
+        num_predictors (int): The number of candidate moves scored every round.
+    """
+    uses_history = True
+
+    def __init__(self, match_lengths: Sequence[int] = (1, 2, 3, 5, 10, 20),
+                 frequency_decays: Sequence[float] = (1.0, 0.9, 0.5),
+                 horizons: Sequence[float] = (1.0, 0.99, 0.9, 0.7), rotations: int = 3,
+                 table_size: int = 1 << 12, seed: int = None):
+        """
+        :param match_lengths: The lengths of the move sequences to match in the past.
+        :param frequency_decays: The count decay of each frequency predictor (1 never forgets).
+        :param horizons: The score decay of each meta-predictor (1 never forgets).
+        :param rotations: The number of sicilian rotations of each guess.
+        :param table_size: The number of move sequences remembered per match length and sequence
+         kind.
+        :param seed: Seeds the strategy's random number generator, used for guesses without data.
+        """
+        super().__init__('Iocaine')
+        self._lengths = tuple(match_lengths)
+        self._frequency_decays = np.array(frequency_decays, dtype=float)
+        self._horizons = np.array(horizons, dtype=float)
+        self._horizon_column = self._horizons[:, None]
+        self._rotations = rotations
+        self._table_size = table_size
+        # Guesses from history matching: one per length and sequence kind, for the opponent's
+        # next move and for the strategy's own next move
+        self._num_guesses = 2 * (3 * len(self._lengths) + len(self._frequency_decays))
+        self.num_predictors = self._num_guesses * rotations
+        self._random = random.Random(seed)
+        self._rps_logic: RPSLogic = None
+
+    def _setup(self, rps_logic: RPSLogic):
+        """
+        Sets up the predictors for a ruleset.
+
+        :param rps_logic: The game logic.
+        """
+        self._rps_logic = rps_logic
+        num_weapons = len(rps_logic.options)
+        self._num_weapons = num_weapons
+        self._payoff = payoff_matrix(rps_logic)
+
+        # counter[k][w] is the weapon answering w after k rotations: the best answer to the best
+        # answer to ... w
+        counter = self._payoff.argmax(axis=0)
+        rotated = [np.arange(num_weapons)]
+        for _ in range(self._rotations + 1):
+            rotated.append(counter[rotated[-1]])
+        rotated = np.array(rotated)
+        # Guessing the opponent's move, play its answer; guessing the strategy's own move, the
+        # opponent is expected to answer it, so play the answer to that answer
+        self._rotation_steps = np.concatenate([
+            np.tile(np.arange(1, self._rotations + 1), (self._num_guesses // 2, 1)),
+            np.tile(np.arange(2, self._rotations + 2), (self._num_guesses // 2, 1))])
+        self._rotated = rotated
+
+        # Per match length and sequence kind (opponent, own, both), in that order: the recent
+        # moves' rolling hash, and a table of the moves that followed each hash, whose entries
+        # are (hash, (opponent move, own move)) at index hash % table size
+        self._opponent_moves: List[int] = []
+        self._own_moves: List[int] = []
+        self._hashes = [0] * (3 * len(self._lengths))
+        self._followers: List[List[Optional[Tuple[int, Tuple[int, int]]]]] = [
+            [None] * self._table_size for _ in self._hashes]
+        self._base_powers = [pow(_HASH_BASE, length - 1, _HASH_MODULUS)
+                             for length in self._lengths]
+        self._guesses = np.zeros(self._num_guesses, dtype=np.intp)
+
+        # The opponent's and own move counts, per decay
+        self._frequency_counts = DecayingCounts(self._frequency_decays, (2, num_weapons))
+        self._scores = np.zeros((len(self._horizons), self.num_predictors))
+        self._meta_scores = np.zeros(len(self._horizons))
+        self._rounds_seen = 0
+        self._propose()
+
+    def execute(self, game_logic: RPSLogic) -> str:
+        """
+        Scores the predictors against the last round, then plays the best meta-predictor's move.
+
+        :param game_logic: The game logic.
+        :return: The chosen weapon's short name.
+        """
+        if game_logic is not self._rps_logic:
+            self._setup(game_logic)
+
+        history = self.history
+        if history is not None and history.total > self._rounds_seen and len(history):
+            self._observe(int(history.moves(3 - self.seat, 1)[0]),
+                          int(history.moves(self.seat, 1)[0]))
+            self._rounds_seen = history.total
+            self._propose()
+        return game_logic.options[self._move]
+
+    def _observe(self, opponent: int, own: int):
+        """
+        Scores every predictor against the opponent's move, and records the round.
+
+        :param opponent: The opponent's weapon id.
+        :param own: The strategy's own weapon id.
+        """
+        # Score all candidates and meta-predictors in one lookup each
+        self._scores *= self._horizon_column
+        self._scores += self._payoff[self._candidates, opponent]
+        self._meta_scores *= self._horizons
+        self._meta_scores += self._payoff[self._meta_moves, opponent]
+
+        self._frequency_counts.add((0, opponent), (1, own))
+
+        # Record which moves followed each matched sequence, then roll the hashes forward. Hashes
+        # are kept per match length, for the opponent's, own and both players' moves in turn
+        opponent_moves, own_moves = self._opponent_moves, self._own_moves
+        played = len(opponent_moves)
+        num_weapons = self._num_weapons
+        both = opponent * num_weapons + own
+        pair = (opponent, own)
+        hashes, followers, table_size = self._hashes, self._followers, self._table_size
+        for index, length in enumerate(self._lengths):
+            slot = 3 * index
+            hash1, hash2, hash3 = hashes[slot:slot + 3]
+            if played >= length:
+                followers[slot][hash1 % table_size] = (hash1, pair)
+                followers[slot + 1][hash2 % table_size] = (hash2, pair)
+                followers[slot + 2][hash3 % table_size] = (hash3, pair)
+                old = played - length
+                power = self._base_powers[index]
+                opponent_old, own_old = opponent_moves[old], own_moves[old]
+                hash1 -= opponent_old * power
+                hash2 -= own_old * power
+                hash3 -= (opponent_old * num_weapons + own_old) * power
+            hashes[slot] = (hash1 * _HASH_BASE + opponent) % _HASH_MODULUS
+            hashes[slot + 1] = (hash2 * _HASH_BASE + own) % _HASH_MODULUS
+            hashes[slot + 2] = (hash3 * _HASH_BASE + both) % _HASH_MODULUS
+
+        opponent_moves.append(opponent)
+        own_moves.append(own)
+        longest = self._lengths[-1] if self._lengths else 0
+        if len(opponent_moves) > 2 * longest + 64:
+            # Only the last `longest` moves are needed to roll the hashes
+            del opponent_moves[:-longest or None]
+            del own_moves[:-longest or None]
+
+    def _propose(self):
+        """
+        Computes every predictor's candidate move and the move to play next.
+        """
+        played = len(self._opponent_moves)
+        opponent_guesses, own_guesses = [], []
+        missing = None
+        for index, length in enumerate(self._lengths):
+            for slot in range(3 * index, 3 * index + 3):
+                follower = None
+                if played >= length:
+                    hash_ = self._hashes[slot]
+                    entry = self._followers[slot][hash_ % self._table_size]
+                    # Another sequence may have taken the entry since
+                    if entry is not None and entry[0] == hash_:
+                        follower = entry[1]
+                if follower is None:
+                    if missing is None:
+                        missing = self._random.randrange(self._num_weapons)
+                    follower = (missing, missing)
+                opponent_guesses.append(follower[0])
+                own_guesses.append(follower[1])
+        opponent_counts, own_counts = self._frequency_counts.values.argmax(axis=2).T.tolist()
+        self._guesses[:] = opponent_guesses + opponent_counts + own_guesses + own_counts
+
+        candidates = self._rotated[self._rotation_steps, self._guesses[:, None]].ravel()
+        self._candidates = candidates
+        self._meta_moves = candidates[self._scores.argmax(axis=1)]
+        self._move = int(self._meta_moves[self._meta_scores.argmax()])
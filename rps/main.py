@@ -20,10 +20,9 @@ def main():
     # configuration
     rps_logic = RPSLogic()
 
-    # Displaying the game title from the assets (external text file)
-    # print('hello')
-    print(AssetManager().get_asset('game_title.txt'))
-    # print('world')
+    # Displaying the game title from the assets (external text file). The shared AssetManager
+    # keeps assets cached across games in the same process
+    print(AssetManager.shared().get_asset('game_title.txt'))
 
     # Create a human player and a computer player, passing the game logic to both
     human = HumanPlayer(rps_logic=rps_logic)
@@ -0,0 +1,324 @@
+"""
+This module provides skill-based matchmaking in front of `Game`: waiting players are paired with
+opponents of similar rating, and each player's acceptable rating gap widens the longer they wait.
+
+Waiting players are kept sorted by rating. Two players can be matched once their rating gap is
+within both players' windows, and since windows grow linearly with waiting time, the moment a pair
+becomes matchable can be computed when the pair is formed. The queue therefore only considers
+players adjacent in rating order: it schedules each adjacent pair in a heap keyed by that moment,
+and re-schedules the new adjacent pairs when players join or leave. Each join, leave and match is
+O(log n) heap and search work, so polling never scans the queue.
+"""
+
+import heapq
+import itertools
+import math
+import time
+from bisect import bisect_left, bisect_right, insort
+from typing import Callable, Dict, Hashable, List, NamedTuple, Optional, Tuple
+
+from rps.game import Game
+from rps.player import Player
+from rps.rps_logic import RPSLogic
+
+# A waiting player's position in the rating order: (rating, ticket number)
+_Key = Tuple[float, int]
+
+
+class _SortedKeys:
+    """
+    A sorted collection split into buckets of a few hundred keys, so inserting and removing only
+    shift a single small bucket rather than the whole collection.
+    """
+    _LOAD = 512
+
+    def __init__(self):
+        self._buckets: List[List[_Key]] = []
+        self._maxes: List[_Key] = []  # The largest key of each bucket
+
+    def add(self, key: _Key):
+        """
+        :param key: The key to insert.
+        """
+        if not self._buckets:
+            self._buckets.append([key])
+            self._maxes.append(key)
+            return
+        index = bisect_left(self._maxes, key)
+        if index == len(self._maxes):
+            index -= 1
+            self._buckets[index].append(key)
+            self._maxes[index] = key
+        else:
+            insort(self._buckets[index], key)
+
+        bucket = self._buckets[index]
+        if len(bucket) > 2 * self._LOAD:
+            self._buckets.insert(index + 1, bucket[self._LOAD:])
+            del bucket[self._LOAD:]
+            self._maxes.insert(index, bucket[-1])
+
+    def remove(self, key: _Key):
+        """
+        :param key: A key in the collection.
+        """
+        index = bisect_left(self._maxes, key)
+        bucket = self._buckets[index]
+        del bucket[bisect_left(bucket, key)]
+        if bucket:
+            self._maxes[index] = bucket[-1]
+        else:
+            del self._buckets[index]
+            del self._maxes[index]
+
+    def lower(self, key: _Key) -> Optional[_Key]:
+        """
+        :return: The largest key smaller than the given key, if any.
+        """
+        index = bisect_left(self._maxes, key)
+        if index < len(self._buckets):
+            bucket = self._buckets[index]
+            position = bisect_left(bucket, key)
+            if position:
+                return bucket[position - 1]
+        return self._buckets[index - 1][-1] if index else None
+
+    def higher(self, key: _Key) -> Optional[_Key]:
+        """
+        :return: The smallest key larger than the given key, if any.
+        """
+        index = bisect_right(self._maxes, key)
+        if index == len(self._buckets):
+            return None
+        bucket = self._buckets[index]
+        return bucket[bisect_right(bucket, key)]
+
+    def __iter__(self):
+        for bucket in self._buckets:
+            yield from bucket
+
+    def __len__(self) -> int:
+        return sum(len(bucket) for bucket in self._buckets)
+
+
+class _Ticket:
+    """
+    A waiting player.
+    """
+    __slots__ = ('player_id', 'key', 'enqueued_at')
+
+    def __init__(self, player_id: Hashable, key: _Key, enqueued_at: float):
+        self.player_id = player_id
+        self.key = key
+        self.enqueued_at = enqueued_at
+
+
+class Match(NamedTuple):
+    """
+    Two players paired by the matchmaking queue.
+
+    Attributes:
+        player1: The first player's id.
+        player2: The second player's id.
+        rating_gap (float): The absolute difference between their ratings.
+        waited (float): The longest time either player waited, in seconds.
+    """
+    player1: Hashable
+    player2: Hashable
+    rating_gap: float
+    waited: float
+
+
+class MatchmakingQueue:
+    """
+    A queue of players waiting for an opponent, matched by rating.
+
+    A player waiting for `t` seconds accepts opponents within `initial_window + widen_rate * t`
+    rating points (at most `max_window`). Two players are matched once their rating gap is within
+    both of their windows.
+
+    Attributes:
+        initial_window (float): The rating gap every player accepts immediately.
+        widen_rate (float): How many rating points the window widens per second of waiting.
+        max_window (float): The largest window, or None for no limit.
+    """
+
+    def __init__(self, initial_window: float = 50.0, widen_rate: float = 25.0,
+                 max_window: float = None, clock: Callable[[], float] = time.monotonic):
+        """
+        :param initial_window: The rating gap every player accepts immediately.
+        :param widen_rate: How many rating points the window widens per second of waiting.
+        :param max_window: The largest window, or None for no limit.
+        :param clock: The time source, in seconds.
+        """
+        self.initial_window = initial_window
+        self.widen_rate = widen_rate
+        self.max_window = max_window
+        self._clock = clock
+        self._keys = _SortedKeys()
+        self._tickets: Dict[_Key, _Ticket] = {}
+        self._ticket_of: Dict[Hashable, _Ticket] = {}
+        # (time the pair becomes matchable, key, key) for pairs adjacent in rating order
+        self._schedule: List[Tuple[float, _Key, _Key]] = []
+        self._ticket_numbers = itertools.count()
+
+    def enqueue(self, player_id: Hashable, rating: float):
+        """
+        Adds a player to the queue. Matches are collected with `poll`.
+
+        :param player_id: A unique, hashable player id.
+        :param rating: The player's rating.
+        :raises ValueError: If the player is already waiting.
+        """
+        if player_id in self._ticket_of:
+            raise ValueError(f'Player {player_id!r} is already waiting.')
+        key = (rating, next(self._ticket_numbers))
+        ticket = _Ticket(player_id, key, self._clock())
+        self._tickets[key] = ticket
+        self._ticket_of[player_id] = ticket
+        self._keys.add(key)
+        self._schedule_pair(self._keys.lower(key), key)
+        self._schedule_pair(key, self._keys.higher(key))
+
+    def cancel(self, player_id: Hashable) -> bool:
+        """
+        Removes a player from the queue.
+
+        :param player_id: The player's id.
+        :return: Whether the player was waiting.
+        """
+        ticket = self._ticket_of.get(player_id)
+        if ticket is None:
+            return False
+        self._remove(ticket)
+        return True
+
+    def poll(self) -> List[Match]:
+        """
+        Matches every pair of waiting players that has become matchable.
+
+        :return: The new matches, in the order they became matchable.
+        """
+        now = self._clock()
+        matches = []
+        # Removing players may rebuild the heap, so it is looked up on every iteration
+        while self._schedule and self._schedule[0][0] <= now:
+            _, key1, key2 = heapq.heappop(self._schedule)
+            ticket1, ticket2 = self._tickets.get(key1), self._tickets.get(key2)
+            if ticket1 is None or ticket2 is None:
+                continue  # One of them was matched or left since the pair was scheduled
+            self._remove(ticket1)
+            self._remove(ticket2)
+            matches.append(Match(ticket1.player_id, ticket2.player_id, key2[0] - key1[0],
+                                 now - min(ticket1.enqueued_at, ticket2.enqueued_at)))
+        return matches
+
+    def window(self, player_id: Hashable) -> float:
+        """
+        :param player_id: A waiting player's id.
+        :return: The rating gap the player currently accepts.
+        :raises KeyError: If the player is not waiting.
+        """
+        waited = self._clock() - self._ticket_of[player_id].enqueued_at
+        window = self.initial_window + self.widen_rate * waited
+        return window if self.max_window is None else min(window, self.max_window)
+
+    def __len__(self) -> int:
+        return len(self._tickets)
+
+    def __contains__(self, player_id: Hashable) -> bool:
+        return player_id in self._ticket_of
+
+    def _remove(self, ticket: _Ticket):
+        """
+        Removes a waiting player, and schedules the pair of players that become adjacent.
+        """
+        key = ticket.key
+        del self._tickets[key]
+        del self._ticket_of[ticket.player_id]
+        self._keys.remove(key)
+        self._schedule_pair(self._keys.lower(key), self._keys.higher(key))
+
+        # Pairs involving departed players stay in the heap until they come up; once they are
+        # the majority, rebuild the heap from the current adjacent pairs
+        if len(self._schedule) > 4 * len(self._tickets) + 64:
+            self._schedule = []
+            previous = None
+            for current in self._keys:
+                self._schedule_pair(previous, current)
+                previous = current
+
+    def _schedule_pair(self, key1: Optional[_Key], key2: Optional[_Key]):
+        """
+        Schedules a pair of adjacent players at the moment both windows cover their rating gap.
+
+        :param key1: The lower-rated player's key, if any.
+        :param key2: The higher-rated player's key, if any.
+        """
+        if key1 is None or key2 is None:
+            return
+        gap = key2[0] - key1[0]
+        if self.max_window is not None and gap > self.max_window:
+            return  # Never matchable
+        missing = gap - self.initial_window
+        if missing <= 0:
+            delay = 0.0
+        elif self.widen_rate > 0:
+            delay = missing / self.widen_rate
+        else:
+            return  # Never matchable
+        # The player who joined last is the one whose window covers the gap last
+        ready_at = max(self._tickets[key1].enqueued_at, self._tickets[key2].enqueued_at) + delay
+        if not math.isinf(ready_at):
+            heapq.heappush(self._schedule, (ready_at, key1, key2))
+
+
+class Matchmaker:
+    """
+    Pairs waiting players by rating and creates silent games between them.
+
+    Attributes:
+        rps_logic (RPSLogic): The game logic for new games.
+        num_rounds (int): The number of rounds of each game.
+        queue (MatchmakingQueue): The rating-ordered queue of waiting players.
+    """
+
+    def __init__(self, rps_logic: RPSLogic, num_rounds: int, queue: MatchmakingQueue = None):
+        """
+        :param rps_logic: The game logic for new games.
+        :param num_rounds: The number of rounds of each game.
+        :param queue: The queue to use; a queue with default windows if not provided.
+        """
+        self.rps_logic = rps_logic
+        self.num_rounds = num_rounds
+        self.queue = queue or MatchmakingQueue()
+        self._players: Dict[int, Player] = {}
+
+    def join(self, player: Player, rating: float):
+        """
+        Adds a player to the queue.
+
+        :param player: The player.
+        :param rating: The player's rating.
+        :raises ValueError: If the player is already waiting.
+        """
+        self.queue.enqueue(id(player), rating)
+        self._players[id(player)] = player
+
+    def leave(self, player: Player) -> bool:
+        """
+        Removes a player from the queue.
+
+        :param player: The player.
+        :return: Whether the player was waiting.
+        """
+        self._players.pop(id(player), None)
+        return self.queue.cancel(id(player))
+
+    def poll(self) -> List[Game]:
+        """
+        :return: A new game for each match made since the last poll.
+        """
+        return [Game(self._players.pop(match.player1), self._players.pop(match.player2),
+                     self.rps_logic, num_rounds=self.num_rounds, verbose=False)
+                for match in self.queue.poll()]
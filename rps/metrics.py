@@ -0,0 +1,566 @@
+"""
+This module provides a small metrics registry with counters, gauges and histograms, exported in
+the Prometheus text exposition format, either over a local HTTP endpoint or as a file for the
+node_exporter textfile collector.
+
+Updates are lock-light: every thread accumulates into its own cell of each metric, so concurrent
+game loops never contend on a shared lock. A lock is only taken the first time a thread touches a
+metric, and when the registry is rendered.
+"""
+
+import itertools
+import os
+import threading
+import weakref
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Sequence, Tuple
+
+from rps.exceptions import FailedGameException, MaxAttemptsExceededError
+
+# Default latency buckets (seconds) for round durations
+DEFAULT_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+
+
+def _escape(value: str) -> str:
+    """
+    :param value: A label value.
+    :return: The value escaped for the Prometheus text format.
+    """
+    return value.replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def _format_labels(label_names: Sequence[str], label_values: Sequence[str]) -> str:
+    """
+    :param label_names: The label names.
+    :param label_values: The label values, in the same order.
+    :return: The label set formatted as '{name="value",...}', or '' if there are no labels.
+    """
+    if not label_names:
+        return ''
+    pairs = ','.join(f'{name}="{_escape(value)}"'
+                     for name, value in zip(label_names, label_values))
+    return f'{{{pairs}}}'
+
+
+class _CellHolder:
+    """
+    Holds a thread's cell in the thread's local storage, which drops it when the thread ends.
+    """
+    __slots__ = ('cell', '__weakref__')
+
+
+def _retire_cell(cells_ref: 'weakref.ref', key: int):
+    """
+    Folds the cell of a thread that ended into its metric's retired totals.
+
+    :param cells_ref: A weak reference to the `_ShardedCells` the cell belongs to.
+    :param key: The cell's key.
+    """
+    cells = cells_ref()
+    if cells is not None:
+        cells.retire(key)
+
+
+class _ShardedCells:
+    """
+    A set of per-thread cells (lists of numbers) that are summed on read.
+    Each thread only ever writes to its own cell, so writes need no lock. When a thread ends, its
+    cell is folded into the retired totals, so the cells don't grow with the number of threads
+    that ever recorded a value.
+    """
+
+    def __init__(self, width: int):
+        """
+        :param width: The number of values in each cell.
+        """
+        self._width = width
+        self._local = threading.local()
+        self._cells: Dict[int, list] = {}
+        self._retired = [0] * width
+        self._keys = itertools.count()
+        self._lock = threading.Lock()
+
+    def cell(self) -> list:
+        """
+        :return: The calling thread's cell, created on first use.
+        """
+        try:
+            return self._local.holder.cell
+        except AttributeError:
+            holder = _CellHolder()
+            holder.cell = [0] * self._width
+            with self._lock:
+                key = next(self._keys)
+                self._cells[key] = holder.cell
+            weakref.finalize(holder, _retire_cell, weakref.ref(self), key)
+            self._local.holder = holder
+            return holder.cell
+
+    def retire(self, key: int):
+        """
+        Folds a cell into the retired totals, once its thread has ended.
+
+        :param key: The cell's key.
+        """
+        with self._lock:
+            cell = self._cells.pop(key, None)
+            if cell is not None:
+                for index, value in enumerate(cell):
+                    self._retired[index] += value
+
+    def totals(self) -> list:
+        """
+        :return: The element-wise sum of all threads' cells.
+        """
+        with self._lock:
+            cells = list(self._cells.values())
+            totals = list(self._retired)
+        for cell in cells:
+            for index, value in enumerate(cell):
+                totals[index] += value
+        return totals
+
+
+class _CounterChild:
+    """
+    A single labelled time series of a Counter.
+    """
+
+    def __init__(self):
+        self._cells = _ShardedCells(1)
+
+    def inc(self, amount: float = 1):
+        """
+        Increments the counter.
+
+        :param amount: The non-negative amount to add.
+        """
+        self._cells.cell()[0] += amount
+
+    def get(self) -> float:
+        """
+        :return: The current value.
+        """
+        return self._cells.totals()[0]
+
+
+class _GaugeChild:
+    """
+    A single labelled time series of a Gauge.
+    """
+
+    def __init__(self):
+        self._cells = _ShardedCells(1)
+        self._offset = 0
+        self._offset_lock = threading.Lock()
+
+    def inc(self, amount: float = 1):
+        """
+        Increases the gauge.
+
+        :param amount: The amount to add.
+        """
+        self._cells.cell()[0] += amount
+
+    def dec(self, amount: float = 1):
+        """
+        Decreases the gauge.
+
+        :param amount: The amount to subtract.
+        """
+        self._cells.cell()[0] -= amount
+
+    def set(self, value: float):
+        """
+        Sets the gauge to an absolute value. Unlike inc/dec this takes a lock, as it has to
+        account for all threads' cells.
+
+        :param value: The new value.
+        """
+        with self._offset_lock:
+            self._offset = value - self._cells.totals()[0]
+
+    def get(self) -> float:
+        """
+        :return: The current value.
+        """
+        return self._offset + self._cells.totals()[0]
+
+
+class _HistogramChild:
+    """
+    A single labelled time series of a Histogram.
+    Each cell holds one count per bucket (plus +Inf), followed by the sum and the count.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self._buckets = buckets
+        self._cells = _ShardedCells(len(buckets) + 3)
+
+    def observe(self, value: float):
+        """
+        Records an observation.
+
+        :param value: The observed value.
+        """
+        cell = self._cells.cell()
+        cell[bisect_left(self._buckets, value)] += 1
+        cell[-2] += value
+        cell[-1] += 1
+
+    def get(self) -> Tuple[List[int], float, int]:
+        """
+        :return: The cumulative bucket counts (including +Inf), the sum and the count.
+        """
+        totals = self._cells.totals()
+        cumulative, running = [], 0
+        for count in totals[:-2]:
+            running += count
+            cumulative.append(running)
+        return cumulative, totals[-2], totals[-1]
+
+
+class _Metric:
+    """
+    Base class for metrics: a name, help text, and a child time series per label value set.
+
+    Attributes:
+        name (str): The metric name.
+        documentation (str): The metric help text.
+        label_names (tuple): The names of the metric's labels.
+    """
+
+    type_name = ''
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        """
+        :param name: The metric name.
+        :param documentation: The metric help text.
+        :param label_names: The names of the metric's labels.
+        """
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        if not self.label_names:
+            self._unlabelled = self.labels()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *label_values: str):
+        """
+        Returns the time series for a set of label values, creating it on first use.
+
+        :param label_values: One value per label name, in order.
+        :return: The child time series.
+        :raises ValueError: If the number of values does not match the label names.
+        """
+        child = self._children.get(label_values)
+        if child is None:
+            if len(label_values) != len(self.label_names):
+                raise ValueError(f'{self.name}: expected labels {self.label_names}, '
+                                 f'got {label_values}')
+            with self._lock:
+                child = self._children.setdefault(label_values, self._new_child())
+        return child
+
+    def render(self) -> List[str]:
+        """
+        :return: The metric's lines in the Prometheus text format.
+        """
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.type_name}']
+        with self._lock:
+            children = sorted(self._children.items())
+        for label_values, child in children:
+            lines.extend(self._render_child(label_values, child))
+        return lines
+
+    def _render_child(self, label_values, child) -> List[str]:
+        return [f'{self.name}{_format_labels(self.label_names, label_values)} {child.get()}']
+
+
+class Counter(_Metric):
+    """
+    A monotonically increasing counter.
+    """
+
+    type_name = 'counter'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1):
+        """
+        Increments an unlabelled counter.
+
+        :param amount: The non-negative amount to add.
+        """
+        self._unlabelled.inc(amount)
+
+
+class Gauge(_Metric):
+    """
+    A value that can go up and down.
+    """
+
+    type_name = 'gauge'
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def inc(self, amount: float = 1):
+        """
+        Increases an unlabelled gauge.
+
+        :param amount: The amount to add.
+        """
+        self._unlabelled.inc(amount)
+
+    def dec(self, amount: float = 1):
+        """
+        Decreases an unlabelled gauge.
+
+        :param amount: The amount to subtract.
+        """
+        self._unlabelled.dec(amount)
+
+    def set(self, value: float):
+        """
+        Sets an unlabelled gauge.
+
+        :param value: The new value.
+        """
+        self._unlabelled.set(value)
+
+
+class Histogram(_Metric):
+    """
+    A histogram of observations in fixed, cumulative buckets.
+    """
+
+    type_name = 'histogram'
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        :param name: The metric name.
+        :param documentation: The metric help text.
+        :param label_names: The names of the metric's labels.
+        :param buckets: The upper bounds of the buckets, in increasing order.
+        """
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, label_names)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        """
+        Records an observation in an unlabelled histogram.
+
+        :param value: The observed value.
+        """
+        self._unlabelled.observe(value)
+
+    def _render_child(self, label_values, child) -> List[str]:
+        cumulative, total, count = child.get()
+        label_names = self.label_names + ('le',)
+        lines = []
+        for bound, bucket_count in zip(self.buckets + (float('inf'),), cumulative):
+            le = '+Inf' if bound == float('inf') else repr(bound)
+            labels = _format_labels(label_names, label_values + (le,))
+            lines.append(f'{self.name}_bucket{labels} {bucket_count}')
+        labels = _format_labels(self.label_names, label_values)
+        lines.append(f'{self.name}_sum{labels} {total}')
+        lines.append(f'{self.name}_count{labels} {count}')
+        return lines
+
+
+class MetricsRegistry:
+    """
+    A collection of metrics that can be rendered together in the Prometheus text format.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty registry.
+        """
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        """
+        :param metric: The metric to add.
+        :return: The metric.
+        :raises ValueError: If a metric with the same name is already registered.
+        """
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f'Metric already registered: {metric.name}')
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Counter:
+        """
+        Creates and registers a counter.
+        """
+        return self._register(Counter(name, documentation, label_names))
+
+    def gauge(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Gauge:
+        """
+        Creates and registers a gauge.
+        """
+        return self._register(Gauge(name, documentation, label_names))
+
+    def histogram(self, name: str, documentation: str, label_names: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """
+        Creates and registers a histogram.
+        """
+        return self._register(Histogram(name, documentation, label_names, buckets))
+
+    def render(self) -> str:
+        """
+        :return: All metrics in the Prometheus text exposition format.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+    def write_textfile(self, path: str):
+        """
+        Writes all metrics to a file for the node_exporter textfile collector. The file is
+        replaced atomically, so the collector never reads a partial file.
+
+        :param path: The output file path (should end with '.prom').
+        """
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+    def serve(self, host: str = '127.0.0.1', port: int = 9108) -> ThreadingHTTPServer:
+        """
+        Serves the metrics over HTTP (any path) from a background thread.
+
+        :param host: The address to bind to; local-only by default.
+        :param port: The port to listen on (0 picks a free port).
+        :return: The running server; call `shutdown()` to stop it.
+        """
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            """
+            Responds to every GET request with the rendered registry.
+            """
+
+            def do_GET(self):  # pylint: disable=invalid-name
+                body = registry.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+                # Scrapes are frequent; don't write a log line for each of them
+                pass
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+class GameMetrics:
+    """
+    The standard set of game metrics, registered in a MetricsRegistry. Pass an instance to `Game`
+    to have it report rounds, outcomes, completed and failed games, active games and round
+    latency.
+
+    Attributes:
+        registry (MetricsRegistry): The registry holding the metrics.
+    """
+
+    def __init__(self, registry: MetricsRegistry = None):
+        """
+        Registers the game metrics.
+
+        :param registry: The registry to register in; a new one is created if not provided.
+        """
+        self.registry = registry or MetricsRegistry()
+        self.rounds = self.registry.counter(
+            'rps_rounds_total', 'Rounds played.')
+        self.outcomes = self.registry.counter(
+            'rps_round_outcomes_total', 'Round outcomes per chosen weapon.',
+            ('weapon', 'outcome'))
+        self.games_completed = self.registry.counter(
+            'rps_games_completed_total', 'Games played to completion.')
+        self.games_failed = self.registry.counter(
+            'rps_games_failed_total', 'Games that ended with an error.', ('reason',))
+        self.active_games = self.registry.gauge(
+            'rps_active_games', 'Games currently in progress.')
+        self.round_duration = self.registry.histogram(
+            'rps_round_duration_seconds', 'Time taken to play a round.')
+
+    def game_started(self):
+        """
+        Records the start of a game.
+        """
+        self.active_games.inc()
+
+    def game_completed(self):
+        """
+        Records a game that was played to completion.
+        """
+        self.active_games.dec()
+        self.games_completed.inc()
+
+    def game_failed(self, error: Exception, started: bool = True):
+        """
+        Records a game that ended with an error. The failure reason is
+        'max_attempts_exceeded' if the error was caused by a MaxAttemptsExceededError, and the
+        error's class name otherwise.
+
+        :param error: The error that ended the game.
+        :param started: Whether `game_started` was recorded for this game.
+        """
+        if started:
+            self.active_games.dec()
+
+        reason = type(error).__name__
+        cause = error
+        while cause is not None:
+            if isinstance(cause, MaxAttemptsExceededError):
+                reason = 'max_attempts_exceeded'
+                break
+            cause = cause.__cause__
+        if reason == FailedGameException.__name__:
+            reason = 'failed_game'
+        self.games_failed.labels(reason).inc()
+
+    def round_played(self, weapon1: str, weapon2: str, result: int, duration_ns: int):
+        """
+        Records a played round.
+
+        :param weapon1: The first player's weapon (short name).
+        :param weapon2: The second player's weapon (short name).
+        :param result: The round result (0 - tie, 1 - player1 wins, otherwise player2 wins).
+        :param duration_ns: The time taken to play the round, in nanoseconds.
+        """
+        self.rounds.inc()
+        if result == 0:
+            outcome1 = outcome2 = 'tie'
+        elif result == 1:
+            outcome1, outcome2 = 'win', 'loss'
+        else:
+            outcome1, outcome2 = 'loss', 'win'
+        self.outcomes.labels(weapon1, outcome1).inc()
+        self.outcomes.labels(weapon2, outcome2).inc()
+        self.round_duration.observe(duration_ns / 1e9)
@@ -0,0 +1,270 @@
+"""
+This module provides the MonteCarloEngine class, which estimates outcome distributions between
+two strategies by playing a large number of rounds across multiple worker processes.
+
+Workers never send per-round or per-game results back to the parent. Each worker owns one row of a
+`multiprocessing.shared_memory` array and accumulates its outcome counts and per-weapon histograms
+there directly; the parent reduces the rows once all workers have finished.
+"""
+
+import multiprocessing
+import os
+import random
+from multiprocessing import shared_memory
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+from rps.checkpoint import Checkpointer
+from rps.exceptions import CheckpointError, SimulationError
+from rps.rps_logic import RPSLogic
+from rps.strategy import Strategy
+
+# Rounds a worker plays between flushes of its local counts into shared memory
+_FLUSH_EVERY = 1 << 16
+
+
+def _row_layout(num_weapons: int) -> Dict[str, slice]:
+    """
+    Describes the layout of a worker's row in the shared array:
+    the counts of ties / player1 wins / player2 wins, then per player the number of times each
+    weapon was chosen, then per player the number of wins with each weapon.
+
+    :param num_weapons: The number of weapons in the ruleset.
+    :return: The slice of the row holding each section.
+    """
+    n = num_weapons
+    return {
+        'outcomes': slice(0, 3),
+        'choices1': slice(3, 3 + n),
+        'choices2': slice(3 + n, 3 + 2 * n),
+        'wins1': slice(3 + 2 * n, 3 + 3 * n),
+        'wins2': slice(3 + 3 * n, 3 + 4 * n),
+    }
+
+
+def _simulate(rps_logic: RPSLogic, strategy1: Strategy, strategy2: Strategy, num_rounds: int,
+              row: np.ndarray):
+    """
+    Plays rounds between two strategies, accumulating the results into a row of the shared array.
+
+    :param rps_logic: The game logic.
+    :param strategy1: The first player's strategy.
+    :param strategy2: The second player's strategy.
+    :param num_rounds: The number of rounds to play.
+    :param row: The row to accumulate into (see `_row_layout`).
+    """
+    layout = _row_layout(len(rps_logic.options))
+    weapon_ids = rps_logic.weapon_ids
+    # Nested lists index faster than a NumPy matrix for scalar lookups
+    outcome_table = rps_logic.outcome_matrix.tolist()
+    execute1, execute2 = strategy1.execute, strategy2.execute
+
+    remaining = num_rounds
+    while remaining:
+        batch = min(remaining, _FLUSH_EVERY)
+        remaining -= batch
+
+        # Count in local Python lists, then add the batch to shared memory in one vector step
+        outcomes = [0, 0, 0]
+        num_weapons = len(weapon_ids)
+        choices1, choices2 = [0] * num_weapons, [0] * num_weapons
+        wins1, wins2 = [0] * num_weapons, [0] * num_weapons
+        for _ in range(batch):
+            weapon1 = weapon_ids[execute1(rps_logic)]
+            weapon2 = weapon_ids[execute2(rps_logic)]
+            result = outcome_table[weapon1][weapon2]
+            outcomes[result] += 1
+            choices1[weapon1] += 1
+            choices2[weapon2] += 1
+            if result == 1:
+                wins1[weapon1] += 1
+            elif result == 2:
+                wins2[weapon2] += 1
+
+        row[layout['outcomes']] += outcomes
+        row[layout['choices1']] += choices1
+        row[layout['choices2']] += choices2
+        row[layout['wins1']] += wins1
+        row[layout['wins2']] += wins2
+
+
+def _worker(shm_name: str, shape: tuple, worker_index: int, rps_logic: RPSLogic,
+            strategy1_factory: Callable[[], Strategy], strategy2_factory: Callable[[], Strategy],
+            num_rounds: int, seed: str):
+    """
+    Entry point of a worker process: attaches to the shared array and simulates its share of the
+    rounds into its own row.
+
+    :param shm_name: The name of the shared memory block.
+    :param shape: The shape of the shared array (workers x row width).
+    :param worker_index: The row owned by this worker.
+    :param rps_logic: The game logic.
+    :param strategy1_factory: Creates the first player's strategy.
+    :param strategy2_factory: Creates the second player's strategy.
+    :param num_rounds: The number of rounds to play.
+    :param seed: The seed for this worker's random number generators.
+    """
+    # Strategies draw from the global generators, which are per process
+    random.seed(seed)
+    np.random.seed(random.getrandbits(32))
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    counts = np.ndarray(shape, dtype=np.int64, buffer=shm.buf)
+    try:
+        _simulate(rps_logic, strategy1_factory(), strategy2_factory(), num_rounds,
+                  counts[worker_index])
+    finally:
+        del counts  # Release the buffer before closing the shared memory
+        shm.close()
+
+
+class MonteCarloResult:
+    """
+    The aggregated outcome of a Monte Carlo simulation.
+
+    Attributes:
+        rounds (int): The number of rounds played.
+        ties (int): The number of tied rounds.
+        player1_wins (int): The number of rounds won by the first player.
+        player2_wins (int): The number of rounds won by the second player.
+        choices (tuple): Per player, a dictionary of how many times each weapon was chosen.
+        wins (tuple): Per player, a dictionary of how many rounds were won with each weapon.
+    """
+
+    def __init__(self, options, totals: np.ndarray):
+        """
+        :param options: The weapon short names, in id order.
+        :param totals: The reduced row of counts (see `_row_layout`).
+        """
+        layout = _row_layout(len(options))
+        self.ties, self.player1_wins, self.player2_wins = (int(x) for x in totals[0:3])
+        self.rounds = self.ties + self.player1_wins + self.player2_wins
+        self.choices = tuple(dict(zip(options, totals[layout[key]].tolist()))
+                             for key in ('choices1', 'choices2'))
+        self.wins = tuple(dict(zip(options, totals[layout[key]].tolist()))
+                          for key in ('wins1', 'wins2'))
+
+    @property
+    def outcome_rates(self) -> Dict[str, float]:
+        """
+        :return: The fraction of rounds tied, won by player1 and won by player2.
+        """
+        rounds = self.rounds or 1
+        return {'tie': self.ties / rounds, 'player1': self.player1_wins / rounds,
+                'player2': self.player2_wins / rounds}
+
+
+class MonteCarloEngine:
+    """
+    Estimates the outcome distribution of two strategies playing each other, using several worker
+    processes that accumulate results in shared memory.
+
+    Strategies are created inside each worker from the given factories (typically the strategy
+    classes themselves), so they must be picklable, as must the game logic.
+
+    Attributes:
+        rps_logic (RPSLogic): The game logic.
+        strategy1_factory (callable): Creates the first player's strategy.
+        strategy2_factory (callable): Creates the second player's strategy.
+        num_workers (int): The number of worker processes.
+    """
+
+    def __init__(self, rps_logic: RPSLogic, strategy1_factory: Callable[[], Strategy],
+                 strategy2_factory: Callable[[], Strategy], num_workers: int = None):
+        """
+        :param rps_logic: The game logic.
+        :param strategy1_factory: Creates the first player's strategy.
+        :param strategy2_factory: Creates the second player's strategy.
+        :param num_workers: The number of worker processes; defaults to the number of CPUs.
+        """
+        self.rps_logic = rps_logic
+        self.strategy1_factory = strategy1_factory
+        self.strategy2_factory = strategy2_factory
+        self.num_workers = num_workers or os.cpu_count() or 1
+
+    def run(self, num_rounds: int, seed: Optional[int] = None, checkpoint_path: str = None,
+            checkpoint_rounds: int = 10_000_000) -> MonteCarloResult:
+        """
+        Plays the given number of rounds, split evenly across the workers.
+
+        With a checkpoint path, the rounds are played in batches of `checkpoint_rounds`, and the
+        accumulated counts are checkpointed after each batch. Running again with the same path
+        resumes after the last completed batch; the checkpoint is removed once the run completes.
+
+        :param num_rounds: The total number of rounds to play.
+        :param seed: Makes the simulation reproducible for a given number of workers.
+        :param checkpoint_path: Where to write checkpoints; checkpointing is disabled if not given.
+        :param checkpoint_rounds: The number of rounds between checkpoints.
+        :return: The aggregated result.
+        :raises SimulationError: If a worker process fails.
+        :raises CheckpointError: If the checkpoint belongs to a different simulation.
+        """
+        if seed is None:
+            seed = int.from_bytes(os.urandom(8), 'little')
+
+        if checkpoint_path is None:
+            return MonteCarloResult(self.rps_logic.options, self._run_batch(num_rounds, f'{seed}'))
+
+        # Every batch ends with a checkpoint, so the batch size alone sets the interval
+        checkpointer = Checkpointer(checkpoint_path, interval=0)
+        state = checkpointer.load()
+        if state is None:
+            state = {'num_rounds': num_rounds, 'seed': seed, 'rounds_done': 0, 'batches_done': 0,
+                     'totals': np.zeros(3 + 4 * len(self.rps_logic.options), dtype=np.int64)}
+        elif state['num_rounds'] != num_rounds:
+            raise CheckpointError('The checkpoint belongs to a different simulation.')
+
+        while state['rounds_done'] < num_rounds:
+            batch = min(checkpoint_rounds, num_rounds - state['rounds_done'])
+            state['totals'] += self._run_batch(batch, f'{state["seed"]}-b{state["batches_done"]}')
+            state['rounds_done'] += batch
+            state['batches_done'] += 1
+            checkpointer.save(state)
+
+        checkpointer.remove()
+        return MonteCarloResult(self.rps_logic.options, state['totals'])
+
+    def _run_batch(self, num_rounds: int, seed: str) -> np.ndarray:
+        """
+        Plays a number of rounds across the worker processes.
+
+        :param num_rounds: The number of rounds to play.
+        :param seed: The prefix of the workers' seeds.
+        :return: The reduced row of counts (see `_row_layout`).
+        :raises SimulationError: If a worker process fails.
+        """
+        num_workers = max(1, min(self.num_workers, num_rounds))
+        row_width = 3 + 4 * len(self.rps_logic.options)
+        shape = (num_workers, row_width)
+
+        shm = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)) * 8)
+        counts = np.ndarray(shape, dtype=np.int64, buffer=shm.buf)
+        try:
+            counts[:] = 0
+
+            share, extra = divmod(num_rounds, num_workers)
+            processes = [
+                multiprocessing.Process(
+                    target=_worker,
+                    args=(shm.name, shape, index, self.rps_logic, self.strategy1_factory,
+                          self.strategy2_factory, share + (index < extra), f'{seed}-{index}'),
+                    daemon=True)
+                for index in range(num_workers)
+            ]
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join()
+
+            failed = [process.exitcode for process in processes if process.exitcode != 0]
+            if failed:
+                raise SimulationError(f'{len(failed)} of {num_workers} workers failed '
+                                      f'(exit codes {failed})')
+
+            # The only reduction: one vector sum over the workers' rows
+            return counts.sum(axis=0)
+        finally:
+            del counts  # Release the buffer before closing the shared memory
+            shm.close()
+            shm.unlink()
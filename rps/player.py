@@ -41,6 +41,23 @@ class Player(ABC):
         """
         return self.strategy.execute(self.rps_logic)
 
+    def get_state(self) -> dict:
+        """
+        Returns the player's state, for checkpointing.
+
+        :return: The player's score and the state of their strategy.
+        """
+        return {'score': self.score, 'strategy': self.strategy.get_state()}
+
+    def set_state(self, state: dict):
+        """
+        Restores a state previously returned by `get_state`.
+
+        :param state: The state to restore.
+        """
+        self.score = state['score']
+        self.strategy.set_state(state['strategy'])
+
 
 class HumanPlayer(Player):
     """
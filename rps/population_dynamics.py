@@ -0,0 +1,459 @@
+"""
+This module simulates how a population of mixed strategies evolves under the game's payoffs, for
+thousands of strategy types at once.
+
+Every strategy type plays a fixed distribution over the weapons (see
+`Strategy.move_distribution`), so, stacking the distributions as the rows of P and with M the
+ruleset's payoff matrix, the expected payoffs of all types against a population with type shares x
+are P·(M·(Pᵀ·x)). Time steps are a few such matrix-vector products, and never form the
+(types × types) cross-table.
+
+Two dynamics are provided:
+
+    ReplicatorDynamics  An infinite population, whose shares follow the replicator equation
+                        dxᵢ/dt = xᵢ·(fᵢ - x·f). It is integrated with Heun's method, with an
+                        adaptive step size: the difference between the Euler and Heun estimates
+                        bounds the step's error, and the step grows or shrinks to keep it within
+                        the tolerance.
+    MoranProcess        A finite population of individuals. In each birth-death event, an
+                        individual chosen in proportion to its fitness reproduces, and one chosen
+                        uniformly at random dies. Events are simulated in leaps: the fitnesses are
+                        held for as many events as keeps the expected relative change of any
+                        type's share within the tolerance, so near-neutral populations take large
+                        leaps; a tolerance of 0 simulates events one at a time, exactly.
+
+Time is counted in generations: one unit of the replicator equation, or as many Moran events as
+there are individuals. Population snapshots can be streamed to a compact snapshot file (see
+`SnapshotWriter`), which `read_snapshots` maps into memory without copying.
+"""
+
+import json
+import mmap
+import struct
+import time
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+from rps.exceptions import ConfigurationError
+from rps.game_runner import StrategyFactory
+from rps.rps_logic import RPSLogic
+from rps.ruleset_analysis import payoff_matrix
+
+SNAPSHOT_MAGIC = b'RPSPOP01'
+SNAPSHOT_VERSION = 1
+# magic, version, reserved, number of types, name table length, records offset
+_SNAPSHOT_HEADER = struct.Struct('<8sHHIQQ')
+_RECORD_ALIGNMENT = 8
+
+
+def snapshot_dtype(num_types: int) -> np.dtype:
+    """
+    :param num_types: The number of strategy types.
+    :return: The dtype of a snapshot record: the time in generations, and each type's share of
+     the population.
+    """
+    return np.dtype([('time', '<f8'), ('shares', '<f4', (num_types,))])
+
+
+class SnapshotWriter:
+    """
+    Streams population snapshots to a snapshot file: a header, the type names as UTF-8 JSON, then
+    one fixed-size record per snapshot (see `snapshot_dtype`). Records are appended as they are
+    written, so the file can be read while the simulation runs.
+
+    Use as a context manager.
+
+    Attributes:
+        path (str): The file written.
+        num_types (int): The number of strategy types.
+        records (int): The number of snapshots written.
+    """
+
+    def __init__(self, path: str, names: Sequence[str]):
+        """
+        Writes the header and the name table.
+
+        :param path: The file to write.
+        :param names: The strategy types' names.
+        """
+        self.path = path
+        self.num_types = len(names)
+        self.records = 0
+        self._dtype = snapshot_dtype(self.num_types)
+
+        table = json.dumps(list(names), ensure_ascii=False).encode('utf-8')
+        offset = -(-(_SNAPSHOT_HEADER.size + len(table)) // _RECORD_ALIGNMENT) * _RECORD_ALIGNMENT
+        self._file = open(path, 'wb')
+        self._file.write(_SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, 0, self.num_types,
+                                               len(table), offset))
+        self._file.write(table.ljust(offset - _SNAPSHOT_HEADER.size, b' '))
+
+    def write(self, generation: float, shares: np.ndarray):
+        """
+        Appends a snapshot.
+
+        :param generation: The population's time, in generations.
+        :param shares: Each type's share of the population.
+        """
+        record = np.empty(1, dtype=self._dtype)
+        record['time'] = generation
+        record['shares'] = shares
+        self._file.write(record.tobytes())
+        self.records += 1
+
+    def flush(self):
+        """
+        Makes the snapshots written so far visible to readers.
+        """
+        self._file.flush()
+
+    def close(self):
+        """
+        Closes the file.
+        """
+        self._file.close()
+
+    def __enter__(self) -> 'SnapshotWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class Snapshots(NamedTuple):
+    """
+    The snapshots of a snapshot file.
+
+    Attributes:
+        names (tuple): The strategy types' names.
+        times (np.ndarray): The time of each snapshot, in generations.
+        shares (np.ndarray): The shares of the population, of shape (snapshots, types).
+    """
+    names: Tuple[str, ...]
+    times: np.ndarray
+    shares: np.ndarray
+
+
+def read_snapshots(path: str) -> Snapshots:
+    """
+    Reads a snapshot file, returning read-only views of the memory-mapped file. A file still being
+    written is read up to its last complete snapshot.
+
+    :param path: The snapshot file.
+    :return: The snapshots.
+    :raises ConfigurationError: If the file is not a snapshot file.
+    """
+    with open(path, 'rb') as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as e:  # Empty file
+            raise ConfigurationError(f'{path}: not a snapshot file') from e
+
+    if len(mapped) < _SNAPSHOT_HEADER.size:
+        raise ConfigurationError(f'{path}: truncated header')
+    magic, version, _, num_types, table_length, offset = _SNAPSHOT_HEADER.unpack_from(mapped)
+    if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+        raise ConfigurationError(f'{path}: not a snapshot file of version {SNAPSHOT_VERSION}')
+    try:
+        names = tuple(json.loads(mapped[_SNAPSHOT_HEADER.size:_SNAPSHOT_HEADER.size +
+                                        table_length]))
+    except ValueError as e:
+        raise ConfigurationError(f'{path}: invalid name table ({e})') from e
+    if len(names) != num_types:
+        raise ConfigurationError(f'{path}: {len(names)} names for {num_types} types')
+
+    dtype = snapshot_dtype(num_types)
+    count = max(len(mapped) - offset, 0) // dtype.itemsize
+    records = np.frombuffer(mapped, dtype=dtype, count=count, offset=min(offset, len(mapped)))
+    return Snapshots(names, records['time'], records['shares'])
+
+
+class DynamicsReport(NamedTuple):
+    """
+    The outcome of a simulation run.
+
+    Attributes:
+        generations (float): The time simulated, in generations.
+        steps (int): The number of steps (replicator) or leaps (Moran) taken.
+        rejected_steps (int): The number of steps rejected for exceeding the tolerance.
+        seconds (float): The simulation time.
+        generations_per_second (float): The simulation throughput.
+    """
+    generations: float
+    steps: int
+    rejected_steps: int
+    seconds: float
+    generations_per_second: float
+
+
+def strategy_distributions(rps_logic: RPSLogic, strategy_factories: Dict[str, StrategyFactory]
+                           ) -> Tuple[List[str], np.ndarray]:
+    """
+    :param rps_logic: The game logic.
+    :param strategy_factories: Maps each strategy's name to a callable creating an instance.
+    :return: The strategies' names, and their move distributions as rows.
+    :raises ValueError: If a strategy declares no move distribution.
+    """
+    names = list(strategy_factories)
+    distributions = []
+    for name in names:
+        distribution = strategy_factories[name]().move_distribution(rps_logic)
+        if distribution is None:
+            raise ValueError(f'{name} does not declare a move distribution.')
+        distributions.append(distribution)
+    return names, np.array(distributions, dtype=float).reshape(len(names), -1)
+
+
+class _PopulationDynamics:
+    """
+    The payoffs of a population of strategy types, shared by the dynamics.
+
+    Attributes:
+        names (tuple): The strategy types' names.
+        distributions (np.ndarray): Each type's move distribution, of shape (types, weapons).
+        generation (float): The population's time, in generations.
+    """
+
+    def __init__(self, rps_logic: RPSLogic, distributions: np.ndarray, names: Sequence[str] = None):
+        """
+        :param rps_logic: The game logic.
+        :param distributions: Each type's probability of each weapon id, of shape (types, weapons).
+        :param names: The types' names; numbered if not provided.
+        :raises ValueError: If a row is not a probability distribution over the ruleset's weapons.
+        """
+        distributions = np.asarray(distributions, dtype=float)
+        num_weapons = len(rps_logic.options)
+        if distributions.ndim != 2 or distributions.shape[1] != num_weapons:
+            raise ValueError(f'Distributions must have one column per weapon ({num_weapons}).')
+        invalid = (distributions < 0).any(axis=1) | ~np.isclose(distributions.sum(axis=1), 1.0)
+        if invalid.any():
+            raise ValueError(f'Type {np.flatnonzero(invalid)[0]} is not a probability '
+                             f'distribution over the weapons.')
+        self.names = tuple(names) if names is not None else tuple(
+            f'type{index}' for index in range(len(distributions)))
+        if len(self.names) != len(distributions):
+            raise ValueError(f'{len(self.names)} names for {len(distributions)} types.')
+        self.distributions = distributions
+        self._payoffs = payoff_matrix(rps_logic)
+        self.generation = 0.0
+
+    @classmethod
+    def from_strategies(cls, rps_logic: RPSLogic, strategy_factories: Dict[str, StrategyFactory],
+                        **kwargs):
+        """
+        :param rps_logic: The game logic.
+        :param strategy_factories: Maps each strategy's name to a callable creating an instance;
+         every strategy must declare its move distribution.
+        :param kwargs: The dynamics' other arguments.
+        :return: The dynamics of a population of the strategies.
+        """
+        names, distributions = strategy_distributions(rps_logic, strategy_factories)
+        return cls(rps_logic, distributions, names=names, **kwargs)
+
+    def payoffs(self, shares: np.ndarray) -> np.ndarray:
+        """
+        :param shares: Each type's share of the population.
+        :return: Each type's expected payoff per round against the population.
+        """
+        return self.distributions @ (self._payoffs @ (self.distributions.T @ shares))
+
+    @staticmethod
+    def _initial_shares(initial, num_types: int) -> np.ndarray:
+        shares = np.full(num_types, 1.0 / num_types) if initial is None else np.array(
+            initial, dtype=float)
+        if shares.shape != (num_types,) or (shares < 0).any() or not shares.sum() > 0:
+            raise ValueError('The initial population must hold a non-negative amount of each '
+                             'type.')
+        return shares / shares.sum()
+
+
+class ReplicatorDynamics(_PopulationDynamics):
+    """
+    The replicator dynamics of an infinite population, integrated with adaptive steps.
+
+    Attributes:
+        shares (np.ndarray): Each type's share of the population.
+        step_size (float): The size of the next step, in generations.
+        tolerance (float): The largest error allowed in any share per step.
+    """
+
+    def __init__(self, rps_logic: RPSLogic, distributions: np.ndarray, names: Sequence[str] = None,
+                 initial: Sequence[float] = None, tolerance: float = 1e-6,
+                 step_size: float = 0.01, max_step_size: float = 1.0):
+        """
+        :param rps_logic: The game logic.
+        :param distributions: Each type's probability of each weapon id, of shape (types, weapons).
+        :param names: The types' names; numbered if not provided.
+        :param initial: Each type's initial share, normalized; uniform if not provided.
+        :param tolerance: The largest error allowed in any share per step.
+        :param step_size: The size of the first step, in generations.
+        :param max_step_size: The largest step size, in generations.
+        :raises ValueError: If the distributions or the initial population are invalid.
+        """
+        super().__init__(rps_logic, distributions, names)
+        self.shares = self._initial_shares(initial, len(self.names))
+        self.tolerance = tolerance
+        self.step_size = step_size
+        self.max_step_size = max_step_size
+
+    def velocity(self, shares: np.ndarray) -> np.ndarray:
+        """
+        :param shares: Each type's share of the population.
+        :return: The rate of change of each share.
+        """
+        fitness = self.payoffs(shares)
+        return shares * (fitness - shares @ fitness)
+
+    def run(self, generations: float, writer: SnapshotWriter = None,
+            snapshot_interval: float = 1.0) -> DynamicsReport:
+        """
+        Integrates the replicator equation over `generations`.
+
+        :param generations: The time to simulate, in generations.
+        :param writer: If provided, snapshots are written to it every `snapshot_interval`
+         generations and at the end of the run, and at the start if it is empty.
+        :param snapshot_interval: The time between snapshots, in generations.
+        :return: The run's report.
+        """
+        shares, step_size = self.shares, self.step_size
+        end = self.generation + generations
+        next_snapshot = min(self.generation + snapshot_interval, end) if writer else end
+        if writer is not None and not writer.records:
+            writer.write(self.generation, shares)
+        steps = rejected = 0
+        start = time.perf_counter()
+        while self.generation < end:
+            # Land exactly on snapshot times and on the end
+            h = min(step_size, self.max_step_size, next_snapshot - self.generation)
+            slope = self.velocity(shares)
+            euler = shares + h * slope
+            heun = shares + 0.5 * h * (slope + self.velocity(euler))
+            error = float(np.abs(heun - euler).max())
+            if error > self.tolerance or heun.min() < -self.tolerance:
+                step_size = h * max(0.2, 0.9 * (self.tolerance / error) ** 0.5) \
+                    if error > self.tolerance else 0.5 * h
+                rejected += 1
+                continue
+            step_size = h * min(2.0, 0.9 * (self.tolerance / error) ** 0.5) \
+                if error > 0 else 2.0 * h
+
+            shares = np.maximum(heun, 0.0)
+            shares /= shares.sum()
+            self.generation += h
+            steps += 1
+            if self.generation >= next_snapshot - 1e-12:
+                self.generation = next_snapshot
+                if writer is not None:
+                    writer.write(self.generation, shares)
+                    next_snapshot = min(next_snapshot + snapshot_interval, end)
+        seconds = time.perf_counter() - start
+        self.shares, self.step_size = shares, step_size
+        return DynamicsReport(generations, steps, rejected, seconds,
+                              generations / seconds if seconds > 0 else float('inf'))
+
+
+class MoranProcess(_PopulationDynamics):
+    """
+    The Moran process of a finite population, simulated in leaps of birth-death events.
+
+    An individual's fitness is exp(selection × its expected payoff against the population, itself
+    included), so it is always positive, and selection 0 is neutral drift.
+
+    Attributes:
+        counts (np.ndarray): The number of individuals of each type.
+        population_size (int): The number of individuals.
+        selection (float): The intensity of selection.
+        tolerance (float): The largest expected relative change of a type's share per leap,
+         from selection; 0 simulates one event at a time.
+    """
+
+    def __init__(self, rps_logic: RPSLogic, distributions: np.ndarray, population_size: int,
+                 names: Sequence[str] = None, initial: Sequence[float] = None,
+                 selection: float = 1.0, tolerance: float = 0.01, seed: int = None):
+        """
+        :param rps_logic: The game logic.
+        :param distributions: Each type's probability of each weapon id, of shape (types, weapons).
+        :param population_size: The number of individuals.
+        :param names: The types' names; numbered if not provided.
+        :param initial: Each type's initial share, normalized and rounded to whole individuals;
+         uniform if not provided.
+        :param selection: The intensity of selection.
+        :param tolerance: The largest expected relative change of a type's share per leap, from
+         selection; 0 simulates one event at a time.
+        :param seed: Seeds the process's random number generator.
+        :raises ValueError: If the distributions or the initial population are invalid.
+        """
+        super().__init__(rps_logic, distributions, names)
+        if population_size < 1:
+            raise ValueError('The population needs at least one individual.')
+        self.population_size = population_size
+        self.selection = selection
+        self.tolerance = tolerance
+        self._rng = np.random.default_rng(seed)
+
+        # Round the initial shares to whole individuals, largest remainders first
+        exact = self._initial_shares(initial, len(self.names)) * population_size
+        counts = np.floor(exact).astype(np.int64)
+        remainder = population_size - int(counts.sum())
+        counts[np.argsort(counts - exact, kind='stable')[:remainder]] += 1
+        self.counts = counts
+
+    @property
+    def shares(self) -> np.ndarray:
+        """
+        :return: Each type's share of the population.
+        """
+        return self.counts / self.population_size
+
+    def run(self, generations: float, writer: SnapshotWriter = None,
+            snapshot_interval: float = 1.0) -> DynamicsReport:
+        """
+        Simulates `generations` × population size birth-death events.
+
+        :param generations: The time to simulate, in generations.
+        :param writer: If provided, snapshots are written to it every `snapshot_interval`
+         generations and at the end of the run, and at the start if it is empty.
+        :param snapshot_interval: The time between snapshots, in generations.
+        :return: The run's report.
+        """
+        size, rng = self.population_size, self._rng
+        counts = self.counts
+        events_left = int(round(generations * size))
+        interval_events = max(1, int(round(snapshot_interval * size))) if writer else events_left
+        # Capped at the events left, so the run's final state is written too
+        until_snapshot = min(interval_events, events_left)
+        if writer is not None and not writer.records:
+            writer.write(self.generation, counts / size)
+        events = leaps = 0
+        start = time.perf_counter()
+        while events_left > 0:
+            fitness = np.exp(self.selection * self.payoffs(counts / size))
+            births = counts * fitness
+            # A type's share changes by about (fitnessᵢ / mean fitness - 1) of itself per
+            # generation
+            drift = float(np.abs(fitness[counts > 0] / (births.sum() / size) - 1.0).max())
+            if not self.tolerance:
+                leap = 1
+            else:
+                leap = max(1, int(self.tolerance * size / drift)) if drift > 0 else size
+            # At most a generation per leap, as no more individuals than there are can die
+            leap = min(leap, size, events_left, until_snapshot)
+
+            # Deaths are drawn from the individuals alive at the start of the leap, so no count
+            # goes negative
+            counts = (counts + rng.multinomial(leap, births / births.sum())
+                      - rng.multivariate_hypergeometric(counts, leap, method='marginals'))
+            events += leap
+            events_left -= leap
+            until_snapshot -= leap
+            leaps += 1
+            if until_snapshot == 0:
+                until_snapshot = min(interval_events, events_left)
+                if writer is not None:
+                    writer.write(self.generation + events / size, counts / size)
+        seconds = time.perf_counter() - start
+        self.counts = counts
+        self.generation += events / size
+        return DynamicsReport(events / size, leaps, 0, seconds,
+                              events / size / seconds if seconds > 0 else float('inf'))
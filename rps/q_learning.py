@@ -0,0 +1,279 @@
+"""
+This module trains Rock-Paper-Scissors bots by tabular Q-learning, stepping thousands of
+independent environments in lockstep as NumPy arrays.
+
+Each environment is a game against a fixed opponent. Its state is the context of the last few
+rounds (both players' moves), actions are weapon ids, and rewards come from the ruleset's outcome
+matrix: 1 for a win, 0 for a tie and -1 for a loss. All environments share one Q-table; every step
+updates it once with the average temporal-difference error of each (state, action) pair visited,
+so the environments act as one large minibatch.
+
+The learned table is exported as a QTableStrategy, which plays greedily from it in ordinary games.
+"""
+
+import time
+from typing import NamedTuple, Sequence
+
+import numpy as np
+
+from rps.exceptions import ConfigurationError
+from rps.rps_logic import RPSLogic
+from rps.ruleset_analysis import payoff_matrix
+from rps.strategy import Strategy
+
+
+class UniformOpponent:
+    """
+    An opponent choosing uniformly at random, like RandomStrategy.
+    """
+
+    def moves(self, rng: np.random.Generator, step: int, num_envs: int,
+              num_weapons: int) -> np.ndarray:
+        """
+        :param rng: The trainer's random number generator.
+        :param step: The step number.
+        :param num_envs: The number of environments.
+        :param num_weapons: The number of weapons.
+        :return: The opponent's weapon id in each environment.
+        """
+        return rng.integers(num_weapons, size=num_envs)
+
+
+class StationaryOpponent:
+    """
+    An opponent playing each weapon with a fixed probability.
+    """
+
+    def __init__(self, probabilities: Sequence[float]):
+        """
+        :param probabilities: The probability of each weapon id.
+        """
+        cumulative = np.cumsum(probabilities, dtype=float)
+        self._cumulative = cumulative / cumulative[-1]
+
+    def moves(self, rng: np.random.Generator, step: int, num_envs: int,
+              num_weapons: int) -> np.ndarray:
+        """
+        See `UniformOpponent.moves`.
+        """
+        choices = np.searchsorted(self._cumulative, rng.random(num_envs), side='right')
+        return np.minimum(choices, num_weapons - 1)
+
+
+class RecordedOpponent:
+    """
+    An opponent replaying recorded moves, e.g. a human's. Each environment replays the recording
+    cyclically from its own random starting point.
+    """
+
+    def __init__(self, moves: Sequence[int]):
+        """
+        :param moves: The recorded weapon ids, in the order they were played.
+        :raises ValueError: If the recording is empty.
+        """
+        self._moves = np.asarray(moves, dtype=np.intp)
+        if not len(self._moves):
+            raise ValueError('The recording is empty.')
+        self._offsets: np.ndarray = None
+
+    @classmethod
+    def from_names(cls, rps_logic: RPSLogic, moves: Sequence[str]) -> 'RecordedOpponent':
+        """
+        :param rps_logic: The game logic.
+        :param moves: The recorded weapons' short names.
+        :return: An opponent replaying the moves.
+        """
+        return cls([rps_logic.weapon_ids[move] for move in moves])
+
+    def moves(self, rng: np.random.Generator, step: int, num_envs: int,
+              num_weapons: int) -> np.ndarray:
+        """
+        See `UniformOpponent.moves`.
+        """
+        if self._offsets is None or len(self._offsets) != num_envs:
+            self._offsets = rng.integers(len(self._moves), size=num_envs)
+        return self._moves[(self._offsets + step) % len(self._moves)]
+
+
+class TrainingReport(NamedTuple):
+    """
+    The outcome of a training run.
+
+    Attributes:
+        steps (int): The number of lockstep steps.
+        env_steps (int): The number of environment steps (steps times environments).
+        seconds (float): The training time.
+        env_steps_per_second (float): The training throughput.
+        mean_reward (float): The average reward per environment step, in [-1, 1].
+    """
+    steps: int
+    env_steps: int
+    seconds: float
+    env_steps_per_second: float
+    mean_reward: float
+
+
+class QLearningTrainer:
+    """
+    Trains a Q-table against an opponent in many parallel environments.
+
+    Attributes:
+        rps_logic (RPSLogic): The game logic.
+        num_envs (int): The number of environments stepped in lockstep.
+        context_length (int): The number of past rounds making up a state.
+        num_states (int): The number of states: every combination of both players' moves in the
+         last `context_length` rounds.
+        q_table (np.ndarray): The action values, of shape (num_states, number of weapons).
+    """
+
+    def __init__(self, rps_logic: RPSLogic, opponent=None, num_envs: int = 4096,
+                 context_length: int = 1, learning_rate: float = 0.1, discount: float = 0.9,
+                 epsilon: float = 0.1, seed: int = None):
+        """
+        :param rps_logic: The game logic.
+        :param opponent: The opponent model (see `UniformOpponent`); uniformly random if not
+         provided.
+        :param num_envs: The number of environments stepped in lockstep.
+        :param context_length: The number of past rounds making up a state.
+        :param learning_rate: The step size of the Q-value updates.
+        :param discount: The discount factor of future rewards.
+        :param epsilon: The probability of exploring a random action.
+        :param seed: Seeds the trainer's random number generator.
+        """
+        self.rps_logic = rps_logic
+        self.opponent = opponent or UniformOpponent()
+        self.num_envs = num_envs
+        self.context_length = context_length
+        self.learning_rate = learning_rate
+        self.discount = discount
+        self.epsilon = epsilon
+
+        num_weapons = len(rps_logic.options)
+        self._symbols = num_weapons * num_weapons  # A round's (opponent, own) moves
+        self.num_states = self._symbols ** context_length
+        self.q_table = np.zeros((self.num_states, num_weapons))
+        self._rewards = payoff_matrix(rps_logic)
+        self._rng = np.random.default_rng(seed)
+        self._states = np.zeros(num_envs, dtype=np.intp)
+        self._steps = 0
+
+    def train(self, steps: int) -> TrainingReport:
+        """
+        Steps all environments `steps` times, updating the Q-table after each step.
+
+        :param steps: The number of lockstep steps.
+        :return: The training report.
+        """
+        num_envs, num_weapons = self.num_envs, len(self.rps_logic.options)
+        q_table, rng = self.q_table, self._rng
+        q_values = q_table.reshape(-1)
+        states = self._states
+        total_reward = 0.0
+        start = time.perf_counter()
+        for _ in range(steps):
+            # Epsilon-greedy actions
+            actions = q_table[states].argmax(axis=1)
+            explore = rng.random(num_envs) < self.epsilon
+            actions[explore] = rng.integers(num_weapons, size=int(explore.sum()))
+
+            opponent_moves = self.opponent.moves(rng, self._steps, num_envs, num_weapons)
+            rewards = self._rewards[actions, opponent_moves]
+            total_reward += rewards.sum()
+            next_states = ((states * self._symbols + opponent_moves * num_weapons + actions)
+                           % self.num_states)
+
+            # Average the temporal-difference errors of each visited (state, action) pair, so
+            # environments sharing a pair don't overwrite each other's updates
+            cells = states * num_weapons + actions
+            errors = rewards + self.discount * q_table[next_states].max(axis=1) - q_values[cells]
+            error_sums = np.bincount(cells, weights=errors, minlength=q_values.size)
+            visits = np.bincount(cells, minlength=q_values.size)
+            visited = visits > 0
+            q_values[visited] += self.learning_rate * error_sums[visited] / visits[visited]
+
+            states = next_states
+            self._steps += 1
+        seconds = time.perf_counter() - start
+        self._states = states
+
+        env_steps = steps * num_envs
+        return TrainingReport(steps, env_steps, seconds,
+                              env_steps / seconds if seconds > 0 else float('inf'),
+                              float(total_reward) / env_steps if env_steps else 0.0)
+
+    def strategy(self) -> 'QTableStrategy':
+        """
+        :return: A strategy playing greedily from a copy of the current Q-table.
+        """
+        return QTableStrategy(self.q_table.copy(), self.context_length, self.rps_logic.options)
+
+    def save(self, path: str):
+        """
+        Saves the Q-table, loadable with `QTableStrategy.load`.
+
+        :param path: The file to write (NumPy .npz), used as given.
+        """
+        self.strategy().save(path)
+
+
+class QTableStrategy(Strategy):
+    """
+    A strategy playing the action with the highest value in a learned Q-table, in the state given by
+    the game's last rounds. The game's round history must be attached (see
+    `Strategy.attach_history`); before `context_length` rounds are played, missing rounds count
+    as both players having played the first weapon, as in training.
+
+    Attributes:
+        q_table (np.ndarray): The action values, of shape (number of states, number of weapons).
+        context_length (int): The number of past rounds making up a state.
+        options (tuple): The weapon short names the table was trained with, in id order.
+    """
+    uses_history = True
+
+    def __init__(self, q_table: np.ndarray, context_length: int, options: Sequence[str]):
+        """
+        :param q_table: The action values.
+        :param context_length: The number of past rounds making up a state.
+        :param options: The weapon short names the table was trained with, in id order.
+        """
+        super().__init__('Q-Table')
+        self.q_table = q_table
+        self.context_length = context_length
+        self.options = tuple(options)
+        # The greedy action of each state
+        self._policy = q_table.argmax(axis=1).tolist()
+
+    @classmethod
+    def load(cls, path: str) -> 'QTableStrategy':
+        """
+        :param path: A file written by `save`.
+        :return: The strategy.
+        """
+        with np.load(path) as data:
+            return cls(data['q_table'], int(data['context_length']), data['options'].tolist())
+
+    def save(self, path: str):
+        """
+        :param path: The file to write (NumPy .npz), used as given.
+        """
+        # Written through a file object, as np.savez would otherwise add a missing .npz suffix
+        with open(path, 'wb') as f:
+            np.savez(f, q_table=self.q_table, context_length=self.context_length,
+                     options=np.array(self.options))
+
+    def execute(self, game_logic: RPSLogic) -> str:
+        """
+        :param game_logic: The game logic.
+        :return: The greedy action's weapon short name.
+        :raises ConfigurationError: If the game's weapons differ from the trained ones.
+        """
+        if game_logic.options != self.options:
+            raise ConfigurationError('The Q-table was trained with a different ruleset.')
+        num_weapons = len(self.options)
+        state = 0
+        if self.history is not None:
+            opponent_moves = self.history.moves(3 - self.seat, self.context_length).tolist()
+            own_moves = self.history.moves(self.seat, self.context_length).tolist()
+            for opponent, own in zip(opponent_moves, own_moves):
+                state = state * num_weapons * num_weapons + opponent * num_weapons + own
+        return self.options[self._policy[state]]
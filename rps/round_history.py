@@ -0,0 +1,144 @@
+"""
+This module provides the RoundHistory class, a fixed-capacity record of a game's most recent rounds
+that the game maintains and shares with history-aware strategies.
+
+Rounds are stored as weapon ids and results in typed arrays of twice the capacity, so memory stays
+constant however long a game runs. Rounds are appended one after the other; when the arrays are
+full, the most recent `capacity` rounds are moved back to the start in one block copy, which costs
+O(1) per round amortized. The last `k` rounds are therefore always one contiguous slice, and
+windows are NumPy views of the arrays rather than copies.
+"""
+
+from array import array
+from typing import Tuple
+
+import numpy as np
+
+
+class RoundHistory:
+    """
+    The most recent rounds of a game, as a bounded buffer of weapon ids (see `RPSLogic.weapon_ids`)
+    and round results (see `RPSLogic.compare`).
+
+    Windows returned by `moves`, `results` and `window` are read-only views: they are not copied,
+    and they may change as new rounds are recorded, so they should not be kept across rounds.
+
+    Attributes:
+        capacity (int): The number of most recent rounds retained.
+        total (int): The number of rounds recorded since the history was created or cleared.
+    """
+
+    def __init__(self, capacity: int = 1024, num_weapons: int = 256):
+        """
+        :param capacity: The number of most recent rounds retained.
+        :param num_weapons: The number of weapons in the ruleset, which decides the width of the
+         stored weapon ids.
+        :raises ValueError: If the capacity is not positive.
+        """
+        if capacity <= 0:
+            raise ValueError('The capacity must be positive.')
+        self.capacity = capacity
+        self.total = 0
+        self._end = 0  # The index after the most recent round
+
+        typecode = 'B' if num_weapons <= 1 << 8 else 'H'
+        self._moves1 = array(typecode, bytes(2 * capacity * array(typecode).itemsize))
+        self._moves2 = array(typecode, bytes(2 * capacity * array(typecode).itemsize))
+        self._results = array('B', bytes(2 * capacity))
+
+        # NumPy views of the arrays, which never resize: writable ones for moving rounds back,
+        # and read-only ones for windows
+        self._buffers = tuple(np.frombuffer(values, dtype=np.uint8 if values.typecode == 'B'
+                                            else np.uint16)
+                              for values in (self._moves1, self._moves2, self._results))
+        self._views = tuple(buffer.view() for buffer in self._buffers)
+        for view in self._views:
+            view.setflags(write=False)
+
+    def append(self, weapon1: int, weapon2: int, result: int):
+        """
+        Records a round, dropping the oldest one once the history is full.
+
+        :param weapon1: The first player's weapon id.
+        :param weapon2: The second player's weapon id.
+        :param result: The round's result (0 - tie, 1 - player1 wins, 2 - player2 wins).
+        """
+        end = self._end
+        if end == 2 * self.capacity:
+            # Move the retained rounds back to the start, making room for `capacity` more
+            for buffer in self._buffers:
+                buffer[:self.capacity] = buffer[self.capacity:]
+            end = self.capacity
+        self._moves1[end] = weapon1
+        self._moves2[end] = weapon2
+        self._results[end] = result
+        self._end = end + 1
+        self.total += 1
+
+    def window(self, k: int = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        :param k: The number of rounds; all retained rounds if not provided or larger.
+        :return: Views of the first player's weapon ids, the second player's weapon ids and the
+         results of the last `k` rounds, oldest first.
+        """
+        end = self._end
+        start = end - self._length(k)
+        moves1, moves2, results = self._views
+        return moves1[start:end], moves2[start:end], results[start:end]
+
+    def moves(self, seat: int, k: int = None) -> np.ndarray:
+        """
+        :param seat: The player: 1 for the first player, 2 for the second.
+        :param k: The number of rounds; all retained rounds if not provided or larger.
+        :return: A view of the player's weapon ids in the last `k` rounds, oldest first.
+        """
+        end = self._end
+        return self._views[seat - 1][end - self._length(k):end]
+
+    def results(self, k: int = None) -> np.ndarray:
+        """
+        :param k: The number of rounds; all retained rounds if not provided or larger.
+        :return: A view of the results of the last `k` rounds, oldest first.
+        """
+        end = self._end
+        return self._views[2][end - self._length(k):end]
+
+    def clear(self):
+        """
+        Forgets all recorded rounds.
+        """
+        self.total = 0
+        self._end = 0
+
+    def __len__(self) -> int:
+        return min(self._end, self.capacity)
+
+    def get_state(self) -> dict:
+        """
+        :return: The retained rounds, as a picklable dictionary that `set_state` can restore.
+        """
+        moves1, moves2, results = self.window()
+        return {'total': self.total, 'moves1': moves1.tobytes(), 'moves2': moves2.tobytes(),
+                'results': results.tobytes()}
+
+    def set_state(self, state: dict):
+        """
+        Restores the rounds of a state returned by `get_state`; rounds beyond this history's
+        capacity are dropped, oldest first.
+
+        :param state: The state to restore.
+        """
+        self.clear()
+        moves1, moves2, results = (np.frombuffer(state[key], dtype=view.dtype)
+                                   for key, view in zip(('moves1', 'moves2', 'results'),
+                                                        self._views))
+        for weapon1, weapon2, result in zip(moves1.tolist(), moves2.tolist(), results.tolist()):
+            self.append(weapon1, weapon2, result)
+        self.total = max(state['total'], self.total)
+
+    def _length(self, k: int = None) -> int:
+        """
+        :return: The number of rounds a window of `k` rounds spans.
+        """
+        length = min(self._end, self.capacity)
+        return length if k is None or k > length else max(k, 0)
@@ -5,11 +5,27 @@ a Rock-Paper-Scissors-like game.
 
 import json
 import os
+from types import MappingProxyType
+
+import numpy as np
 import pandas as pd
 
 from rps.exceptions import ConfigurationError
+from rps.input_matcher import InputMatcher
+from rps.ruleset_format import read_binary_ruleset
 from rps.verify_input_files import (
-    validate_config_files_input)
+    validate_config_files_input, validate_short_names)
+
+# Paths to the input files for weapon names and their relationships
+# Resolve paths relative to this file so the module works regardless of
+# the current working directory
+_DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+DEFAULT_SHORT_NAMES_PATH = os.path.join(_DATA_DIR, 'short_names.json')
+DEFAULT_RELATIONSHIP_PATH = os.path.join(_DATA_DIR, 'relationship.csv')
+
+# Rulesets up to this size also compile nested dictionaries of outcomes, the fastest lookup by name;
+# larger ones look outcomes up in the outcome matrix
+_OUTCOME_DICT_MAX_WEAPONS = 256
 
 
 class RPSLogic:
@@ -17,43 +33,187 @@ class RPSLogic:
     Represents the logic for a Rock-Paper-Scissors-like game, including the loading
     of weapon names and their relationships (which weapons beat others).
 
+    An RPSLogic is immutable once constructed: its collections are tuples, read-only mappings and
+    a read-only array, and its attributes cannot be reassigned. A single instance can therefore be
+    shared by any number of games and threads without locking.
+
     Attributes:
-        names_tuples (list): A list of tuples with short names and full names of weapons.
-        relationship (pd.DataFrame): A DataFrame representing the relationships between weapons
-         (who wins against whom).
-        short_names_to_full_names (dict): A dictionary mapping short weapon names to full names.
-        options (list): A list of all available weapon short names.
+        names_tuples (tuple): The (short name, full name) pair of each weapon.
+        relationship (pd.DataFrame): The relationships between weapons (who wins against whom), as
+         loaded. Kept for inspection only; comparisons use the compiled tables below.
+        short_names_to_full_names (Mapping): A read-only mapping of short weapon names to full
+         names.
+        options (tuple): All available weapon short names.
+        input_matcher (InputMatcher): Resolves user input to weapon short names and holds the
+         rendered weapon prompt for this ruleset.
+        weapon_ids (Mapping): A read-only mapping of weapon short names to their index in
+         `options`.
+        outcome_matrix (np.ndarray): The relationship as a read-only int8 matrix indexed by weapon
+         ids, in the same order as `options`.
     """
 
-    def __init__(self):
+    def __init__(self, short_names_path: str = None, relationship_path: str = None):
         """
         Initializes RPSLogic by loading weapon names and relationships from external files.
+
+        :param short_names_path: The weapon names JSON file; defaults to data/short_names.json.
+        :param relationship_path: The relationships CSV file; defaults to data/relationship.csv.
+        :raises ConfigurationError: If the files' contents are invalid.
         """
-        # Paths to the input files for weapon names and their relationships
-        # Resolve paths relative to this file so the module works regardless of
-        # the current working directory
-        base_dir = os.path.dirname(__file__)
-        short_names_path = os.path.join(base_dir, '..', 'data', 'short_names.json')
-        relationship_path = os.path.join(base_dir, '..', 'data', 'relationship.csv')
+        short_names_path = short_names_path or DEFAULT_SHORT_NAMES_PATH
+        relationship_path = relationship_path or DEFAULT_RELATIONSHIP_PATH
 
         # Load weapon names from the JSON file
         with open(short_names_path, 'r', encoding='utf-8') as f:
-            self.names_tuples = json.load(f)
+            names_tuples = json.load(f)
 
         # Load weapon relationships from the CSV file into a DataFrame
-        self.relationship = pd.read_csv(relationship_path, index_col=0)
+        relationship = pd.read_csv(relationship_path, index_col=0)
+
+        self._compile(names_tuples, relationship)
+
+    @classmethod
+    def from_data(cls, names_tuples, relationship: pd.DataFrame) -> 'RPSLogic':
+        """
+        Creates an RPSLogic from already loaded weapon names and relationships.
+
+        :param names_tuples: The (short name, full name) pair of each weapon.
+        :param relationship: The relationships between weapons, indexed by short names.
+        :return: The game logic.
+        :raises ConfigurationError: If the data is invalid.
+        """
+        rps_logic = cls.__new__(cls)
+        rps_logic._compile(names_tuples, relationship)
+        return rps_logic
+
+    @classmethod
+    def from_outcome_matrix(cls, names_tuples, outcome_matrix: np.ndarray,
+                            validate_cells: bool = True) -> 'RPSLogic':
+        """
+        Creates an RPSLogic from weapon names and an outcome matrix indexed by weapon ids. A
+        read-only int8 matrix is used as is, without copying; `relationship` is a view of it.
+
+        :param names_tuples: The (short name, full name) pair of each weapon.
+        :param outcome_matrix: The outcome of each pair of weapon ids (see `compare`).
+        :param validate_cells: Whether to check that every cell is 0, 1 or 2, which reads the
+         whole matrix.
+        :return: The game logic.
+        :raises ConfigurationError: If the data is invalid.
+        """
+        names_tuples = tuple(tuple(pair) for pair in names_tuples)
+        try:
+            validate_short_names(names_tuples)
+        except AssertionError as e:
+            raise ConfigurationError(f"Invalid input data: {e}") from e
+        matrix = np.asarray(outcome_matrix)
+        if matrix.shape != (len(names_tuples),) * 2:
+            raise ConfigurationError(f"Invalid input data: a {matrix.shape} outcome matrix for "
+                                     f"{len(names_tuples)} weapons")
+        if validate_cells and matrix.size and (matrix.min() < 0 or matrix.max() > 2):
+            raise ConfigurationError("Invalid input data: outcomes must be 0, 1 or 2")
+        if matrix.dtype != np.int8 or matrix.flags.writeable:
+            # Copied, so the caller can't change the rules afterwards
+            matrix = matrix.astype(np.int8)
+            matrix.setflags(write=False)
+
+        options = [short for short, _ in names_tuples]
+        rps_logic = cls.__new__(cls)
+        rps_logic._build(names_tuples,
+                         pd.DataFrame(matrix, index=options, columns=options, copy=False),
+                         matrix, from_matrix=True)
+        return rps_logic
+
+    @classmethod
+    def from_binary(cls, path: str) -> 'RPSLogic':
+        """
+        Loads a binary ruleset file (see `rps.ruleset_format`). An int8 matrix is memory-mapped
+        rather than parsed: the outcome matrix is a read-only view of the file, read once to check
+        its cells.
+
+        :param path: The binary ruleset file.
+        :return: The game logic.
+        :raises ConfigurationError: If the file is invalid.
+        """
+        names_tuples, outcome_matrix = read_binary_ruleset(path)
+        # read_binary_ruleset already checked the cells; checking them again would read the whole
+        # matrix a second time
+        return cls.from_outcome_matrix(names_tuples, outcome_matrix, validate_cells=False)
+
+    def _compile(self, names_tuples, relationship: pd.DataFrame):
+        """
+        Validates the ruleset and builds the immutable lookup tables.
+
+        :param names_tuples: The (short name, full name) pair of each weapon.
+        :param relationship: The relationships between weapons, indexed by short names.
+        :raises ConfigurationError: If the data is invalid.
+        """
+        names_tuples = tuple(tuple(pair) for pair in names_tuples)
 
         # Validate the loaded data to ensure correctness
         try:
-            validate_config_files_input(self.names_tuples, self.relationship)
+            validate_config_files_input(names_tuples, relationship)
         except AssertionError as e:
             raise ConfigurationError(f"Invalid input data: {e}") from e
 
-        # Create a dictionary mapping short names (e.g., 'r') to full names (e.g., 'Rock')
-        self.short_names_to_full_names = {short: full for short, full in self.names_tuples}
+        options = [short for short, full in names_tuples]
+        try:
+            outcome_matrix = relationship.loc[options, options].to_numpy(dtype=np.int8)
+        except KeyError as e:
+            raise ConfigurationError(f"Invalid input data: missing relationships {e}") from e
+        outcome_matrix.setflags(write=False)
+        self._build(names_tuples, relationship, outcome_matrix)
+
+    def _build(self, names_tuples: tuple, relationship: pd.DataFrame, outcome_matrix: np.ndarray,
+               from_matrix: bool = False):
+        """
+        Builds the immutable lookup tables of a validated ruleset.
+
+        :param names_tuples: The (short name, full name) pair of each weapon, as tuples.
+        :param relationship: The relationships between weapons, indexed by short names.
+        :param outcome_matrix: The read-only int8 outcome matrix, indexed by weapon ids.
+        :param from_matrix: Whether the ruleset was created from its outcome matrix.
+        """
+        self.names_tuples = names_tuples
+        self.relationship = relationship
+        self._from_matrix = from_matrix
+
+        # Create a mapping of short names (e.g., 'r') to full names (e.g., 'Rock')
+        self.short_names_to_full_names = MappingProxyType(
+            {short: full for short, full in self.names_tuples})
+
+        # All weapon short names for easy reference
+        self.options = tuple(short for short, full in self.names_tuples)
+
+        # Compile the user input matcher once, so validation and prompt rendering don't have to
+        # be repeated on every round
+        self.input_matcher = InputMatcher(self.names_tuples)
+
+        # Intern weapons as integer ids, for code that works on arrays of moves rather than names
+        self.weapon_ids = MappingProxyType(
+            {short: index for index, short in enumerate(self.options)})
+        self.outcome_matrix = outcome_matrix
+
+        # Nested dictionaries are the fastest lookup for a pair of names; they are private, so
+        # they are never mutated after construction
+        self._outcomes = ({weapon1: dict(zip(self.options, row))
+                           for weapon1, row in zip(self.options, outcome_matrix.tolist())}
+                          if len(self.options) <= _OUTCOME_DICT_MAX_WEAPONS else None)
+        self._frozen = True
+
+    def __setattr__(self, name, value):
+        if getattr(self, '_frozen', False):
+            raise AttributeError(f'RPSLogic is immutable, cannot set {name!r}')
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name):
+        raise AttributeError(f'RPSLogic is immutable, cannot delete {name!r}')
 
-        # List of all weapon short names for easy reference
-        self.options = [short for short, full in self.names_tuples]
+    def __reduce__(self):
+        # Read-only mappings can't be pickled, so the ruleset is rebuilt from its source data
+        if self._from_matrix:
+            return RPSLogic.from_outcome_matrix, (self.names_tuples,
+                                                  np.array(self.outcome_matrix))
+        return RPSLogic.from_data, (self.names_tuples, self.relationship)
 
     def compare(self, weapon1: str, weapon2: str) -> int:
         """
@@ -62,6 +222,11 @@ class RPSLogic:
         :param weapon1: The first weapon (short name).
         :param weapon2: The second weapon (short name).
         :return: 0 if it's a tie, 1 if the first weapon wins, and 2 if the second weapon wins.
+        :raises KeyError: If either weapon is unknown.
         """
-        # Lookup in the relationship DataFrame to determine the result
-        return self.relationship.loc[weapon1, weapon2]
+        # Lookup in the compiled outcome table to determine the result
+        outcomes = self._outcomes
+        if outcomes is not None:
+            return outcomes[weapon1][weapon2]
+        weapon_ids = self.weapon_ids
+        return int(self.outcome_matrix[weapon_ids[weapon1], weapon_ids[weapon2]])
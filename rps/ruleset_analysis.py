@@ -0,0 +1,479 @@
+"""
+This module analyses rulesets as two-player zero-sum games: it derives the payoff matrix from a
+ruleset, computes its equilibrium mixed strategy, and reports whether it is balanced.
+
+The balance report (see `analyze`) checks that every weapon beats as many weapons as it loses to,
+that relationships mirror each other, that no weapon is dominated by another, how the weapons'
+"beats" graph splits into cycles, and whether the uniform mixed strategy is an equilibrium. All
+checks are whole-matrix NumPy operations, so rulesets of thousands of weapons are analysed in
+seconds. Reports can be cached on disk, keyed by a hash of the ruleset's contents.
+
+Run as a script to print the report of the configured ruleset:
+
+    python -m rps.ruleset_analysis [--short-names PATH] [--relationship PATH]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+from rps.rps_logic import DEFAULT_RELATIONSHIP_PATH, DEFAULT_SHORT_NAMES_PATH, RPSLogic
+
+# Bump when the report's fields change, so older cache files are recomputed
+_REPORT_VERSION = 1
+
+# Recent equilibria, keyed by ruleset digest and solver settings, so the rulesets themselves are
+# not kept alive
+_EQUILIBRIUM_CACHE_SIZE = 16
+_equilibrium_cache: 'OrderedDict[Tuple[str, float, int], np.ndarray]' = OrderedDict()
+_equilibrium_lock = threading.Lock()
+
+
+def payoff_matrix(rps_logic: RPSLogic) -> np.ndarray:
+    """
+    :param rps_logic: The game logic.
+    :return: The first player's payoff for each pair of weapon ids: 1 for a win, -1 for a loss and
+     0 for a tie, as a read-only float matrix.
+    """
+    # Results are 0 for a tie, 1 if the first weapon wins and 2 if the second one wins
+    payoff = np.array([0.0, 1.0, -1.0])[rps_logic.outcome_matrix]
+    payoff.setflags(write=False)
+    return payoff
+
+
+def equilibrium(rps_logic: RPSLogic, tolerance: float = 1e-9,
+                max_iterations: int = 100_000) -> np.ndarray:
+    """
+    Computes an equilibrium mixed strategy of the ruleset: a probability for each weapon such that
+    no opponent can expect to win more rounds than they lose against it. The most recent results
+    are cached by the ruleset's contents (see `ruleset_digest`), so equal rulesets share them.
+
+    The game is solved approximately by regret matching+, whose averaged strategies converge to an
+    equilibrium. Whenever the approximation improves tenfold, the weapons it plays are taken as
+    the equilibrium's support, on which the exact equilibrium is the solution of a linear system.
+
+    :param rps_logic: The game logic.
+    :param tolerance: The largest expected payoff of the best counter-strategy to accept.
+    :param max_iterations: The maximum number of regret matching iterations.
+    :return: The probability of each weapon id, as a read-only array.
+    """
+    key = (ruleset_digest(rps_logic), tolerance, max_iterations)
+    with _equilibrium_lock:
+        if key in _equilibrium_cache:
+            _equilibrium_cache.move_to_end(key)
+            return _equilibrium_cache[key]
+
+    # Solved outside the lock; threads racing on the same ruleset find the same result
+    strategy = _solve_equilibrium(payoff_matrix(rps_logic), tolerance, max_iterations)
+    with _equilibrium_lock:
+        _equilibrium_cache[key] = strategy
+        if len(_equilibrium_cache) > _EQUILIBRIUM_CACHE_SIZE:
+            _equilibrium_cache.popitem(last=False)
+    return strategy
+
+
+def _solve_equilibrium(payoff: np.ndarray, tolerance: float, max_iterations: int) -> np.ndarray:
+    """
+    :param payoff: The first player's payoff matrix.
+    :param tolerance: The largest expected payoff of the best counter-strategy to accept.
+    :param max_iterations: The maximum number of regret matching iterations.
+    :return: An equilibrium strategy, as a read-only array (see `equilibrium`).
+    """
+    num_weapons = len(payoff)
+    uniform = np.full(num_weapons, 1.0 / num_weapons)
+    if exploitability(payoff, uniform) <= tolerance:
+        # Balanced rulesets, where every weapon beats as many weapons as it loses to
+        uniform.setflags(write=False)
+        return uniform
+
+    # Both players' regrets are updated in turn; the game is symmetric, so the averages of both
+    # players' strategies approximate the same equilibrium
+    regrets1, regrets2 = np.zeros(num_weapons), np.zeros(num_weapons)
+    strategy1 = strategy2 = uniform
+    total, total_weight = np.zeros(num_weapons), 0.0
+    best, best_exploitability = uniform, exploitability(payoff, uniform)
+    refine_below = 1e-2  # Try the exact solution once the approximation is this close
+    for iteration in range(1, max_iterations + 1):
+        strategy1 = _regret_matching_step(regrets1, payoff @ strategy2, strategy1, uniform)
+        strategy2 = _regret_matching_step(regrets2, -(strategy1 @ payoff), strategy2, uniform)
+
+        # Later iterations are weighted more, which converges faster than a plain average
+        total += iteration * (strategy1 + strategy2)
+        total_weight += 2 * iteration
+        if iteration % 16:
+            continue
+        candidates = [total / total_weight]
+        if exploitability(payoff, candidates[0]) <= refine_below:
+            refine_below /= 10
+            refined = _solve_on_support(payoff, candidates[0] > 1e-2 * candidates[0].max())
+            if refined is not None:
+                candidates.append(refined)
+        for candidate in candidates:
+            candidate_exploitability = exploitability(payoff, candidate)
+            if candidate_exploitability < best_exploitability:
+                best, best_exploitability = candidate, candidate_exploitability
+        if best_exploitability <= tolerance:
+            break
+
+    best.setflags(write=False)
+    return best
+
+
+def _regret_matching_step(regrets: np.ndarray, values: np.ndarray, strategy: np.ndarray,
+                          uniform: np.ndarray) -> np.ndarray:
+    """
+    Accumulates a player's regrets in place, and returns their next strategy.
+
+    :param regrets: The player's cumulative regrets, clipped at zero.
+    :param values: The player's payoff for each weapon against the opponent's strategy.
+    :param strategy: The player's current strategy.
+    :param uniform: The uniform strategy, played when no weapon has positive regret.
+    :return: The player's next strategy.
+    """
+    regrets += values - strategy @ values
+    np.maximum(regrets, 0.0, out=regrets)
+    positive = regrets.sum()
+    return regrets / positive if positive > 0 else uniform
+
+
+def _solve_on_support(payoff: np.ndarray, support: np.ndarray):
+    """
+    Finds the strategy playing only the supported weapons, against which every supported weapon
+    breaks even.
+
+    :param payoff: The first player's payoff matrix.
+    :param support: Whether each weapon is played.
+    :return: The strategy, or None if the support admits no valid one.
+    """
+    indices = np.flatnonzero(support)
+    system = np.vstack([payoff[np.ix_(indices, indices)], np.ones(len(indices))])
+    target = np.zeros(len(indices) + 1)
+    target[-1] = 1.0
+    solution = np.linalg.lstsq(system, target, rcond=None)[0]
+    if np.any(solution < -1e-12):
+        return None
+    strategy = np.zeros(len(payoff))
+    strategy[indices] = np.maximum(solution, 0.0)
+    return strategy / strategy.sum()
+
+
+def exploitability(payoff: np.ndarray, strategy: np.ndarray) -> float:
+    """
+    :param payoff: The first player's payoff matrix (see `payoff_matrix`).
+    :param strategy: A mixed strategy: the probability of each weapon id.
+    :return: The expected payoff of the best pure counter-strategy against the mixed strategy.
+    """
+    return float(np.max(payoff @ strategy))
+
+
+class RulesetReport(NamedTuple):
+    """
+    The balance report of a ruleset. Weapons are referred to by their id.
+
+    Attributes:
+        digest (str): The hash of the ruleset's contents (see `ruleset_digest`).
+        num_weapons (int): The number of weapons.
+        wins (tuple): The number of weapons each weapon beats.
+        losses (tuple): The number of weapons each weapon loses to.
+        inconsistent_pairs (tuple): The (weapon, weapon) pairs whose relationships don't mirror
+         each other, e.g. both weapons beat the other, or a weapon that doesn't tie with itself.
+        dominated (tuple): The (weapon, dominating weapon) pairs of the dominated weapons: the
+         dominating weapon does at least as well against every weapon, and better against one.
+        components (tuple): The strongly connected components of the "beats" graph, largest first.
+         Every weapon of a component with several weapons is on a cycle through the others.
+        uniform_exploitability (float): The expected payoff of the best counter-strategy against
+         uniform play.
+    """
+    digest: str
+    num_weapons: int
+    wins: Tuple[int, ...]
+    losses: Tuple[int, ...]
+    inconsistent_pairs: Tuple[Tuple[int, int], ...]
+    dominated: Tuple[Tuple[int, int], ...]
+    components: Tuple[Tuple[int, ...], ...]
+    uniform_exploitability: float
+
+    @property
+    def balanced(self) -> bool:
+        """
+        :return: Whether every weapon beats as many weapons as it loses to.
+        """
+        return self.wins == self.losses
+
+    @property
+    def uniform_equilibrium(self) -> bool:
+        """
+        :return: Whether uniform play is an equilibrium; if not, every equilibrium is non-uniform.
+        """
+        return self.uniform_exploitability <= 1e-9
+
+
+def ruleset_digest(rps_logic: RPSLogic) -> str:
+    """
+    :param rps_logic: The game logic.
+    :return: A SHA-256 hex digest of the weapon names and the outcome matrix.
+    """
+    digest = hashlib.sha256(json.dumps(rps_logic.names_tuples).encode('utf-8'))
+    digest.update(np.ascontiguousarray(rps_logic.outcome_matrix).tobytes())
+    return digest.hexdigest()
+
+
+def analyze(rps_logic: RPSLogic) -> RulesetReport:
+    """
+    Computes the balance report of a ruleset.
+
+    :param rps_logic: The game logic.
+    :return: The report.
+    """
+    outcomes = rps_logic.outcome_matrix
+    # Results are 0 for a tie, 1 if the first weapon wins and 2 if the second one wins
+    beats, loses = outcomes == 1, outcomes == 2
+    wins, losses = beats.sum(axis=1), loses.sum(axis=1)
+
+    # Weapon i beating j must mean j loses to i, and a weapon must tie with itself
+    mismatched = beats != loses.T
+    mismatched |= mismatched.T
+    inconsistent = np.argwhere(np.triu(mismatched))
+
+    num_weapons = len(outcomes)
+    uniform_exploitability = (float((wins - losses).max()) / num_weapons
+                              if num_weapons else 0.0)
+    components = sorted(strongly_connected_components(beats), key=len, reverse=True)
+    return RulesetReport(
+        digest=ruleset_digest(rps_logic),
+        num_weapons=num_weapons,
+        wins=tuple(wins.tolist()),
+        losses=tuple(losses.tolist()),
+        inconsistent_pairs=tuple(map(tuple, inconsistent.tolist())),
+        dominated=tuple(dominated_weapons(beats, loses)),
+        components=tuple(tuple(component.tolist()) for component in components),
+        uniform_exploitability=uniform_exploitability,
+    )
+
+
+def dominated_weapons(beats: np.ndarray, loses: np.ndarray) -> List[Tuple[int, int]]:
+    """
+    Finds the weapons that are strictly dominated by another weapon.
+
+    Weapon i does better than j against k when i beats k and j doesn't, or i ties with k and j
+    loses to it. Counting those opponents for every pair of weapons is a few matrix products of
+    the 0/1 matrices, rather than a comparison of every pair of rows.
+
+    :param beats: Whether each weapon (row) beats each weapon (column).
+    :param loses: Whether each weapon (row) loses to each weapon (column).
+    :return: A (dominated weapon, dominating weapon) pair for each dominated weapon.
+    """
+    if not len(beats):
+        return []
+    # Float32 products are exact for counts below 2 ** 24
+    beats32, loses32 = beats.astype(np.float32), loses.astype(np.float32)
+    ties = ~(beats | loses)
+    np.fill_diagonal(ties, False)
+
+    # better[i, j] is the number of weapons against which i does better than j. Every weapon ties
+    # with itself, which is the `loses.T` term; ties between different weapons are rare
+    better = beats32.sum(axis=1)[:, None] - beats32 @ beats32.T
+    better += loses32.T
+    if ties.any():
+        better += ties.astype(np.float32) @ loses32.T
+
+    # If j never does worse than i, it dominates i exactly when its total payoff is higher
+    scores = beats.sum(axis=1) - loses.sum(axis=1)
+    dominates = (better == 0) & (scores[None, :] > scores[:, None])
+    dominated = np.flatnonzero(dominates.any(axis=1))
+    return list(zip(dominated.tolist(), dominates[dominated].argmax(axis=1).tolist()))
+
+
+def strongly_connected_components(adjacency: np.ndarray) -> List[np.ndarray]:
+    """
+    Finds the strongly connected components of a directed graph, by forward-backward
+    decomposition: the component of a pivot node is the set of nodes it both reaches and is reached
+    from, and every other component lies within the nodes it only reaches, only is reached from, or
+    neither. Nodes without incoming or outgoing edges are trimmed first, as their own components.
+    Every step works on whole rows of the adjacency matrix.
+
+    :param adjacency: Whether there is an edge from each node (row) to each node (column).
+    :return: The node indices of each component.
+    """
+    components = []
+    pending = [np.arange(len(adjacency))]
+    while pending:
+        nodes = pending.pop()
+        edges = adjacency[np.ix_(nodes, nodes)]
+
+        keep = np.ones(len(nodes), dtype=bool)
+        out_degrees, in_degrees = edges.sum(axis=1), edges.sum(axis=0)
+        while True:
+            trimmed = keep & ((out_degrees == 0) | (in_degrees == 0))
+            if not trimmed.any():
+                break
+            keep &= ~trimmed
+            out_degrees -= edges[:, trimmed].sum(axis=1)
+            in_degrees -= edges[trimmed].sum(axis=0)
+            components.extend(nodes[trimmed, None])
+        if not keep.any():
+            continue
+        if not keep.all():
+            remaining = np.flatnonzero(keep)
+            nodes, edges = nodes[remaining], edges[np.ix_(remaining, remaining)]
+
+        forward = _reachable(edges, 0)
+        backward = _reachable(np.ascontiguousarray(edges.T), 0)
+        component = forward & backward
+        components.append(nodes[component])
+        for part in (forward & ~component, backward & ~component, ~(forward | backward)):
+            if part.any():
+                pending.append(nodes[part])
+    return components
+
+
+def _reachable(adjacency: np.ndarray, start: int) -> np.ndarray:
+    """
+    :param adjacency: Whether there is an edge from each node (row) to each node (column).
+    :param start: The node to start from.
+    :return: Whether each node is reachable from the start node.
+    """
+    visited = np.zeros(len(adjacency), dtype=bool)
+    visited[start] = True
+    frontier = np.array([start])
+    while len(frontier):
+        new = adjacency[frontier].any(axis=0) & ~visited
+        visited |= new
+        frontier = np.flatnonzero(new)
+    return visited
+
+
+def cached_analysis(rps_logic: RPSLogic, cache_dir: str) -> RulesetReport:
+    """
+    Returns the balance report of a ruleset, from the cache if it was computed before.
+
+    :param rps_logic: The game logic.
+    :param cache_dir: The folder of cached reports, one file per ruleset digest.
+    :return: The report.
+    """
+    path = os.path.join(cache_dir, f'{ruleset_digest(rps_logic)}.json')
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached['version'] == _REPORT_VERSION:
+            return _report_from_json(cached['report'])
+    except (OSError, ValueError, KeyError, TypeError):
+        pass  # Missing or unreadable; recompute
+
+    report = analyze(rps_logic)
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': _REPORT_VERSION, 'report': report._asdict()}, f)
+    os.replace(tmp_path, path)
+    return report
+
+
+def _report_from_json(data: dict) -> RulesetReport:
+    """
+    :param data: A report's fields, as written to the cache.
+    :return: The report.
+    """
+    data = dict(data)
+    for field in ('wins', 'losses'):
+        data[field] = tuple(data[field])
+    for field in ('inconsistent_pairs', 'dominated', 'components'):
+        data[field] = tuple(map(tuple, data[field]))
+    return RulesetReport(**data)
+
+
+def format_report(report: RulesetReport, options: Sequence[str], limit: int = 10) -> str:
+    """
+    :param report: The report.
+    :param options: The weapon short names, in id order.
+    :param limit: The maximum number of weapons or pairs listed per check.
+    :return: The report as readable text.
+    """
+    def listing(items) -> str:
+        items = list(items)
+        shown = ', '.join(items[:limit])
+        return shown + (f', ... ({len(items) - limit} more)' if len(items) > limit else '')
+
+    lines = [f'Ruleset: {report.num_weapons} weapons (digest {report.digest[:12]})']
+
+    if report.balanced:
+        lines.append('Balance: balanced, every weapon beats as many weapons as it loses to')
+    else:
+        unbalanced = [f'{options[weapon]} ({wins}-{losses})' for weapon, (wins, losses)
+                      in enumerate(zip(report.wins, report.losses)) if wins != losses]
+        lines.append(f'Balance: unbalanced, {len(unbalanced)} weapons beat a different number '
+                     f'of weapons than they lose to (wins-losses): {listing(unbalanced)}')
+
+    if report.inconsistent_pairs:
+        lines.append(f'Consistency: {len(report.inconsistent_pairs)} relationships don\'t mirror '
+                     'each other: ' + listing(f'{options[i]}/{options[j]}'
+                                              for i, j in report.inconsistent_pairs))
+    else:
+        lines.append('Consistency: all relationships mirror each other')
+
+    if report.dominated:
+        lines.append(f'Dominated weapons: {len(report.dominated)}: ' + listing(
+            f'{options[weapon]} (by {options[by]})' for weapon, by in report.dominated))
+    else:
+        lines.append('Dominated weapons: none')
+
+    cyclic = [component for component in report.components if len(component) > 1]
+    if len(report.components) == 1 and cyclic:
+        lines.append('Cycles: every weapon is on a cycle through all the others')
+    elif cyclic:
+        lines.append(f'Cycles: {len(report.components)} strongly connected components, the largest '
+                     f'of {len(cyclic[0])} weapons; {report.num_weapons - sum(map(len, cyclic))} '
+                     'weapons are on no cycle')
+    else:
+        lines.append('Cycles: none, the weapons are ranked')
+
+    if report.uniform_equilibrium:
+        lines.append('Equilibrium: uniform play is an equilibrium')
+    else:
+        lines.append('Equilibrium: non-uniform, the best counter-strategy to uniform play wins '
+                     f'{report.uniform_exploitability:.3f} more rounds than it loses, per round')
+    return '\n'.join(lines)
+
+
+def main():
+    """
+    Prints the balance report of a ruleset from the command line.
+    """
+    parser = argparse.ArgumentParser(description='Report whether a ruleset is balanced.')
+    parser.add_argument('--short-names', default=DEFAULT_SHORT_NAMES_PATH,
+                        help='The weapon names JSON file (default: data/short_names.json).')
+    parser.add_argument('--relationship', default=DEFAULT_RELATIONSHIP_PATH,
+                        help='The relationships CSV file (default: data/relationship.csv).')
+    parser.add_argument('--cache-dir',
+                        help='The folder of cached reports (default: .ruleset_analysis next to '
+                             'the relationships file).')
+    parser.add_argument('--no-cache', action='store_true', help='Always recompute the report.')
+    parser.add_argument('--limit', type=int, default=10,
+                        help='The maximum number of weapons listed per check.')
+    parser.add_argument('--equilibrium', action='store_true',
+                        help='Also compute and print the equilibrium mixed strategy.')
+    args = parser.parse_args()
+
+    rps_logic = RPSLogic(args.short_names, args.relationship)
+    if args.no_cache:
+        report = analyze(rps_logic)
+    else:
+        cache_dir = args.cache_dir or os.path.join(
+            os.path.dirname(os.path.abspath(args.relationship)), '.ruleset_analysis')
+        report = cached_analysis(rps_logic, cache_dir)
+    print(format_report(report, rps_logic.options, args.limit))
+    if args.equilibrium:
+        probabilities = equilibrium(rps_logic)
+        print('Equilibrium strategy: ' + ', '.join(
+            f'{weapon} {probability:.4f}'
+            for weapon, probability in zip(rps_logic.options, probabilities) if probability > 0))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,379 @@
+"""
+This module defines a compact binary ruleset format, for rulesets far larger than the CSV and JSON
+files can comfortably hold, and converts between the two.
+
+A binary ruleset file holds:
+
+    header       Magic, format version, matrix encoding, number of weapons, the name table's
+                 length and the matrix's offset (see `_HEADER`).
+    name table   The (short name, full name) pairs, as UTF-8 JSON.
+    matrix       The outcome matrix, row by row, aligned to 64 bytes. Cells hold the codes of
+                 `RPSLogic.compare`, either one int8 per cell, or 2 bits per cell (four cells per
+                 byte, lowest bits first, each row padded to a whole byte).
+
+An int8 matrix is used in place: `read_binary_ruleset` maps the file into memory and returns a
+read-only view of it, so loading costs neither parsing nor a copy. Its cells are checked once on
+load, with a vectorized min and max over the mapped matrix, so a corrupt file is rejected rather
+than served. A packed matrix takes a quarter of the space and is unpacked into memory on load.
+
+Both conversions stream: CSV files are read a block of rows at a time and written to the matrix
+row by row, and binary files are written out as CSV a block of rows at a time.
+
+Run as a script to convert rulesets:
+
+    python -m rps.ruleset_format to-binary SHORT_NAMES.json RELATIONSHIP.csv OUT.rpsr [--packed]
+    python -m rps.ruleset_format to-csv IN.rpsr SHORT_NAMES.json RELATIONSHIP.csv
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+from typing import Iterable, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from rps.exceptions import ConfigurationError
+
+MAGIC = b'RPSRULE1'
+VERSION = 1
+# One int8 per cell, or 2 bits per cell
+ENCODING_INT8 = 0
+ENCODING_PACKED = 1
+# magic, version, encoding, reserved, number of weapons, name table length, matrix offset
+_HEADER = struct.Struct('<8sHBBIQQ')
+_MATRIX_ALIGNMENT = 64
+# The largest valid cell: 2 when the second weapon wins
+_MAX_CELL = 2
+
+
+def row_bytes(num_weapons: int, encoding: int) -> int:
+    """
+    :param num_weapons: The number of weapons.
+    :param encoding: The matrix encoding, `ENCODING_INT8` or `ENCODING_PACKED`.
+    :return: The size of a matrix row in bytes.
+    """
+    return num_weapons if encoding == ENCODING_INT8 else (num_weapons + 3) // 4
+
+
+class BinaryRulesetWriter:
+    """
+    Writes a binary ruleset file, taking the matrix rows in any order and any number at a time, so
+    the matrix never has to be held in memory.
+
+    Use as a context manager. The file is written under a temporary name and only moved into place
+    once every row was written and the writer is closed, so a failed write never leaves a
+    truncated ruleset behind.
+    """
+
+    def __init__(self, path: str, names_tuples: Sequence[Sequence[str]],
+                 encoding: int = ENCODING_INT8):
+        """
+        Writes the header and the name table to the temporary file.
+
+        :param path: The file to write.
+        :param names_tuples: The (short name, full name) pair of each weapon.
+        :param encoding: The matrix encoding, `ENCODING_INT8` or `ENCODING_PACKED`.
+        :raises ValueError: If the encoding is unknown.
+        """
+        if encoding not in (ENCODING_INT8, ENCODING_PACKED):
+            raise ValueError(f'Unknown matrix encoding {encoding}.')
+        self.path = path
+        self.num_weapons = len(names_tuples)
+        self.encoding = encoding
+        self._row_bytes = row_bytes(self.num_weapons, encoding)
+        self._written = np.zeros(self.num_weapons, dtype=bool)
+
+        names = json.dumps([list(pair) for pair in names_tuples],
+                           ensure_ascii=False).encode('utf-8')
+        self._matrix_offset = -(-(_HEADER.size + len(names)) // _MATRIX_ALIGNMENT) * _MATRIX_ALIGNMENT
+        self._tmp_path = f'{path}.tmp'
+        self._file = open(self._tmp_path, 'wb')
+        try:
+            self._file.write(_HEADER.pack(MAGIC, VERSION, encoding, 0, self.num_weapons,
+                                          len(names), self._matrix_offset))
+            self._file.write(names)
+            # Size the file up front, so rows can be written at any position
+            self._file.truncate(self._matrix_offset + self.num_weapons * self._row_bytes)
+        except BaseException:
+            self.discard()
+            raise
+
+    def write_rows(self, start: int, rows: np.ndarray):
+        """
+        Writes consecutive matrix rows.
+
+        :param start: The weapon id of the first row.
+        :param rows: The rows' cells, of shape (number of rows, number of weapons).
+        :raises ValueError: If the rows don't fit the matrix or hold invalid cells.
+        """
+        rows = np.asarray(rows)
+        if rows.ndim != 2 or rows.shape[1] != self.num_weapons or not (
+                0 <= start and start + len(rows) <= self.num_weapons):
+            raise ValueError(f'Rows {start} to {start + len(rows)} don\'t fit a '
+                             f'{self.num_weapons}-weapon matrix.')
+        if rows.size and (rows.min() < 0 or rows.max() > _MAX_CELL):
+            raise ValueError(f'Rows {start} to {start + len(rows)} hold cells other than 0, 1 '
+                             f'and 2.')
+        self._file.seek(self._matrix_offset + start * self._row_bytes)
+        self._file.write(encode_rows(rows, self.encoding).tobytes())
+        self._written[start:start + len(rows)] = True
+
+    def close(self):
+        """
+        Closes the file and moves it into place.
+
+        :raises ConfigurationError: If some rows were never written; the file is then discarded.
+        """
+        missing = np.flatnonzero(~self._written)
+        if len(missing):
+            self.discard()
+            raise ConfigurationError(f'{self.path}: {len(missing)} matrix rows were not written, '
+                                     f'e.g. row {missing[0]}.')
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+
+    def discard(self):
+        """
+        Closes and deletes the temporary file, leaving any existing file at the path untouched.
+        """
+        self._file.close()
+        try:
+            os.remove(self._tmp_path)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self) -> 'BinaryRulesetWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+
+def encode_rows(rows: np.ndarray, encoding: int) -> np.ndarray:
+    """
+    :param rows: Matrix rows, of shape (number of rows, number of weapons).
+    :param encoding: The matrix encoding, `ENCODING_INT8` or `ENCODING_PACKED`.
+    :return: The rows' bytes in the encoding, as a uint8 or int8 array.
+    """
+    if encoding == ENCODING_INT8:
+        return np.ascontiguousarray(rows, dtype=np.int8)
+    num_rows, num_weapons = rows.shape
+    padded = np.zeros((num_rows, row_bytes(num_weapons, encoding) * 4), dtype=np.uint8)
+    padded[:, :num_weapons] = rows
+    quads = padded.reshape(num_rows, -1, 4)
+    return quads[:, :, 0] | quads[:, :, 1] << 2 | quads[:, :, 2] << 4 | quads[:, :, 3] << 6
+
+
+def decode_rows(data: np.ndarray, num_weapons: int) -> np.ndarray:
+    """
+    :param data: Packed matrix rows, as a uint8 array of shape (number of rows, row bytes).
+    :param num_weapons: The number of weapons.
+    :return: The rows' cells, as an int8 array of shape (number of rows, number of weapons).
+    """
+    cells = data[:, :, None] >> np.array([0, 2, 4, 6], dtype=np.uint8) & 3
+    return cells.reshape(len(data), -1)[:, :num_weapons].astype(np.int8)
+
+
+def read_binary_ruleset(path: str) -> Tuple[List[List[str]], np.ndarray]:
+    """
+    Reads a binary ruleset file. An int8 matrix is returned as a read-only view of the memory-mapped
+    file, without copying; a packed one is unpacked into memory. Either way, the cells are checked
+    to be 0, 1 or 2.
+
+    :param path: The binary ruleset file.
+    :return: The (short name, full name) pair of each weapon, and the int8 outcome matrix.
+    :raises ConfigurationError: If the file is not a valid binary ruleset.
+    """
+    with open(path, 'rb') as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as e:  # Empty file
+            raise ConfigurationError(f'{path}: not a binary ruleset') from e
+
+    if len(mapped) < _HEADER.size:
+        raise ConfigurationError(f'{path}: truncated header')
+    magic, version, encoding, _, num_weapons, names_length, matrix_offset = \
+        _HEADER.unpack_from(mapped)
+    if magic != MAGIC or version != VERSION:
+        raise ConfigurationError(f'{path}: not a binary ruleset of version {VERSION}')
+    if encoding not in (ENCODING_INT8, ENCODING_PACKED):
+        raise ConfigurationError(f'{path}: unknown matrix encoding {encoding}')
+    stride = row_bytes(num_weapons, encoding)
+    if len(mapped) < matrix_offset + num_weapons * stride:
+        raise ConfigurationError(f'{path}: truncated matrix')
+    try:
+        names_tuples = json.loads(mapped[_HEADER.size:_HEADER.size + names_length])
+    except ValueError as e:
+        raise ConfigurationError(f'{path}: invalid name table ({e})') from e
+    if len(names_tuples) != num_weapons:
+        raise ConfigurationError(f'{path}: {len(names_tuples)} names for {num_weapons} weapons')
+
+    if encoding == ENCODING_INT8:
+        matrix = np.frombuffer(mapped, dtype=np.int8, count=num_weapons * num_weapons,
+                               offset=matrix_offset).reshape(num_weapons, num_weapons)
+    else:
+        packed = np.frombuffer(mapped, dtype=np.uint8, count=num_weapons * stride,
+                               offset=matrix_offset).reshape(num_weapons, stride)
+        matrix = np.empty((num_weapons, num_weapons), dtype=np.int8)
+        # Unpack a block of rows at a time, to bound the temporaries
+        block = max(1, (1 << 22) // max(num_weapons, 1))
+        for start in range(0, num_weapons, block):
+            matrix[start:start + block] = decode_rows(packed[start:start + block], num_weapons)
+        matrix.setflags(write=False)
+    if matrix.size and (matrix.min() < 0 or matrix.max() > _MAX_CELL):
+        raise ConfigurationError(f'{path}: invalid matrix cells')
+    return names_tuples, matrix
+
+
+def csv_to_binary(short_names_path: str, relationship_path: str, path: str,
+                  encoding: int = ENCODING_INT8, chunk_rows: int = 256):
+    """
+    Converts a ruleset from its JSON and CSV files to a binary ruleset file, reading the CSV a
+    block of rows at a time. Rows and columns may be in any order. The binary file is only
+    replaced once the whole ruleset was converted (see `BinaryRulesetWriter`).
+
+    :param short_names_path: The weapon names JSON file.
+    :param relationship_path: The relationships CSV file.
+    :param path: The binary ruleset file to write.
+    :param encoding: The matrix encoding, `ENCODING_INT8` or `ENCODING_PACKED`.
+    :param chunk_rows: The number of CSV rows read at a time.
+    :raises ConfigurationError: If the relationships don't match the weapon names: unknown,
+     missing or duplicate rows or columns, or invalid cells.
+    """
+    with open(short_names_path, 'r', encoding='utf-8') as f:
+        names_tuples = json.load(f)
+    options = [short for short, _ in names_tuples]
+    weapon_ids = {short: index for index, short in enumerate(options)}
+    seen = np.zeros(len(options), dtype=bool)
+
+    with BinaryRulesetWriter(path, names_tuples, encoding) as writer:
+        for chunk in pd.read_csv(relationship_path, index_col=0, chunksize=chunk_rows):
+            try:
+                # Read as floats, so out-of-range and empty cells are seen before the int8 cast
+                cells = chunk[options].to_numpy(dtype=np.float64)
+                positions = [weapon_ids[short] for short in chunk.index]
+            except KeyError as e:
+                raise ConfigurationError(f'{relationship_path}: unknown or missing weapons '
+                                         f'{e}') from e
+            except ValueError as e:
+                raise ConfigurationError(f'{relationship_path}: invalid cells ({e})') from e
+            invalid = ~np.isin(cells, (0, 1, 2))
+            if invalid.any():
+                raise ConfigurationError(f'{relationship_path}: invalid cells '
+                                         f'{np.unique(cells[invalid]).tolist()}; cells must be 0, '
+                                         f'1 or 2')
+            rows = cells.astype(np.int8)
+            # pandas renames duplicate columns (w0, w0.1, ...), so they show up as unknown ones
+            unknown = chunk.columns.difference(options)
+            if len(unknown):
+                raise ConfigurationError(f'{relationship_path}: unknown or duplicate columns '
+                                         f'{list(unknown)}')
+            duplicated = seen[positions] | chunk.index.duplicated()
+            if duplicated.any():
+                raise ConfigurationError(f'{relationship_path}: duplicate rows '
+                                         f'{list(chunk.index[duplicated])}')
+            seen[positions] = True
+            # Write runs of consecutive rows at once
+            start = 0
+            for end in range(1, len(positions) + 1):
+                if end == len(positions) or positions[end] != positions[end - 1] + 1:
+                    try:
+                        writer.write_rows(positions[start], rows[start:end])
+                    except ValueError as e:
+                        raise ConfigurationError(f'{relationship_path}: {e}') from e
+                    start = end
+        missing = np.flatnonzero(~seen)
+        if len(missing):
+            raise ConfigurationError(f'{relationship_path}: {len(missing)} weapons have no row, '
+                                     f'e.g. {options[missing[0]]!r}')
+
+
+def binary_to_csv(path: str, short_names_path: str, relationship_path: str,
+                  chunk_rows: int = 256):
+    """
+    Converts a binary ruleset file to JSON and CSV files, writing the CSV a block of rows at a
+    time.
+
+    :param path: The binary ruleset file.
+    :param short_names_path: The weapon names JSON file to write.
+    :param relationship_path: The relationships CSV file to write.
+    :param chunk_rows: The number of CSV rows written at a time.
+    """
+    names_tuples, matrix = read_binary_ruleset(path)
+    write_csv_ruleset(short_names_path, relationship_path, names_tuples,
+                      (matrix[start:start + chunk_rows]
+                       for start in range(0, len(names_tuples), chunk_rows)))
+
+
+def write_csv_ruleset(short_names_path: str, relationship_path: str,
+                      names_tuples: Sequence[Sequence[str]], blocks: Iterable[np.ndarray]):
+    """
+    Writes a ruleset's JSON and CSV files, taking the matrix a block of rows at a time.
+
+    :param short_names_path: The weapon names JSON file to write.
+    :param relationship_path: The relationships CSV file to write.
+    :param names_tuples: The (short name, full name) pair of each weapon.
+    :param blocks: The matrix rows, in order, as arrays of shape (number of rows, number of
+     weapons).
+    :raises ValueError: If the blocks don't hold one row per weapon.
+    """
+    with open(short_names_path, 'w', encoding='utf-8') as f:
+        json.dump([list(pair) for pair in names_tuples], f, ensure_ascii=False, indent='\t')
+
+    options = [short for short, _ in names_tuples]
+    with open(relationship_path, 'wb') as f:
+        f.write((','.join(['index'] + options) + '\n').encode('utf-8'))
+        start = 0
+        for rows in blocks:
+            rows = np.asarray(rows)
+            if rows.ndim != 2 or rows.shape[1] != len(options) or start + len(rows) > len(options):
+                raise ValueError(f'{relationship_path}: rows {start} to {start + len(rows)} '
+                                 f'don\'t fit a {len(options)}-weapon matrix.')
+            if rows.size and (rows.min() < 0 or rows.max() > _MAX_CELL):
+                raise ValueError(f'{relationship_path}: rows {start} to {start + len(rows)} hold '
+                                 f'cells other than 0, 1 and 2.')
+            # Cells are single digits, so a row's text is a comma and a digit per cell
+            text = np.full((len(rows), 2 * len(options) + 1), ord(','), dtype=np.uint8)
+            text[:, 1:-1:2] = rows + ord('0')
+            text[:, -1] = ord('\n')
+            for short, line in zip(options[start:start + len(rows)], text):
+                f.write(short.encode('utf-8'))
+                f.write(line.tobytes())
+            start += len(rows)
+    if start != len(options):
+        raise ValueError(f'{relationship_path}: {start} matrix rows for {len(options)} weapons.')
+
+
+def main():
+    """
+    Converts rulesets between the JSON and CSV files and the binary format, from the command line.
+    """
+    parser = argparse.ArgumentParser(description='Convert rulesets to and from the binary format.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    to_binary = commands.add_parser('to-binary', help='Convert JSON and CSV files to binary.')
+    to_binary.add_argument('short_names', help='The weapon names JSON file.')
+    to_binary.add_argument('relationship', help='The relationships CSV file.')
+    to_binary.add_argument('output', help='The binary ruleset file to write.')
+    to_binary.add_argument('--packed', action='store_true',
+                           help='Store 2 bits per cell instead of one byte.')
+    to_csv = commands.add_parser('to-csv', help='Convert a binary file to JSON and CSV files.')
+    to_csv.add_argument('input', help='The binary ruleset file.')
+    to_csv.add_argument('short_names', help='The weapon names JSON file to write.')
+    to_csv.add_argument('relationship', help='The relationships CSV file to write.')
+    args = parser.parse_args()
+
+    if args.command == 'to-binary':
+        csv_to_binary(args.short_names, args.relationship, args.output,
+                      ENCODING_PACKED if args.packed else ENCODING_INT8)
+    else:
+        binary_to_csv(args.input, args.short_names, args.relationship)
+
+
+if __name__ == '__main__':
+    main()
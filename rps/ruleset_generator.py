@@ -0,0 +1,190 @@
+"""
+This module generates balanced rulesets of any odd number of weapons, for testing at scales far
+beyond the shipped 3-weapon game.
+
+A generated ruleset starts as the cyclic tournament of RPS-101: weapon i beats the next
+(n - 1) / 2 weapons, wrapping around, and loses to the others. Seeded perturbations then reverse
+random rock-paper-scissors triangles (a beats b, b beats c, c beats a becomes the opposite): each
+weapon in a reversed triangle swaps one win for one loss, so every weapon still beats exactly half
+of the others, while the ruleset is no longer a plain cycle.
+
+The matrix is never held in memory. Rows are computed a block at a time from the cyclic pattern and
+the sparse set of reversed pairs, and streamed to the JSON and CSV files or to a binary ruleset
+file (see `rps.ruleset_format`), so rulesets of tens of thousands of weapons take memory
+proportional to one block of rows.
+
+Run as a script to write a ruleset:
+
+    python -m rps.ruleset_generator 20001 --perturbations 1000 --seed 0 --binary ruleset.rpsr
+    python -m rps.ruleset_generator 101 --csv short_names.json relationship.csv
+"""
+
+import argparse
+import random
+from typing import Dict, Iterator, Set
+
+import numpy as np
+
+from rps.rps_logic import RPSLogic
+from rps.ruleset_format import (ENCODING_INT8, ENCODING_PACKED, BinaryRulesetWriter,
+                                write_csv_ruleset)
+
+
+class BalancedRulesetGenerator:
+    """
+    Generates a balanced ruleset: every weapon beats exactly (n - 1) / 2 of the others.
+
+    Attributes:
+        num_weapons (int): The number of weapons.
+        names_tuples (list): The (short name, full name) pair of each weapon: `w0`, `Weapon 0`, ...
+        perturbations (int): The number of triangles reversed.
+    """
+
+    def __init__(self, num_weapons: int, perturbations: int = 0, seed: int = None):
+        """
+        :param num_weapons: The number of weapons; odd, so that it can be balanced.
+        :param perturbations: The number of random triangles to reverse.
+        :param seed: Seeds the choice of triangles.
+        :raises ValueError: If the number of weapons is not odd, or perturbations are requested
+         with fewer than 3 weapons.
+        """
+        if num_weapons < 1 or num_weapons % 2 == 0:
+            raise ValueError(f'A balanced ruleset needs an odd number of weapons, not '
+                             f'{num_weapons}.')
+        if perturbations and num_weapons < 3:
+            raise ValueError('Perturbations need at least 3 weapons.')
+        self.num_weapons = num_weapons
+        self.names_tuples = [[f'w{i}', f'Weapon {i}'] for i in range(num_weapons)]
+        self.perturbations = perturbations
+        # The pairs whose outcome is the reverse of the cyclic one, by weapon id, both ways round
+        self._reversed: Dict[int, Set[int]] = {}
+        distance = np.arange(num_weapons)
+        pattern = np.where(distance == 0, 0, np.where(distance <= num_weapons // 2, 1, 2))
+        self._pattern = np.tile(pattern.astype(np.int8), 2)
+
+        rng = random.Random(seed)
+        for _ in range(perturbations):
+            self._reverse_random_triangle(rng)
+
+    def beats(self, weapon1: int, weapon2: int) -> bool:
+        """
+        :param weapon1: A weapon id.
+        :param weapon2: Another weapon id.
+        :return: Whether weapon1 beats weapon2.
+        """
+        distance = (weapon2 - weapon1) % self.num_weapons
+        cyclic = 0 < distance <= self.num_weapons // 2
+        return cyclic != (weapon2 in self._reversed.get(weapon1, ()))
+
+    def _reverse_random_triangle(self, rng: random.Random):
+        """
+        Reverses a random triangle, drawing random triples until one is a triangle (about one in
+        four is).
+        """
+        while True:
+            a, b, c = rng.sample(range(self.num_weapons), 3)
+            if not self.beats(a, b):
+                b, c = c, b
+            if self.beats(a, b) and self.beats(b, c) and self.beats(c, a):
+                for weapon1, weapon2 in ((a, b), (b, c), (c, a)):
+                    self._toggle(weapon1, weapon2)
+                return
+
+    def _toggle(self, weapon1: int, weapon2: int):
+        for source, target in ((weapon1, weapon2), (weapon2, weapon1)):
+            pairs = self._reversed.setdefault(source, set())
+            pairs.symmetric_difference_update((target,))
+            if not pairs:
+                del self._reversed[source]
+
+    def rows(self, start: int, stop: int) -> np.ndarray:
+        """
+        :param start: The weapon id of the first row.
+        :param stop: The weapon id after the last row.
+        :return: The outcome matrix's rows (see `RPSLogic.compare`), as an int8 array of shape
+         (stop - start, number of weapons).
+        """
+        # Row i is the cyclic pattern of row 0 rotated right by i places: a slice of the pattern
+        # repeated twice
+        n = self.num_weapons
+        rows = np.empty((stop - start, n), dtype=np.int8)
+        for weapon1 in range(start, stop):
+            rows[weapon1 - start] = self._pattern[n - weapon1:2 * n - weapon1]
+        for weapon1 in range(start, stop):
+            reversed_pairs = self._reversed.get(weapon1)
+            if reversed_pairs:
+                columns = list(reversed_pairs)
+                rows[weapon1 - start, columns] = 3 - rows[weapon1 - start, columns]
+        return rows
+
+    def blocks(self, block_rows: int = 256) -> Iterator[np.ndarray]:
+        """
+        :param block_rows: The number of rows per block.
+        :return: The outcome matrix's rows, a block at a time, in order.
+        """
+        for start in range(0, self.num_weapons, block_rows):
+            yield self.rows(start, min(start + block_rows, self.num_weapons))
+
+    def write_csv(self, short_names_path: str, relationship_path: str, block_rows: int = 256):
+        """
+        Writes the ruleset as short_names.json and relationship.csv files.
+
+        :param short_names_path: The weapon names JSON file to write.
+        :param relationship_path: The relationships CSV file to write.
+        :param block_rows: The number of rows computed and written at a time.
+        """
+        write_csv_ruleset(short_names_path, relationship_path, self.names_tuples,
+                          self.blocks(block_rows))
+
+    def write_binary(self, path: str, encoding: int = ENCODING_INT8, block_rows: int = 256):
+        """
+        Writes the ruleset as a binary ruleset file.
+
+        :param path: The binary ruleset file to write.
+        :param encoding: The matrix encoding, `ENCODING_INT8` or `ENCODING_PACKED`.
+        :param block_rows: The number of rows computed and written at a time.
+        """
+        with BinaryRulesetWriter(path, self.names_tuples, encoding) as writer:
+            for start, rows in zip(range(0, self.num_weapons, block_rows),
+                                   self.blocks(block_rows)):
+                writer.write_rows(start, rows)
+
+    def rps_logic(self) -> RPSLogic:
+        """
+        :return: The game logic of the ruleset, holding the whole matrix in memory.
+        """
+        matrix = self.rows(0, self.num_weapons)
+        matrix.setflags(write=False)
+        return RPSLogic.from_outcome_matrix(self.names_tuples, matrix, validate_cells=False)
+
+
+def main():
+    """
+    Writes a generated balanced ruleset from the command line.
+    """
+    parser = argparse.ArgumentParser(description='Generate a balanced ruleset.')
+    parser.add_argument('num_weapons', type=int, help='The number of weapons (odd).')
+    parser.add_argument('--perturbations', type=int, default=0,
+                        help='The number of random triangles to reverse.')
+    parser.add_argument('--seed', type=int, help='Seeds the perturbations.')
+    parser.add_argument('--csv', nargs=2, metavar=('SHORT_NAMES', 'RELATIONSHIP'),
+                        help='Write the weapon names JSON and relationships CSV files.')
+    parser.add_argument('--binary', metavar='PATH', help='Write a binary ruleset file.')
+    parser.add_argument('--packed', action='store_true',
+                        help='Store 2 bits per cell in the binary file instead of one byte.')
+    args = parser.parse_args()
+    if not args.csv and not args.binary:
+        parser.error('Nothing to write: pass --csv and/or --binary.')
+
+    try:
+        generator = BalancedRulesetGenerator(args.num_weapons, args.perturbations, args.seed)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.csv:
+        generator.write_csv(*args.csv)
+    if args.binary:
+        generator.write_binary(args.binary, ENCODING_PACKED if args.packed else ENCODING_INT8)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""
+This module provides the RulesetWatcher class, which reloads the ruleset when its data files change,
+without restarting the process.
+
+The watcher polls the files' modification times from a background thread. When they change, it
+loads and validates the new ruleset on that thread, and only then publishes it by rebinding
+`current` (a single atomic reference assignment). Readers never take a lock: a game reads `current`
+once when it is created and keeps using that RPSLogic until it finishes, so a reload never changes
+the rules in the middle of a game. Invalid files are reported and ignored, keeping the previous
+ruleset in service. Listeners that fail are logged and skipped, so they never stop the polling.
+"""
+
+import logging
+import os
+import threading
+from typing import Callable, List, Optional, Tuple
+
+from rps.exceptions import ConfigurationError
+from rps.rps_logic import DEFAULT_RELATIONSHIP_PATH, DEFAULT_SHORT_NAMES_PATH, RPSLogic
+
+_logger = logging.getLogger(__name__)
+
+
+class RulesetWatcher:
+    """
+    Holds the current ruleset and replaces it when the data files change.
+
+    Attributes:
+        short_names_path (str): The watched weapon names JSON file.
+        relationship_path (str): The watched relationships CSV file.
+        poll_interval (float): Seconds between checks of the files' modification times.
+        current (RPSLogic): The most recent valid ruleset.
+        version (int): Incremented each time a new ruleset is published, starting at 1.
+        last_error (Exception): Why the most recent change was rejected, or None if it was loaded.
+    """
+
+    def __init__(self, short_names_path: str = None, relationship_path: str = None,
+                 poll_interval: float = 1.0):
+        """
+        Loads the initial ruleset.
+
+        :param short_names_path: The weapon names JSON file; defaults to data/short_names.json.
+        :param relationship_path: The relationships CSV file; defaults to data/relationship.csv.
+        :param poll_interval: Seconds between checks of the files' modification times.
+        :raises ConfigurationError: If the initial files are invalid.
+        """
+        self.short_names_path = short_names_path or DEFAULT_SHORT_NAMES_PATH
+        self.relationship_path = relationship_path or DEFAULT_RELATIONSHIP_PATH
+        self.poll_interval = poll_interval
+        self.last_error: Optional[Exception] = None
+        self._listeners: List[Callable[[RPSLogic], None]] = []
+        self._stop = threading.Event()
+        self._thread: threading.Thread = None
+
+        self._signature = self._stat()
+        self.current: RPSLogic = RPSLogic(self.short_names_path, self.relationship_path)
+        self.version = 1
+
+    def add_listener(self, listener: Callable[[RPSLogic], None]):
+        """
+        Registers a callable notified with each newly published ruleset, on the watcher's thread.
+        Exceptions it raises are logged, and do not keep the other listeners from being notified.
+
+        :param listener: The callable to notify.
+        """
+        self._listeners.append(listener)
+
+    def check(self) -> bool:
+        """
+        Reloads the ruleset if the data files changed since the last check.
+
+        :return: Whether a new ruleset was published.
+        """
+        signature = self._stat()
+        if signature == self._signature:
+            return False
+        # Taken before loading, so a write racing with the load is picked up on the next check
+        self._signature = signature
+
+        try:
+            rps_logic = RPSLogic(self.short_names_path, self.relationship_path)
+        except (ConfigurationError, OSError, ValueError, KeyError) as e:
+            # Possibly a file caught mid-write; its next modification triggers another attempt
+            self.last_error = e
+            return False
+
+        self.current = rps_logic
+        self.version += 1
+        self.last_error = None
+        for listener in self._listeners:
+            try:
+                listener(rps_logic)
+            except Exception:
+                _logger.exception('Ruleset listener %r failed.', listener)
+        return True
+
+    def start(self):
+        """
+        Starts polling the data files in a background thread.
+        """
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._poll, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops the background thread.
+        """
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _poll(self):
+        """
+        The background thread's loop.
+        """
+        while not self._stop.wait(self.poll_interval):
+            self.check()
+
+    def _stat(self) -> Tuple[Optional[Tuple[int, int]], ...]:
+        """
+        :return: The modification time and size of each data file (None for a missing file).
+        """
+        signature = []
+        for path in (self.short_names_path, self.relationship_path):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                signature.append(None)
+            else:
+                signature.append((stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
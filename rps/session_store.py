@@ -0,0 +1,314 @@
+"""
+This module provides the SessionStore class, which keeps long-lived game sessions between requests
+while bounding the memory that abandoned sessions can hold.
+
+Sessions live in an OrderedDict kept in least-recently-used order, so lookups, refreshes and LRU
+evictions are all O(1). Expiry is tracked in a min-heap holding a single (expiry, key) item per
+session: touching a session only updates its entry, and the heap item is rescheduled lazily when it
+reaches the top. A background thread sweeps expired sessions periodically; lookups also treat an
+expired session as missing, so nothing depends on the sweep's timing.
+"""
+
+import heapq
+import sys
+import threading
+import time
+from collections import OrderedDict
+from types import MemberDescriptorType
+from typing import Any, Callable, Iterable, Optional
+
+
+def deep_sizeof(obj: Any, exclude: Iterable[Any] = ()) -> int:
+    """
+    Estimates the memory held by an object and everything it references. Classes and other
+    callables (functions, bound methods) are code shared between objects, and are not counted.
+
+    :param obj: The object to measure.
+    :param exclude: Objects shared with others (e.g. the game logic), which are not counted.
+    :return: The approximate size in bytes.
+    """
+    seen = {id(excluded) for excluded in exclude}
+    pending = [obj]
+    total = 0
+    while pending:
+        current = pending.pop()
+        if id(current) in seen or callable(current):
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+
+        if isinstance(current, dict):
+            pending.extend(current.keys())
+            pending.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            pending.extend(current)
+        instance_dict = getattr(current, '__dict__', None)
+        if isinstance(instance_dict, dict) and id(instance_dict) not in seen:
+            # Attribute names are interned and shared, only the values belong to the object
+            seen.add(id(instance_dict))
+            total += sys.getsizeof(instance_dict)
+            pending.extend(instance_dict.values())
+        for cls in type(current).__mro__:
+            slots = cls.__dict__.get('__slots__', ())
+            for slot in (slots,) if isinstance(slots, str) else slots:
+                # Read slots through their descriptors, bypassing any __getattr__
+                descriptor = cls.__dict__.get(slot)
+                if isinstance(descriptor, MemberDescriptorType):
+                    try:
+                        pending.append(descriptor.__get__(current, cls))
+                    except AttributeError:
+                        pass  # Unset slot
+    return total
+
+
+class _Entry:
+    """
+    A stored session and its bookkeeping.
+    """
+    __slots__ = ('value', 'ttl', 'expires_at', 'scheduled_at', 'size')
+
+    def __init__(self, value: Any, ttl: float, expires_at: float, size: int):
+        self.value = value
+        self.ttl = ttl
+        self.expires_at = expires_at
+        # The expiry time of this session's item in the heap
+        self.scheduled_at = expires_at
+        self.size = size
+
+
+class SessionStore:
+    """
+    A thread-safe store of sessions with per-session time-to-live and global caps on the number of
+    sessions and their total memory. Accessing a session extends its time-to-live.
+
+    Attributes:
+        ttl (float): The default time-to-live in seconds.
+        max_sessions (int): The maximum number of sessions, or None for no limit.
+        max_bytes (int): The maximum total estimated size of the sessions, or None for no limit.
+        total_bytes (int): The total estimated size of the stored sessions.
+        expired (int): The number of sessions removed because their time-to-live passed.
+        evicted (int): The number of sessions removed to stay within the caps.
+    """
+
+    def __init__(self, ttl: float = 1800.0, max_sessions: int = None, max_bytes: int = None,
+                 size_of: Callable[[Any], int] = None, sweep_interval: float = 1.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        :param ttl: The default time-to-live in seconds.
+        :param max_sessions: The maximum number of sessions, or None for no limit.
+        :param max_bytes: The maximum total estimated size of the sessions, or None for no limit.
+        :param size_of: Estimates the size of a session; defaults to `deep_sizeof` when a memory
+         cap is set. Sizes are estimated when a session is stored.
+        :param sweep_interval: Seconds between the background thread's sweeps.
+        :param clock: The time source, in seconds.
+        """
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.sweep_interval = sweep_interval
+        self.total_bytes = 0
+        self.expired = 0
+        self.evicted = 0
+        self._size_of = size_of or (deep_sizeof if max_bytes is not None else None)
+        self._clock = clock
+        self._entries: 'OrderedDict[str, _Entry]' = OrderedDict()  # Least recently used first
+        self._heap = []  # (expiry time, key) items, one per session
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread = None
+
+    def put(self, key: str, value: Any, ttl: float = None):
+        """
+        Stores a session, replacing any session with the same key, and evicts the least recently
+        used sessions if a cap is exceeded.
+
+        :param key: The session's key.
+        :param value: The session.
+        :param ttl: The session's time-to-live in seconds; defaults to the store's.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        size = self._size_of(value) if self._size_of is not None else 0
+        with self._lock:
+            expires_at = self._clock() + ttl
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = _Entry(value, ttl, expires_at, size)
+                self._entries[key] = entry
+                heapq.heappush(self._heap, (expires_at, key))
+            else:
+                self.total_bytes -= entry.size
+                entry.value, entry.ttl, entry.expires_at, entry.size = value, ttl, expires_at, size
+                self._entries.move_to_end(key)
+                if expires_at < entry.scheduled_at:
+                    # The heap item would fire too late; the old item becomes stale
+                    entry.scheduled_at = expires_at
+                    heapq.heappush(self._heap, (expires_at, key))
+            self.total_bytes += size
+            self._enforce_caps()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Looks up a session and extends its time-to-live.
+
+        :param key: The session's key.
+        :param default: Returned if there is no such session or it has expired.
+        :return: The session.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            now = self._clock()
+            if entry.expires_at <= now:
+                self._remove(key)
+                self.expired += 1
+                return default
+            entry.expires_at = now + entry.ttl
+            self._entries.move_to_end(key)
+            return entry.value
+
+    def pop(self, key: str, default: Any = None) -> Any:
+        """
+        Removes a session.
+
+        :param key: The session's key.
+        :param default: Returned if there is no such session.
+        :return: The removed session.
+        """
+        with self._lock:
+            entry = self._remove(key)
+            return default if entry is None else entry.value
+
+    def update_size(self, key: str):
+        """
+        Re-estimates the size of a session that changed in place, and evicts the least recently
+        used sessions if the memory cap is now exceeded. Does nothing without a size estimator.
+
+        :param key: The session's key.
+        """
+        if self._size_of is None:
+            return
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            value = entry.value
+        size = self._size_of(value)
+        with self._lock:
+            if self._entries.get(key) is entry:
+                self.total_bytes += size - entry.size
+                entry.size = size
+                self._enforce_caps()
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any):
+        self.put(key, value)
+
+    def __delitem__(self, key: str):
+        if self.pop(key, _MISSING) is _MISSING:
+            raise KeyError(key)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry.expires_at > self._clock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def sweep(self) -> int:
+        """
+        Removes all expired sessions.
+
+        :return: The number of sessions removed.
+        """
+        removed = 0
+        with self._lock:
+            now = self._clock()
+            heap = self._heap
+            while heap and heap[0][0] <= now:
+                scheduled_at, key = heapq.heappop(heap)
+                entry = self._entries.get(key)
+                if entry is None or entry.scheduled_at != scheduled_at:
+                    continue  # Removed, or rescheduled with an earlier item
+                if entry.expires_at > now:
+                    # Touched since it was scheduled
+                    entry.scheduled_at = entry.expires_at
+                    heapq.heappush(heap, (entry.expires_at, key))
+                    continue
+                self._remove(key)
+                removed += 1
+            self.expired += removed
+            self._compact_heap()
+        return removed
+
+    def start(self):
+        """
+        Starts sweeping expired sessions in a background thread.
+        """
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sweep_periodically, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops the background thread.
+        """
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _sweep_periodically(self):
+        """
+        The background thread's loop.
+        """
+        while not self._stop.wait(self.sweep_interval):
+            self.sweep()
+
+    def _enforce_caps(self):
+        """
+        Evicts the least recently used sessions until the caps are met, keeping at least the most
+        recently stored one. Must hold the lock.
+        """
+        entries = self._entries
+        while len(entries) > 1 and (
+                (self.max_sessions is not None and len(entries) > self.max_sessions)
+                or (self.max_bytes is not None and self.total_bytes > self.max_bytes)):
+            _, entry = entries.popitem(last=False)
+            self.total_bytes -= entry.size
+            self.evicted += 1
+        self._compact_heap()
+
+    def _compact_heap(self):
+        """
+        Rebuilds the heap once most of its items belong to removed sessions, which would otherwise
+        linger until their expiry. Must hold the lock.
+        """
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = [(entry.scheduled_at, key) for key, entry in self._entries.items()]
+            heapq.heapify(self._heap)
+
+    def _remove(self, key: str) -> Optional[_Entry]:
+        """
+        Removes a session; its heap item is discarded when it reaches the top. Must hold the lock.
+
+        :param key: The session's key.
+        :return: The removed entry, or None if there was no such session.
+        """
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry.size
+        return entry
+
+
+# Distinguishes a missing session from a stored None
+_MISSING = object()
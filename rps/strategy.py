@@ -5,22 +5,46 @@ Each strategy implements the `execute` method to return a chosen weapon based on
  strategy's logic.
 """
 
+import itertools
 import random
+import threading
 from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Type
 
 from rps.exceptions import MaxAttemptsExceededError, FailedWeaponChoiceException
+from rps.round_history import RoundHistory
 from rps.rps_logic import RPSLogic
 from rps.user_input import get_user_input_with_verification
 
+# Guards the creation of RandomStrategy's per-thread generators
+_THREAD_RNG_LOCK = threading.Lock()
+_get_ident = threading.get_ident
+
 
 class Strategy(ABC):
     """
     Abstract base class representing a strategy for selecting a weapon in the Rock-Paper-Scissors
      game.
 
+    Strategies with internal state (such as random number generators or move statistics) expose it
+    through `get_state` and `set_state`, so that long runs can be checkpointed and resumed.
+
+    Strategies that adapt to past rounds set `uses_history`; a game then records its rounds in a
+    shared RoundHistory and hands it to them through `attach_history` before the first round.
+
+    Stationary strategies, which draw every move independently from a fixed distribution, can
+    declare it through `move_distribution`, so their expected results can be computed exactly
+    instead of simulated (see `rps.cross_table`).
+
     Attributes:
         name (str): The name of the strategy.
+        uses_history (bool): Whether the strategy wants the game's round history.
+        history (RoundHistory): The game's round history, once attached.
+        seat (int): The strategy's player in the attached history (1 or 2).
     """
+    uses_history: bool = False
+    history: RoundHistory = None
+    seat: int = None
 
     def __init__(self, strategy_name: str):
         """
@@ -38,17 +62,90 @@ class Strategy(ABC):
         :return: The chosen weapon as a string.
         """
 
+    def move_distribution(self, game_logic: RPSLogic) -> Optional[List[float]]:
+        """
+        Declares the fixed distribution every move is drawn from, if there is one. Strategies
+        whose moves depend on the rounds played, or on each other, return None.
+
+        :param game_logic: The game logic.
+        :return: The probability of each weapon id, or None.
+        """
+        return None
+
+    def attach_history(self, history: RoundHistory, seat: int):
+        """
+        Gives the strategy the round history of the game it is playing.
+
+        :param history: The game's round history, updated after every round.
+        :param seat: The strategy's player in the history: 1 for the first player, 2 for the second.
+        """
+        self.history = history
+        self.seat = seat
+
+    def get_state(self) -> dict:
+        """
+        Returns the strategy's internal state. Stateless strategies return an empty dictionary.
+
+        :return: A picklable dictionary that `set_state` can restore.
+        """
+        return {}
+
+    def set_state(self, state: dict):
+        """
+        Restores internal state previously returned by `get_state`.
+
+        :param state: The state to restore.
+        """
+
 
 class RandomStrategy(Strategy):
     """
     A strategy that selects a weapon randomly.
+
+    The strategy's random number generator (about 2.5 KB of state) is only created when it is
+    first used, which keeps strategies of idle games, e.g. in a session store, small.
+
+    Generators are never shared between threads. The first thread to use the strategy gets the
+    generator seeded with the strategy's seed, so single-threaded runs are reproducible; any other
+    thread gets its own generator, seeded from the strategy's seed and the order in which threads
+    first used it.
+
+    Attributes:
+        rng (random.Random): The calling thread's random number generator.
     """
 
-    def __init__(self):
+    def __init__(self, seed: int = None):
         """
         Initializes a RandomStrategy with the name 'Random'.
+
+        :param seed: Seeds the strategy's random number generator. If not provided, the seed is
+         drawn from the global `random` module, so seeding it makes a run reproducible.
         """
         super().__init__('Random')
+        self._seed = random.getrandbits(64) if seed is None else seed
+        self._rng: random.Random = None
+        self._owner: int = None  # The id of the thread using `_rng`
+        self._other_threads: threading.local = None
+        self._thread_count = 0
+
+    @property
+    def rng(self) -> random.Random:
+        """
+        :return: The calling thread's random number generator, created on first use.
+        """
+        if self._owner == threading.get_ident():
+            return self._rng
+        with _THREAD_RNG_LOCK:
+            if self._rng is None:
+                self._rng, self._owner = random.Random(self._seed), threading.get_ident()
+                return self._rng
+            if self._other_threads is None:
+                self._other_threads = threading.local()
+            local = self._other_threads
+            if not hasattr(local, 'rng'):
+                self._thread_count += 1
+                local.rng = random.Random(f'{self._seed}/{self._thread_count}')
+            return local.rng
 
     def execute(self, game_logic: RPSLogic) -> str:
         """
@@ -57,8 +154,87 @@ class RandomStrategy(Strategy):
         :param game_logic: The game logic containing weapon options.
         :return: The randomly chosen weapon as a string.
         """
-        # Use Python's random.choice to select a weapon from available options
-        return random.choice(game_logic.options)
+        # Use the calling thread's generator to select a weapon from available options
+        rng = self._rng if self._owner == _get_ident() else self.rng
+        return rng.choice(game_logic.options)
+
+    def move_distribution(self, game_logic: RPSLogic) -> List[float]:
+        """
+        :param game_logic: The game logic.
+        :return: The uniform distribution over the weapons.
+        """
+        num_weapons = len(game_logic.options)
+        return [1.0 / num_weapons] * num_weapons
+
+    def get_state(self) -> dict:
+        """
+        :return: The state of the calling thread's random number generator, or just the
+         strategy's seed if it hasn't been used yet.
+        """
+        if self._rng is None:
+            return {'seed': self._seed}
+        return {'rng': self.rng.getstate()}
+
+    def set_state(self, state: dict):
+        """
+        Restores the calling thread's generator, or reseeds the strategy, discarding the
+        generators of all threads.
+
+        :param state: A state returned by `get_state`.
+        """
+        if 'rng' in state:
+            self.rng.setstate(state['rng'])
+        else:
+            self._seed, self._rng, self._owner = state['seed'], None, None
+            self._other_threads, self._thread_count = None, 0
+
+
+class MixedStrategy(RandomStrategy):
+    """
+    A strategy that draws each weapon with a fixed probability, proportional to its weight.
+    Weapons without a weight are never played.
+    """
+
+    def __init__(self, weights: Dict[str, float], seed: int = None):
+        """
+        Initializes a MixedStrategy with the name 'Mixed'.
+
+        :param weights: The weight of each weapon, by short name.
+        :param seed: Seeds the strategy's random number generator (see `RandomStrategy`).
+        :raises ValueError: If a weight is negative or no weight is positive.
+        """
+        super().__init__(seed)
+        self.name = 'Mixed'
+        if any(weight < 0 for weight in weights.values()) or not sum(weights.values()) > 0:
+            raise ValueError('Weights must be non-negative, and at least one must be positive.')
+        self.weights = dict(weights)
+        # The cumulative weights in the order of a ruleset's options, computed once per ruleset
+        self._cumulative = (None, None)
+
+    def execute(self, game_logic: RPSLogic) -> str:
+        """
+        :param game_logic: The game logic containing weapon options.
+        :return: A weapon drawn according to the weights.
+        """
+        cached_logic, cumulative = self._cumulative
+        if cached_logic is not game_logic:
+            cumulative = list(itertools.accumulate(
+                self.weights.get(weapon, 0.0) for weapon in game_logic.options))
+            self._cumulative = (game_logic, cumulative)
+        rng = self._rng if self._owner == _get_ident() else self.rng
+        return rng.choices(game_logic.options, cum_weights=cumulative)[0]
+
+    def move_distribution(self, game_logic: RPSLogic) -> List[float]:
+        """
+        :param game_logic: The game logic.
+        :return: The weights of the ruleset's weapons, normalized.
+        :raises ValueError: If no weapon of the ruleset has a positive weight.
+        """
+        weights = [self.weights.get(weapon, 0.0) for weapon in game_logic.options]
+        total = sum(weights)
+        if not total > 0:
+            raise ValueError('No weapon of the ruleset has a positive weight.')
+        return [weight / total for weight in weights]
 
 
 class UserInputStrategy(Strategy):
@@ -81,21 +257,34 @@ class UserInputStrategy(Strategy):
         :raises FailedWeaponChoiceException: If the user fails to provide a valid input after
          multiple attempts.
         """
-        # Formatting the weapon options for user display
-        separator: str = '\n\t'
-        formatted_options = separator + separator.join(
-            f'{short_name}- {full_name}'
-            for short_name, full_name in game_logic.short_names_to_full_names.items()
-        )
+        # The matcher is compiled once per ruleset and already holds the rendered prompt
+        matcher = game_logic.input_matcher
 
         try:
-            # Prompt the user to choose a weapon, with input verification for valid choices
-            user_prompt = f'Choose from the following options: {formatted_options}\n'
-            return get_user_input_with_verification(
-                message=user_prompt, options=game_logic.options)
+            # Prompt the user to choose a weapon, accepting short names, full names and prefixes
+            return get_user_input_with_verification(message=matcher.prompt, matcher=matcher)
 
         except MaxAttemptsExceededError as error:
             # Raise a specific exception if the user exceeds allowed attempts for valid input
             raise FailedWeaponChoiceException(
                 'Invalid weapon choice by UserInput Strategy'
             ) from error
+
+
+# Strategies that can be referred to by name, e.g. by tournament workers on other machines
+STRATEGIES: Dict[str, Type[Strategy]] = {
+    'random': RandomStrategy,
+}
+
+
+def register_strategy(key: str):
+    """
+    Registers a strategy class under a name, so it can be instantiated by name.
+
+    :param key: The name to register the strategy under.
+    :return: A class decorator registering the strategy.
+    """
+    def decorator(strategy_class: Type[Strategy]) -> Type[Strategy]:
+        STRATEGIES[key] = strategy_class
+        return strategy_class
+    return decorator
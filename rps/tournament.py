@@ -0,0 +1,156 @@
+"""
+This module provides the Tournament class, which plays a round-robin between strategies: every
+pair of strategies plays a silent Game of a fixed number of rounds.
+
+Long tournaments can be checkpointed periodically and resumed exactly where they stopped, including
+the game in progress, the strategies' internal state and the random number generators' states.
+"""
+
+import itertools
+import random
+from typing import Callable, Dict, List, Tuple
+
+from rps.checkpoint import Checkpointer
+from rps.exceptions import CheckpointError
+from rps.game import Game
+from rps.player import Player
+from rps.rps_logic import RPSLogic
+from rps.strategy import Strategy
+
+
+class Tournament:
+    """
+    A round-robin tournament between strategies.
+
+    Attributes:
+        rps_logic (RPSLogic): The game logic shared by all games.
+        strategy_factories (dict): Maps each contestant's name to a callable creating a fresh
+         instance of its strategy.
+        rounds_per_game (int): The number of rounds of each game.
+        pairings (list): The (name1, name2) pairs, in the order they are played.
+        results (dict): Maps the index of each completed pairing to its final (score1, score2).
+        checkpointer (Checkpointer): Writes periodic checkpoints, if enabled.
+    """
+
+    def __init__(self, rps_logic: RPSLogic, strategy_factories: Dict[str, Callable[[], Strategy]],
+                 rounds_per_game: int, checkpoint_path: str = None,
+                 checkpoint_interval: float = 5.0):
+        """
+        :param rps_logic: The game logic shared by all games.
+        :param strategy_factories: Maps each contestant's name to a strategy factory.
+        :param rounds_per_game: The number of rounds of each game.
+        :param checkpoint_path: Where to write checkpoints; checkpointing is disabled if not given.
+        :param checkpoint_interval: The minimum number of seconds between checkpoints.
+        """
+        self.rps_logic = rps_logic
+        self.strategy_factories = strategy_factories
+        self.rounds_per_game = rounds_per_game
+        self.pairings: List[Tuple[str, str]] = list(itertools.combinations(strategy_factories, 2))
+        self.results: Dict[int, Tuple[int, int]] = {}
+        self.checkpointer = (Checkpointer(checkpoint_path, checkpoint_interval)
+                             if checkpoint_path else None)
+
+        # The game in progress and the index of its pairing
+        self._game: Game = None
+        self._game_index: int = None
+
+    def _new_game(self, index: int) -> Game:
+        """
+        :param index: The index of the pairing.
+        :return: A silent game between fresh instances of the pairing's strategies.
+        """
+        name1, name2 = self.pairings[index]
+        player1 = Player(name1, self.strategy_factories[name1](), self.rps_logic)
+        player2 = Player(name2, self.strategy_factories[name2](), self.rps_logic)
+        return Game(player1, player2, self.rps_logic, num_rounds=self.rounds_per_game,
+                    verbose=False)
+
+    def run(self, resume: bool = True) -> Dict[str, Dict[str, int]]:
+        """
+        Plays all remaining pairings. If checkpointing is enabled and a checkpoint exists, the
+        tournament first resumes from it; the checkpoint is removed once the tournament completes.
+
+        :param resume: Whether to resume from an existing checkpoint.
+        :return: The standings (see `standings`).
+        :raises CheckpointError: If the checkpoint belongs to a different tournament.
+        """
+        if resume and self.checkpointer is not None:
+            state = self.checkpointer.load()
+            if state is not None:
+                self.set_state(state)
+
+        for index in range(len(self.pairings)):
+            if index in self.results:
+                continue
+            if self._game_index != index:
+                self._game, self._game_index = self._new_game(index), index
+
+            game = self._game
+            while game.rounds_played < game.num_rounds:
+                game.play_one_round()
+                if self.checkpointer is not None:
+                    self.checkpointer.maybe_save(self.get_state)
+
+            self.results[index] = (game.player1.score, game.player2.score)
+            self._game, self._game_index = None, None
+
+        if self.checkpointer is not None:
+            self.checkpointer.remove()
+        return self.standings()
+
+    def standings(self) -> Dict[str, Dict[str, int]]:
+        """
+        :return: Per contestant, the number of games won, lost and tied and the total number of
+         rounds won, ordered by games won and then rounds won.
+        """
+        table = {name: {'won': 0, 'lost': 0, 'tied': 0, 'rounds_won': 0}
+                 for name in self.strategy_factories}
+        for index, (score1, score2) in self.results.items():
+            name1, name2 = self.pairings[index]
+            table[name1]['rounds_won'] += score1
+            table[name2]['rounds_won'] += score2
+            if score1 == score2:
+                table[name1]['tied'] += 1
+                table[name2]['tied'] += 1
+            else:
+                winner, loser = (name1, name2) if score1 > score2 else (name2, name1)
+                table[winner]['won'] += 1
+                table[loser]['lost'] += 1
+        return dict(sorted(table.items(),
+                           key=lambda item: (-item[1]['won'], -item[1]['rounds_won'])))
+
+    def get_state(self) -> dict:
+        """
+        Returns the complete run state: completed pairings, the game in progress (with its players'
+        and strategies' states) and the global random number generator's state.
+
+        :return: A picklable dictionary that `set_state` can restore.
+        """
+        return {
+            'pairings': self.pairings,
+            'rounds_per_game': self.rounds_per_game,
+            'results': dict(self.results),
+            'game_index': self._game_index,
+            'game': self._game.get_state() if self._game is not None else None,
+            'random': random.getstate(),
+        }
+
+    def set_state(self, state: dict):
+        """
+        Restores a state previously returned by `get_state`.
+
+        :param state: The state to restore.
+        :raises CheckpointError: If the state belongs to a tournament with different contestants
+         or game length.
+        """
+        if (list(state['pairings']) != self.pairings
+                or state['rounds_per_game'] != self.rounds_per_game):
+            raise CheckpointError('The checkpoint belongs to a different tournament.')
+
+        self.results = dict(state['results'])
+        self._game, self._game_index = None, state['game_index']
+        if state['game'] is not None:
+            # Creating the strategies draws from the global generator, so restore it afterwards
+            self._game = self._new_game(self._game_index)
+            self._game.set_state(state['game'])
+        random.setstate(state['random'])
@@ -7,22 +7,26 @@ These functions are designed to provide robust user input handling and validatio
 """
 
 from rps.exceptions import InvalidInputError, MaxAttemptsExceededError
+from rps.input_matcher import InputMatcher
 
 
 def get_user_input_with_verification(message: str, options: list = None,
                                      verification_method: callable = None,
-                                     attempts: int = 3) -> str:
+                                     attempts: int = 3, matcher: InputMatcher = None) -> str:
     """
     Prompts the user for input and verifies it based on provided options or a verification method.
 
     If both `options` and `verification_method` are not provided, any input will be accepted.
     If `options` are provided, the input must match one of the options.
     If a `verification_method` is provided, the input must pass the verification method.
+    If a `matcher` is provided, the input must resolve to a weapon, and the resolved short name is
+    returned instead of the raw input.
 
     :param message: The prompt message to show to the user.
     :param options: A list of valid options to verify user input against.
     :param verification_method: A callable that verifies the user input.
     :param attempts: Number of attempts the user has to provide valid input.
+    :param matcher: An InputMatcher used to resolve the input to a weapon short name.
     :return: The user's valid input.
     :raises MaxAttemptsExceededError: If the user fails to provide valid input within the allowed
      number of attempts.
@@ -36,6 +40,9 @@ def get_user_input_with_verification(message: str, options: list = None,
         try:
             # Verify user input based on provided options or a custom verification method
             verify_user_input(user_input, options, verification_method)
+            if matcher is not None:
+                # Resolve aliases (full names, other casing, prefixes) to the short name
+                return matcher.match(user_input)
             return user_input  # Return the valid input if no exception was raised
         except InvalidInputError as error:
             # Print the error message and let the user try again
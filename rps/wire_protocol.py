@@ -0,0 +1,333 @@
+"""
+This module provides a compact binary protocol for bot clients that play very many rounds per
+connection, together with its asyncio server and a blocking client library.
+
+Every frame is a 4-byte big-endian payload length followed by the payload, whose first byte is the
+message type:
+
+    HELLO    (client)  No body. Answered with RULESET.
+    RULESET  (server)  u8 weapon count, then per weapon id: u8 length + UTF-8 short name.
+    PLAY     (client)  One byte per round: the client's weapon id (see `RPSLogic.weapon_ids`).
+    RESULTS  (server)  u64 client score, u64 computer score, then N bytes of the computer's weapon
+                       ids and N bytes of round results (see `RPSLogic.compare`).
+    ERROR    (server)  A UTF-8 error message.
+
+A single PLAY frame carries any number of rounds, and clients may pipeline several frames before
+reading the replies, which come back in order. Each connection is one game against a
+ComputerPlayer.
+
+Weapon ids, the weapon count and name lengths each fit in one byte, so the protocol serves
+rulesets of at most `MAX_WEAPONS` weapons whose short names are at most 255 bytes of UTF-8;
+`WireServer` rejects larger rulesets when it is created. Larger rulesets are served by the
+HTTP/JSON API (see `rps.http_api`).
+"""
+
+import argparse
+import asyncio
+import socket
+import struct
+from typing import Iterable, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from rps.exceptions import ConfigurationError
+from rps.http_api import GameSession, HTTPError
+from rps.rps_logic import RPSLogic
+
+MSG_HELLO = 1
+MSG_RULESET = 2
+MSG_PLAY = 3
+MSG_RESULTS = 4
+MSG_ERROR = 5
+
+# Frames with larger payloads are rejected; this also bounds the rounds per PLAY frame
+MAX_FRAME_BYTES = 1 << 24
+# The weapon count, and so every weapon id, is sent as a single byte
+MAX_WEAPONS = 255
+
+_LENGTH = struct.Struct('>I')
+_SCORES = struct.Struct('>QQ')
+
+
+class ProtocolError(Exception):
+    """
+    Raised when a peer sends a malformed frame, or the server answers with an ERROR frame.
+    """
+
+
+def encode_frame(message_type: int, body: bytes = b'') -> bytes:
+    """
+    :param message_type: One of the MSG_* constants.
+    :param body: The message body.
+    :return: The framed message.
+    """
+    return _LENGTH.pack(len(body) + 1) + bytes((message_type,)) + body
+
+
+def encode_ruleset(options: Sequence[str]) -> bytes:
+    """
+    :param options: The weapon short names, in id order.
+    :return: The body of a RULESET message.
+    :raises ConfigurationError: If there are more than `MAX_WEAPONS` weapons, or a short name is
+     longer than 255 bytes.
+    """
+    if len(options) > MAX_WEAPONS:
+        raise ConfigurationError(f'The wire protocol supports at most {MAX_WEAPONS} weapons, not '
+                                 f'{len(options)}.')
+    encoded = [option.encode('utf-8') for option in options]
+    for option, name in zip(options, encoded):
+        if len(name) > 255:
+            raise ConfigurationError(f'Weapon short name {option[:20]!r}... is longer than 255 '
+                                     f'bytes.')
+    return bytes((len(encoded),)) + b''.join(bytes((len(name),)) + name for name in encoded)
+
+
+def decode_ruleset(body: memoryview) -> List[str]:
+    """
+    :param body: The body of a RULESET message.
+    :return: The weapon short names, in id order.
+    """
+    options, offset = [], 1
+    for _ in range(body[0]):
+        length = body[offset]
+        options.append(bytes(body[offset + 1:offset + 1 + length]).decode('utf-8'))
+        offset += 1 + length
+    return options
+
+
+def decode_results(body: memoryview) -> Tuple[Tuple[int, int], np.ndarray, np.ndarray]:
+    """
+    Decodes a RESULTS message without copying its round data.
+
+    :param body: The body of a RESULTS message.
+    :return: The (client, computer) scores, the computer's weapon ids and the round results, as
+     uint8 arrays viewing the body.
+    """
+    scores = _SCORES.unpack_from(body)
+    rounds = np.frombuffer(body, dtype=np.uint8, offset=_SCORES.size)
+    count = len(rounds) // 2
+    return scores, rounds[:count], rounds[count:]
+
+
+class WireServer:
+    """
+    Serves the binary protocol over TCP.
+
+    Attributes:
+        rps_logic (RPSLogic): The game logic shared by all connections.
+        address (tuple): The (host, port) the server listens on, once started.
+    """
+
+    def __init__(self, rps_logic: RPSLogic = None, host: str = '127.0.0.1', port: int = 8081):
+        """
+        :param rps_logic: The game logic; loaded from the data files if not provided.
+        :param host: The address to listen on.
+        :param port: The port to listen on (0 picks a free port).
+        :raises ConfigurationError: If the ruleset is too large for the protocol (see
+         `encode_ruleset`).
+        """
+        self.rps_logic = rps_logic or RPSLogic()
+        self.address: Tuple[str, int] = (host, port)
+        self._server: asyncio.AbstractServer = None
+        self._num_weapons = len(self.rps_logic.options)
+        self._ruleset_frame = encode_frame(MSG_RULESET, encode_ruleset(self.rps_logic.options))
+
+    async def start(self):
+        """
+        Starts listening for connections.
+        """
+        self._server = await asyncio.start_server(self._handle_connection, *self.address)
+        self.address = self._server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self):
+        """
+        Starts the server if needed and serves until cancelled.
+        """
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        """
+        Stops listening and waits for the server to close.
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader,
+                                 writer: asyncio.StreamWriter):
+        """
+        Plays a game over a connection until the client closes it or sends a malformed frame.
+        """
+        peer = writer.get_extra_info('peername')
+        session = GameSession(f'{peer[0]}:{peer[1]}' if peer else 'wire', self.rps_logic)
+        try:
+            while True:
+                (length,) = _LENGTH.unpack(await reader.readexactly(_LENGTH.size))
+                if not 0 < length <= MAX_FRAME_BYTES:
+                    writer.write(encode_frame(MSG_ERROR, b'Invalid frame length.'))
+                    return
+                frame = await reader.readexactly(length)
+                try:
+                    writer.write(self.handle_frame(session, memoryview(frame)))
+                except ProtocolError as e:
+                    writer.write(encode_frame(MSG_ERROR, str(e).encode('utf-8')))
+                    return
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            return
+        finally:
+            writer.close()
+
+    def handle_frame(self, session: GameSession, frame: memoryview) -> bytes:
+        """
+        Answers a single client frame. The moves of a PLAY frame are read in place, without
+        copying or decoding them one by one.
+
+        :param session: The connection's game.
+        :param frame: The frame payload (message type and body).
+        :return: The framed reply.
+        :raises ProtocolError: If the frame is malformed or contains invalid moves.
+        """
+        message_type = frame[0]
+        if message_type == MSG_HELLO:
+            return self._ruleset_frame
+        if message_type != MSG_PLAY:
+            raise ProtocolError(f'Unexpected message type {message_type}.')
+
+        client_ids = np.frombuffer(frame, dtype=np.uint8, offset=1)
+        if len(client_ids) and client_ids.max() >= self._num_weapons:
+            raise ProtocolError('Invalid weapon id.')
+        try:
+            computer_ids, results = session.play_ids(client_ids)
+        except HTTPError as e:
+            raise ProtocolError(str(e)) from e
+
+        body_length = 1 + _SCORES.size + 2 * len(client_ids)
+        return b''.join((_LENGTH.pack(body_length), bytes((MSG_RESULTS,)),
+                         _SCORES.pack(session.client_score, session.computer_score),
+                         computer_ids.astype(np.uint8, copy=False).tobytes(),
+                         results.tobytes()))
+
+
+class WireClient:
+    """
+    A blocking client for the binary protocol. Each client plays one game against the computer.
+
+    Attributes:
+        options (list): The weapon short names, in id order, as announced by the server.
+        weapon_ids (dict): Maps weapon short names to their ids.
+        scores (tuple): The (client, computer) scores after the last reply.
+    """
+
+    def __init__(self, host: str, port: int, timeout: float = None):
+        """
+        Connects to a server and fetches its ruleset.
+
+        :param host: The server's host.
+        :param port: The server's port.
+        :param timeout: The socket timeout in seconds.
+        :raises ProtocolError: If the server answers unexpectedly.
+        """
+        self._sock = socket.create_connection((host, port), timeout)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._stream = self._sock.makefile('rb')
+        self.scores = (0, 0)
+
+        self._sock.sendall(encode_frame(MSG_HELLO))
+        self.options = decode_ruleset(self._expect(MSG_RULESET))
+        self.weapon_ids = {short: index for index, short in enumerate(self.options)}
+
+    def play(self, moves: Iterable[str]) -> Tuple[List[str], List[int]]:
+        """
+        Plays one round per move in a single frame.
+
+        :param moves: The client's moves (short names).
+        :return: The computer's moves and the round results (see `RPSLogic.compare`).
+        :raises ProtocolError: If the server rejects the moves.
+        """
+        computer_ids, results = self.play_ids(bytes(self.weapon_ids[move] for move in moves))
+        return [self.options[weapon_id] for weapon_id in computer_ids.tolist()], results.tolist()
+
+    def play_ids(self, client_ids: Union[bytes, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Plays one round per move in a single frame, with moves given as weapon ids.
+
+        :param client_ids: The client's weapon ids, one byte each.
+        :return: The computer's weapon ids and the round results, as uint8 arrays.
+        :raises ProtocolError: If the server rejects the moves.
+        """
+        return self.pipeline([client_ids])[0]
+
+    def pipeline(self, batches: Sequence[Union[bytes, np.ndarray]]
+                 ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Sends several PLAY frames before reading any reply, saving a round trip per frame.
+
+        :param batches: The weapon ids of each frame, one byte per round.
+        :return: The computer's weapon ids and the round results of each frame.
+        :raises ProtocolError: If the server rejects the moves.
+        """
+        self._sock.sendall(b''.join(encode_frame(MSG_PLAY, bytes(batch)) for batch in batches))
+        replies = []
+        for _ in batches:
+            self.scores, computer_ids, results = decode_results(self._expect(MSG_RESULTS))
+            replies.append((computer_ids, results))
+        return replies
+
+    def close(self):
+        """
+        Closes the connection.
+        """
+        self._stream.close()
+        self._sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _expect(self, message_type: int) -> memoryview:
+        """
+        Reads a frame of the expected type.
+
+        :param message_type: The expected message type.
+        :return: The frame body.
+        :raises ProtocolError: On an ERROR frame, a frame of another type, or a closed connection.
+        """
+        header = self._stream.read(_LENGTH.size)
+        if len(header) < _LENGTH.size:
+            raise ProtocolError('The server closed the connection.')
+        (length,) = _LENGTH.unpack(header)
+        frame = memoryview(self._stream.read(length))
+        if len(frame) < length:
+            raise ProtocolError('The server closed the connection.')
+        if frame[0] == MSG_ERROR:
+            raise ProtocolError(bytes(frame[1:]).decode('utf-8'))
+        if frame[0] != message_type:
+            raise ProtocolError(f'Unexpected message type {frame[0]}.')
+        return frame[1:]
+
+
+def main():
+    """
+    Runs the binary protocol server from the command line.
+    """
+    parser = argparse.ArgumentParser(description='Rock-Paper-Scissors binary protocol server.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8081)
+    args = parser.parse_args()
+
+    server = WireServer(host=args.host, port=args.port)
+    print(f'Serving on {args.host}:{args.port}')
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
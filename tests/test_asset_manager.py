@@ -6,8 +6,9 @@ managing and retrieving assets in the Rock-Paper-Scissors game.
 import unittest
 from unittest.mock import patch, mock_open
 import os
+import tempfile
 
-from rps.asset_manager import AssetManager
+from rps.asset_manager import AssetManager, AssetBundle, write_asset_bundle
 
 
 class TestAssetManager(unittest.TestCase):
@@ -41,5 +42,114 @@ class TestAssetManager(unittest.TestCase):
         self.assertEqual(result, "")
 
 
+class TestAssetManagerCache(unittest.TestCase):
+
+    def setUp(self):
+        # Arrange: A temporary assets folder with two assets
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.assets_dir = self.tmp_dir.name
+        self.write('title.txt', 'Title')
+        self.write('banner.txt', 'Banner')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write(self, filename, content, mtime_ns=None):
+        path = os.path.join(self.assets_dir, filename)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        if mtime_ns is not None:
+            os.utime(path, ns=(mtime_ns, mtime_ns))
+
+    def test_get_asset_is_cached(self):
+        am = AssetManager(assets_dir=self.assets_dir)
+        self.assertEqual(am.get_asset('title.txt'), 'Title')
+
+        # Act: A second read must not touch the file system
+        with patch('builtins.open') as mock_file:
+            result = am.get_asset('title.txt')
+
+        # Assert
+        mock_file.assert_not_called()
+        self.assertEqual(result, 'Title')
+
+    def test_changed_file_is_invalidated_by_mtime(self):
+        am = AssetManager(assets_dir=self.assets_dir, revalidate_after=0)
+        self.write('title.txt', 'Title', mtime_ns=1_000_000_000)
+        self.assertEqual(am.get_asset('title.txt'), 'Title')
+
+        # Act: Rewrite the asset with a different modification time
+        self.write('title.txt', 'New title', mtime_ns=2_000_000_000)
+
+        # Assert
+        self.assertEqual(am.get_asset('title.txt'), 'New title')
+
+    def test_lru_eviction(self):
+        # Arrange: Room for exactly one of the two assets
+        am = AssetManager(assets_dir=self.assets_dir, max_cache_bytes=6)
+
+        # Act
+        am.get_asset('title.txt')
+        am.get_asset('banner.txt')
+
+        # Assert: The least recently used asset was evicted
+        self.assertEqual(list(am._cache), ['banner.txt'])
+        self.assertLessEqual(am._cache_bytes, 6)
+
+    def test_preload(self):
+        am = AssetManager(assets_dir=self.assets_dir)
+
+        # Act
+        loaded = am.preload()
+
+        # Assert
+        self.assertEqual(loaded, 2)
+        self.assertEqual(set(am._cache), {'title.txt', 'banner.txt'})
+
+    def test_bundle(self):
+        # Arrange: Pack the assets folder into a bundle, then remove the loose files
+        bundle_path = os.path.join(self.assets_dir, 'assets.bundle')
+        self.assertEqual(write_asset_bundle(self.assets_dir, bundle_path), 2)
+        os.remove(os.path.join(self.assets_dir, 'title.txt'))
+
+        # Act
+        am = AssetManager(assets_dir=self.assets_dir, bundle_path=bundle_path)
+
+        # Assert: Assets are served from the bundle, missing ones fall back to the folder
+        self.assertEqual(am.get_asset('title.txt'), 'Title')
+        self.assertEqual(am.get_asset('missing.txt'), '')
+        self.assertEqual(sorted(am.bundle.names()), ['banner.txt', 'title.txt'])
+        am.bundle.close()
+
+    def test_rebuilt_bundle_is_remapped(self):
+        # Arrange: A non-ASCII asset, whose size in bytes differs from its length
+        self.write('title.txt', 'Tître')
+        bundle_path = os.path.join(self.assets_dir, 'assets.bundle')
+        write_asset_bundle(self.assets_dir, bundle_path)
+        am = AssetManager(assets_dir=self.assets_dir, bundle_path=bundle_path, revalidate_after=0)
+        old_bundle = am.bundle
+
+        # Act
+        self.assertEqual(am.get_asset('title.txt'), 'Tître')
+        cached_bytes = am._cache_bytes
+        self.write('title.txt', 'Rebuilt')
+        write_asset_bundle(self.assets_dir, bundle_path)
+        os.utime(bundle_path, ns=(old_bundle.mtime + 1, old_bundle.mtime + 1))
+
+        # Assert
+        self.assertEqual(cached_bytes, len('Tître'.encode('utf-8')))
+        self.assertEqual(am.get_asset('title.txt'), 'Rebuilt')
+        self.assertIsNot(am.bundle, old_bundle)
+        am.bundle.close()
+
+    def test_invalid_bundle(self):
+        bundle_path = os.path.join(self.assets_dir, 'title.txt')
+        with self.assertRaises(ValueError):
+            AssetBundle(bundle_path)
+
+    def test_shared_instance(self):
+        self.assertIs(AssetManager.shared(), AssetManager.shared())
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,93 @@
+"""
+This module contains unit tests for the BanditStrategy meta-strategy.
+"""
+
+import unittest
+
+from rps.bandit import ALGORITHMS, BanditStrategy
+from rps.game import Game
+from rps.player import Player
+from rps.rps_logic import RPSLogic
+from rps.strategy import STRATEGIES, Strategy
+
+
+class AlwaysRockStrategy(Strategy):
+    """A strategy that always picks rock."""
+
+    def __init__(self):
+        super().__init__('Always Rock')
+
+    def execute(self, game_logic):
+        return 'r'
+
+
+class TestBanditStrategy(unittest.TestCase):
+    """
+    Test cases for the BanditStrategy class.
+    """
+
+    def setUp(self):
+        self.rps_logic = RPSLogic()
+
+    def _play(self, strategy: Strategy, num_rounds: int) -> Game:
+        """
+        :return: A finished silent game of the strategy against rock.
+        """
+        game = Game(Player('Bandit', strategy, self.rps_logic),
+                    Player('Rock', AlwaysRockStrategy(), self.rps_logic), self.rps_logic,
+                    num_rounds=num_rounds, verbose=False)
+        game.play_game()
+        return game
+
+    def test_learns_to_beat_a_constant_opponent(self):
+        for algorithm in ALGORITHMS:
+            with self.subTest(algorithm=algorithm):
+                # Act
+                game = self._play(BanditStrategy(algorithm, seed=0), num_rounds=300)
+
+                # Assert: Nearly every round is won once the predictive arms lead
+                self.assertGreater(game.player1.score, 250)
+
+    def test_portfolio_size(self):
+        # Act
+        strategy = BanditStrategy(random_arms=2, equilibrium_arms=1,
+                                  frequency_decays=[1.0, 0.9, 0.8], markov_decays=[0.5])
+
+        # Assert
+        self.assertEqual(strategy.num_arms, 7)
+        self.assertEqual(strategy.arm_names[:3], ['random', 'random', 'equilibrium'])
+        self.assertEqual(strategy.arm_names[-1], 'markov(decay=0.5)')
+
+    def test_works_without_history(self):
+        strategy = BanditStrategy(seed=0)
+        self.assertIn(strategy.execute(self.rps_logic), self.rps_logic.options)
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            BanditStrategy('greedy')
+        with self.assertRaises(ValueError):
+            BanditStrategy(random_arms=0, equilibrium_arms=0, frequency_decays=(),
+                           markov_decays=())
+
+    def test_state_round_trip(self):
+        # Arrange: A strategy that has learned for a while
+        strategy = BanditStrategy('thompson', seed=1)
+        game = self._play(strategy, num_rounds=20)
+        state = strategy.get_state()
+
+        # Act: Continue the original, and restore the state into a fresh strategy in a copy of the
+        # game
+        expected = [strategy.execute(self.rps_logic) for _ in range(10)]
+        restored = BanditStrategy('thompson', seed=2)
+        restored.attach_history(game.history, 1)
+        restored.set_state(state)
+
+        # Assert
+        self.assertEqual([restored.execute(self.rps_logic) for _ in range(10)], expected)
+
+    def test_registered(self):
+        self.assertIs(STRATEGIES['bandit'], BanditStrategy)
+
+
+if __name__ == '__main__':
+    unittest.main()
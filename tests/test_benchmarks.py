@@ -0,0 +1,82 @@
+"""
+This module contains unit tests for the benchmark harness: measurement, baseline storage and the
+regression comparison.
+"""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from benchmarks.harness import (compare_results, format_ns, load_baseline, measure,
+                                run_benchmarks, save_baseline)
+
+
+class TestHarness(unittest.TestCase):
+    """
+    Test cases for the benchmark harness functions.
+    """
+
+    def test_measure(self):
+        calls = []
+        result = measure(lambda: calls.append(1), operations=10, repeats=3, target_seconds=0.001)
+
+        self.assertGreater(result['loops'], 0)
+        self.assertLessEqual(result['best_ns'], result['median_ns'])
+        self.assertGreaterEqual(len(calls), 3 * result['loops'])
+
+    def test_compare_results(self):
+        baseline = {'fast': {'best_ns': 100.0}, 'slow': {'best_ns': 100.0},
+                    'removed': {'best_ns': 1.0}}
+        results = {'fast': {'best_ns': 90.0}, 'slow': {'best_ns': 130.0},
+                   'new': {'best_ns': 5.0}}
+
+        rows = {row['name']: row for row in compare_results(results, baseline, threshold=0.2)}
+
+        # Only benchmarks present in both are compared
+        self.assertEqual(set(rows), {'fast', 'slow'})
+        self.assertFalse(rows['fast']['regressed'])
+        self.assertTrue(rows['slow']['regressed'])
+        self.assertAlmostEqual(rows['slow']['ratio'], 1.3)
+
+    def test_compare_results_per_benchmark_threshold(self):
+        baseline = {'noisy': {'best_ns': 100.0}}
+        results = {'noisy': {'best_ns': 130.0}}
+
+        rows = compare_results(results, baseline, threshold=0.2, thresholds={'noisy': 0.5})
+
+        self.assertFalse(rows[0]['regressed'])
+        self.assertEqual(rows[0]['threshold'], 0.5)
+
+    def test_save_and_load_baseline(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'baseline.json')
+            self.assertEqual(load_baseline(path), {})
+
+            save_baseline(path, {'a': {'best_ns': 1.0}})
+            save_baseline(path, {'b': {'best_ns': 2.0}})
+
+            # Saving a subset keeps previously stored results
+            self.assertEqual(load_baseline(path), {'a': {'best_ns': 1.0}, 'b': {'best_ns': 2.0}})
+
+    def test_run_benchmarks_extra_results(self):
+        benchmarks = {'plain': (lambda: (lambda: None, 1), None),
+                      'extra': (lambda: (lambda: None, 1, {'bytes_per_item': 42.0}), None)}
+        lines = []
+
+        with patch.dict('benchmarks.harness.BENCHMARKS', benchmarks, clear=True):
+            results = run_benchmarks(repeats=1, target_seconds=0.001, log=lines.append)
+
+        # Extra measurements are stored next to the timings and logged
+        self.assertNotIn('bytes_per_item', results['plain'])
+        self.assertEqual(results['extra']['bytes_per_item'], 42.0)
+        self.assertIn('bytes_per_item=42', lines[1])
+
+    def test_format_ns(self):
+        self.assertEqual(format_ns(12.0), '12.0 ns')
+        self.assertEqual(format_ns(1500.0), '1.50 us')
+        self.assertEqual(format_ns(2.5e9), '2.50 s')
+
+
+if __name__ == '__main__':
+    unittest.main()
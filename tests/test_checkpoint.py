@@ -0,0 +1,104 @@
+"""
+This module contains unit tests for checkpoint files and the Checkpointer class.
+"""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from rps.checkpoint import Checkpointer, read_checkpoint, write_checkpoint
+from rps.exceptions import CheckpointError
+
+
+class TestCheckpointFiles(unittest.TestCase):
+    """
+    Test cases for writing and reading checkpoint files.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'run.ckpt')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_round_trip(self):
+        state = {'scores': (3, 4), 'rounds': 10, 'rng': (3, tuple(range(625)), None)}
+        write_checkpoint(self.path, state)
+
+        self.assertEqual(read_checkpoint(self.path), state)
+        # No temporary file is left behind
+        self.assertEqual(os.listdir(self.tmp_dir.name), ['run.ckpt'])
+
+    def test_corrupted_payload(self):
+        write_checkpoint(self.path, {'rounds': 10})
+        with open(self.path, 'r+b') as f:
+            f.seek(-1, os.SEEK_END)
+            last = f.read(1)
+            f.seek(-1, os.SEEK_END)
+            f.write(bytes([last[0] ^ 0xFF]))
+
+        with self.assertRaises(CheckpointError):
+            read_checkpoint(self.path)
+
+    def test_not_a_checkpoint(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'definitely not a checkpoint file')
+        with self.assertRaises(CheckpointError):
+            read_checkpoint(self.path)
+
+        with open(self.path, 'wb') as f:
+            f.write(b'short')
+        with self.assertRaises(CheckpointError):
+            read_checkpoint(self.path)
+
+
+class TestCheckpointer(unittest.TestCase):
+    """
+    Test cases for the Checkpointer class.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'run.ckpt')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    @patch('rps.checkpoint.time.monotonic')
+    def test_maybe_save_respects_interval(self, mock_monotonic):
+        mock_monotonic.return_value = 100.0
+        checkpointer = Checkpointer(self.path, interval=5.0)
+        calls = []
+
+        def get_state():
+            calls.append(1)
+            return {'calls': len(calls)}
+
+        # Act & Assert: Not due yet, so the state isn't even collected
+        mock_monotonic.return_value = 103.0
+        self.assertFalse(checkpointer.maybe_save(get_state))
+        self.assertEqual(calls, [])
+
+        mock_monotonic.return_value = 105.0
+        self.assertTrue(checkpointer.maybe_save(get_state))
+        self.assertEqual(checkpointer.load(), {'calls': 1})
+
+        mock_monotonic.return_value = 106.0
+        self.assertFalse(checkpointer.maybe_save(get_state))
+
+    def test_load_and_remove(self):
+        checkpointer = Checkpointer(self.path)
+        self.assertIsNone(checkpointer.load())
+
+        checkpointer.save({'rounds': 1})
+        self.assertEqual(checkpointer.load(), {'rounds': 1})
+
+        checkpointer.remove()
+        self.assertFalse(os.path.exists(self.path))
+        checkpointer.remove()  # Removing a missing checkpoint is a no-op
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+"""
+This module contains unit tests for the expected-payoff cross-table.
+"""
+
+import unittest
+
+import numpy as np
+
+from rps.cross_table import cross_table
+from rps.rps_logic import RPSLogic
+from rps.strategy import MixedStrategy, RandomStrategy, Strategy
+
+
+class AlwaysRockStrategy(Strategy):
+    """A strategy that always picks rock, without declaring it."""
+
+    def __init__(self):
+        super().__init__('Always Rock')
+
+    def execute(self, game_logic):
+        return 'r'
+
+
+class InvalidDistributionStrategy(AlwaysRockStrategy):
+    """A strategy declaring probabilities that don't sum to 1."""
+
+    def move_distribution(self, game_logic):
+        return [0.5, 0.0, 0.0]
+
+
+class TestCrossTable(unittest.TestCase):
+    """
+    Test cases for the cross_table function.
+    """
+
+    def setUp(self):
+        self.rps_logic = RPSLogic()
+
+    def test_declared_distributions_are_exact(self):
+        # Arrange
+        factories = {
+            'random': RandomStrategy,
+            'rock': lambda: MixedStrategy({'r': 1}),
+            'paper': lambda: MixedStrategy({'p': 1}),
+            'mostly rock': lambda: MixedStrategy({'r': 3, 's': 1}),
+        }
+
+        # Act
+        table = cross_table(self.rps_logic, factories)
+
+        # Assert
+        self.assertEqual(table.names, ('random', 'rock', 'paper', 'mostly rock'))
+        self.assertFalse(table.simulated.any())
+        np.testing.assert_allclose(table.payoffs, -table.payoffs.T, atol=1e-12)
+        self.assertAlmostEqual(table.payoffs[0, 1], 0.0)
+        self.assertAlmostEqual(table.payoffs[2, 1], 1.0)
+        # Paper beats rock 3/4 of the time and loses to scissors 1/4 of the time
+        self.assertAlmostEqual(table.payoffs[2, 3], 0.5)
+        self.assertAlmostEqual(table.mean_payoffs()['paper'], (0 + 1 + 0 + 0.5) / 4)
+
+    def test_undeclared_strategies_are_simulated(self):
+        # Arrange
+        factories = {'always rock': AlwaysRockStrategy,
+                     'paper': lambda: MixedStrategy({'p': 1}),
+                     'scissors': lambda: MixedStrategy({'s': 1})}
+
+        # Act
+        table = cross_table(self.rps_logic, factories, simulation_rounds=50, max_workers=2)
+
+        # Assert: Only the pairings with the undeclared strategy are simulated
+        np.testing.assert_array_equal(table.simulated, [[False, True, True],
+                                                        [True, False, False],
+                                                        [True, False, False]])
+        self.assertEqual(table.payoffs[0, 1], -1.0)
+        self.assertEqual(table.payoffs[2, 0], -1.0)
+        self.assertEqual(table.payoffs[0, 0], 0.0)
+
+    def test_simulation_matches_the_exact_payoff(self):
+        # Arrange: The same distribution, declared or not
+        factories = {'declared': lambda: MixedStrategy({'r': 1, 'p': 1}, seed=1),
+                     'undeclared': lambda: _Undeclared({'r': 1, 'p': 1}, seed=2),
+                     'paper': lambda: MixedStrategy({'p': 1})}
+
+        # Act
+        table = cross_table(self.rps_logic, factories, simulation_rounds=4000)
+
+        # Assert: Against paper, rock loses and paper ties
+        self.assertAlmostEqual(table.payoffs[0, 2], -0.5)
+        self.assertAlmostEqual(table.payoffs[1, 2], -0.5, delta=0.05)
+
+    def test_invalid_distribution(self):
+        with self.assertRaises(ValueError):
+            cross_table(self.rps_logic, {'invalid': InvalidDistributionStrategy})
+
+
+class _Undeclared(MixedStrategy):
+    """A MixedStrategy hiding its distribution."""
+
+    def move_distribution(self, game_logic):
+        return None
+
+
+if __name__ == '__main__':
+    unittest.main()
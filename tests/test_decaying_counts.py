@@ -0,0 +1,70 @@
+"""
+This module contains unit tests for the DecayingCounts class.
+"""
+
+import unittest
+
+import numpy as np
+
+from rps.decaying_counts import DecayingCounts
+
+
+class TestDecayingCounts(unittest.TestCase):
+    """
+    Test cases for the DecayingCounts class.
+    """
+
+    def test_matches_explicit_decay(self):
+        # Arrange
+        decays = [1.0, 0.9, 0.5]
+        counts = DecayingCounts(decays, (3,))
+        expected = np.zeros((3, 3))
+        observations = [0, 1, 1, 2, 0, 2, 2, 1]
+
+        # Act
+        for observation in observations:
+            counts.add((observation,))
+            expected *= np.array(decays)[:, None]
+            expected[:, observation] += 1.0
+
+        # Assert: Each table is proportional to the explicitly decayed counts
+        actual = counts.get_state()['values']
+        np.testing.assert_allclose(actual, expected)
+
+    def test_several_observations_per_step(self):
+        counts = DecayingCounts([0.5], (2, 2))
+        counts.add((0, 1), (1, 0))
+        counts.add((0, 1))
+        np.testing.assert_allclose(counts.get_state()['values'], [[[0, 1.5], [0.5, 0]]])
+
+    def test_rescales_without_overflow_or_subnormals(self):
+        # Arrange
+        counts = DecayingCounts([0.25, 1.0], (2,))
+
+        # Act: Many more steps than a weight of 4 ** steps could represent
+        for _ in range(5000):
+            counts.add((0,))
+        counts.add((1,))
+
+        # Assert: With fast decay the latest observation outweighs all the earlier ones
+        self.assertTrue(np.all(np.isfinite(counts.values)))
+        np.testing.assert_array_equal(counts.values.argmax(axis=1), [1, 0])
+        np.testing.assert_allclose(counts.get_state()['values'][1], [5000, 1])
+
+    def test_state_round_trip(self):
+        counts = DecayingCounts([0.9], (3,))
+        for observation in (0, 2, 2):
+            counts.add((observation,))
+        restored = DecayingCounts([0.9], (3,))
+        restored.set_state(counts.get_state())
+        counts.add((1,))
+        restored.add((1,))
+        np.testing.assert_allclose(restored.get_state()['values'], counts.get_state()['values'])
+
+    def test_invalid_decay(self):
+        with self.assertRaises(ValueError):
+            DecayingCounts([0.0], (3,))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,233 @@
+"""
+This module contains unit tests for the distributed tournament coordinator and workers. All
+connections are made over localhost, with workers running in threads.
+"""
+
+import socket
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from benchmarks.rulesets import balanced_ruleset
+from rps.distributed import (TournamentCoordinator, TournamentWorker, receive_message,
+                             send_message)
+from rps.exceptions import ConfigurationError
+from rps.rps_logic import RPSLogic
+from rps.strategy import STRATEGIES, Strategy, register_strategy
+
+
+@register_strategy('test-always-rock')
+class AlwaysRockStrategy(Strategy):
+    """A strategy that always picks rock."""
+
+    def __init__(self):
+        super().__init__('Always Rock')
+
+    def execute(self, game_logic):
+        return 'r'
+
+
+@register_strategy('test-always-paper')
+class AlwaysPaperStrategy(Strategy):
+    """A strategy that always picks paper."""
+
+    def __init__(self):
+        super().__init__('Always Paper')
+
+    def execute(self, game_logic):
+        return 'p'
+
+
+@register_strategy('test-slow-rock')
+class SlowRockStrategy(Strategy):
+    """A strategy that always picks rock, slowly."""
+
+    def __init__(self):
+        super().__init__('Slow Rock')
+
+    def execute(self, game_logic):
+        time.sleep(0.02)
+        return 'r'
+
+
+class FakeWorker:
+    """Speaks the protocol by hand, to control exactly what the coordinator sees."""
+
+    def __init__(self, address):
+        self.sock = socket.create_connection(address)
+        self.stream = self.sock.makefile('rb')
+        send_message(self.sock, {'type': 'hello'})
+        self.config = receive_message(self.stream)
+
+    def sync(self, results=(), queued=(), want=0):
+        send_message(self.sock, {'type': 'sync', 'results': list(results),
+                                 'queued': list(queued), 'want': want})
+        return receive_message(self.stream)
+
+    def close(self):
+        self.stream.close()
+        self.sock.close()
+
+
+class TestDistributedTournament(unittest.TestCase):
+    """
+    Test cases for TournamentCoordinator and TournamentWorker.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.rps_logic = RPSLogic()
+
+    def make_coordinator(self, contestants=None, **kwargs):
+        contestants = contestants or {'random1': 'random', 'random2': 'random',
+                                      'random3': 'random', 'random4': 'random'}
+        coordinator = TournamentCoordinator(self.rps_logic, contestants, 20, **kwargs)
+        coordinator.start()
+        self.addCleanup(coordinator.stop)
+        return coordinator
+
+    def start_worker(self, coordinator, **kwargs):
+        worker = TournamentWorker(*coordinator.address, rps_logic=self.rps_logic,
+                                  sync_interval=0.05, poll_interval=0.01, **kwargs)
+        thread = threading.Thread(target=worker.run, daemon=True)
+        thread.start()
+        self.addCleanup(thread.join, 5)
+        return worker
+
+    def test_workers_complete_tournament(self):
+        coordinator = self.make_coordinator({'rock': 'test-always-rock',
+                                             'paper': 'test-always-paper',
+                                             'random': 'random'})
+
+        # Act: Two workers share the pairings
+        workers = [self.start_worker(coordinator, prefetch=1, result_batch=1) for _ in range(2)]
+        standings = coordinator.wait(timeout=10)
+
+        # Assert: Every pairing was played once, and paper beat rock in every round
+        self.assertEqual(len(coordinator.tournament.results), 3)
+        self.assertGreaterEqual(sum(worker.games_played for worker in workers), 3)
+        paper_vs_rock = coordinator.tournament.results[
+            coordinator.tournament.pairings.index(('rock', 'paper'))]
+        self.assertEqual(paper_vs_rock, (0, 20))
+        self.assertEqual(standings['paper']['won'] + standings['paper']['tied']
+                         + standings['paper']['lost'], 2)
+
+    def test_idle_worker_steals_queued_tasks(self):
+        coordinator = self.make_coordinator()
+
+        # Arrange: One worker takes every task and reports them all as queued
+        busy = FakeWorker(coordinator.address)
+        self.addCleanup(busy.close)
+        tasks = busy.sync(want=10)['tasks']
+        self.assertEqual(tasks, list(range(6)))
+        busy.sync(queued=tasks)
+
+        # Act: A second worker asks for work once nothing is left unassigned
+        idle = FakeWorker(coordinator.address)
+        self.addCleanup(idle.close)
+        stolen = idle.sync(want=4)['tasks']
+
+        # Assert: Half of the queued tasks moved, and the victim is told to drop them
+        self.assertEqual(stolen, [3, 4, 5])
+        self.assertEqual(busy.sync(queued=tasks)['revoke'], [3, 4, 5])
+
+    def test_disconnected_worker_tasks_reassigned(self):
+        coordinator = self.make_coordinator()
+
+        # Arrange: A worker takes every task, then disconnects without finishing any
+        crashed = FakeWorker(coordinator.address)
+        crashed.sync(want=10)
+        crashed.close()
+
+        # Act: A healthy worker joins
+        self.start_worker(coordinator)
+
+        # Assert: The tournament still completes
+        coordinator.wait(timeout=10)
+        self.assertEqual(len(coordinator.tournament.results), 6)
+
+    def test_silent_worker_times_out(self):
+        coordinator = self.make_coordinator(worker_timeout=0.2)
+
+        # Arrange: A worker takes every task and then stops syncing, but stays connected
+        hung = FakeWorker(coordinator.address)
+        self.addCleanup(hung.close)
+        hung.sync(want=10)
+
+        # Act: A healthy worker joins
+        self.start_worker(coordinator)
+
+        # Assert: The hung worker's tasks are reassigned once it times out
+        coordinator.wait(timeout=10)
+        self.assertEqual(len(coordinator.tournament.results), 6)
+
+    def test_hung_worker_is_reaped_without_other_syncs(self):
+        coordinator = self.make_coordinator(worker_timeout=0.2)
+
+        # Arrange: A worker takes every task and then stops syncing, but stays connected
+        hung = FakeWorker(coordinator.address)
+        self.addCleanup(hung.close)
+        hung.sync(want=10)
+
+        # Act
+        time.sleep(0.5)
+
+        # Assert: Its tasks are back in the queue
+        with coordinator._lock:
+            self.assertEqual(sorted(coordinator._pending), list(range(6)))
+
+    def test_long_game_keeps_worker_alive(self):
+        # Arrange: A single game (20 slow rounds) longer than the timeout
+        coordinator = self.make_coordinator({'a': 'test-slow-rock', 'b': 'test-slow-rock'},
+                                            worker_timeout=0.2)
+        requeued = []
+        requeue = coordinator._requeue
+
+        def record_requeue(worker):
+            requeued.append(set(worker.outstanding))
+            requeue(worker)
+
+        # Act
+        with patch.object(coordinator, '_requeue', record_requeue):
+            worker = self.start_worker(coordinator, prefetch=1)
+            coordinator.wait(timeout=10)
+
+        # Assert: The worker's heartbeats kept its game from being reassigned
+        self.assertEqual(worker.games_played, 1)
+        self.assertFalse(any(requeued))
+
+    def test_worker_with_different_ruleset(self):
+        coordinator = self.make_coordinator()
+        worker = TournamentWorker(*coordinator.address,
+                                  rps_logic=RPSLogic.from_data(*balanced_ruleset(5)))
+        with self.assertRaises(ConfigurationError):
+            worker.run()
+        self.assertEqual(worker.games_played, 0)
+
+    def test_duplicate_results_keep_the_first(self):
+        coordinator = self.make_coordinator({'a': 'random', 'b': 'random'})
+        worker1 = FakeWorker(coordinator.address)
+        worker2 = FakeWorker(coordinator.address)
+        self.addCleanup(worker1.close)
+        self.addCleanup(worker2.close)
+        worker1.sync(want=1)
+
+        # Act: The same task is reported twice
+        worker1.sync(results=[[0, 5, 7]])
+        reply = worker2.sync(results=[[0, 1, 1]])
+
+        # Assert: The first result is kept and the tournament is done
+        self.assertEqual(coordinator.tournament.results[0], (5, 7))
+        self.assertTrue(reply['done'])
+
+    def test_unknown_strategy(self):
+        with self.assertRaises(KeyError):
+            TournamentCoordinator(self.rps_logic, {'a': 'no-such-strategy', 'b': 'random'}, 1)
+
+    def test_strategies_registered(self):
+        self.assertIs(STRATEGIES['test-always-rock'], AlwaysRockStrategy)
+
+
+if __name__ == '__main__':
+    unittest.main()
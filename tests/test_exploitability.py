@@ -0,0 +1,157 @@
+"""
+This module contains unit tests for the streaming exploitability evaluator.
+"""
+
+import csv
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from rps.exploitability import ExploitabilityEvaluator, evaluate_round_log, format_estimates
+from rps.rps_logic import RPSLogic
+
+
+class TestExploitabilityEvaluator(unittest.TestCase):
+    """
+    Test cases for the ExploitabilityEvaluator class.
+    """
+
+    def setUp(self):
+        self.rps_logic = RPSLogic()
+        self.rng = np.random.default_rng(0)
+
+    def test_cycling_strategy_is_exploitable_with_context(self):
+        # Arrange: The strategy plays each weapon in turn
+        evaluator = ExploitabilityEvaluator(self.rps_logic, max_depth=2)
+        subject = np.arange(3000) % 3
+
+        # Act
+        evaluator.observe_many(subject, self.rng.integers(3, size=3000))
+        estimates = evaluator.report()
+
+        # Assert: Its moves are balanced overall, but the previous move gives the next one away
+        self.assertAlmostEqual(estimates[0].expected_loss, 0.0)
+        self.assertAlmostEqual(estimates[1].expected_loss, 1.0)
+        # The online opponent only learns after the first batch of 256 rounds
+        self.assertGreater(estimates[1].online_expected_loss, 0.9)
+        self.assertEqual(estimates[1].rounds, 2999)
+        self.assertEqual(estimates[1].contexts, 9)
+
+    def test_random_strategy_is_not_exploitable_online(self):
+        # Arrange
+        evaluator = ExploitabilityEvaluator(self.rps_logic, max_depth=2)
+
+        # Act
+        evaluator.observe_many(self.rng.integers(3, size=20000),
+                               self.rng.integers(3, size=20000))
+
+        # Assert
+        for estimate in evaluator.report():
+            self.assertAlmostEqual(estimate.online_expected_loss, 0.0, delta=0.03)
+
+    def test_biased_strategy(self):
+        # Arrange: Rock half of the time, so paper wins 0.5 - 0.25 per round
+        evaluator = ExploitabilityEvaluator(self.rps_logic, max_depth=0)
+        subject = self.rng.choice(3, p=[0.5, 0.25, 0.25], size=20000)
+
+        # Act
+        evaluator.observe_many(subject, self.rng.integers(3, size=20000))
+
+        # Assert
+        self.assertAlmostEqual(evaluator.report()[0].expected_loss, 0.25, delta=0.02)
+
+    def test_streams_match_a_single_batch(self):
+        # Arrange
+        subject = self.rng.integers(3, size=1000)
+        opponent = self.rng.integers(3, size=1000)
+        batched = ExploitabilityEvaluator(self.rps_logic, max_depth=3)
+        streamed = ExploitabilityEvaluator(self.rps_logic, max_depth=3)
+        stream = streamed.new_stream()
+
+        # Act: One batch, and single rounds in a stream
+        batched.observe_many(subject, opponent)
+        for move, opponent_move in zip(subject.tolist(), opponent.tolist()):
+            stream.observe(move, opponent_move)
+
+        # Assert: The tables are the same, and so are the online estimates, which are scored in
+        # batches of the same size
+        self.assertEqual(batched.report(), streamed.report())
+
+    def test_contexts_never_span_streams(self):
+        # Arrange
+        evaluator = ExploitabilityEvaluator(self.rps_logic, max_depth=2)
+
+        # Act: Two games of two rounds
+        for _ in range(2):
+            evaluator.new_stream().observe_many([0, 1], [2, 2])
+        estimates = evaluator.report()
+
+        # Assert
+        self.assertEqual([estimate.rounds for estimate in estimates], [4, 2, 0])
+
+    def test_table_size_is_bounded(self):
+        with self.assertRaises(ValueError):
+            ExploitabilityEvaluator(self.rps_logic, max_depth=10)
+
+    def test_format_estimates(self):
+        # Arrange
+        evaluator = ExploitabilityEvaluator(self.rps_logic, max_depth=1)
+        evaluator.observe_many([0, 0, 0], [1, 1, 1])
+
+        # Act
+        lines = format_estimates(evaluator.report()).splitlines()
+
+        # Assert
+        self.assertEqual(len(lines), 3)
+        self.assertIn('expected loss', lines[0])
+
+
+class TestEvaluateRoundLog(unittest.TestCase):
+    """
+    Test cases for evaluating round logs.
+    """
+
+    def setUp(self):
+        self.rps_logic = RPSLogic()
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'rounds.csv')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_log(self, rows):
+        with open(self.path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['round_number', 'weapon1', 'weapon2', 'result'])
+            writer.writerows(rows)
+
+    def test_reads_in_chunks_and_splits_games(self):
+        # Arrange: Two games in which player 2 always answers the previous round with rock
+        rows = []
+        for _ in range(2):
+            for round_number in range(1, 101):
+                rows.append([round_number, 'rps'[round_number % 3], 'r', 0])
+        self.write_log(rows)
+
+        # Act
+        estimates = evaluate_round_log(self.path, self.rps_logic, seat=2, max_depth=1,
+                                       chunk_rounds=64)
+
+        # Assert: Player 2 is fully predictable; the first round of each game has no context
+        self.assertEqual(estimates[0].rounds, 200)
+        self.assertEqual(estimates[1].rounds, 198)
+        self.assertAlmostEqual(estimates[0].expected_loss, 1.0)
+
+    def test_unknown_weapon(self):
+        # Arrange
+        self.write_log([[1, 'r', 'x', 0]])
+
+        # Act & Assert
+        with self.assertRaises(ValueError):
+            evaluate_round_log(self.path, self.rps_logic)
+
+
+if __name__ == '__main__':
+    unittest.main()
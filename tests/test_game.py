@@ -2,10 +2,17 @@
 This module contains unit tests for the Game class in the Rock-Paper-Scissors game.
 """
 
+import asyncio
+import itertools
 import unittest
 from unittest.mock import Mock, patch
-from rps.game import Game
+from rps.game import Game, RoundResult
 from rps.exceptions import FailedWeaponChoiceException, FailedGameException, MaxAttemptsExceededError
+from rps.instrumentation import RoundInstrumentation
+from rps.metrics import GameMetrics
+from rps.player import Player
+from rps.rps_logic import RPSLogic
+from rps.strategy import Strategy
 
 
 class TestGame(unittest.TestCase):
@@ -134,6 +141,220 @@ class TestGame(unittest.TestCase):
         with self.assertRaises(FailedGameException):
             game.play_one_round()
 
+    @patch('rps.game.get_user_input_with_verification', return_value=1)
+    def test_play_one_round_instrumented(self, mock_user_input):
+        # Arrange: Mock players and rps_logic, and enable instrumentation
+        player1 = Mock()
+        player1.choose.return_value = 'r'
+        player1.name = 'Player1'
+        player1.score = 0
+
+        player2 = Mock()
+        player2.choose.return_value = 's'
+        player2.name = 'Player2'
+        player2.score = 0
+
+        rps_logic = Mock()
+        rps_logic.compare.return_value = 1
+        rps_logic.short_names_to_full_names = {'r': 'rock', 's': 'scissors'}
+
+        instrumentation = RoundInstrumentation()
+        game = Game(player1, player2, rps_logic, instrumentation=instrumentation)
+
+        # Act: Play two rounds
+        with patch('builtins.print'):
+            game.play_one_round()
+            game.play_one_round()
+
+        # Assert: The round is played as usual and every phase was timed
+        self.assertEqual(player1.score, 2)
+        for phase_summary in instrumentation.snapshot().values():
+            self.assertEqual(phase_summary['count'], 2)
+
+    @patch('rps.game.get_user_input_with_verification', return_value=2)
+    def test_play_game_reports_metrics(self, mock_user_input):
+        # Arrange: Mock players and rps_logic, and report to game metrics
+        player1 = Mock()
+        player1.choose.return_value = 'r'
+        player1.name = 'Player1'
+        player1.score = 0
+
+        player2 = Mock()
+        player2.choose.return_value = 's'
+        player2.name = 'Player2'
+        player2.score = 0
+
+        rps_logic = Mock()
+        rps_logic.compare.return_value = 1
+        rps_logic.short_names_to_full_names = {'r': 'rock', 's': 'scissors'}
+
+        metrics = GameMetrics()
+        game = Game(player1, player2, rps_logic, metrics=metrics)
+
+        # Act
+        with patch('builtins.print'):
+            game.play_game()
+
+        # Assert
+        self.assertEqual(metrics.rounds.labels().get(), 2)
+        self.assertEqual(metrics.outcomes.labels('r', 'win').get(), 2)
+        self.assertEqual(metrics.games_completed.labels().get(), 1)
+        self.assertEqual(metrics.active_games.labels().get(), 0)
+
+    def test_unexpected_error_reports_metrics(self):
+        # Arrange: The ruleset fails with an error other than a failed game
+        player1, player2 = Mock(), Mock()
+        player1.choose.return_value = player2.choose.return_value = 'r'
+        rps_logic = Mock()
+        rps_logic.compare.side_effect = RuntimeError('broken ruleset')
+        metrics = GameMetrics()
+        game = Game(player1, player2, rps_logic, num_rounds=1, verbose=False, metrics=metrics)
+
+        # Act
+        with self.assertRaises(RuntimeError):
+            game.play_game()
+
+        # Assert: The game is no longer counted as active
+        self.assertEqual(metrics.active_games.labels().get(), 0)
+        self.assertEqual(metrics.games_failed.labels('RuntimeError').get(), 1)
+
+    @patch('rps.game.get_user_input_with_verification', side_effect=MaxAttemptsExceededError)
+    def test_game_initialization_failure_reports_metrics(self, mock_user_input):
+        metrics = GameMetrics()
+        with self.assertRaises(FailedGameException):
+            Game(Mock(), Mock(), Mock(), metrics=metrics)
+        self.assertEqual(metrics.games_failed.labels('max_attempts_exceeded').get(), 1)
+
+    def test_silent_game_with_given_rounds(self):
+        # Arrange: Mock players and rps_logic; the number of rounds is given, not asked for
+        player1 = Mock()
+        player1.choose.return_value = 'p'
+        player1.score = 0
+        player2 = Mock()
+        player2.choose.return_value = 'r'
+        player2.score = 0
+        rps_logic = Mock()
+        rps_logic.compare.return_value = 1
+        rps_logic.short_names_to_full_names = {'r': 'rock', 'p': 'paper'}
+
+        with patch('rps.game.get_user_input_with_verification') as mock_user_input:
+            game = Game(player1, player2, rps_logic, num_rounds=4, verbose=False)
+
+        # Act
+        with patch('builtins.print') as mock_print:
+            game.play_game()
+
+        # Assert
+        mock_user_input.assert_not_called()
+        mock_print.assert_not_called()
+        self.assertEqual(player1.score, 4)
+        self.assertEqual(game.rounds_played, 4)
+
+    def test_get_and_set_state(self):
+        # Arrange: A game two rounds in
+        player1, player2 = Mock(), Mock()
+        player1.get_state.return_value = {'score': 2, 'strategy': {}}
+        player2.get_state.return_value = {'score': 0, 'strategy': {}}
+        game = Game(player1, player2, Mock(), num_rounds=5)
+        game.rounds_played = 2
+
+        # Act: Restore the state into a new game
+        state = game.get_state()
+        restored = Game(Mock(), Mock(), Mock(), num_rounds=1)
+        restored.set_state(state)
+
+        # Assert
+        self.assertEqual(restored.num_rounds, 5)
+        self.assertEqual(restored.rounds_played, 2)
+        restored.player1.set_state.assert_called_once_with({'score': 2, 'strategy': {}})
+
+    def _silent_game(self, num_rounds: int) -> Game:
+        """
+        :return: A silent game where player1 always picks paper and player2 cycles through
+         rock, paper and scissors.
+        """
+        player1 = Player('Player1', Mock(), RPSLogic())
+        player1.choose = Mock(return_value='p')
+        player2 = Player('Player2', Mock(), player1.rps_logic)
+        player2.choose = Mock(side_effect=itertools.cycle(['r', 'p', 's']))
+        return Game(player1, player2, player1.rps_logic, num_rounds=num_rounds, verbose=False)
+
+    def test_iter_rounds_yields_records(self):
+        # Arrange
+        game = self._silent_game(num_rounds=3)
+
+        # Act
+        records = list(game.iter_rounds())
+
+        # Assert
+        self.assertEqual(records, [RoundResult(1, 'p', 'r', 1), RoundResult(2, 'p', 'p', 0),
+                                   RoundResult(3, 'p', 's', 2)])
+        self.assertEqual((game.player1.score, game.player2.score), (1, 1))
+
+    def test_iter_rounds_early_stop_and_resume(self):
+        # Arrange
+        game = self._silent_game(num_rounds=5)
+
+        # Act: Stop after two rounds, then continue the game
+        for record in game.iter_rounds():
+            if record.round_number == 2:
+                break
+        rounds_after_stop = game.rounds_played
+        remaining = [record.round_number for record in game.iter_rounds()]
+
+        # Assert
+        self.assertEqual(rounds_after_stop, 2)
+        self.assertEqual(remaining, [3, 4, 5])
+
+    def test_aiter_rounds(self):
+        # Arrange
+        game = self._silent_game(num_rounds=7)
+
+        async def collect():
+            return [record async for record in game.aiter_rounds(rounds_per_yield=2)]
+
+        # Act
+        records = asyncio.run(collect())
+
+        # Assert
+        self.assertEqual([record.round_number for record in records], list(range(1, 8)))
+        self.assertEqual(game.rounds_played, 7)
+
+    def test_history_recorded_for_history_aware_strategies(self):
+        # Arrange: player2's strategy reads the history, player1's doesn't
+        class LastMoveStrategy(Strategy):
+            uses_history = True
+
+            def __init__(self):
+                super().__init__('Last Move')
+                self.seen = []
+
+            def execute(self, game_logic):
+                self.seen.append(self.history.moves(3 - self.seat, 1).tolist())
+                return 'r'
+
+        rps_logic = RPSLogic()
+        strategy = LastMoveStrategy()
+        player1 = Player('Player1', Mock(), rps_logic)
+        player1.choose = Mock(side_effect=['p', 's', 'r'])
+        player2 = Player('Player2', strategy, rps_logic)
+        game = Game(player1, player2, rps_logic, num_rounds=3, verbose=False, history_capacity=2)
+
+        # Act
+        game.play_game()
+
+        # Assert: The strategy saw the opponent's previous move each round
+        ids = rps_logic.weapon_ids
+        self.assertIs(strategy.history, game.history)
+        self.assertEqual(strategy.seat, 2)
+        self.assertEqual(strategy.seen, [[], [ids['p']], [ids['s']]])
+        self.assertEqual(game.history.moves(1).tolist(), [ids['s'], ids['r']])
+
+    def test_no_history_without_history_aware_strategies(self):
+        game = self._silent_game(num_rounds=2)
+        game.play_game()
+        self.assertIsNone(game.history)
+
 
 if __name__ == "__main__":
     unittest.main()
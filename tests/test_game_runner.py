@@ -0,0 +1,90 @@
+"""
+This module contains unit tests for the ThreadPoolGameRunner class.
+"""
+
+import unittest
+
+from rps.exceptions import FailedGameException, FailedWeaponChoiceException
+from rps.game_runner import ThreadPoolGameRunner
+from rps.rps_logic import RPSLogic
+from rps.strategy import RandomStrategy, Strategy
+
+
+class AlwaysRockStrategy(Strategy):
+    """A strategy that always picks rock."""
+
+    def __init__(self):
+        super().__init__('Always Rock')
+
+    def execute(self, game_logic):
+        return 'r'
+
+
+class AlwaysPaperStrategy(Strategy):
+    """A strategy that always picks paper."""
+
+    def __init__(self):
+        super().__init__('Always Paper')
+
+    def execute(self, game_logic):
+        return 'p'
+
+
+class FailingStrategy(Strategy):
+    """A strategy that never manages to choose."""
+
+    def __init__(self):
+        super().__init__('Failing')
+
+    def execute(self, game_logic):
+        raise FailedWeaponChoiceException('No choice')
+
+
+class TestThreadPoolGameRunner(unittest.TestCase):
+    """
+    Test cases for the ThreadPoolGameRunner class.
+    """
+
+    def setUp(self):
+        self.rps_logic = RPSLogic()
+
+    def test_run_returns_scores_in_matchup_order(self):
+        # Arrange
+        runner = ThreadPoolGameRunner(self.rps_logic, max_workers=4)
+        matchups = [(AlwaysRockStrategy, AlwaysPaperStrategy),
+                    (AlwaysPaperStrategy, AlwaysRockStrategy),
+                    (AlwaysRockStrategy, AlwaysRockStrategy)] * 10
+
+        # Act
+        scores = runner.run(matchups, num_rounds=7)
+
+        # Assert
+        self.assertEqual(scores, [(0, 7), (7, 0), (0, 0)] * 10)
+
+    def test_run_matches_single_threaded_play(self):
+        # Arrange: Seeded strategies, created fresh for each game
+        matchups = [(lambda i=i: RandomStrategy(seed=i), lambda i=i: RandomStrategy(seed=-i))
+                    for i in range(20)]
+
+        # Act
+        threaded = ThreadPoolGameRunner(self.rps_logic, max_workers=4).run(matchups, 50)
+        sequential = [ThreadPoolGameRunner(self.rps_logic).play(factory1, factory2, 50)
+                      for factory1, factory2 in matchups]
+
+        # Assert: Games don't share state, so threading doesn't change their outcomes
+        self.assertEqual(threaded, sequential)
+
+    def test_run_propagates_failed_games(self):
+        # Arrange
+        runner = ThreadPoolGameRunner(self.rps_logic, max_workers=2)
+
+        # Act & Assert
+        with self.assertRaises(FailedGameException):
+            runner.run([(AlwaysRockStrategy, FailingStrategy)], num_rounds=3)
+
+    def test_default_workers(self):
+        self.assertGreaterEqual(ThreadPoolGameRunner(self.rps_logic).max_workers, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,210 @@
+"""
+This module contains unit tests for the HTTP/JSON game API: request routing, batched rounds and
+keep-alive connections.
+"""
+
+import asyncio
+import json
+import unittest
+from http import HTTPStatus
+from unittest.mock import patch
+
+from benchmarks.rulesets import balanced_ruleset
+from rps.exploitability import ExploitabilityEvaluator
+from rps.http_api import GameServer, HTTPError
+from rps.rps_logic import RPSLogic
+
+
+class TestGameServerDispatch(unittest.TestCase):
+    """
+    Test cases for the request routing and handlers, without a network connection.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.rps_logic = RPSLogic()
+
+    def setUp(self):
+        self.server = GameServer(self.rps_logic)
+
+    def create_session(self, **request):
+        status, session = self.server.dispatch('POST', '/sessions', json.dumps(request).encode())
+        self.assertEqual(status, HTTPStatus.CREATED)
+        return session['session']
+
+    def test_ruleset(self):
+        status, body = self.server.dispatch('GET', '/ruleset', b'')
+
+        ruleset = json.loads(body)
+        self.assertEqual(status, HTTPStatus.OK)
+        self.assertEqual(ruleset['options'], list(self.rps_logic.options))
+        self.assertEqual(ruleset['names']['r'], 'rock')
+        self.assertEqual(ruleset['outcome_matrix'], self.rps_logic.outcome_matrix.tolist())
+
+    def test_play_round(self):
+        session_id = self.create_session()
+
+        # Act: The computer is forced to pick scissors
+        with patch.object(self.server.sessions[session_id].computer, 'choose',
+                          return_value='s'):
+            status, response = self.server.dispatch(
+                'POST', f'/sessions/{session_id}/round', b'{"move": "Rock"}')
+
+        # Assert: Rock beats scissors, and the score is updated
+        self.assertEqual(status, HTTPStatus.OK)
+        self.assertEqual((response['move'], response['computer_move'], response['result']),
+                         ('r', 's', 1))
+        self.assertEqual(response['score'], {'client': 1, 'computer': 0})
+        self.assertEqual(response['rounds_played'], 1)
+
+    def test_play_batch(self):
+        session_id = self.create_session(rounds=3)
+        moves = json.dumps({'moves': ['r', 'p', 's']}).encode()
+
+        # Act: The computer always picks paper
+        with patch.object(self.server.sessions[session_id].computer, 'choose',
+                          return_value='p'):
+            status, response = self.server.dispatch('POST', f'/sessions/{session_id}/rounds',
+                                                    moves)
+
+        # Assert: One result per move, matching RPSLogic.compare
+        self.assertEqual(status, HTTPStatus.OK)
+        self.assertEqual(response['computer_moves'], ['p', 'p', 'p'])
+        self.assertEqual(response['results'],
+                         [self.rps_logic.compare(move, 'p') for move in 'rps'])
+        self.assertEqual(response['score'], {'client': 1, 'computer': 1})
+
+        # The session's round limit is enforced
+        with self.assertRaises(HTTPError) as context:
+            self.server.dispatch('POST', f'/sessions/{session_id}/round', b'{"move": "r"}')
+        self.assertEqual(context.exception.status, HTTPStatus.CONFLICT)
+
+    def test_invalid_requests(self):
+        session_id = self.create_session()
+        cases = [
+            ('POST', f'/sessions/{session_id}/round', b'{"move": "banana"}',
+             HTTPStatus.BAD_REQUEST),
+            ('POST', f'/sessions/{session_id}/rounds', b'{"moves": "r"}', HTTPStatus.BAD_REQUEST),
+            ('POST', f'/sessions/{session_id}/round', b'not json', HTTPStatus.BAD_REQUEST),
+            ('POST', '/sessions', b'{"rounds": 0}', HTTPStatus.BAD_REQUEST),
+            ('GET', f'/sessions/{"0" * 32}', b'', HTTPStatus.NOT_FOUND),
+            ('GET', '/nowhere', b'', HTTPStatus.NOT_FOUND),
+            ('POST', '/ruleset', b'', HTTPStatus.METHOD_NOT_ALLOWED),
+        ]
+        for method, path, body, expected in cases:
+            with self.subTest(path=path, body=body):
+                with self.assertRaises(HTTPError) as context:
+                    self.server.dispatch(method, path, body)
+                self.assertEqual(context.exception.status, expected)
+
+    def test_exploitability(self):
+        # Arrange
+        server = GameServer(self.rps_logic, evaluator=ExploitabilityEvaluator(self.rps_logic, 1))
+        status, session = server.dispatch('POST', '/sessions', b'{}')
+        moves = json.dumps({'moves': ['r'] * 10}).encode()
+
+        # Act
+        server.dispatch('POST', f'/sessions/{session["session"]}/rounds', moves)
+        status, response = server.dispatch('GET', '/exploitability', b'')
+
+        # Assert: The computer's rounds are evaluated
+        self.assertEqual(status, HTTPStatus.OK)
+        self.assertEqual([estimate['rounds'] for estimate in response['estimates']], [10, 9])
+
+    def test_exploitability_disabled(self):
+        with self.assertRaises(HTTPError) as context:
+            self.server.dispatch('GET', '/exploitability', b'')
+        self.assertEqual(context.exception.status, HTTPStatus.NOT_FOUND)
+
+    def test_large_ruleset(self):
+        # Arrange: More weapons than one byte can number
+        server = GameServer(RPSLogic.from_data(*balanced_ruleset(301)))
+        _, session = server.dispatch('POST', '/sessions', b'{}')
+        moves = json.dumps({'moves': ['w300', 'w0', 'w299']}).encode()
+
+        # Act
+        status, response = server.dispatch('POST', f'/sessions/{session["session"]}/rounds',
+                                           moves)
+
+        # Assert
+        self.assertEqual(status, HTTPStatus.OK)
+        self.assertEqual(response['results'],
+                         [server.rps_logic.compare(move, computer_move) for move, computer_move
+                          in zip(['w300', 'w0', 'w299'], response['computer_moves'])])
+
+    def test_delete_session(self):
+        session_id = self.create_session()
+
+        status, _ = self.server.dispatch('DELETE', f'/sessions/{session_id}', b'')
+
+        self.assertEqual(status, HTTPStatus.OK)
+        self.assertNotIn(session_id, self.server.sessions)
+
+
+class TestGameServerConnection(unittest.IsolatedAsyncioTestCase):
+    """
+    Test cases for serving requests over a real localhost connection.
+    """
+
+    async def asyncSetUp(self):
+        self.server = GameServer(RPSLogic(), port=0)
+        await self.server.start()
+        self.reader, self.writer = await asyncio.open_connection(*self.server.address)
+
+    async def asyncTearDown(self):
+        self.writer.close()
+        await self.server.close()
+
+    async def request(self, method, path, payload=None, headers=''):
+        body = json.dumps(payload).encode() if payload is not None else b''
+        self.writer.write(f'{method} {path} HTTP/1.1\r\nHost: test\r\n{headers}'
+                          f'Content-Length: {len(body)}\r\n\r\n'.encode() + body)
+        head = (await self.reader.readuntil(b'\r\n\r\n')).decode()
+        status = int(head.split(' ')[1])
+        length = int(head.lower().split('content-length: ')[1].split('\r\n')[0])
+        return status, head, json.loads(await self.reader.readexactly(length))
+
+    async def test_keep_alive_session(self):
+        # Act: Several requests over the same connection
+        status, _, session = await self.request('POST', '/sessions', {})
+        path = f'/sessions/{session["session"]}'
+        _, _, single = await self.request('POST', f'{path}/round', {'move': 'r'})
+        _, _, batch = await self.request('POST', f'{path}/rounds', {'moves': ['p'] * 1000})
+        _, head, state = await self.request('GET', path)
+
+        # Assert: All were served and the session kept count
+        self.assertEqual(status, HTTPStatus.CREATED)
+        self.assertEqual(len(batch['results']), 1000)
+        self.assertEqual(state['rounds_played'], 1001)
+        results = [single['result']] + batch['results']
+        self.assertEqual(state['score'], {'client': results.count(1),
+                                          'computer': results.count(2)})
+        self.assertIn('Connection: keep-alive', head)
+
+    async def test_connection_close(self):
+        _, head, _ = await self.request('GET', '/ruleset', headers='Connection: close\r\n')
+
+        # Assert: The server closes the connection after responding
+        self.assertIn('Connection: close', head)
+        self.assertEqual(await self.reader.read(), b'')
+
+    async def test_internal_error_response(self):
+        # Act: A handler fails unexpectedly
+        with patch.object(self.server, 'dispatch', side_effect=RuntimeError('bug')):
+            with self.assertLogs('rps.http_api', 'ERROR'):
+                status, head, body = await self.request('GET', '/ruleset')
+
+        # Assert: The client gets an answer, and the connection is closed
+        self.assertEqual(status, HTTPStatus.INTERNAL_SERVER_ERROR)
+        self.assertIn('error', body)
+        self.assertIn('Connection: close', head)
+
+    async def test_error_response(self):
+        status, _, body = await self.request('GET', '/nowhere')
+
+        self.assertEqual(status, HTTPStatus.NOT_FOUND)
+        self.assertIn('error', body)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+"""
+This module contains unit tests for the InputMatcher class, which resolves user input to weapon
+short names in the Rock-Paper-Scissors game.
+"""
+
+import unittest
+
+from rps.exceptions import InvalidInputError
+from rps.input_matcher import InputMatcher
+
+
+class TestInputMatcher(unittest.TestCase):
+    """
+    Test cases for the InputMatcher class.
+    """
+
+    def setUp(self):
+        self.matcher = InputMatcher([['r', 'rock'], ['p', 'paper'], ['s', 'scissors'],
+                                     ['sp', 'spock']])
+
+    def test_short_names(self):
+        self.assertEqual(self.matcher.match('r'), 'r')
+        self.assertEqual(self.matcher.match('sp'), 'sp')
+
+    def test_full_names_case_insensitive(self):
+        self.assertEqual(self.matcher.match('Rock'), 'r')
+        self.assertEqual(self.matcher.match('PAPER'), 'p')
+        self.assertEqual(self.matcher.match('  spock '), 'sp')
+
+    def test_unique_prefixes(self):
+        self.assertEqual(self.matcher.match('ro'), 'r')
+        self.assertEqual(self.matcher.match('sc'), 's')
+        self.assertEqual(self.matcher.match('spo'), 'sp')
+
+    def test_exact_name_wins_over_prefix(self):
+        # 's' is a prefix of both 'scissors' and 'spock', but is also an exact short name
+        self.assertEqual(self.matcher.match('s'), 's')
+        self.assertEqual(self.matcher.match('S'), 's')
+
+    def test_invalid_input(self):
+        with self.assertRaises(InvalidInputError) as context:
+            self.matcher.match('lizard')
+        self.assertIn("Invalid option: 'lizard'", str(context.exception))
+
+        with self.assertRaises(InvalidInputError):
+            self.matcher.match('')
+
+    def test_ambiguous_prefix(self):
+        matcher = InputMatcher([['z', 'lizard'], ['g', 'log']])
+        with self.assertRaises(InvalidInputError) as context:
+            matcher.match('L')  # Prefix of both 'lizard' and 'log'
+        self.assertIn('Ambiguous', str(context.exception))
+
+    def test_contains(self):
+        self.assertIn('rock', self.matcher)
+        self.assertNotIn('lizard', self.matcher)
+
+    def test_prompt(self):
+        expected_prompt = ('Choose from the following options: \n\t'
+                           'r- rock\n\tp- paper\n\ts- scissors\n\tsp- spock\n')
+        self.assertEqual(self.matcher.prompt, expected_prompt)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+"""
+This module contains unit tests for the round timing instrumentation in the Rock-Paper-Scissors
+game.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+
+from rps.instrumentation import (PHASES, PhaseHistogram, RoundInstrumentation, _bucket_index,
+                                 _bucket_upper_bound)
+
+
+class TestBuckets(unittest.TestCase):
+    """
+    Test cases for the histogram bucket layout.
+    """
+
+    def test_small_values_are_exact(self):
+        for value in range(16):
+            self.assertEqual(_bucket_upper_bound(_bucket_index(value)), value)
+
+    def test_bucket_bounds_contain_value(self):
+        for value in [17, 100, 1_000, 123_456, 10 ** 9, 2 ** 62 + 12345]:
+            index = _bucket_index(value)
+            self.assertLessEqual(value, _bucket_upper_bound(index))
+            self.assertGreater(value, _bucket_upper_bound(index - 1))
+            # Relative error is bounded by the sub-bucket width
+            self.assertLessEqual(_bucket_upper_bound(index) - value, value / 8)
+
+
+class TestPhaseHistogram(unittest.TestCase):
+    """
+    Test cases for the PhaseHistogram class.
+    """
+
+    def test_empty(self):
+        histogram = PhaseHistogram()
+        self.assertEqual(histogram.summary(), {'count': 0, 'mean_ns': 0, 'max_ns': 0,
+                                               'p50_ns': 0, 'p95_ns': 0, 'p99_ns': 0})
+
+    def test_percentiles(self):
+        histogram = PhaseHistogram()
+        for value in range(1, 1001):
+            histogram.record(value * 1000)
+
+        summary = histogram.summary()
+        self.assertEqual(summary['count'], 1000)
+        self.assertEqual(summary['max_ns'], 1_000_000)
+        self.assertEqual(summary['mean_ns'], 500_500)
+        for key, expected in [('p50_ns', 500_000), ('p95_ns', 950_000), ('p99_ns', 990_000)]:
+            self.assertGreaterEqual(summary[key], expected)
+            self.assertLessEqual(summary[key], expected * 1.125)
+
+    def test_clear(self):
+        histogram = PhaseHistogram()
+        histogram.record(42)
+        histogram.clear()
+        self.assertEqual(histogram.count, 0)
+        self.assertEqual(sum(histogram.buckets), 0)
+
+
+class TestRoundInstrumentation(unittest.TestCase):
+    """
+    Test cases for the RoundInstrumentation class.
+    """
+
+    def test_record_round(self):
+        instrumentation = RoundInstrumentation()
+        instrumentation.record_round(100, 10, 20, 300)
+
+        snapshot = instrumentation.snapshot()
+        self.assertEqual(set(snapshot), set(PHASES))
+        self.assertEqual(snapshot['choose']['max_ns'], 100)
+        self.assertEqual(snapshot['round']['max_ns'], 430)
+
+    def test_dump_json(self):
+        instrumentation = RoundInstrumentation()
+        instrumentation.record_round(1, 2, 3, 4)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'timings.json')
+            instrumentation.dump(path)
+            with open(path, encoding='utf-8') as f:
+                self.assertEqual(json.load(f), instrumentation.snapshot())
+
+    def test_reset(self):
+        instrumentation = RoundInstrumentation()
+        instrumentation.record_round(1, 2, 3, 4)
+        instrumentation.reset()
+        self.assertEqual(instrumentation.snapshot()['round']['count'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
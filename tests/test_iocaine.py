@@ -0,0 +1,110 @@
+"""
+This module contains unit tests for the IocaineStrategy ensemble.
+"""
+
+import itertools
+import unittest
+
+from benchmarks.rulesets import balanced_ruleset
+from rps.game import Game
+from rps.iocaine import IocaineStrategy
+from rps.player import Player
+from rps.rps_logic import RPSLogic
+from rps.strategy import STRATEGIES, RandomStrategy, Strategy
+
+
+class CycleStrategy(Strategy):
+    """A strategy that repeats a fixed sequence of moves."""
+
+    def __init__(self, moves):
+        super().__init__('Cycle')
+        self._moves = itertools.cycle(moves)
+
+    def execute(self, game_logic):
+        return next(self._moves)
+
+
+class TestIocaineStrategy(unittest.TestCase):
+    """
+    Test cases for the IocaineStrategy class.
+    """
+
+    def _play(self, rps_logic: RPSLogic, opponent: Strategy, num_rounds: int) -> Game:
+        """
+        :return: A finished silent game of a seeded IocaineStrategy against the opponent.
+        """
+        game = Game(Player('Iocaine', IocaineStrategy(seed=0), rps_logic),
+                    Player('Opponent', opponent, rps_logic), rps_logic, num_rounds=num_rounds,
+                    verbose=False)
+        game.play_game()
+        return game
+
+    def test_beats_repeating_sequences(self):
+        rps_logic = RPSLogic()
+        for moves in ('r', 'rps', 'rpsspr', 'rrpps'):
+            with self.subTest(moves=moves):
+                # Act
+                game = self._play(rps_logic, CycleStrategy(moves), num_rounds=300)
+
+                # Assert: Only the first few rounds, before the pattern is matched, are lost
+                self.assertGreater(game.player1.score, 270)
+                self.assertLess(game.player2.score, 15)
+
+    def test_second_guesses_an_opponent_countering_its_last_move(self):
+        # Arrange: An opponent playing what beats the strategy's previous move
+        rps_logic = RPSLogic()
+        beats = {'r': 'p', 'p': 's', 's': 'r'}
+
+        class CounterLastMove(Strategy):
+            uses_history = True
+
+            def __init__(self):
+                super().__init__('Counter Last Move')
+
+            def execute(self, game_logic):
+                last = self.history.moves(3 - self.seat, 1).tolist()
+                return beats[game_logic.options[last[0]]] if last else 'r'
+
+        # Act
+        game = self._play(rps_logic, CounterLastMove(), num_rounds=300)
+
+        # Assert
+        self.assertGreater(game.player1.score, 270)
+
+    def test_larger_ruleset(self):
+        rps_logic = RPSLogic.from_data(*balanced_ruleset(7))
+        game = self._play(rps_logic, CycleStrategy(['w0', 'w3', 'w5']), num_rounds=200)
+        self.assertGreater(game.player1.score, 180)
+
+    def test_memory_is_bounded(self):
+        # Arrange: A random opponent keeps producing new sequences to remember
+        rps_logic = RPSLogic()
+        strategy = IocaineStrategy(table_size=64, seed=0)
+        game = Game(Player('Iocaine', strategy, rps_logic),
+                    Player('Random', RandomStrategy(seed=0), rps_logic), rps_logic,
+                    num_rounds=3000, verbose=False)
+
+        # Act
+        game.play_game()
+
+        # Assert: The follower tables and move lists never outgrow their fixed sizes, though
+        # the opponent produced far more sequences than fit
+        self.assertTrue(all(len(table) == 64 for table in strategy._followers))
+        self.assertTrue(all(None not in table for table in strategy._followers[-3:]))
+        self.assertLessEqual(len(strategy._opponent_moves), 2 * 20 + 64)
+
+    def test_num_predictors(self):
+        strategy = IocaineStrategy(match_lengths=(1, 2), frequency_decays=(1.0,), rotations=3)
+        # (3 sequence kinds x 2 lengths + 1 frequency) guesses, of both players' moves
+        self.assertEqual(strategy.num_predictors, 2 * 7 * 3)
+
+    def test_works_without_history(self):
+        rps_logic = RPSLogic()
+        self.assertIn(IocaineStrategy(seed=0).execute(rps_logic), rps_logic.options)
+
+    def test_registered(self):
+        self.assertIs(STRATEGIES['iocaine'], IocaineStrategy)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -16,7 +16,7 @@ class TestMain(unittest.TestCase):
     @patch('rps.main.RPSLogic')
     def test_main_game_success(self, mock_rps_logic, mock_asset_manager, mock_game):
         # Arrange
-        mock_asset_manager.return_value.get_asset.return_value = "Rock-Paper-Scissors Game Title"
+        mock_asset_manager.shared.return_value.get_asset.return_value = "Rock-Paper-Scissors Game Title"
         mock_game_instance = mock_game.return_value
         mock_game_instance.play_game.return_value = None
 
@@ -31,7 +31,7 @@ class TestMain(unittest.TestCase):
     @patch('rps.main.RPSLogic')
     def test_main_game_failure(self, mock_rps_logic, mock_asset_manager, mock_game):
         # Arrange
-        mock_asset_manager.return_value.get_asset.return_value = "Rock-Paper-Scissors Game Title"
+        mock_asset_manager.shared.return_value.get_asset.return_value = "Rock-Paper-Scissors Game Title"
 
         # Act
         with patch('builtins.print') as mock_print:
@@ -0,0 +1,181 @@
+"""
+This module contains unit tests for the skill-based matchmaking queue and the Matchmaker.
+"""
+
+import random
+import unittest
+from unittest.mock import Mock
+
+from rps.game import Game
+from rps.matchmaking import Matchmaker, MatchmakingQueue, _SortedKeys
+from rps.player import Player
+from rps.rps_logic import RPSLogic
+
+
+class FakeClock:
+    """A manually advanced clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestSortedKeys(unittest.TestCase):
+    """
+    Test cases for the bucketed sorted collection.
+    """
+
+    def test_matches_sorted_list(self):
+        keys = _SortedKeys()
+        reference = []
+        rng = random.Random(0)
+
+        # Act: Enough random inserts and removals to split and drop buckets
+        for number in range(5000):
+            key = (rng.randrange(1000), number)
+            keys.add(key)
+            reference.append(key)
+            if rng.random() < 0.3:
+                removed = reference.pop(rng.randrange(len(reference)))
+                keys.remove(removed)
+        reference.sort()
+
+        # Assert: Neighbour queries agree with a plain sorted list
+        self.assertEqual(len(keys), len(reference))
+        for index, key in enumerate(reference[::97]):
+            position = reference.index(key)
+            self.assertEqual(keys.lower(key), reference[position - 1] if position else None)
+            self.assertEqual(keys.higher(key), reference[position + 1]
+                             if position + 1 < len(reference) else None)
+        self.assertEqual(keys.lower((-1, 0)), None)
+        self.assertEqual(keys.higher((10_000, 0)), None)
+
+
+class TestMatchmakingQueue(unittest.TestCase):
+    """
+    Test cases for the MatchmakingQueue class.
+    """
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.queue = MatchmakingQueue(initial_window=50, widen_rate=10, clock=self.clock)
+
+    def test_immediate_match_within_window(self):
+        self.queue.enqueue('a', 1500)
+        self.queue.enqueue('b', 2000)
+        self.queue.enqueue('c', 1530)
+
+        matches = self.queue.poll()
+
+        self.assertEqual([(m.player1, m.player2, m.rating_gap) for m in matches],
+                         [('a', 'c', 30)])
+        self.assertEqual(len(self.queue), 1)
+        self.assertIn('b', self.queue)
+
+    def test_window_widens_while_waiting(self):
+        self.queue.enqueue('a', 1500)
+        self.queue.enqueue('b', 1600)
+        self.assertEqual(self.queue.poll(), [])
+
+        # Act: Both windows need to cover the gap of 100 points, i.e. 5 seconds of waiting
+        self.clock.now = 4.9
+        self.assertEqual(self.queue.poll(), [])
+        self.assertAlmostEqual(self.queue.window('a'), 99)
+        self.clock.now = 5
+
+        # Assert: They are matched once both windows are wide enough
+        match, = self.queue.poll()
+        self.assertEqual((match.player1, match.player2, match.waited), ('a', 'b', 5))
+
+    def test_late_joiner_needs_to_wait_too(self):
+        self.queue.enqueue('a', 1500)
+        self.clock.now = 100
+        self.queue.enqueue('b', 1600)
+
+        # The first player's window covers the gap, but not the newcomer's
+        self.assertEqual(self.queue.poll(), [])
+        self.clock.now = 105
+        self.assertEqual(len(self.queue.poll()), 1)
+
+    def test_max_window(self):
+        queue = MatchmakingQueue(initial_window=50, widen_rate=10, max_window=80,
+                                 clock=self.clock)
+        queue.enqueue('a', 1500)
+        queue.enqueue('b', 1600)
+
+        self.clock.now = 1000
+        self.assertEqual(queue.poll(), [])
+        self.assertEqual(queue.window('a'), 80)
+
+    def test_closest_pair_is_matched_first(self):
+        self.queue.enqueue('a', 1000)
+        self.queue.enqueue('b', 1100)
+        self.queue.enqueue('c', 1130)
+
+        # Act: b-c (gap 30) can match immediately, a-b (gap 100) only later
+        matches = self.queue.poll()
+
+        # Assert: Once b is taken, a waits for a new neighbour
+        self.assertEqual([(m.player1, m.player2) for m in matches], [('b', 'c')])
+        self.queue.enqueue('d', 1040)
+        self.assertEqual([(m.player1, m.player2) for m in self.queue.poll()], [('a', 'd')])
+
+    def test_cancel(self):
+        self.queue.enqueue('a', 1500)
+        self.queue.enqueue('b', 1700)
+        self.queue.enqueue('c', 1600)
+
+        # Act: The middle player leaves before the others' windows reach them
+        self.assertTrue(self.queue.cancel('c'))
+        self.assertFalse(self.queue.cancel('c'))
+        self.assertEqual(self.queue.poll(), [])
+
+        # Assert: The remaining neighbours are scheduled with each other
+        self.clock.now = 15
+        self.assertEqual([(m.player1, m.player2) for m in self.queue.poll()], [('a', 'b')])
+
+    def test_duplicate_enqueue(self):
+        self.queue.enqueue('a', 1500)
+        with self.assertRaises(ValueError):
+            self.queue.enqueue('a', 1600)
+
+    def test_many_players_all_matched(self):
+        rng = random.Random(1)
+        for player in range(10_000):
+            self.queue.enqueue(player, rng.gauss(1500, 300))
+
+        self.clock.now = 1000
+        matches = self.queue.poll()
+
+        # Every player is matched exactly once
+        self.assertEqual(len(matches), 5000)
+        self.assertEqual(len({p for m in matches for p in (m.player1, m.player2)}), 10_000)
+        self.assertEqual(len(self.queue), 0)
+
+
+class TestMatchmaker(unittest.TestCase):
+    """
+    Test cases for the Matchmaker class.
+    """
+
+    def test_creates_games(self):
+        rps_logic = Mock(spec=RPSLogic)
+        matchmaker = Matchmaker(rps_logic, num_rounds=5)
+        players = [Player(name, Mock(), rps_logic) for name in ('a', 'b', 'c')]
+        matchmaker.join(players[0], 1500)
+        matchmaker.join(players[1], 3000)
+        matchmaker.join(players[2], 1510)
+        self.assertTrue(matchmaker.leave(players[1]))
+
+        games = matchmaker.poll()
+
+        self.assertEqual(len(games), 1)
+        self.assertIsInstance(games[0], Game)
+        self.assertEqual((games[0].player1, games[0].player2, games[0].num_rounds),
+                         (players[0], players[2], 5))
+
+
+if __name__ == '__main__':
+    unittest.main()
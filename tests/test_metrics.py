@@ -0,0 +1,162 @@
+"""
+This module contains unit tests for the metrics registry and the Prometheus exporter in the
+Rock-Paper-Scissors game.
+"""
+
+import os
+import tempfile
+import threading
+import unittest
+import urllib.request
+
+from rps.exceptions import FailedGameException, MaxAttemptsExceededError
+from rps.metrics import GameMetrics, MetricsRegistry
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    """
+    Test cases for the MetricsRegistry class and its metric types.
+    """
+
+    def test_counter_across_threads(self):
+        registry = MetricsRegistry()
+        counter = registry.counter('test_total', 'A test counter.')
+
+        # Act: Increment from several threads concurrently
+        def work():
+            for _ in range(1000):
+                counter.inc()
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Assert
+        self.assertEqual(counter.labels().get(), 8000)
+        self.assertIn('test_total 8000', registry.render())
+
+    def test_ended_threads_are_retired(self):
+        registry = MetricsRegistry()
+        histogram = registry.histogram('test_seconds', 'A test histogram.', buckets=(1.0,))
+
+        # Act: Observe from many short-lived threads
+        for _ in range(50):
+            thread = threading.Thread(target=histogram.observe, args=(0.5,))
+            thread.start()
+            thread.join()
+
+        # Assert: Their cells were folded into the totals
+        child = histogram.labels()
+        self.assertLessEqual(len(child._cells._cells), 1)
+        self.assertEqual(child.get(), ([50, 50], 25.0, 50))
+
+    def test_labelled_counter(self):
+        registry = MetricsRegistry()
+        counter = registry.counter('hits_total', 'Hits.', ('weapon',))
+        counter.labels('r').inc()
+        counter.labels('r').inc(2)
+        counter.labels('say "hi"').inc()
+
+        rendered = registry.render()
+        self.assertIn('# TYPE hits_total counter', rendered)
+        self.assertIn('hits_total{weapon="r"} 3', rendered)
+        self.assertIn('hits_total{weapon="say \\"hi\\""} 1', rendered)
+
+        with self.assertRaises(ValueError):
+            counter.labels('r', 'extra')
+
+    def test_duplicate_metric(self):
+        registry = MetricsRegistry()
+        registry.counter('dup_total', 'Duplicate.')
+        with self.assertRaises(ValueError):
+            registry.gauge('dup_total', 'Duplicate.')
+
+    def test_gauge(self):
+        gauge = MetricsRegistry().gauge('active', 'Active.')
+        gauge.inc(3)
+        gauge.dec()
+        self.assertEqual(gauge.labels().get(), 2)
+        gauge.set(10)
+        gauge.inc()
+        self.assertEqual(gauge.labels().get(), 11)
+
+    def test_histogram(self):
+        registry = MetricsRegistry()
+        histogram = registry.histogram('latency_seconds', 'Latency.', buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.7, 5.0):
+            histogram.observe(value)
+
+        rendered = registry.render()
+        self.assertIn('latency_seconds_bucket{le="0.1"} 1', rendered)
+        self.assertIn('latency_seconds_bucket{le="1.0"} 3', rendered)
+        self.assertIn('latency_seconds_bucket{le="+Inf"} 4', rendered)
+        self.assertIn('latency_seconds_count 4', rendered)
+        self.assertIn('latency_seconds_sum 6.25', rendered)
+
+    def test_write_textfile(self):
+        registry = MetricsRegistry()
+        registry.counter('written_total', 'Written.').inc()
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'rps.prom')
+            registry.write_textfile(path)
+            with open(path, encoding='utf-8') as f:
+                self.assertEqual(f.read(), registry.render())
+            self.assertEqual(os.listdir(tmp_dir), ['rps.prom'])
+
+    def test_serve(self):
+        registry = MetricsRegistry()
+        registry.counter('served_total', 'Served.').inc()
+
+        server = registry.serve(port=0)
+        try:
+            url = f'http://127.0.0.1:{server.server_address[1]}/metrics'
+            with urllib.request.urlopen(url, timeout=5) as response:
+                body = response.read().decode('utf-8')
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        self.assertIn('served_total 1', body)
+
+
+class TestGameMetrics(unittest.TestCase):
+    """
+    Test cases for the GameMetrics class.
+    """
+
+    def test_round_played(self):
+        metrics = GameMetrics()
+        metrics.round_played('r', 's', 1, 1000)
+        metrics.round_played('r', 'r', 0, 1000)
+        metrics.round_played('p', 's', 2, 1000)
+
+        self.assertEqual(metrics.rounds.labels().get(), 3)
+        self.assertEqual(metrics.outcomes.labels('r', 'win').get(), 1)
+        self.assertEqual(metrics.outcomes.labels('r', 'tie').get(), 2)
+        self.assertEqual(metrics.outcomes.labels('s', 'win').get(), 1)
+        self.assertEqual(metrics.outcomes.labels('p', 'loss').get(), 1)
+        self.assertEqual(metrics.round_duration.labels().get()[2], 3)
+
+    def test_game_lifecycle(self):
+        metrics = GameMetrics()
+        metrics.game_started()
+        metrics.game_started()
+        self.assertEqual(metrics.active_games.labels().get(), 2)
+
+        metrics.game_completed()
+        try:
+            raise FailedGameException('Invalid weapon choice') from MaxAttemptsExceededError()
+        except FailedGameException as e:
+            metrics.game_failed(e)
+        metrics.game_failed(FailedGameException('Other'), started=False)
+
+        self.assertEqual(metrics.active_games.labels().get(), 0)
+        self.assertEqual(metrics.games_completed.labels().get(), 1)
+        self.assertEqual(metrics.games_failed.labels('max_attempts_exceeded').get(), 1)
+        self.assertEqual(metrics.games_failed.labels('failed_game').get(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
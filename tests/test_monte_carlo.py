@@ -0,0 +1,115 @@
+"""
+This module contains unit tests for the multi-process Monte Carlo engine of the
+Rock-Paper-Scissors game.
+"""
+
+import os
+import tempfile
+import unittest
+
+from rps.checkpoint import read_checkpoint
+from rps.exceptions import SimulationError
+from rps.monte_carlo import MonteCarloEngine
+from rps.rps_logic import RPSLogic
+from rps.strategy import RandomStrategy, Strategy
+
+
+class AlwaysRockStrategy(Strategy):
+    """A strategy that always picks rock."""
+
+    def __init__(self):
+        super().__init__('Always Rock')
+
+    def execute(self, game_logic):
+        return 'r'
+
+
+class AlwaysScissorsStrategy(Strategy):
+    """A strategy that always picks scissors."""
+
+    def __init__(self):
+        super().__init__('Always Scissors')
+
+    def execute(self, game_logic):
+        return 's'
+
+
+def failing_factory():
+    raise RuntimeError('Strategy could not be created')
+
+
+class TestMonteCarloEngine(unittest.TestCase):
+    """
+    Test cases for the MonteCarloEngine class.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.rps_logic = RPSLogic()
+
+    def test_deterministic_strategies(self):
+        engine = MonteCarloEngine(self.rps_logic, AlwaysRockStrategy, AlwaysScissorsStrategy,
+                                  num_workers=3)
+
+        # Act: Rounds don't divide evenly between the workers
+        result = engine.run(1000)
+
+        # Assert: Rock always beats scissors
+        self.assertEqual(result.rounds, 1000)
+        self.assertEqual(result.player1_wins, 1000)
+        self.assertEqual(result.ties + result.player2_wins, 0)
+        self.assertEqual(result.choices[0], {'r': 1000, 'p': 0, 's': 0})
+        self.assertEqual(result.choices[1], {'r': 0, 'p': 0, 's': 1000})
+        self.assertEqual(result.wins[0]['r'], 1000)
+        self.assertEqual(result.outcome_rates, {'tie': 0.0, 'player1': 1.0, 'player2': 0.0})
+
+    def test_random_strategies_are_reproducible(self):
+        engine = MonteCarloEngine(self.rps_logic, RandomStrategy, RandomStrategy, num_workers=2)
+
+        result1 = engine.run(3000, seed=7)
+        result2 = engine.run(3000, seed=7)
+
+        self.assertEqual(result1.choices, result2.choices)
+        self.assertEqual(result1.rounds, 3000)
+        self.assertEqual(sum(result1.choices[0].values()), 3000)
+        # Every weapon should come up for a uniformly random strategy
+        self.assertTrue(all(count > 0 for count in result1.choices[0].values()))
+
+    def test_checkpoint_and_resume(self):
+        engine = MonteCarloEngine(self.rps_logic, RandomStrategy, RandomStrategy, num_workers=2)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'simulation.ckpt')
+            reference = engine.run(3000, seed=5, checkpoint_path=path, checkpoint_rounds=1000)
+            self.assertFalse(os.path.exists(path))
+
+            # Act: Crash after the second batch, then run again to resume
+            original_run_batch = engine._run_batch
+            calls = []
+
+            def crash_on_third_batch(num_rounds, seed):
+                calls.append(1)
+                if len(calls) == 3:
+                    raise SimulationError('Host restarted')
+                return original_run_batch(num_rounds, seed)
+
+            engine._run_batch = crash_on_third_batch
+            with self.assertRaises(SimulationError):
+                engine.run(3000, seed=5, checkpoint_path=path, checkpoint_rounds=1000)
+            self.assertEqual(read_checkpoint(path)['rounds_done'], 2000)
+
+            resumed = engine.run(3000, checkpoint_path=path, checkpoint_rounds=1000)
+
+        # Assert: Resuming reuses the checkpointed seed and matches the uninterrupted run
+        self.assertEqual(len(calls), 4)
+        self.assertEqual(resumed.rounds, 3000)
+        self.assertEqual(resumed.choices, reference.choices)
+
+    def test_failed_worker(self):
+        engine = MonteCarloEngine(self.rps_logic, failing_factory, RandomStrategy, num_workers=2)
+        with self.assertRaises(SimulationError):
+            engine.run(100)
+
+
+if __name__ == '__main__':
+    unittest.main()
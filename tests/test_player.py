@@ -46,6 +46,18 @@ class TestPlayer(unittest.TestCase):
         mock_strategy.execute.assert_called_once_with(mock_rps_logic)
         self.assertEqual(weapon, 'rock')
 
+    def test_player_get_and_set_state(self):
+        mock_strategy = Mock()
+        mock_strategy.get_state.return_value = {'rng': 'state'}
+        player = Player(name="TestPlayer", strategy=mock_strategy, rps_logic=Mock(spec=RPSLogic))
+        player.score = 3
+
+        self.assertEqual(player.get_state(), {'score': 3, 'strategy': {'rng': 'state'}})
+
+        player.set_state({'score': 7, 'strategy': {'rng': 'other'}})
+        self.assertEqual(player.score, 7)
+        mock_strategy.set_state.assert_called_once_with({'rng': 'other'})
+
 
 class TestHumanPlayer(unittest.TestCase):
     """
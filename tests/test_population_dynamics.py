@@ -0,0 +1,233 @@
+"""
+This module contains unit tests for the population dynamics engine.
+"""
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from rps.exceptions import ConfigurationError
+from rps.population_dynamics import (MoranProcess, ReplicatorDynamics, SnapshotWriter,
+                                     read_snapshots)
+from rps.rps_logic import RPSLogic
+from rps.strategy import MixedStrategy, RandomStrategy, UserInputStrategy
+
+# Rock, paper, scissors and uniform play, by weapon id
+PURE_AND_UNIFORM = np.array([[1, 0, 0], [0, 1, 0], [0, 0, 1], [1 / 3, 1 / 3, 1 / 3]])
+
+
+def weapon_distributions(rps_logic: RPSLogic, *rows) -> np.ndarray:
+    """
+    :param rps_logic: The game logic.
+    :param rows: Each type's weights of the weapons, by short name.
+    :return: The types' distributions, by weapon id.
+    """
+    distributions = np.zeros((len(rows), len(rps_logic.options)))
+    for row, weights in zip(distributions, rows):
+        for short, weight in weights.items():
+            row[rps_logic.weapon_ids[short]] = weight
+    return distributions
+
+
+class TestReplicatorDynamics(unittest.TestCase):
+    """
+    Test cases for the ReplicatorDynamics class.
+    """
+
+    def setUp(self):
+        self.rps_logic = RPSLogic()
+
+    def test_cycles_conserve_product_of_shares(self):
+        # Arrange: The product of the pure strategies' shares is constant along the orbits
+        distributions = weapon_distributions(self.rps_logic, {'r': 1}, {'p': 1}, {'s': 1})
+        dynamics = ReplicatorDynamics(self.rps_logic, distributions, initial=[0.6, 0.3, 0.1])
+        product = np.prod(dynamics.shares)
+
+        # Act
+        report = dynamics.run(30)
+
+        # Assert
+        self.assertEqual(dynamics.generation, 30)
+        self.assertAlmostEqual(dynamics.shares.sum(), 1.0)
+        self.assertAlmostEqual(np.prod(dynamics.shares) / product, 1.0, delta=1e-3)
+        self.assertFalse(np.allclose(dynamics.shares, [0.6, 0.3, 0.1], atol=0.01))
+        self.assertGreater(report.steps, 30)
+
+    def test_uniform_play_keeps_its_share(self):
+        # Act
+        dynamics = ReplicatorDynamics(self.rps_logic, PURE_AND_UNIFORM,
+                                      initial=[0.5, 0.2, 0.2, 0.1])
+        dynamics.run(10)
+
+        # Assert
+        self.assertAlmostEqual(dynamics.shares[3], 0.1)
+
+    def test_winning_strategy_takes_over(self):
+        # Arrange
+        distributions = weapon_distributions(self.rps_logic, {'r': 1}, {'p': 1})
+
+        # Act
+        dynamics = ReplicatorDynamics(self.rps_logic, distributions)
+        dynamics.run(20)
+
+        # Assert
+        self.assertGreater(dynamics.shares[1], 0.999)
+
+    def test_from_strategies(self):
+        # Arrange
+        factories = {'rocky': lambda: MixedStrategy({'r': 3, 'p': 1}),
+                     'random': RandomStrategy}
+
+        # Act
+        dynamics = ReplicatorDynamics.from_strategies(self.rps_logic, factories)
+
+        # Assert
+        self.assertEqual(dynamics.names, ('rocky', 'random'))
+        np.testing.assert_allclose(dynamics.distributions[0],
+                                   weapon_distributions(self.rps_logic, {'r': 0.75, 'p': 0.25})[0])
+        with self.assertRaises(ValueError):
+            ReplicatorDynamics.from_strategies(self.rps_logic, {'user': UserInputStrategy})
+
+    def test_invalid_input(self):
+        with self.assertRaises(ValueError):
+            ReplicatorDynamics(self.rps_logic, [[0.5, 0.5, 0.5]])
+        with self.assertRaises(ValueError):
+            ReplicatorDynamics(self.rps_logic, [[1, 0]])
+        with self.assertRaises(ValueError):
+            ReplicatorDynamics(self.rps_logic, PURE_AND_UNIFORM, initial=[1, 0, 0])
+
+
+class TestMoranProcess(unittest.TestCase):
+    """
+    Test cases for the MoranProcess class.
+    """
+
+    def setUp(self):
+        self.rps_logic = RPSLogic()
+
+    def test_population_size_is_constant(self):
+        # Arrange
+        process = MoranProcess(self.rps_logic, PURE_AND_UNIFORM, 1001,
+                               initial=[0.5, 0.2, 0.2, 0.1], seed=0)
+        self.assertEqual(process.counts.tolist(), [501, 200, 200, 100])
+
+        # Act
+        report = process.run(20)
+
+        # Assert
+        self.assertEqual(process.counts.sum(), 1001)
+        self.assertTrue((process.counts >= 0).all())
+        self.assertEqual(report.generations, 20)
+        self.assertEqual(process.generation, 20)
+
+    def test_seeded_runs_are_reproducible(self):
+        counts = []
+        for _ in range(2):
+            process = MoranProcess(self.rps_logic, PURE_AND_UNIFORM, 100, seed=7)
+            process.run(5)
+            counts.append(process.counts.tolist())
+        self.assertEqual(counts[0], counts[1])
+
+    def test_exact_events(self):
+        # Act
+        process = MoranProcess(self.rps_logic, PURE_AND_UNIFORM, 20, tolerance=0, seed=0)
+        report = process.run(3)
+
+        # Assert: One leap per birth-death event
+        self.assertEqual(report.steps, 60)
+        self.assertEqual(process.counts.sum(), 20)
+
+    def test_winning_strategy_fixates(self):
+        # Arrange
+        distributions = weapon_distributions(self.rps_logic, {'r': 1}, {'p': 1})
+
+        # Act
+        process = MoranProcess(self.rps_logic, distributions, 500, selection=2.0, seed=0)
+        process.run(30)
+
+        # Assert
+        self.assertEqual(process.counts.tolist(), [0, 500])
+
+
+class TestSnapshots(unittest.TestCase):
+    """
+    Test cases for streaming population snapshots.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'population.snapshots')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_snapshot_round_trip(self):
+        # Arrange
+        dynamics = ReplicatorDynamics(RPSLogic(), PURE_AND_UNIFORM, initial=[0.5, 0.2, 0.2, 0.1])
+
+        # Act
+        with SnapshotWriter(self.path, dynamics.names) as writer:
+            dynamics.run(2, writer, snapshot_interval=0.5)
+            dynamics.run(1, writer, snapshot_interval=0.5)
+        snapshots = read_snapshots(self.path)
+
+        # Assert: The initial state, then every half generation
+        self.assertEqual(snapshots.names, dynamics.names)
+        np.testing.assert_allclose(snapshots.times, np.arange(7) * 0.5)
+        np.testing.assert_allclose(snapshots.shares[0], [0.5, 0.2, 0.2, 0.1], rtol=1e-6)
+        np.testing.assert_allclose(snapshots.shares[-1], dynamics.shares, rtol=1e-6)
+        self.assertFalse(snapshots.shares.flags.writeable)
+
+    def test_moran_snapshots(self):
+        # Arrange
+        process = MoranProcess(RPSLogic(), PURE_AND_UNIFORM, 200, seed=0)
+
+        # Act
+        with SnapshotWriter(self.path, process.names) as writer:
+            process.run(4, writer)
+        snapshots = read_snapshots(self.path)
+
+        # Assert
+        np.testing.assert_array_equal(snapshots.times, [0, 1, 2, 3, 4])
+        np.testing.assert_allclose(snapshots.shares[-1], process.counts / 200)
+
+    def test_moran_final_snapshot(self):
+        # Arrange
+        process = MoranProcess(RPSLogic(), PURE_AND_UNIFORM, 200, seed=0)
+
+        # Act: Runs that aren't a whole number of snapshot intervals
+        with SnapshotWriter(self.path, process.names) as writer:
+            process.run(2.5, writer)
+            process.run(1.25, writer)
+        snapshots = read_snapshots(self.path)
+
+        # Assert: Each run's final state is written
+        np.testing.assert_allclose(snapshots.times, [0, 1, 2, 2.5, 3.5, 3.75])
+        np.testing.assert_allclose(snapshots.shares[-1], process.counts / 200)
+
+    def test_partial_snapshot_is_ignored(self):
+        # Arrange
+        with SnapshotWriter(self.path, ['a', 'b']) as writer:
+            writer.write(0.0, [0.5, 0.5])
+            writer.write(1.0, [0.25, 0.75])
+        with open(self.path, 'ab') as f:
+            f.write(b'\0' * 5)
+
+        # Act
+        snapshots = read_snapshots(self.path)
+
+        # Assert
+        np.testing.assert_array_equal(snapshots.times, [0.0, 1.0])
+        np.testing.assert_array_equal(snapshots.shares[1], [0.25, 0.75])
+
+    def test_invalid_file(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'not a snapshot file at all, not even close')
+        with self.assertRaises(ConfigurationError):
+            read_snapshots(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
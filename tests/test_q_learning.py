@@ -0,0 +1,143 @@
+"""
+This module contains unit tests for the vectorized Q-learning trainer and the QTableStrategy.
+"""
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from rps.exceptions import ConfigurationError
+from rps.game import Game
+from rps.player import Player
+from rps.q_learning import (QLearningTrainer, QTableStrategy, RecordedOpponent,
+                            StationaryOpponent, UniformOpponent)
+from rps.rps_logic import RPSLogic
+from rps.strategy import Strategy
+
+
+class CycleStrategy(Strategy):
+    """A strategy that plays rock, paper, scissors in turn."""
+
+    def __init__(self):
+        super().__init__('Cycle')
+        self.round = 0
+
+    def execute(self, game_logic):
+        self.round += 1
+        return 'rps'[(self.round - 1) % 3]
+
+
+class TestQLearningTrainer(unittest.TestCase):
+    """
+    Test cases for the QLearningTrainer class.
+    """
+
+    def setUp(self):
+        self.rps_logic = RPSLogic()
+
+    def test_learns_to_counter_a_biased_opponent(self):
+        # Arrange: Mostly rock
+        trainer = QLearningTrainer(self.rps_logic, StationaryOpponent([0.8, 0.1, 0.1]),
+                                   num_envs=256, seed=0)
+
+        # Act
+        report = trainer.train(200)
+
+        # Assert: Paper is the best action in every state
+        paper = self.rps_logic.weapon_ids['p']
+        self.assertTrue(np.all(trainer.q_table.argmax(axis=1) == paper))
+        self.assertEqual(report.env_steps, 200 * 256)
+        self.assertGreater(report.mean_reward, 0.4)
+        self.assertGreater(report.env_steps_per_second, 0)
+
+    def test_learns_a_recorded_sequence_from_context(self):
+        # Arrange
+        opponent = RecordedOpponent.from_names(self.rps_logic, 'rps')
+        trainer = QLearningTrainer(self.rps_logic, opponent, num_envs=256, seed=0)
+
+        # Act
+        trainer.train(300)
+        report = trainer.train(50)
+
+        # Assert: The previous opponent move predicts the next one
+        self.assertGreater(report.mean_reward, 0.8)
+
+    def test_uniform_opponent_cannot_be_exploited(self):
+        # Arrange
+        trainer = QLearningTrainer(self.rps_logic, UniformOpponent(), num_envs=512, seed=0)
+
+        # Act
+        report = trainer.train(100)
+
+        # Assert
+        self.assertAlmostEqual(report.mean_reward, 0.0, delta=0.02)
+
+    def test_state_count(self):
+        # Act
+        trainer = QLearningTrainer(self.rps_logic, context_length=2, num_envs=8)
+
+        # Assert: Both players' moves over two rounds
+        self.assertEqual(trainer.num_states, 81)
+        self.assertEqual(trainer.q_table.shape, (81, 3))
+
+    def test_recording_must_not_be_empty(self):
+        with self.assertRaises(ValueError):
+            RecordedOpponent([])
+
+
+class TestQTableStrategy(unittest.TestCase):
+    """
+    Test cases for the QTableStrategy class.
+    """
+
+    def setUp(self):
+        self.rps_logic = RPSLogic()
+
+    def test_save_and_load(self):
+        # Arrange
+        trainer = QLearningTrainer(self.rps_logic, num_envs=16, context_length=2, seed=0)
+        trainer.train(10)
+
+        # A path without the .npz suffix is used as given
+        for name in ('q_table.npz', 'q_table'):
+            with self.subTest(name=name), tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, name)
+
+                # Act
+                trainer.save(path)
+                strategy = QTableStrategy.load(path)
+
+                # Assert
+                self.assertEqual(os.listdir(directory), [name])
+                np.testing.assert_array_equal(strategy.q_table, trainer.q_table)
+                self.assertEqual(strategy.context_length, 2)
+                self.assertEqual(strategy.options, self.rps_logic.options)
+
+    def test_plays_the_trained_policy_in_a_game(self):
+        # Arrange
+        opponent = RecordedOpponent.from_names(self.rps_logic, 'rps')
+        trainer = QLearningTrainer(self.rps_logic, opponent, num_envs=256, seed=0)
+        trainer.train(300)
+        game = Game(Player('Q', trainer.strategy(), self.rps_logic),
+                    Player('Cycle', CycleStrategy(), self.rps_logic), self.rps_logic,
+                    num_rounds=60, verbose=False)
+
+        # Act
+        game.play_game()
+
+        # Assert: Every round after the first is won
+        self.assertGreaterEqual(game.player1.score, 59)
+
+    def test_rejects_a_different_ruleset(self):
+        # Arrange
+        strategy = QTableStrategy(np.zeros((4, 2)), 1, ['a', 'b'])
+
+        # Act & Assert
+        with self.assertRaises(ConfigurationError):
+            strategy.execute(self.rps_logic)
+
+
+if __name__ == '__main__':
+    unittest.main()
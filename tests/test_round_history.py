@@ -0,0 +1,115 @@
+"""
+This module contains unit tests for the RoundHistory ring buffer.
+"""
+
+import pickle
+import unittest
+
+from rps.round_history import RoundHistory
+
+
+class TestRoundHistory(unittest.TestCase):
+    """
+    Test cases for the RoundHistory class.
+    """
+
+    def test_empty_history(self):
+        history = RoundHistory(capacity=4)
+        self.assertEqual(len(history), 0)
+        self.assertEqual(history.moves(1).tolist(), [])
+        self.assertEqual(history.results(3).tolist(), [])
+
+    def test_append_and_window(self):
+        # Arrange
+        history = RoundHistory(capacity=4)
+
+        # Act
+        history.append(0, 1, 2)
+        history.append(2, 2, 0)
+
+        # Assert
+        moves1, moves2, results = history.window()
+        self.assertEqual(moves1.tolist(), [0, 2])
+        self.assertEqual(moves2.tolist(), [1, 2])
+        self.assertEqual(results.tolist(), [2, 0])
+        self.assertEqual(history.moves(2, 1).tolist(), [2])
+
+    def test_wraps_around_keeping_most_recent_rounds(self):
+        # Arrange
+        history = RoundHistory(capacity=3)
+
+        # Act: Record many more rounds than the capacity
+        for round_number in range(100):
+            history.append(round_number % 7, (round_number + 1) % 7, round_number % 3)
+
+        # Assert: Only the last three rounds are retained, oldest first
+        self.assertEqual(len(history), 3)
+        self.assertEqual(history.total, 100)
+        self.assertEqual(history.moves(1).tolist(), [97 % 7, 98 % 7, 99 % 7])
+        self.assertEqual(history.moves(2, 2).tolist(), [99 % 7, 100 % 7])
+        self.assertEqual(history.results(10).tolist(), [1, 2, 0])
+
+    def test_windows_are_read_only_views(self):
+        # Arrange
+        history = RoundHistory(capacity=8)
+        for weapon in range(5):
+            history.append(weapon, weapon, 0)
+
+        # Act
+        window = history.moves(1, 3)
+
+        # Assert: The window shares memory with the history, and can't be written through
+        self.assertFalse(window.flags.owndata)
+        with self.assertRaises(ValueError):
+            window[0] = 1
+
+    def test_large_rulesets_use_wider_ids(self):
+        history = RoundHistory(capacity=2, num_weapons=501)
+        history.append(500, 300, 1)
+        self.assertEqual(history.moves(1).tolist(), [500])
+
+    def test_clear(self):
+        history = RoundHistory(capacity=2)
+        history.append(1, 2, 2)
+        history.clear()
+        self.assertEqual(len(history), 0)
+        self.assertEqual(history.total, 0)
+
+    def test_state_round_trip(self):
+        # Arrange
+        history = RoundHistory(capacity=4)
+        for round_number in range(6):
+            history.append(round_number % 3, 0, round_number % 2)
+
+        # Act: Restore into a history with a smaller capacity
+        state = pickle.loads(pickle.dumps(history.get_state()))
+        restored = RoundHistory(capacity=2)
+        restored.set_state(state)
+
+        # Assert
+        self.assertEqual(restored.total, 6)
+        self.assertEqual(restored.moves(1).tolist(), [1, 2])
+        self.assertEqual(restored.results().tolist(), [0, 1])
+
+    def test_state_round_trip_into_larger_history(self):
+        # Arrange
+        history = RoundHistory(capacity=2)
+        for round_number in range(5):
+            history.append(round_number, 0, 0)
+
+        # Act
+        restored = RoundHistory(capacity=8)
+        restored.set_state(history.get_state())
+
+        # Assert: Only the retained rounds are restored, though the round count is kept
+        self.assertEqual(restored.total, 5)
+        self.assertEqual(len(restored), 2)
+        self.assertEqual(restored.moves(1).tolist(), [3, 4])
+
+    def test_invalid_capacity(self):
+        with self.assertRaises(ValueError):
+            RoundHistory(capacity=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,8 +2,10 @@
 This module contains unit tests for the RPSLogic class in the Rock-Paper-Scissors game.
 """
 
+import pickle
 import unittest
 from unittest.mock import patch, mock_open
+import numpy as np
 import pandas as pd
 from rps.rps_logic import RPSLogic
 from rps.exceptions import ConfigurationError
@@ -42,7 +44,7 @@ class TestRPSLogic(unittest.TestCase):
 
         # Assert
         # Check that the names_tuples are loaded correctly
-        expected_names_tuples = [['r', 'Rock'], ['p', 'Paper'], ['s', 'Scissors']]
+        expected_names_tuples = (('r', 'Rock'), ('p', 'Paper'), ('s', 'Scissors'))
         self.assertEqual(rps_logic.names_tuples, expected_names_tuples)
 
         # Check that the relationship DataFrame is set correctly
@@ -53,7 +55,7 @@ class TestRPSLogic(unittest.TestCase):
         self.assertEqual(rps_logic.short_names_to_full_names, expected_short_names_to_full_names)
 
         # Check that the options list is correct
-        expected_options = ['r', 'p', 's']
+        expected_options = ('r', 'p', 's')
         self.assertEqual(rps_logic.options, expected_options)
 
         # Ensure that validate_input was called with correct arguments
@@ -153,5 +155,71 @@ class TestRPSLogic(unittest.TestCase):
 
         self.assertIn("File not found", str(context.exception))
 
+    def test_rps_logic_is_immutable(self):
+        # Arrange
+        rps_logic = RPSLogic()
+
+        # Act & Assert
+        with self.assertRaises(AttributeError):
+            rps_logic.options = ('r',)
+        with self.assertRaises(AttributeError):
+            del rps_logic.options
+        with self.assertRaises(TypeError):
+            rps_logic.weapon_ids['x'] = 3
+        with self.assertRaises(TypeError):
+            rps_logic.short_names_to_full_names['r'] = 'Boulder'
+        with self.assertRaises(ValueError):
+            rps_logic.outcome_matrix[0, 0] = 1
+
+    def test_compare_unknown_weapon(self):
+        # Arrange
+        rps_logic = RPSLogic()
+
+        # Act & Assert
+        with self.assertRaises(KeyError):
+            rps_logic.compare('r', 'x')
+
+    def test_pickle_round_trip(self):
+        # Arrange
+        rps_logic = RPSLogic()
+
+        # Act
+        restored = pickle.loads(pickle.dumps(rps_logic))
+
+        # Assert
+        self.assertEqual(restored.options, rps_logic.options)
+        self.assertEqual(dict(restored.weapon_ids), dict(rps_logic.weapon_ids))
+        for weapon1 in rps_logic.options:
+            for weapon2 in rps_logic.options:
+                self.assertEqual(restored.compare(weapon1, weapon2),
+                                 rps_logic.compare(weapon1, weapon2))
+
+    def test_from_outcome_matrix(self):
+        # Arrange: More weapons than are compiled into dictionaries
+        num_weapons = 301
+        distance = (np.arange(num_weapons)[None, :] - np.arange(num_weapons)[:, None]) % num_weapons
+        matrix = np.where(distance == 0, 0, np.where(distance <= 150, 1, 2))
+        names_tuples = [[f'w{i}', f'Weapon {i}'] for i in range(num_weapons)]
+
+        # Act
+        rps_logic = RPSLogic.from_outcome_matrix(names_tuples, matrix)
+        matrix[0, 1] = 2
+
+        # Assert: The writable input was copied
+        self.assertEqual(rps_logic.compare('w0', 'w1'), 1)
+        self.assertEqual(rps_logic.compare('w1', 'w0'), 2)
+        self.assertEqual(rps_logic.compare('w7', 'w7'), 0)
+        self.assertEqual(rps_logic.relationship.loc['w0', 'w1'], 1)
+        self.assertEqual(pickle.loads(pickle.dumps(rps_logic)).compare('w0', 'w1'), 1)
+
+    def test_from_outcome_matrix_invalid_input(self):
+        names_tuples = [['r', 'Rock'], ['p', 'Paper']]
+        with self.assertRaises(ConfigurationError):
+            RPSLogic.from_outcome_matrix(names_tuples, np.zeros((2, 3)))
+        with self.assertRaises(ConfigurationError):
+            RPSLogic.from_outcome_matrix(names_tuples, [[0, 3], [2, 0]])
+        with self.assertRaises(ConfigurationError):
+            RPSLogic.from_outcome_matrix([['r', 'Rock'], ['r', 'Rook']], np.zeros((2, 2)))
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,224 @@
+"""
+This module contains unit tests for the ruleset analysis functions.
+"""
+
+import gc
+import json
+import os
+import tempfile
+import unittest
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from rps.rps_logic import RPSLogic
+from rps.ruleset_analysis import (analyze, cached_analysis, equilibrium, exploitability,
+                                  format_report, payoff_matrix, ruleset_digest,
+                                  strongly_connected_components)
+
+
+def well_ruleset() -> RPSLogic:
+    """
+    :return: Rock-Paper-Scissors with a well, which beats rock and scissors and loses to paper, so
+     it dominates rock.
+    """
+    options = ['r', 'p', 's', 'w']
+    names_tuples = [['r', 'Rock'], ['p', 'Paper'], ['s', 'Scissors'], ['w', 'Well']]
+    relationship = pd.DataFrame([[0, 2, 1, 2],
+                                 [1, 0, 2, 1],
+                                 [2, 1, 0, 2],
+                                 [1, 2, 1, 0]], index=options, columns=options)
+    return RPSLogic.from_data(names_tuples, relationship)
+
+
+def ruleset(relationship) -> RPSLogic:
+    """
+    :param relationship: The outcome matrix, with weapons named a, b, c, ...
+    :return: The ruleset.
+    """
+    options = [chr(ord('a') + i) for i in range(len(relationship))]
+    return RPSLogic.from_data([[short, short.upper()] for short in options],
+                              pd.DataFrame(relationship, index=options, columns=options))
+
+
+class TestRulesetAnalysis(unittest.TestCase):
+    """
+    Test cases for the ruleset analysis functions.
+    """
+
+    def test_payoff_matrix(self):
+        # Arrange
+        rps_logic = RPSLogic()
+        ids = rps_logic.weapon_ids
+
+        # Act
+        payoff = payoff_matrix(rps_logic)
+
+        # Assert
+        self.assertEqual(payoff[ids['r'], ids['s']], 1.0)
+        self.assertEqual(payoff[ids['r'], ids['p']], -1.0)
+        self.assertEqual(payoff[ids['r'], ids['r']], 0.0)
+        np.testing.assert_array_equal(payoff, -payoff.T)
+
+    def test_equilibrium_of_balanced_ruleset_is_uniform(self):
+        np.testing.assert_allclose(equilibrium(RPSLogic()), [1 / 3] * 3)
+
+    def test_equilibrium_cache_does_not_keep_rulesets(self):
+        # Arrange
+        rps_logic = well_ruleset()
+        collected = []
+        weakref.finalize(rps_logic, collected.append, True)
+
+        # Act
+        strategy = equilibrium(rps_logic)
+        del rps_logic
+        gc.collect()
+
+        # Assert: The ruleset is freed, and an equal one reuses the cached result
+        self.assertEqual(collected, [True])
+        self.assertIs(equilibrium(well_ruleset()), strategy)
+
+    def test_equilibrium_never_plays_dominated_weapon(self):
+        # Arrange
+        rps_logic = well_ruleset()
+
+        # Act
+        strategy = equilibrium(rps_logic)
+
+        # Assert
+        np.testing.assert_allclose(strategy, [0, 1 / 3, 1 / 3, 1 / 3], atol=1e-9)
+        self.assertLessEqual(exploitability(payoff_matrix(rps_logic), strategy), 1e-9)
+
+    def test_exploitability(self):
+        payoff = payoff_matrix(RPSLogic())
+        self.assertEqual(exploitability(payoff, np.array([1.0, 0.0, 0.0])), 1.0)
+
+
+
+class TestRulesetReport(unittest.TestCase):
+    """
+    Test cases for the ruleset balance report.
+    """
+
+    def test_balanced_ruleset(self):
+        # Act
+        report = analyze(RPSLogic())
+
+        # Assert
+        self.assertTrue(report.balanced)
+        self.assertEqual(report.wins, (1, 1, 1))
+        self.assertEqual(report.inconsistent_pairs, ())
+        self.assertEqual(report.dominated, ())
+        self.assertEqual(len(report.components), 1)
+        self.assertTrue(report.uniform_equilibrium)
+
+    def test_dominated_weapon(self):
+        # Arrange
+        rps_logic = well_ruleset()
+        ids = rps_logic.weapon_ids
+
+        # Act
+        report = analyze(rps_logic)
+
+        # Assert
+        self.assertFalse(report.balanced)
+        self.assertEqual(report.dominated, ((ids['r'], ids['w']),))
+        self.assertEqual(len(report.components), 1)
+        self.assertFalse(report.uniform_equilibrium)
+        self.assertAlmostEqual(report.uniform_exploitability, 0.25)
+
+    def test_ranked_ruleset(self):
+        # Arrange: a beats b and c, b beats c
+        rps_logic = ruleset([[0, 1, 1], [2, 0, 1], [2, 2, 0]])
+
+        # Act
+        report = analyze(rps_logic)
+
+        # Assert
+        self.assertEqual(report.dominated, ((1, 0), (2, 0)))
+        self.assertEqual(sorted(report.components), [(0,), (1,), (2,)])
+
+    def test_inconsistent_relationships(self):
+        # Arrange: a and b both beat each other
+        rps_logic = ruleset([[0, 1, 1], [1, 0, 2], [2, 1, 0]])
+
+        # Act
+        report = analyze(rps_logic)
+
+        # Assert
+        self.assertEqual(report.inconsistent_pairs, ((0, 1),))
+
+    def test_large_balanced_ruleset(self):
+        # Arrange: Every weapon beats the next half of the weapons, cyclically
+        num_weapons = 401
+        distance = (np.arange(num_weapons)[None, :] - np.arange(num_weapons)[:, None]) % num_weapons
+        options = [f'w{i}' for i in range(num_weapons)]
+        rps_logic = RPSLogic.from_data(
+            [[short, f'weapon {short}'] for short in options],
+            pd.DataFrame(np.where(distance == 0, 0, np.where(distance <= 200, 1, 2)),
+                         index=options, columns=options))
+
+        # Act
+        report = analyze(rps_logic)
+
+        # Assert
+        self.assertTrue(report.balanced)
+        self.assertEqual(report.dominated, ())
+        self.assertEqual(len(report.components), 1)
+        self.assertTrue(report.uniform_equilibrium)
+
+    def test_strongly_connected_components(self):
+        # Arrange: Two 2-cycles joined by a one-way edge, and an isolated node
+        adjacency = np.zeros((5, 5), dtype=bool)
+        for source, target in [(0, 1), (1, 0), (1, 2), (2, 3), (3, 2)]:
+            adjacency[source, target] = True
+
+        # Act
+        components = strongly_connected_components(adjacency)
+
+        # Assert
+        self.assertEqual(sorted(sorted(component.tolist()) for component in components),
+                         [[0, 1], [2, 3], [4]])
+
+    def test_cached_analysis(self):
+        # Arrange
+        rps_logic = well_ruleset()
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            # Act
+            report = cached_analysis(rps_logic, cache_dir)
+            cached = cached_analysis(rps_logic, cache_dir)
+
+            # Assert: The report is stored under the ruleset's digest and read back
+            path = os.path.join(cache_dir, f'{ruleset_digest(rps_logic)}.json')
+            self.assertTrue(os.path.exists(path))
+            self.assertEqual(cached, report)
+
+            # Assert: Reports are read from the cache rather than recomputed
+            with open(path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+            stored['report']['uniform_exploitability'] = 0.5
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(stored, f)
+            self.assertEqual(cached_analysis(rps_logic, cache_dir).uniform_exploitability, 0.5)
+
+    def test_digest_depends_on_contents(self):
+        self.assertEqual(ruleset_digest(RPSLogic()), ruleset_digest(RPSLogic()))
+        self.assertNotEqual(ruleset_digest(RPSLogic()), ruleset_digest(well_ruleset()))
+
+    def test_format_report(self):
+        # Arrange
+        rps_logic = well_ruleset()
+
+        # Act
+        text = format_report(analyze(rps_logic), rps_logic.options)
+
+        # Assert
+        self.assertIn('Balance: unbalanced', text)
+        self.assertIn('r (by w)', text)
+        self.assertIn('Equilibrium: non-uniform', text)
+
+
+if __name__ == '__main__':
+    unittest.main()
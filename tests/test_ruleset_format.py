@@ -0,0 +1,204 @@
+"""
+This module contains unit tests for the binary ruleset format and its converters.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from benchmarks.rulesets import balanced_ruleset
+from rps.exceptions import ConfigurationError
+from rps.rps_logic import RPSLogic
+from rps.ruleset_format import (ENCODING_INT8, ENCODING_PACKED, BinaryRulesetWriter,
+                                binary_to_csv, csv_to_binary, decode_rows, encode_rows,
+                                read_binary_ruleset)
+
+
+class TestRulesetFormat(unittest.TestCase):
+    """
+    Test cases for reading, writing and converting binary ruleset files.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.names_tuples, self.relationship = balanced_ruleset(7)
+        self.matrix = self.relationship.to_numpy()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory.name, name)
+
+    def write(self, encoding: int) -> str:
+        path = self.path('ruleset.rpsr')
+        with BinaryRulesetWriter(path, self.names_tuples, encoding) as writer:
+            # Rows may be written in any order
+            writer.write_rows(4, self.matrix[4:])
+            writer.write_rows(0, self.matrix[:4])
+        return path
+
+    def test_round_trip(self):
+        for encoding in (ENCODING_INT8, ENCODING_PACKED):
+            with self.subTest(encoding=encoding):
+                # Act
+                names_tuples, matrix = read_binary_ruleset(self.write(encoding))
+
+                # Assert
+                self.assertEqual(names_tuples, self.names_tuples)
+                np.testing.assert_array_equal(matrix, self.matrix)
+                self.assertEqual(matrix.dtype, np.int8)
+                self.assertFalse(matrix.flags.writeable)
+
+    def test_packed_rows(self):
+        # Arrange: Rows of 5 cells take 2 bytes
+        rows = np.array([[0, 1, 2, 1, 2], [2, 2, 0, 0, 1]])
+
+        # Act
+        packed = encode_rows(rows, ENCODING_PACKED)
+
+        # Assert
+        self.assertEqual(packed.shape, (2, 2))
+        self.assertEqual(packed[0, 0], 0 | 1 << 2 | 2 << 4 | 1 << 6)
+        np.testing.assert_array_equal(decode_rows(packed, 5), rows)
+
+    def test_int8_matrix_is_memory_mapped(self):
+        # Act
+        rps_logic = RPSLogic.from_binary(self.write(ENCODING_INT8))
+
+        # Assert: The matrix is a view of the file, shared with the relationship
+        self.assertFalse(rps_logic.outcome_matrix.flags.owndata)
+        self.assertTrue(np.shares_memory(rps_logic.relationship.to_numpy(),
+                                         rps_logic.outcome_matrix))
+        self.assertEqual(rps_logic.compare('w0', 'w1'), 1)
+        self.assertEqual(rps_logic.compare('w1', 'w0'), 2)
+
+    def test_csv_conversion_round_trip(self):
+        # Arrange: Rows out of order
+        short_names_path, relationship_path = self.path('names.json'), self.path('rel.csv')
+        with open(short_names_path, 'w', encoding='utf-8') as f:
+            json.dump(self.names_tuples, f)
+        self.relationship.iloc[[3, 4, 5, 6, 0, 1, 2]].to_csv(relationship_path)
+        binary_path = self.path('ruleset.rpsr')
+
+        # Act
+        csv_to_binary(short_names_path, relationship_path, binary_path, ENCODING_PACKED,
+                      chunk_rows=2)
+        binary_to_csv(binary_path, self.path('names2.json'), self.path('rel2.csv'), chunk_rows=3)
+
+        # Assert
+        converted = RPSLogic(self.path('names2.json'), self.path('rel2.csv'))
+        self.assertEqual(converted.names_tuples, tuple(map(tuple, self.names_tuples)))
+        np.testing.assert_array_equal(converted.outcome_matrix, self.matrix)
+
+    def test_shipped_ruleset_conversion(self):
+        # Arrange
+        rps_logic = RPSLogic()
+        binary_path = self.path('ruleset.rpsr')
+
+        # Act
+        csv_to_binary(os.path.join('data', 'short_names.json'),
+                      os.path.join('data', 'relationship.csv'), binary_path)
+
+        # Assert
+        converted = RPSLogic.from_binary(binary_path)
+        self.assertEqual(converted.names_tuples, rps_logic.names_tuples)
+        np.testing.assert_array_equal(converted.outcome_matrix, rps_logic.outcome_matrix)
+
+    def test_missing_rows(self):
+        path = self.path('ruleset.rpsr')
+        writer = BinaryRulesetWriter(path, self.names_tuples)
+        writer.write_rows(0, self.matrix[:3])
+
+        with self.assertRaises(ConfigurationError):
+            writer.close()
+
+        # Assert: No partial file is left behind
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+    def test_failed_write_keeps_existing_file(self):
+        # Arrange
+        path = self.write(ENCODING_INT8)
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        # Act: A write that fails half way
+        with self.assertRaises(RuntimeError):
+            with BinaryRulesetWriter(path, self.names_tuples, ENCODING_PACKED) as writer:
+                writer.write_rows(0, self.matrix[:3])
+                raise RuntimeError('interrupted')
+
+        # Assert: The previous file is untouched, and the temporary one was deleted
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read(), data)
+        self.assertEqual(os.listdir(self.directory.name), ['ruleset.rpsr'])
+
+    def test_invalid_csv_conversions(self):
+        # Arrange
+        short_names_path, relationship_path = self.path('names.json'), self.path('rel.csv')
+        binary_path = self.path('ruleset.rpsr')
+        with open(short_names_path, 'w', encoding='utf-8') as f:
+            json.dump(self.names_tuples, f)
+        invalid_cells = self.relationship.copy()
+        invalid_cells.iloc[2, 3] = 3
+        duplicate_column = self.relationship.copy()
+        duplicate_column.insert(1, 'w0', self.relationship['w0'], allow_duplicates=True)
+        out_of_range = self.relationship.copy()
+        # 258 wraps around to 2 as an int8
+        out_of_range.iloc[1, 3] = 258
+        empty_cell = self.relationship.astype(float)
+        empty_cell.iloc[2, 1] = np.nan
+        cases = {
+            'missing rows': self.relationship.iloc[:-1],
+            # Duplicates in the same chunk and in a later one
+            'duplicate rows': self.relationship.iloc[[0, 1, 1, 2, 3, 4, 5, 6]],
+            'duplicate rows across chunks': self.relationship.iloc[[0, 1, 2, 3, 4, 5, 6, 0]],
+            'duplicate column': duplicate_column,
+            'invalid cells': invalid_cells,
+            'out of range cell': out_of_range,
+            'empty cell': empty_cell,
+        }
+
+        for name, relationship in cases.items():
+            with self.subTest(name):
+                relationship.to_csv(relationship_path)
+
+                # Act & Assert
+                with self.assertRaises(ConfigurationError):
+                    csv_to_binary(short_names_path, relationship_path, binary_path,
+                                  chunk_rows=3)
+                self.assertFalse(os.path.exists(binary_path))
+                self.assertFalse(os.path.exists(f'{binary_path}.tmp'))
+
+    def test_invalid_cells(self):
+        with BinaryRulesetWriter(self.path('ruleset.rpsr'), self.names_tuples) as writer:
+            with self.assertRaises(ValueError):
+                writer.write_rows(0, np.full((1, 7), 3))
+            writer.write_rows(0, self.matrix)
+
+    def test_invalid_files(self):
+        # Arrange
+        path = self.write(ENCODING_INT8)
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        # The last byte is the matrix's last cell
+        for name, contents in [('empty', b''), ('magic', b'X' + data[1:]),
+                               ('truncated', data[:-1]), ('negative cell', data[:-1] + b'\xff'),
+                               ('large cell', data[:-1] + b'\x03')]:
+            with self.subTest(name):
+                with open(path, 'wb') as f:
+                    f.write(contents)
+
+                # Act & Assert
+                with self.assertRaises(ConfigurationError):
+                    read_binary_ruleset(path)
+                with self.assertRaises(ConfigurationError):
+                    RPSLogic.from_binary(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+"""
+This module contains unit tests for the balanced ruleset generator.
+"""
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from benchmarks.rulesets import balanced_ruleset
+from rps.rps_logic import RPSLogic
+from rps.ruleset_analysis import analyze
+from rps.ruleset_format import ENCODING_INT8, ENCODING_PACKED
+from rps.ruleset_generator import BalancedRulesetGenerator
+
+
+class TestBalancedRulesetGenerator(unittest.TestCase):
+    """
+    Test cases for the BalancedRulesetGenerator class.
+    """
+
+    def test_cyclic_ruleset(self):
+        # Act
+        generator = BalancedRulesetGenerator(101)
+
+        # Assert
+        np.testing.assert_array_equal(generator.rows(0, 101), balanced_ruleset(101)[1].to_numpy())
+        np.testing.assert_array_equal(generator.rows(40, 60), generator.rows(0, 101)[40:60])
+        self.assertTrue(generator.beats(0, 50))
+        self.assertFalse(generator.beats(0, 51))
+
+    def test_perturbed_ruleset_is_balanced(self):
+        # Act
+        generator = BalancedRulesetGenerator(51, perturbations=200, seed=3)
+        matrix = generator.rows(0, 51)
+
+        # Assert: Differs from the cyclic ruleset, but is still balanced
+        self.assertTrue((matrix != BalancedRulesetGenerator(51).rows(0, 51)).any())
+        report = analyze(generator.rps_logic())
+        self.assertTrue(report.balanced)
+        self.assertEqual(report.wins, (25,) * 51)
+        self.assertEqual(generator.beats(3, 7), matrix[3, 7] == 1)
+
+    def test_seeded_perturbations(self):
+        rows = [BalancedRulesetGenerator(21, perturbations=10, seed=seed).rows(0, 21)
+                for seed in (1, 1, 2)]
+        np.testing.assert_array_equal(rows[0], rows[1])
+        self.assertTrue((rows[0] != rows[2]).any())
+
+    def test_invalid_sizes(self):
+        with self.assertRaises(ValueError):
+            BalancedRulesetGenerator(100)
+        with self.assertRaises(ValueError):
+            BalancedRulesetGenerator(1, perturbations=1)
+
+    def test_write_files(self):
+        # Arrange
+        generator = BalancedRulesetGenerator(301, perturbations=100, seed=0)
+        matrix = generator.rows(0, 301)
+
+        with tempfile.TemporaryDirectory() as directory:
+            short_names_path = os.path.join(directory, 'short_names.json')
+            relationship_path = os.path.join(directory, 'relationship.csv')
+            binary_paths = {encoding: os.path.join(directory, f'ruleset{encoding}.rpsr')
+                            for encoding in (ENCODING_INT8, ENCODING_PACKED)}
+
+            # Act
+            generator.write_csv(short_names_path, relationship_path, block_rows=64)
+            for encoding, path in binary_paths.items():
+                generator.write_binary(path, encoding, block_rows=64)
+
+            # Assert
+            loaded = [RPSLogic(short_names_path, relationship_path)]
+            loaded += [RPSLogic.from_binary(path) for path in binary_paths.values()]
+            for rps_logic in loaded:
+                self.assertEqual(rps_logic.names_tuples[7], ('w7', 'Weapon 7'))
+                np.testing.assert_array_equal(rps_logic.outcome_matrix, matrix)
+            del loaded  # Releases the memory-mapped file
+
+
+if __name__ == '__main__':
+    unittest.main()
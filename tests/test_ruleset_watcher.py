@@ -0,0 +1,160 @@
+"""
+This module contains unit tests for the RulesetWatcher class, which reloads the ruleset when its
+data files change.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from rps.exceptions import ConfigurationError
+from rps.http_api import GameServer, HTTPError
+from rps.rps_logic import DEFAULT_RELATIONSHIP_PATH, DEFAULT_SHORT_NAMES_PATH
+from rps.ruleset_watcher import RulesetWatcher
+
+# Rock-paper-scissors-lizard-spock
+_FIVE_WEAPONS = [['r', 'rock'], ['p', 'paper'], ['s', 'scissors'], ['l', 'lizard'],
+                 ['k', 'spock']]
+_FIVE_RELATIONSHIP = '''index,r,p,s,l,k
+r,0,2,1,1,2
+p,1,0,2,2,1
+s,2,1,0,1,2
+l,2,1,2,0,1
+k,1,2,1,2,0
+'''
+
+
+class TestRulesetWatcher(unittest.TestCase):
+    """
+    Test cases for the RulesetWatcher class.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.short_names_path = os.path.join(self.tmp_dir.name, 'short_names.json')
+        self.relationship_path = os.path.join(self.tmp_dir.name, 'relationship.csv')
+        shutil.copy(DEFAULT_SHORT_NAMES_PATH, self.short_names_path)
+        shutil.copy(DEFAULT_RELATIONSHIP_PATH, self.relationship_path)
+        self.watcher = RulesetWatcher(self.short_names_path, self.relationship_path,
+                                      poll_interval=0.01)
+
+    def write(self, short_names, relationship):
+        with open(self.short_names_path, 'w', encoding='utf-8') as f:
+            json.dump(short_names, f)
+        with open(self.relationship_path, 'w', encoding='utf-8') as f:
+            f.write(relationship)
+        # Make sure the change is visible even on file systems with coarse timestamps
+        for path in (self.short_names_path, self.relationship_path):
+            stat = os.stat(path)
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def test_unchanged_files(self):
+        self.assertFalse(self.watcher.check())
+        self.assertEqual(self.watcher.version, 1)
+
+    def test_reload(self):
+        old = self.watcher.current
+        reloaded = []
+        self.watcher.add_listener(reloaded.append)
+
+        # Act: Add lizard and spock
+        self.write(_FIVE_WEAPONS, _FIVE_RELATIONSHIP)
+        changed = self.watcher.check()
+
+        # Assert: The new ruleset is published, and the old one is left untouched
+        self.assertTrue(changed)
+        self.assertEqual(self.watcher.version, 2)
+        self.assertEqual(list(self.watcher.current.options), ['r', 'p', 's', 'l', 'k'])
+        self.assertEqual(self.watcher.current.compare('k', 's'), 1)
+        self.assertEqual(reloaded, [self.watcher.current])
+        self.assertEqual(list(old.options), ['r', 'p', 's'])
+
+    def test_invalid_change_keeps_current(self):
+        old = self.watcher.current
+
+        # Act: The relationship refers to an unknown weapon
+        self.write(_FIVE_WEAPONS[:3], _FIVE_RELATIONSHIP)
+        changed = self.watcher.check()
+
+        # Assert: The previous ruleset stays in service, and the error is reported
+        self.assertFalse(changed)
+        self.assertIs(self.watcher.current, old)
+        self.assertIsInstance(self.watcher.last_error, ConfigurationError)
+
+        # Fixing the files is picked up
+        self.write(_FIVE_WEAPONS, _FIVE_RELATIONSHIP)
+        self.assertTrue(self.watcher.check())
+        self.assertIsNone(self.watcher.last_error)
+
+    def test_background_polling(self):
+        self.watcher.start()
+        self.addCleanup(self.watcher.stop)
+
+        self.write(_FIVE_WEAPONS, _FIVE_RELATIONSHIP)
+        deadline = time.monotonic() + 5
+        while self.watcher.version == 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        self.assertEqual(self.watcher.version, 2)
+
+    def test_failing_listener(self):
+        reloaded = []
+
+        def fail(rps_logic):
+            raise RuntimeError('listener bug')
+
+        with open(DEFAULT_RELATIONSHIP_PATH, encoding='utf-8') as f:
+            three_relationship = f.read()
+        self.watcher.add_listener(fail)
+        self.watcher.add_listener(reloaded.append)
+        self.watcher.start()
+        self.addCleanup(self.watcher.stop)
+
+        # Act: Two changes, each notifying the failing listener on the watcher's thread
+        with self.assertLogs('rps.ruleset_watcher', 'ERROR') as logs:
+            for expected_version, short_names, relationship in (
+                    (2, _FIVE_WEAPONS, _FIVE_RELATIONSHIP),
+                    (3, _FIVE_WEAPONS[:3], three_relationship)):
+                self.write(short_names, relationship)
+                deadline = time.monotonic() + 5
+                while len(reloaded) < expected_version - 1 and time.monotonic() < deadline:
+                    time.sleep(0.01)
+
+        # Assert: The failures are logged, and the watcher kept polling and notifying
+        self.assertEqual(self.watcher.version, 3)
+        self.assertEqual(len(reloaded), 2)
+        self.assertIs(reloaded[-1], self.watcher.current)
+        self.assertEqual(len(logs.records), 2)
+
+    def test_invalid_initial_files(self):
+        self.write(_FIVE_WEAPONS[:3], _FIVE_RELATIONSHIP)
+
+        with self.assertRaises(ConfigurationError):
+            RulesetWatcher(self.short_names_path, self.relationship_path)
+
+    def test_sessions_keep_their_ruleset(self):
+        server = GameServer(watcher=self.watcher)
+        _, old_session = server.dispatch('POST', '/sessions', b'')
+
+        # Act: Reload with lizard and spock
+        self.write(_FIVE_WEAPONS, _FIVE_RELATIONSHIP)
+        self.watcher.check()
+        _, new_session = server.dispatch('POST', '/sessions', b'')
+        _, ruleset = server.dispatch('GET', '/ruleset', b'')
+
+        # Assert: Only the new session and the ruleset description use the new weapons
+        self.assertEqual(len(json.loads(ruleset)['options']), 5)
+        self.assertEqual(
+            server.dispatch('POST', f'/sessions/{new_session["session"]}/round',
+                            b'{"move": "spock"}')[1]['move'], 'k')
+        with self.assertRaises(HTTPError):
+            server.dispatch('POST', f'/sessions/{old_session["session"]}/round',
+                            b'{"move": "spock"}')
+
+
+if __name__ == '__main__':
+    unittest.main()
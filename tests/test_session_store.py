@@ -0,0 +1,155 @@
+"""
+This module contains unit tests for the SessionStore class: lookups, time-to-live expiry, LRU
+eviction under the session and memory caps, and the background sweeper.
+"""
+
+import time
+import unittest
+
+from rps.session_store import SessionStore, deep_sizeof
+
+
+class FakeClock:
+    """A manually advanced clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestSessionStore(unittest.TestCase):
+    """
+    Test cases for the SessionStore class.
+    """
+
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def test_put_get_pop(self):
+        store = SessionStore(clock=self.clock)
+
+        store['a'] = 1
+        store.put('b', None)
+
+        self.assertEqual(store['a'], 1)
+        self.assertIn('b', store)
+        self.assertIsNone(store['b'])
+        self.assertEqual(store.pop('a'), 1)
+        self.assertEqual(len(store), 1)
+        with self.assertRaises(KeyError):
+            store['a']
+        with self.assertRaises(KeyError):
+            del store['a']
+
+    def test_expiry_on_lookup(self):
+        store = SessionStore(ttl=10, clock=self.clock)
+        store.put('a', 1)
+        store.put('b', 2, ttl=30)
+
+        # Act: Advance past the default time-to-live but not the per-session one
+        self.clock.now = 15
+
+        # Assert: Only the session with the default time-to-live expired
+        self.assertIsNone(store.get('a'))
+        self.assertEqual(store.get('b'), 2)
+        self.assertEqual(store.expired, 1)
+
+    def test_access_extends_ttl(self):
+        store = SessionStore(ttl=10, clock=self.clock)
+        store.put('a', 1)
+
+        # Act: Touch the session before it expires, then sweep after its original expiry
+        self.clock.now = 8
+        store.get('a')
+        self.clock.now = 15
+        removed = store.sweep()
+
+        # Assert: The touched session survives until 10 seconds after its last access
+        self.assertEqual(removed, 0)
+        self.assertIn('a', store)
+        self.clock.now = 18
+        self.assertEqual(store.sweep(), 1)
+        self.assertEqual(len(store), 0)
+
+    def test_sweep_removes_only_expired(self):
+        store = SessionStore(ttl=10, clock=self.clock)
+        for index in range(100):
+            self.clock.now = index
+            store.put(str(index), index)
+
+        self.clock.now = 60
+        removed = store.sweep()
+
+        self.assertEqual(removed, 51)
+        self.assertEqual(len(store), 49)
+        self.assertNotIn('50', store)
+        self.assertIn('51', store)
+
+    def test_replace_with_shorter_ttl(self):
+        store = SessionStore(ttl=100, clock=self.clock)
+        store.put('a', 1)
+        store.put('a', 2, ttl=5)
+
+        self.clock.now = 6
+        self.assertEqual(store.sweep(), 1)
+        # The stale heap item of the first put is ignored later
+        self.clock.now = 200
+        self.assertEqual(store.sweep(), 0)
+
+    def test_session_cap_evicts_least_recently_used(self):
+        store = SessionStore(max_sessions=2, clock=self.clock)
+        store.put('a', 1)
+        store.put('b', 2)
+        store.get('a')
+
+        # Act: A third session exceeds the cap
+        store.put('c', 3)
+
+        # Assert: 'b' was the least recently used
+        self.assertNotIn('b', store)
+        self.assertIn('a', store)
+        self.assertIn('c', store)
+        self.assertEqual(store.evicted, 1)
+
+    def test_memory_cap(self):
+        store = SessionStore(max_bytes=250, size_of=len, clock=self.clock)
+        store.put('a', 'x' * 100)
+        store.put('b', 'x' * 100)
+
+        # Act: A session grows in place past the cap
+        value = ['x'] * 100
+        store.put('c', value)
+        self.assertNotIn('a', store)
+        value.extend(['x'] * 100)
+        store.update_size('c')
+
+        # Assert: Least recently used sessions are evicted, keeping the most recent one
+        self.assertEqual(list(key for key in 'abc' if key in store), ['c'])
+        self.assertEqual(store.total_bytes, 200)
+
+    def test_background_sweeper(self):
+        store = SessionStore(ttl=0.01, sweep_interval=0.01)
+        store.put('a', 1)
+        store.start()
+        self.addCleanup(store.stop)
+
+        deadline = time.monotonic() + 5
+        while len(store) and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        self.assertEqual(len(store), 0)
+        self.assertEqual(store.expired, 1)
+
+    def test_deep_sizeof(self):
+        shared = ['x'] * 1000
+        small = {'data': [1, 2, 3], 'shared': shared}
+
+        # The shared list dominates the size unless it's excluded
+        self.assertGreater(deep_sizeof(small), deep_sizeof(shared))
+        self.assertLess(deep_sizeof(small, exclude=(shared,)), deep_sizeof(shared))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,13 +3,19 @@ This module contains unit tests for the strategy classes in the Rock-Paper-Sciss
  including:
 - The abstract `Strategy` base class.
 - The `RandomStrategy` class, which selects a weapon randomly.
+- The `MixedStrategy` class, which selects weapons with fixed probabilities.
 - The `UserInputStrategy` class, which allows a user to input their weapon choice.
 """
 
+import threading
 import unittest
 from unittest.mock import Mock, patch
-from rps.strategy import Strategy, RandomStrategy, UserInputStrategy
+from collections import Counter
+
+from rps.strategy import (STRATEGIES, MixedStrategy, Strategy, RandomStrategy, UserInputStrategy,
+                          register_strategy)
 from rps.exceptions import FailedWeaponChoiceException, MaxAttemptsExceededError
+from rps.input_matcher import InputMatcher
 from rps.rps_logic import RPSLogic
 
 class TestStrategy(unittest.TestCase):
@@ -39,19 +45,137 @@ class TestRandomStrategy(unittest.TestCase):
         strategy = RandomStrategy()
         self.assertEqual(strategy.name, "Random")
 
-    @patch('random.choice', return_value='s')
-    def test_random_strategy_execute(self, mock_random_choice):
+    def test_random_strategy_execute(self):
         # Mock RPSLogic
         mock_rps_logic = Mock(spec=RPSLogic)
         mock_rps_logic.options = ['r', 'p', 's']
 
         strategy = RandomStrategy()
-        weapon = strategy.execute(mock_rps_logic)
+        with patch.object(strategy.rng, 'choice', return_value='s') as mock_random_choice:
+            weapon = strategy.execute(mock_rps_logic)
 
         # Assertions
         mock_random_choice.assert_called_once_with(['r', 'p', 's'])
         self.assertEqual(weapon, 's')
 
+    def test_random_strategy_seed(self):
+        mock_rps_logic = Mock(spec=RPSLogic)
+        mock_rps_logic.options = ['r', 'p', 's']
+
+        strategy1 = RandomStrategy(seed=42)
+        strategy2 = RandomStrategy(seed=42)
+
+        self.assertEqual([strategy1.execute(mock_rps_logic) for _ in range(20)],
+                         [strategy2.execute(mock_rps_logic) for _ in range(20)])
+
+    def test_random_strategy_state(self):
+        mock_rps_logic = Mock(spec=RPSLogic)
+        mock_rps_logic.options = ['r', 'p', 's']
+        strategy = RandomStrategy(seed=1)
+        strategy.execute(mock_rps_logic)
+
+        # Act: Save the state, continue, then restore it into a different strategy
+        state = strategy.get_state()
+        expected = [strategy.execute(mock_rps_logic) for _ in range(20)]
+        restored = RandomStrategy(seed=2)
+        restored.set_state(state)
+
+        # Assert: The restored strategy continues with the same moves
+        self.assertEqual([restored.execute(mock_rps_logic) for _ in range(20)], expected)
+
+
+    def test_random_strategy_state_before_first_use(self):
+        mock_rps_logic = Mock(spec=RPSLogic)
+        mock_rps_logic.options = ['r', 'p', 's']
+        strategy = RandomStrategy(seed=3)
+
+        # Act: Save the state of a strategy that hasn't chosen yet
+        state = strategy.get_state()
+        restored = RandomStrategy(seed=4)
+        restored.set_state(state)
+
+        # Assert: The state is compact, and the restored strategy makes the same moves
+        self.assertEqual(state, {'seed': 3})
+        self.assertEqual([restored.execute(mock_rps_logic) for _ in range(20)],
+                         [strategy.execute(mock_rps_logic) for _ in range(20)])
+
+    def test_random_strategy_generator_per_thread(self):
+        mock_rps_logic = Mock(spec=RPSLogic)
+        mock_rps_logic.options = ['r', 'p', 's']
+        strategy = RandomStrategy(seed=5)
+        main_rng = strategy.rng
+        thread_rngs = []
+
+        # Act: Use the strategy from another thread
+        thread = threading.Thread(target=lambda: thread_rngs.append(strategy.rng))
+        thread.start()
+        thread.join()
+
+        # Assert: The other thread got its own generator, and the first thread keeps the seeded one
+        self.assertIsNot(thread_rngs[0], main_rng)
+        self.assertIs(strategy.rng, main_rng)
+        reference = RandomStrategy(seed=5)
+        self.assertEqual([strategy.execute(mock_rps_logic) for _ in range(20)],
+                         [reference.execute(mock_rps_logic) for _ in range(20)])
+
+    def test_random_strategy_move_distribution(self):
+        self.assertEqual(RandomStrategy().move_distribution(RPSLogic()), [1 / 3] * 3)
+
+
+class TestMixedStrategy(unittest.TestCase):
+    """
+    Test cases for the MixedStrategy class.
+    """
+
+    def setUp(self):
+        self.rps_logic = RPSLogic()
+
+    def test_mixed_strategy_execute(self):
+        # Arrange
+        strategy = MixedStrategy({'r': 3, 'p': 1}, seed=0)
+
+        # Act
+        counts = Counter(strategy.execute(self.rps_logic) for _ in range(4000))
+
+        # Assert: Scissors has no weight, and rock is played three times as often as paper
+        self.assertEqual(set(counts), {'r', 'p'})
+        self.assertAlmostEqual(counts['r'] / 4000, 0.75, delta=0.03)
+
+    def test_mixed_strategy_move_distribution(self):
+        strategy = MixedStrategy({'r': 3, 'p': 1})
+        self.assertEqual(strategy.move_distribution(self.rps_logic), [0.75, 0.25, 0.0])
+
+    def test_mixed_strategy_invalid_weights(self):
+        with self.assertRaises(ValueError):
+            MixedStrategy({'r': -1, 'p': 2})
+        with self.assertRaises(ValueError):
+            MixedStrategy({'r': 0})
+        with self.assertRaises(ValueError):
+            MixedStrategy({'x': 1}).move_distribution(self.rps_logic)
+
+    def test_adaptive_strategies_declare_no_distribution(self):
+        self.assertIsNone(UserInputStrategy().move_distribution(self.rps_logic))
+
+
+class TestStrategyRegistry(unittest.TestCase):
+    """
+    Test cases for registering strategies by name.
+    """
+
+    def test_builtin_strategies_registered(self):
+        self.assertIs(STRATEGIES['random'], RandomStrategy)
+
+    def test_register_strategy(self):
+        # Arrange & Act: Register a strategy class under a name
+        @register_strategy('test-registry')
+        class RegisteredStrategy(Strategy):
+            def execute(self, game_logic):
+                return 'r'
+
+        # Assert: The class is returned unchanged and can be looked up by name
+        self.addCleanup(STRATEGIES.pop, 'test-registry')
+        self.assertIs(STRATEGIES['test-registry'], RegisteredStrategy)
+
 class TestUserInputStrategy(unittest.TestCase):
     """
     Test cases for the UserInputStrategy class.
@@ -60,6 +184,7 @@ class TestUserInputStrategy(unittest.TestCase):
     def test_user_input_strategy_initialization(self):
         strategy = UserInputStrategy()
         self.assertEqual(strategy.name, "User Input")
+        self.assertEqual(strategy.get_state(), {})
 
     @patch('rps.strategy.get_user_input_with_verification', return_value='r')
     def test_user_input_strategy_execute(self, mock_get_user_input):
@@ -71,6 +196,8 @@ class TestUserInputStrategy(unittest.TestCase):
             'p': 'Paper',
             's': 'Scissors'
         }
+        mock_rps_logic.input_matcher = InputMatcher(
+            [['r', 'Rock'], ['p', 'Paper'], ['s', 'Scissors']])
 
         strategy = UserInputStrategy()
         weapon = strategy.execute(mock_rps_logic)
@@ -83,7 +210,7 @@ class TestUserInputStrategy(unittest.TestCase):
         )
         mock_get_user_input.assert_called_once_with(
             message=expected_message,
-            options=['r', 'p', 's']
+            matcher=mock_rps_logic.input_matcher
         )
         self.assertEqual(weapon, 'r')
 
@@ -98,6 +225,8 @@ class TestUserInputStrategy(unittest.TestCase):
             'p': 'Paper',
             's': 'Scissors'
         }
+        mock_rps_logic.input_matcher = InputMatcher(
+            [['r', 'Rock'], ['p', 'Paper'], ['s', 'Scissors']])
 
         strategy = UserInputStrategy()
 
@@ -0,0 +1,117 @@
+"""
+This module contains unit tests for the round-robin Tournament class, including checkpointing and
+resuming.
+"""
+
+import os
+import random
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from rps.checkpoint import write_checkpoint
+from rps.exceptions import CheckpointError
+from rps.game import Game
+from rps.rps_logic import RPSLogic
+from rps.strategy import RandomStrategy, Strategy
+from rps.tournament import Tournament
+
+
+class AlwaysRockStrategy(Strategy):
+    """A strategy that always picks rock."""
+
+    def __init__(self):
+        super().__init__('Always Rock')
+
+    def execute(self, game_logic):
+        return 'r'
+
+
+class AlwaysPaperStrategy(Strategy):
+    """A strategy that always picks paper."""
+
+    def __init__(self):
+        super().__init__('Always Paper')
+
+    def execute(self, game_logic):
+        return 'p'
+
+
+class TestTournament(unittest.TestCase):
+    """
+    Test cases for the Tournament class.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.rps_logic = RPSLogic()
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'tournament.ckpt')
+        self.factories = {'random1': RandomStrategy, 'random2': RandomStrategy,
+                          'random3': RandomStrategy}
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_standings(self):
+        tournament = Tournament(self.rps_logic, {'rock': AlwaysRockStrategy,
+                                                 'paper': AlwaysPaperStrategy,
+                                                 'rock2': AlwaysRockStrategy},
+                                rounds_per_game=10)
+
+        standings = tournament.run()
+
+        self.assertEqual(len(tournament.results), 3)
+        self.assertEqual(list(standings)[0], 'paper')
+        self.assertEqual(standings['paper'], {'won': 2, 'lost': 0, 'tied': 0, 'rounds_won': 20})
+        self.assertEqual(standings['rock'], {'won': 0, 'lost': 1, 'tied': 1, 'rounds_won': 0})
+
+    def test_resume_continues_exactly(self):
+        # Arrange: An uninterrupted reference run
+        random.seed(123)
+        reference = Tournament(self.rps_logic, self.factories, rounds_per_game=50)
+        reference.run()
+
+        # Act: The same run, crashing in the middle of its second game...
+        random.seed(123)
+        interrupted = Tournament(self.rps_logic, self.factories, rounds_per_game=50,
+                                 checkpoint_path=self.path, checkpoint_interval=0)
+        original_play_one_round = Game.play_one_round
+        calls = []
+
+        def crash_after_70_rounds(game):
+            calls.append(1)
+            if len(calls) > 70:
+                raise RuntimeError('Host restarted')
+            original_play_one_round(game)
+
+        with patch.object(Game, 'play_one_round', crash_after_70_rounds):
+            with self.assertRaises(RuntimeError):
+                interrupted.run()
+        self.assertTrue(os.path.exists(self.path))
+
+        # ...and resumed by a new process, with a different global random state
+        random.seed(999)
+        resumed = Tournament(self.rps_logic, self.factories, rounds_per_game=50,
+                             checkpoint_path=self.path)
+        resumed.run()
+
+        # Assert: The resumed run ends with exactly the same results
+        self.assertEqual(resumed.results, reference.results)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_resume_different_tournament(self):
+        # Arrange: A checkpoint of a tournament with longer games
+        write_checkpoint(self.path, Tournament(self.rps_logic, self.factories,
+                                               rounds_per_game=50).get_state())
+
+        other = Tournament(self.rps_logic, self.factories, rounds_per_game=10,
+                           checkpoint_path=self.path)
+        with self.assertRaises(CheckpointError):
+            other.run()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+"""
+This module contains unit tests for the binary wire protocol: frame encoding and decoding, the
+server's frame handling and the client library over a localhost connection.
+"""
+
+import asyncio
+import threading
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from benchmarks.rulesets import balanced_ruleset
+from rps.exceptions import ConfigurationError
+from rps.http_api import GameSession
+from rps.rps_logic import RPSLogic
+from rps.wire_protocol import (MAX_WEAPONS, MSG_HELLO, MSG_PLAY, MSG_RESULTS, ProtocolError,
+                               WireClient, WireServer, decode_results, decode_ruleset,
+                               encode_frame, encode_ruleset)
+
+
+class TestWireEncoding(unittest.TestCase):
+    """
+    Test cases for the frame encoding helpers.
+    """
+
+    def test_encode_frame(self):
+        self.assertEqual(encode_frame(MSG_PLAY, b'\x00\x01'), b'\x00\x00\x00\x03\x03\x00\x01')
+
+    def test_ruleset_round_trip(self):
+        options = ['r', 'p', 's', 'sp']
+        self.assertEqual(decode_ruleset(memoryview(encode_ruleset(options))), options)
+
+    def test_largest_ruleset_round_trip(self):
+        options = [f'w{i}' for i in range(MAX_WEAPONS)]
+        self.assertEqual(decode_ruleset(memoryview(encode_ruleset(options))), options)
+
+    def test_ruleset_too_large(self):
+        cases = [[f'w{i}' for i in range(MAX_WEAPONS + 1)], ['r', 'x' * 256]]
+        for options in cases:
+            with self.subTest(count=len(options)):
+                with self.assertRaises(ConfigurationError):
+                    encode_ruleset(options)
+
+    def test_server_rejects_large_ruleset(self):
+        # Arrange: More weapons than one byte can number
+        rps_logic = RPSLogic.from_data(*balanced_ruleset(301))
+
+        # Act & Assert: Rejected up front rather than when a client connects
+        with self.assertRaises(ConfigurationError):
+            WireServer(rps_logic)
+
+
+class TestWireServerFrames(unittest.TestCase):
+    """
+    Test cases for the server's handling of single frames.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.rps_logic = RPSLogic()
+
+    def setUp(self):
+        self.server = WireServer(self.rps_logic)
+        self.session = GameSession('test', self.rps_logic)
+
+    def test_hello(self):
+        reply = self.server.handle_frame(self.session, memoryview(bytes((MSG_HELLO,))))
+
+        self.assertEqual(decode_ruleset(memoryview(reply)[5:]), list(self.rps_logic.options))
+
+    def test_play(self):
+        ids = self.rps_logic.weapon_ids
+        frame = bytes((MSG_PLAY, ids['r'], ids['p'], ids['s']))
+
+        # Act: The computer always picks paper
+        with patch.object(self.session.computer, 'choose', return_value='p'):
+            reply = memoryview(self.server.handle_frame(self.session, memoryview(frame)))
+
+        # Assert: The reply carries the scores, the computer's moves and the results
+        self.assertEqual(reply[4], MSG_RESULTS)
+        scores, computer_ids, results = decode_results(reply[5:])
+        self.assertEqual(computer_ids.tolist(), [ids['p']] * 3)
+        self.assertEqual(results.tolist(), [self.rps_logic.compare(move, 'p') for move in 'rps'])
+        self.assertEqual(scores, (1, 1))
+
+    def test_invalid_frames(self):
+        for frame in (bytes((MSG_PLAY, len(self.rps_logic.options))), bytes((99,))):
+            with self.subTest(frame=frame):
+                with self.assertRaises(ProtocolError):
+                    self.server.handle_frame(self.session, memoryview(frame))
+
+
+class TestWireClient(unittest.TestCase):
+    """
+    Test cases for the client library against a server running in a background thread.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = WireServer(RPSLogic(), port=0)
+        cls.loop = asyncio.new_event_loop()
+        cls.loop.run_until_complete(cls.server.start())
+        cls.thread = threading.Thread(target=cls.loop.run_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        asyncio.run_coroutine_threadsafe(cls.server.close(), cls.loop).result(5)
+        cls.loop.call_soon_threadsafe(cls.loop.stop)
+        cls.thread.join(5)
+        cls.loop.close()
+
+    def test_play(self):
+        with WireClient(*self.server.address, timeout=5) as client:
+            self.assertEqual(client.options, list(self.server.rps_logic.options))
+
+            computer_moves, results = client.play(['r', 'p', 's'])
+
+            self.assertEqual(results, [self.server.rps_logic.compare(move, computer)
+                                       for move, computer in zip('rps', computer_moves)])
+            self.assertEqual(client.scores, (results.count(1), results.count(2)))
+
+    def test_pipeline(self):
+        with WireClient(*self.server.address, timeout=5) as client:
+            batches = [np.full(1000, index % 3, dtype=np.uint8) for index in range(10)]
+
+            replies = client.pipeline(batches)
+
+            # Assert: One reply per frame, in order, with one result per round
+            self.assertEqual([len(results) for _, results in replies], [1000] * 10)
+            results = np.concatenate([results for _, results in replies])
+            self.assertEqual(client.scores, (int((results == 1).sum()), int((results == 2).sum())))
+
+    def test_invalid_move(self):
+        with WireClient(*self.server.address, timeout=5) as client:
+            with self.assertRaises(ProtocolError):
+                client.play_ids(bytes((200,)))
+
+
+if __name__ == '__main__':
+    unittest.main()